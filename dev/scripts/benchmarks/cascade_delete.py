@@ -0,0 +1,154 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the per-relation walk and the planned single statement cascade delete of AWS bills.
+
+Creates synthetic tenants filled with AWS bills, cost entries and daily line items, then
+deletes the bills of each tenant with both implementations. Every run is rolled back.
+
+Usage:
+    python dev/scripts/benchmarks/cascade_delete.py --tenants 3 --bills 12 --rows 2000
+"""
+import argparse
+import datetime
+
+from common import print_table
+from common import setup_django
+from common import timeit
+
+
+def walk_delete(from_model, instance_pk_query, skip_relations, level=0):
+    """Delete like the recursive cascade_delete did: one statement per relation and level."""
+    from django.db import models
+
+    from koku.database import execute_delete_sql
+    from koku.database import execute_update_sql
+    from koku.database import fast_table_exists
+
+    statements = 0
+    instance_pk_query = instance_pk_query.values_list("pk").order_by()
+    for model_relation in from_model._meta.related_objects:
+        related_model = model_relation.related_model
+        if related_model in skip_relations or not fast_table_exists(related_model._meta.db_table):
+            continue
+        filterspec = {f"{model_relation.remote_field.column}__in": models.Subquery(instance_pk_query)}
+        if model_relation.on_delete.__name__ == "SET_NULL":
+            execute_update_sql(
+                related_model.objects.filter(**filterspec), **{model_relation.remote_field.column: None}
+            )
+            statements += 1
+        elif model_relation.on_delete.__name__ == "CASCADE":
+            related_pk_values = related_model.objects.filter(**filterspec).values_list(related_model._meta.pk.name)
+            statements += walk_delete(related_model, related_pk_values, skip_relations, level + 1)
+    if level:
+        instance_pk_query = from_model.objects.filter(pk__in=models.Subquery(instance_pk_query))
+    execute_delete_sql(instance_pk_query)
+    return statements + 1
+
+
+def create_tenant(schema, bills, rows):
+    """Create a synthetic tenant holding bills AWS bills with rows cost entries and daily line items each."""
+    from tenant_schemas.utils import schema_context
+
+    from api.iam.models import Tenant
+    from api.provider.models import Provider
+    from reporting.provider.aws.models import AWSCostEntry
+    from reporting.provider.aws.models import AWSCostEntryBill
+    from reporting.provider.aws.models import AWSCostEntryLineItemDaily
+
+    tenant, created = Tenant.objects.get_or_create(schema_name=schema)
+    if created:
+        tenant.create_schema()
+    provider = Provider.objects.filter(type=Provider.PROVIDER_AWS_LOCAL).first()
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    with schema_context(schema):
+        AWSCostEntryBill.objects.filter(billing_resource="benchmark").delete()
+        for month in range(bills):
+            bill = AWSCostEntryBill.objects.create(
+                billing_resource="benchmark",
+                bill_type=f"benchmark-{month}",
+                billing_period_start=start + datetime.timedelta(days=31 * month),
+                billing_period_end=start + datetime.timedelta(days=31 * (month + 1)),
+                provider=provider,
+            )
+            AWSCostEntry.objects.bulk_create(
+                AWSCostEntry(
+                    interval_start=bill.billing_period_start + datetime.timedelta(hours=hour),
+                    interval_end=bill.billing_period_start + datetime.timedelta(hours=hour + 1),
+                    bill=bill,
+                )
+                for hour in range(rows)
+            )
+            AWSCostEntryLineItemDaily.objects.bulk_create(
+                AWSCostEntryLineItemDaily(
+                    cost_entry_bill=bill,
+                    line_item_type="Usage",
+                    usage_account_id="benchmark",
+                    usage_start=bill.billing_period_start.date(),
+                    product_code="AmazonEC2",
+                    resource_id=f"i-{row}",
+                    currency_code="USD",
+                )
+                for row in range(rows)
+            )
+
+
+def delete_bills(schema, planned):
+    """Delete the synthetic bills of schema, roll back and return the number of statements issued."""
+    from django.db import transaction
+    from tenant_schemas.utils import schema_context
+
+    from koku.database import cascade_delete
+    from koku.database import CASCADE_SKIP_TABLES
+    from koku.database import get_model
+    from reporting.provider.aws.models import AWSCostEntryBill
+
+    with schema_context(schema), transaction.atomic():
+        bills = AWSCostEntryBill.objects.filter(billing_resource="benchmark")
+        if planned:
+            cascade_delete(bills.query.model, bills)
+            statements = 1
+        else:
+            statements = walk_delete(AWSCostEntryBill, bills, [get_model(table) for table in CASCADE_SKIP_TABLES])
+        transaction.set_rollback(True)
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenants", type=int, default=2)
+    parser.add_argument("--bills", type=int, default=6)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django()
+    from koku.database import cascade_delete
+    from reporting.provider.aws.models import AWSCostEntryBill
+    from tenant_schemas.utils import schema_context
+
+    results = []
+    for tenant in range(args.tenants):
+        schema = f"org_cascade_benchmark_{tenant}"
+        create_tenant(schema, args.bills, args.rows)
+        with schema_context(schema):
+            bills = AWSCostEntryBill.objects.filter(billing_resource="benchmark")
+            counts = cascade_delete(bills.query.model, bills, dry_run=True)
+        walk_time, walk_statements = timeit(delete_bills, schema, False, repeat=args.repeat)
+        plan_time, _ = timeit(delete_bills, schema, True, repeat=args.repeat)
+        results.append(
+            (
+                schema,
+                sum(counts["DELETE"].values()),
+                walk_statements,
+                f"{walk_time:.2f}",
+                f"{plan_time:.2f}",
+                f"{walk_time / plan_time:.1f}x",
+            )
+        )
+    print_table(("tenant", "rows", "walk statements", "walk s", "planned s", "speedup"), results)
+
+
+if __name__ == "__main__":
+    main()
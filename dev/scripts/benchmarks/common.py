@@ -0,0 +1,70 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Shared helpers for the koku micro-benchmarks."""
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+KOKU_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "koku"))
+
+
+def setup_django():
+    """Make the koku project importable from a benchmark script."""
+    if KOKU_DIR not in sys.path:
+        sys.path.insert(0, KOKU_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp")
+    import django
+
+    django.setup()
+
+
+def _run_in_child(queue, func, args):
+    """Run func and report its wall time and the child's peak RSS."""
+    setup_django()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, peak_rss_kb, result))
+
+
+def measure(func, *args):
+    """Run func in a fresh process so peak RSS is not polluted by other runs.
+
+    Returns:
+        (tuple): elapsed seconds, peak RSS in MiB, func return value
+
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_in_child, args=(queue, func, args))
+    process.start()
+    elapsed, peak_rss_kb, result = queue.get()
+    process.join()
+    return elapsed, peak_rss_kb / 1024, result
+
+
+def timeit(func, *args, repeat=3):
+    """Return the best wall time of func over repeat runs in this process."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def print_table(headers, rows):
+    """Print benchmark results as an aligned table."""
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    line = "  ".join(f"{{:<{width}}}" for width in widths)
+    print(line.format(*headers))
+    print(line.format(*["-" * width for width in widths]))
+    for row in rows:
+        print(line.format(*row))
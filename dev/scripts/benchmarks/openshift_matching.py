@@ -0,0 +1,131 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Benchmark OpenShift on cloud matching of resources and labels for large clusters.
+
+Usage:
+    python dev/scripts/benchmarks/openshift_matching.py --rows 500000 --labels 100 2000 --nodes 1000
+    python dev/scripts/benchmarks/openshift_matching.py --skip-baseline
+"""
+import argparse
+import json
+import random
+import uuid
+
+from common import print_table
+from common import setup_django
+from common import timeit
+
+
+def generate_cluster(nodes, labels):
+    """Return a cluster topology and the enabled (key, value) labels of a cluster."""
+    topology = {
+        "cluster_id": "my-cluster-id",
+        "cluster_alias": "my-cluster",
+        "resource_ids": [f"i-{node:08x}" for node in range(nodes)],
+        "nodes": [f"node-{node}" for node in range(nodes)],
+        "persistent_volumes": [f"pvc-{node}" for node in range(nodes)],
+    }
+    label_pairs = [(f"label{label}", f"value{label % 50}") for label in range(labels)]
+    return topology, label_pairs
+
+
+def generate_data_frame(provider, rows, topology, label_pairs, distinct_tags):
+    """Return a daily data frame for provider whose tags draw from the cluster labels."""
+    import numpy as np
+    import pandas as pd
+
+    tags = [
+        json.dumps(dict(random.sample(label_pairs, min(8, len(label_pairs))) + [("owner", f"user{i}")]))
+        for i in range(distinct_tags)
+    ]
+    tags = np.random.choice(tags, rows)
+    if provider == "AWS":
+        resource_ids = topology["resource_ids"] + [f"x-{i}" for i in range(len(topology["resource_ids"]) * 10)]
+        return pd.DataFrame(
+            {"lineitem_resourceid": np.random.choice(resource_ids, rows), "resourcetags": tags, "cost": 1.0}
+        )
+    if provider == "Azure":
+        names = topology["nodes"] + [f"vm-{i}" for i in range(len(topology["nodes"]) * 10)]
+        resource_ids = [f"/subscriptions/sub/providers/Microsoft.Compute/virtualMachines/{name}" for name in names]
+        return pd.DataFrame(
+            {"resourceid": np.random.choice(resource_ids, rows), "instanceid": "", "tags": tags, "cost": 1.0}
+        )
+    return pd.DataFrame({"labels": tags, "cost": 1.0})
+
+
+def baseline_aws_match(data_frame, cluster_topology, matched_tags):
+    """The row by row AWS matching that preceded the compiled matcher."""
+    import pandas as pd
+
+    from masu.util.ocp.common import match_openshift_labels
+
+    data_frame["resource_id_matched"] = data_frame["lineitem_resourceid"].isin(cluster_topology["resource_ids"])
+    tags = data_frame["resourcetags"].str.lower()
+    data_frame["special_case_tag_matched"] = tags.str.contains("openshift_cluster|openshift_project|openshift_node")
+    tag_keys = [key for tag in matched_tags for key in tag]
+    tag_values = [value for tag in matched_tags for value in tag.values()]
+    tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
+    tag_df = pd.concat([tags, tag_matched], axis=1)
+    tag_df.columns = ("tags", "tag_matched")
+    data_frame["matched_tag"] = tag_df[tag_df.tag_matched].tags.apply(match_openshift_labels, args=(matched_tags,))
+    data_frame["matched_tag"].fillna(value="", inplace=True)
+    matched = data_frame[
+        data_frame["resource_id_matched"] | data_frame["special_case_tag_matched"] | (data_frame["matched_tag"] != "")
+    ]
+    matched["uuid"] = matched.apply(lambda _: str(uuid.uuid4()), axis=1)
+    return matched.drop(columns=["special_case_tag_matched"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--labels", type=int, nargs="+", default=[100, 2000], help="enabled labels per run")
+    parser.add_argument("--distinct-tags", type=int, default=5000, help="distinct tag sets in the data")
+    parser.add_argument("--skip-baseline", action="store_true", help="do not time the row by row AWS matching")
+    args = parser.parse_args()
+
+    setup_django()
+    from masu.util.aws.common import match_openshift_resources_and_labels as aws_match
+    from masu.util.azure.common import match_openshift_resources_and_labels as azure_match
+    from masu.util.gcp.common import match_openshift_resources_and_labels as gcp_match
+    from masu.util.ocp.common import OpenShiftMatcher
+
+    matchers = {"AWS": aws_match, "Azure": azure_match, "GCP": gcp_match}
+    results = []
+    for labels in args.labels:
+        topology, label_pairs = generate_cluster(args.nodes, labels)
+        matched_tags = [{key: value} for key, value in label_pairs[: labels // 2]]
+        for provider, match in matchers.items():
+            data_frame = generate_data_frame(provider, args.rows, topology, label_pairs, args.distinct_tags)
+            compile_time, matcher = timeit(OpenShiftMatcher, topology, matched_tags, repeat=1)
+            match_time, matched = timeit(
+                lambda: match(data_frame.copy(), topology, matched_tags, matcher=matcher), repeat=1
+            )
+            baseline = "-"
+            if provider == "AWS" and not args.skip_baseline:
+                baseline_time, _ = timeit(
+                    lambda: baseline_aws_match(data_frame.copy(), topology, matched_tags), repeat=1
+                )
+                baseline = f"{baseline_time:.2f}"
+            results.append(
+                (
+                    provider,
+                    args.rows,
+                    args.nodes,
+                    labels,
+                    len(matched),
+                    f"{compile_time:.3f}",
+                    f"{match_time:.2f}",
+                    baseline,
+                )
+            )
+    print_table(
+        ("provider", "rows", "nodes", "labels", "matched rows", "compile s", "match s", "row by row s"), results
+    )
+
+
+if __name__ == "__main__":
+    main()
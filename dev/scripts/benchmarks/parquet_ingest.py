@@ -0,0 +1,108 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the pandas and arrow CSV ingest engines used for Parquet conversion.
+
+Usage:
+    python dev/scripts/benchmarks/parquet_ingest.py --rows 1000000
+    python dev/scripts/benchmarks/parquet_ingest.py --file /tmp/my-cur.csv.gz --provider-type AWS
+"""
+import argparse
+import csv
+import gzip
+import os
+import random
+import tempfile
+
+from common import KOKU_DIR
+from common import measure
+from common import print_table
+
+SAMPLE_CUR = os.path.join(KOKU_DIR, "masu", "test", "data", "test_cur.csv")
+
+
+def generate_cur(path, rows):
+    """Write a gzipped AWS CUR with rows lines built from the test CUR."""
+    with open(SAMPLE_CUR) as sample:
+        reader = csv.reader(sample)
+        header = next(reader)
+        sample_rows = list(reader)
+    float_columns = [idx for idx, col in enumerate(header) if col.lower().endswith(("amount", "cost", "rate"))]
+    with gzip.open(path, "wt", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(header)
+        for i in range(rows):
+            row = list(sample_rows[i % len(sample_rows)])
+            for idx in float_columns:
+                row[idx] = f"{random.random() * 100:.10f}"
+            writer.writerow(row)
+
+
+def convert(csv_filename, provider_type, engine, batch_size, out_dir):
+    """Convert csv_filename to parquet parts with the given engine and return the row count."""
+    import pandas as pd
+
+    from masu.processor.parquet.arrow_csv_reader import ARROW_INGEST_ENGINE
+    from masu.processor.parquet.arrow_csv_reader import read_csv_batches
+    from masu.processor.parquet.parquet_report_processor import COLUMN_CONVERTERS
+
+    kwargs = {"compression": "gzip"} if csv_filename.endswith(".gz") else {}
+    converters = COLUMN_CONVERTERS[provider_type]()
+    col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
+    if engine == ARROW_INGEST_ENGINE:
+        batches = read_csv_batches(csv_filename, col_names, converters, batch_size, **kwargs)
+    else:
+        csv_converters = {col: converters[col.lower()] for col in col_names if col.lower() in converters}
+        csv_converters.update({col: str for col in col_names if col not in csv_converters})
+        batches = pd.read_csv(csv_filename, converters=csv_converters, chunksize=batch_size, **kwargs)
+    rows = 0
+    for i, data_frame in enumerate(batches):
+        data_frame.to_parquet(
+            os.path.join(out_dir, f"{engine}_{i}.parquet"),
+            allow_truncated_timestamps=True,
+            coerce_timestamps="ms",
+            index=False,
+        )
+        rows += len(data_frame)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000, help="rows in the generated AWS CUR")
+    parser.add_argument("--file", help="benchmark an existing CSV file instead of a generated CUR")
+    parser.add_argument("--provider-type", default="AWS", help="provider type of --file")
+    parser.add_argument("--batch-size", type=int, default=200000, help="PARQUET_PROCESSING_BATCH_SIZE")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_filename = args.file
+        if not csv_filename:
+            csv_filename = os.path.join(temp_dir, "benchmark-cur.csv.gz")
+            generate_cur(csv_filename, args.rows)
+
+        results = []
+        outputs = {}
+        for engine in ("pandas", "arrow"):
+            out_dir = os.path.join(temp_dir, engine)
+            os.mkdir(out_dir)
+            elapsed, peak_rss, rows = measure(
+                convert, csv_filename, args.provider_type, engine, args.batch_size, out_dir
+            )
+            outputs[engine] = out_dir
+            results.append((engine, rows, f"{elapsed:.2f}", f"{rows / elapsed:,.0f}", f"{peak_rss:,.0f}"))
+
+        print_table(("engine", "rows", "seconds", "rows/sec", "peak RSS MiB"), results)
+
+        identical = True
+        for name in sorted(os.listdir(outputs["pandas"])):
+            arrow_name = name.replace("pandas", "arrow")
+            with open(os.path.join(outputs["pandas"], name), "rb") as expected:
+                with open(os.path.join(outputs["arrow"], arrow_name), "rb") as result:
+                    identical = identical and expected.read() == result.read()
+        print(f"\nParquet output byte-identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare row-wise and columnar folding of tag columns on wide synthetic CURs.
+
+Usage:
+    python dev/scripts/benchmarks/tag_folding.py --rows 100000 --tag-columns 50 300 --density 0.03
+"""
+import argparse
+import json
+import random
+
+from common import print_table
+from common import setup_django
+from common import timeit
+
+
+def generate_tag_frame(rows, tag_columns, density):
+    """Return a data frame of rows with tag_columns sparse tag columns."""
+    import numpy as np
+    import pandas as pd
+
+    values = np.full((rows, tag_columns), "", dtype=object)
+    for column in range(tag_columns):
+        present = np.random.rand(rows) < density
+        values[present, column] = [random.choice(("prod", "stage", f"team-{column}")) for _ in range(present.sum())]
+    columns = [f"resourceTags/user:key{column}" for column in range(tag_columns)]
+    return pd.DataFrame(values, columns=columns)
+
+
+def fold_by_row(data_frame, tag_columns, scrub_column_name):
+    """The row-wise folding aws_post_processor and oci_post_processor used."""
+    tags = data_frame[tag_columns].apply(
+        lambda row: {scrub_column_name(column): value for column, value in row.items() if value}, axis=1
+    )
+    tags.where(tags.notna(), lambda _: [{}], inplace=True)
+    return tags.apply(json.dumps)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--tag-columns", type=int, nargs="+", default=[50, 300])
+    parser.add_argument("--density", type=float, default=0.03, help="share of non-empty tag cells")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from masu.util.common import fold_tag_columns
+
+    def scrub_column_name(column):
+        return column.replace("resourceTags/user:", "")
+
+    results = []
+    for tag_columns in args.tag_columns:
+        data_frame = generate_tag_frame(args.rows, tag_columns, args.density)
+        columns = list(data_frame)
+        row_time, expected = timeit(fold_by_row, data_frame, columns, scrub_column_name, repeat=args.repeat)
+        column_time, result = timeit(fold_tag_columns, data_frame, columns, scrub_column_name, repeat=args.repeat)
+        results.append(
+            (
+                args.rows,
+                tag_columns,
+                f"{row_time:.2f}",
+                f"{column_time:.2f}",
+                f"{row_time / column_time:.1f}x",
+                expected.tolist() == result.tolist(),
+            )
+        )
+    print_table(("rows", "tag columns", "row-wise s", "columnar s", "speedup", "identical"), results)
+
+
+if __name__ == "__main__":
+    main()
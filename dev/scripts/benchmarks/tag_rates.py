@@ -0,0 +1,140 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare per-rate and set-based application of OpenShift tag rates.
+
+Runs against the local database and rolls every run back, so it can be pointed
+at any schema holding OpenShift daily summary data.
+
+Usage:
+    python dev/scripts/benchmarks/tag_rates.py --schema org1234567 --cluster-id my-ocp-cluster-1 --tag-values 50 500
+"""
+import argparse
+import random
+
+from common import print_table
+from common import setup_django
+from common import timeit
+
+METRICS = (
+    "cpu_core_usage_per_hour",
+    "cpu_core_request_per_hour",
+    "memory_gb_usage_per_hour",
+    "memory_gb_request_per_hour",
+    "storage_gb_usage_per_month",
+)
+
+
+def build_rates(label_pairs, tag_values):
+    """Return infrastructure and supplementary tag rates covering tag_values values per metric."""
+    pairs = list(label_pairs)
+    while len(pairs) < tag_values:
+        pairs.append(("benchmark", f"value-{len(pairs)}"))
+    rates = ({}, {})
+    for metric in METRICS:
+        for rate_type in rates:
+            tags = rate_type.setdefault(metric, {})
+            for key, value in pairs[:tag_values]:
+                tags.setdefault(key, {})[value] = f"{random.uniform(0.01, 10):.10f}"
+    return rates
+
+
+def split_rates(rates):
+    """Yield one single-rate cost model per (metric, key, value), as the per-rate loop applied them."""
+    for metric, tags in rates.items():
+        for key, values in tags.items():
+            for value, rate in values.items():
+                yield {metric: {key: {value: rate}}}
+
+
+def apply_rates(schema, cluster_id, start_date, end_date, rates, per_rate):
+    """Apply the tag rates, roll them back and return the number of rows and the cost they added."""
+    from django.db import connection
+    from django.db import transaction
+    from tenant_schemas.utils import schema_context
+
+    from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+
+    infrastructure_rates, supplementary_rates = rates
+    with schema_context(schema), transaction.atomic():
+        with OCPReportDBAccessor(schema) as accessor:
+            if per_rate:
+                for infra in split_rates(infrastructure_rates):
+                    accessor.populate_tag_usage_costs(infra, {}, start_date, end_date, cluster_id)
+                for supplementary in split_rates(supplementary_rates):
+                    accessor.populate_tag_usage_costs({}, supplementary, start_date, end_date, cluster_id)
+            else:
+                accessor.populate_tag_usage_costs(
+                    infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
+                )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT count(*),
+                    round(sum(
+                        coalesce((infrastructure_usage_cost->>'cpu')::numeric, 0)
+                        + coalesce((infrastructure_usage_cost->>'memory')::numeric, 0)
+                        + coalesce((infrastructure_usage_cost->>'storage')::numeric, 0)
+                        + coalesce((supplementary_usage_cost->>'cpu')::numeric, 0)
+                        + coalesce((supplementary_usage_cost->>'memory')::numeric, 0)
+                        + coalesce((supplementary_usage_cost->>'storage')::numeric, 0)
+                    ), 6)
+                FROM reporting_ocpusagelineitem_daily_summary
+                WHERE monthly_cost_type = 'Tag' AND cluster_id = %s AND usage_start >= %s AND usage_start <= %s
+                """,
+                [cluster_id, start_date, end_date],
+            )
+            result = cursor.fetchone()
+        transaction.set_rollback(True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--schema", required=True)
+    parser.add_argument("--cluster-id", required=True)
+    parser.add_argument("--tag-values", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django()
+    from tenant_schemas.utils import schema_context
+
+    from api.utils import DateHelper
+    from reporting.provider.ocp.models import OCPUsagePodLabelSummary
+
+    dh = DateHelper()
+    start_date, end_date = dh.this_month_start.date(), dh.this_month_end.date()
+    with schema_context(args.schema):
+        label_pairs = dict.fromkeys(
+            (row.key, value)
+            for row in OCPUsagePodLabelSummary.objects.filter(report_period__cluster_id=args.cluster_id)
+            for value in row.values
+        )
+
+    results = []
+    for tag_values in args.tag_values:
+        rates = build_rates(label_pairs, tag_values)
+        statements = sum(1 for rate_type in rates for _ in split_rates(rate_type))
+        loop_time, expected = timeit(
+            apply_rates, args.schema, args.cluster_id, start_date, end_date, rates, True, repeat=args.repeat
+        )
+        set_time, result = timeit(
+            apply_rates, args.schema, args.cluster_id, start_date, end_date, rates, False, repeat=args.repeat
+        )
+        results.append(
+            (
+                tag_values,
+                statements,
+                f"{loop_time:.2f}",
+                f"{set_time:.2f}",
+                f"{loop_time / set_time:.1f}x",
+                expected == result,
+            )
+        )
+    print_table(("tag values", "per-rate statements", "per-rate s", "set-based s", "speedup", "identical"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -132,13 +132,20 @@ class ReportPagination(StandardResultsSetPagination):
             return int(request.query_params.get(self.limit_query_param))
         return None
 
+    def get_page_limit(self, request):
+        """Get the page limit from request, 0 meaning all of the data."""
+        if self.get_limit_parameter(request) == 0:
+            return 0
+        return self.get_limit(request)
+
+    def get_page(self, data):
+        """Slice the page out of the report data."""
+        return data[self.offset : self.offset + self.limit]  # noqa: E203
+
     def paginate_queryset(self, queryset, request, view=None):
         """Override queryset pagination."""
         self.count = self.get_count(queryset)
-        if self.get_limit_parameter(request) == 0:
-            self.limit = 0
-        else:
-            self.limit = self.get_limit(request)
+        self.limit = self.get_page_limit(request)
         if self.limit is None:
             return None
         self.offset = self.get_offset(request)
@@ -151,7 +158,7 @@ class ReportPagination(StandardResultsSetPagination):
             return queryset
 
         if self.limit:
-            query_data = queryset.get("data", [])[self.offset : self.offset + self.limit]  # noqa
+            query_data = self.get_page(queryset.get("data", []))
         else:
             query_data = queryset.get("data", [])
 
@@ -183,6 +190,23 @@ class ReportPagination(StandardResultsSetPagination):
         return Response(response)
 
 
+class DatePagedReportPagination(ReportPagination):
+    """A paginator for report data the query handler already restricted to the page."""
+
+    def __init__(self, count):
+        """Set the parameters."""
+        super().__init__()
+        self.count = count
+
+    def get_count(self, queryset):
+        """Determine a report data's count."""
+        return self.count
+
+    def get_page(self, data):
+        """Return the report data, which only holds the page."""
+        return data
+
+
 class ForecastListPaginator(ListPaginator):
     """A paginator that applies a default limit based on days in month."""
 
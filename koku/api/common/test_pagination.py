@@ -10,6 +10,7 @@ from unittest.mock import patch
 from django.test import TestCase
 from rest_framework.response import Response
 
+from .pagination import DatePagedReportPagination
 from .pagination import PATH_INFO
 from .pagination import ReportPagination
 from .pagination import ReportRankedPagination
@@ -149,6 +150,32 @@ class ReportPaginationTest(TestCase):
         self.assertIn("last", links)
 
 
+class DatePagedReportPaginationTest(TestCase):
+    """Tests for report API pagination of pre-paged report data."""
+
+    def setUp(self):
+        """Set up each test case."""
+        self.paginator = DatePagedReportPagination(10)
+        self.paginator.request = Mock
+        self.paginator.request.META = {}
+        self.paginator.request.query_params = {}
+
+        self.data = {"total": {}, "data": [{"usage": 1, "cost": 2}, {"usage": 2, "cost": 4}]}
+
+    def test_get_count(self):
+        """Test that the count of the full report is returned."""
+        self.assertEqual(self.paginator.get_count(self.data), 10)
+
+    def test_paginate_queryset(self):
+        """Test that the page is not sliced again."""
+        self.paginator.request.query_params = {"limit": 2, "offset": 4}
+        data = self.paginator.paginate_queryset(self.data, self.paginator.request)
+
+        self.assertEqual(len(data.get("data", [])), 2)
+        self.assertEqual(self.paginator.count, 10)
+        self.assertEqual(self.paginator.offset, 4)
+
+
 class ReportRankedPaginationTest(TestCase):
     """Tests for ranked report API pagination."""
 
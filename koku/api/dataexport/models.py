@@ -30,6 +30,8 @@ class DataExportRequest(models.Model):
     start_date = models.DateField(null=False)
     end_date = models.DateField(null=False)
     bucket_name = models.CharField(max_length=63)
+    # S3 prefixes already copied, so a retried export continues where it stopped
+    synced_prefixes = models.JSONField(null=False, default=list)
 
     class Meta:
         ordering = ("created_timestamp",)
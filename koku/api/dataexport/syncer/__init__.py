@@ -1,11 +1,16 @@
 """Data export syncer."""
 import logging
+import threading
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from datetime import timedelta
 from itertools import product
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from dateutil.rrule import DAILY
 from dateutil.rrule import MONTHLY
@@ -35,7 +40,7 @@ class SyncerInterface(ABC):
     """Data syncer interface."""
 
     @abstractmethod
-    def sync_bucket(self, schema_name, destination_bucket_name, date_range):
+    def sync_bucket(self, schema_name, destination_bucket_name, date_range, synced_prefixes=(), on_prefix_synced=None):
         """
         Sync all files in our bucket for one account to customer account.
 
@@ -43,6 +48,8 @@ class SyncerInterface(ABC):
             schema_name (str): account schema name to sync
             destination_bucket_name (str): name of the customer bucket
             date_range (tuple): Pair of date objects of inclusive start and exclusive end dates for which to sync data.
+            synced_prefixes (iterable): prefixes already synced by an earlier attempt, which are skipped
+            on_prefix_synced (callable): called with each prefix once all of its files are synced
 
         Returns:
             None
@@ -63,11 +70,72 @@ class AwsS3Syncer(SyncerInterface):
         """
         self.s3_resource = boto3.resource("s3", settings.S3_REGION)
         self.s3_source_bucket = self.s3_resource.Bucket(s3_source_bucket_name)
+        self.s3_source_bucket_name = s3_source_bucket_name
+        self.transfer_config = TransferConfig(multipart_threshold=settings.DATA_EXPORT_MULTIPART_THRESHOLD)
+        self._local = threading.local()
+
+    def _get_s3_resource(self):
+        """Return an S3 resource for the current thread, boto3 resources are not thread safe."""
+        if threading.current_thread() is threading.main_thread():
+            return self.s3_resource
+        if not hasattr(self._local, "s3_resource"):
+            self._local.s3_resource = boto3.resource("s3", settings.S3_REGION)
+        return self._local.s3_resource
+
+    def _get_prefixes(self, schema_name, date_range):
+        """
+        Get the month level prefixes followed by the day prefixes to sync for each of the account's providers.
+
+        Args:
+            schema_name (str): account schema name to sync
+            date_range (tuple): Pair of date objects of inclusive start and exclusive end dates for which to sync data.
+
+        Returns:
+            list of prefixes
+
+        """
+        start_date, end_date = date_range
+        # rrule is inclusive for both dates, so we need to make end_date exclusive
+        end_date = end_date - timedelta(days=1)
+        days = rrule(DAILY, dtstart=start_date, until=end_date)
+        months = rrule(MONTHLY, dtstart=start_date, until=end_date)
+        providers = Provider.objects.filter(customer__schema_name=schema_name).all()
+
+        prefixes = []
+        # The specific month level files are under the 00 day, followed by all the day files
+        for date, day, provider in [
+            *((month, 0, provider) for month, provider in product(months, providers)),
+            *((day, day.day, provider) for day, provider in product(days, providers)),
+        ]:
+            # We need to normalize capitalization and "-local" dev providers.
+            provider_slug = provider.type.lower().split("-")[0]
+            prefixes.append(
+                f"{settings.S3_BUCKET_PATH}/{schema_name}/"
+                f"{provider_slug}/{provider.uuid}/"
+                f"{date.year:04d}/{date.month:02d}/{day:02d}/"
+            )
+        return prefixes
+
+    def _list_objects(self, prefix):
+        """
+        List the source objects under a prefix.
+
+        Args:
+            prefix (str): the prefix to list
+
+        Returns:
+            list of boto3.s3.ObjectSummary
+
+        """
+        LOG.debug("sync_bucket checking prefix %s", prefix)
+        return list(self._get_s3_resource().Bucket(self.s3_source_bucket_name).objects.filter(Prefix=prefix))
 
     def _copy_object(self, s3_destination_bucket, source_object):
         """
         Copy a source object to the destination bucket.
 
+        Objects of DATA_EXPORT_MULTIPART_THRESHOLD bytes or more are copied in parts by the S3 transfer manager.
+
         Args:
             s3_destination_bucket (boto3.s3.Bucket): the destination bucket object
             source_object (boto3.s3.Object): our source object
@@ -76,10 +144,13 @@ class AwsS3Syncer(SyncerInterface):
         LOG.debug("copying S3 object %s to %s", source_object.key, s3_destination_bucket)
         try:
             destination_object = s3_destination_bucket.Object(source_object.key)
-            destination_object.copy_from(
-                ACL="bucket-owner-full-control",
-                CopySource={"Bucket": source_object.bucket_name, "Key": source_object.key},
-            )
+            copy_source = {"Bucket": source_object.bucket_name, "Key": source_object.key}
+            if source_object.size >= settings.DATA_EXPORT_MULTIPART_THRESHOLD:
+                destination_object.copy(
+                    copy_source, ExtraArgs={"ACL": "bucket-owner-full-control"}, Config=self.transfer_config
+                )
+            else:
+                destination_object.copy_from(ACL="bucket-owner-full-control", CopySource=copy_source)
         except ClientError as e:
             # If we run into an InvalidObjectState error, and object is in glacier, retrieve it
             if source_object.storage_class == "GLACIER" and e.response["Error"]["Code"] == "InvalidObjectState":
@@ -99,7 +170,67 @@ class AwsS3Syncer(SyncerInterface):
                 )
             raise e
 
-    def sync_bucket(self, schema_name, s3_destination_bucket_name, date_range):
+    def _copy_to_bucket(self, s3_destination_bucket_name, source_object):
+        """Copy a source object to the destination bucket from a worker thread."""
+        self._copy_object(self._get_s3_resource().Bucket(s3_destination_bucket_name), source_object)
+
+    def _sync_prefixes(self, s3_destination_bucket_name, prefixes, on_prefix_synced=None):  # noqa: C901
+        """
+        List the prefixes and copy their objects to the destination bucket with a bounded thread pool.
+
+        A file in cold storage does not stop the other copies, so the restores of all such files are requested
+        before SyncedFileInColdStorageError is raised. Any other error cancels the copies not yet started.
+
+        Args:
+            s3_destination_bucket_name (str): name of the customer bucket
+            prefixes (list): prefixes to sync
+            on_prefix_synced (callable): called from this thread with each prefix once all of its files are copied
+
+        """
+        cold_storage_errors = []
+        unsynced_prefixes = set()
+        # The prefix of each running listing and copy and the number of copies left per listed prefix
+        listings = {}
+        copies = {}
+        remaining = {}
+        with ThreadPoolExecutor(max_workers=settings.DATA_EXPORT_WORKERS) as executor:
+            for prefix in prefixes:
+                listings[executor.submit(self._list_objects, prefix)] = prefix
+            not_done = set(listings)
+            try:
+                while not_done:
+                    done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in listings:
+                            prefix = listings.pop(future)
+                            source_objects = future.result()
+                            remaining[prefix] = len(source_objects)
+                            for source_object in source_objects:
+                                copy = executor.submit(self._copy_to_bucket, s3_destination_bucket_name, source_object)
+                                copies[copy] = prefix
+                                not_done.add(copy)
+                        else:
+                            prefix = copies.pop(future)
+                            remaining[prefix] -= 1
+                            try:
+                                future.result()
+                            except SyncedFileInColdStorageError as e:
+                                cold_storage_errors.append(e)
+                                unsynced_prefixes.add(prefix)
+                        if remaining[prefix] == 0 and prefix not in unsynced_prefixes and on_prefix_synced:
+                            on_prefix_synced(prefix)
+            except BaseException:
+                for future in not_done:
+                    future.cancel()
+                raise
+
+        if cold_storage_errors:
+            LOG.info("%s requested files are in cold storage.", len(cold_storage_errors))
+            raise cold_storage_errors[0]
+
+    def sync_bucket(
+        self, schema_name, s3_destination_bucket_name, date_range, synced_prefixes=(), on_prefix_synced=None
+    ):
         """
         Sync buckets if the ENABLE_S3_ARCHIVING flag is set.
 
@@ -107,6 +238,8 @@ class AwsS3Syncer(SyncerInterface):
             schema_name (str): account schema name to sync
             s3_destination_bucket_name (str): name of the customer bucket
             date_range (tuple): Pair of date objects of inclusive start and exclusive end dates for which to sync data.
+            synced_prefixes (iterable): prefixes already synced by an earlier attempt, which are skipped
+            on_prefix_synced (callable): called with each prefix once all of its files are synced
 
         """
         if settings.ENABLE_S3_ARCHIVING:
@@ -117,39 +250,13 @@ class AwsS3Syncer(SyncerInterface):
                 date_range[0],
                 date_range[1],
             )
-            start_date, end_date = date_range
-            # rrule is inclusive for both dates, so we need to make end_date exclusive
-            end_date = end_date - timedelta(days=1)
-            days = rrule(DAILY, dtstart=start_date, until=end_date)
-            months = rrule(MONTHLY, dtstart=start_date, until=end_date)
-            s3_destination_bucket = self.s3_resource.Bucket(s3_destination_bucket_name)
-            providers = Provider.objects.filter(customer__schema_name=schema_name).all()
-
-            # Copy the specific month level files
-            for month, provider in product(months, providers):
-                # We need to normalize capitalization and "-local" dev providers.
-                provider_slug = provider.type.lower().split("-")[0]
-                prefix = (
-                    f"{settings.S3_BUCKET_PATH}/{schema_name}/"
-                    f"{provider_slug}/{provider.uuid}/"
-                    f"{month.year:04d}/{month.month:02d}/00/"
-                )
-                LOG.debug("sync_bucket checking prefix %s", prefix)
-                for source_object in self.s3_source_bucket.objects.filter(Prefix=prefix):
-                    self._copy_object(s3_destination_bucket, source_object)
-
-            # Copy all the day files
-            for day, provider in product(days, providers):
-                # We need to normalize capitalization and "-local" dev providers.
-                provider_slug = provider.type.lower().split("-")[0]
-                prefix = (
-                    f"{settings.S3_BUCKET_PATH}/{schema_name}/"
-                    f"{provider_slug}/{provider.uuid}/"
-                    f"{day.year:04d}/{day.month:02d}/{day.day:02d}/"
-                )
-                LOG.debug("sync_bucket checking prefix %s", prefix)
-                for source_object in self.s3_source_bucket.objects.filter(Prefix=prefix):
-                    self._copy_object(s3_destination_bucket, source_object)
+            synced_prefixes = set(synced_prefixes)
+            prefixes = [
+                prefix for prefix in self._get_prefixes(schema_name, date_range) if prefix not in synced_prefixes
+            ]
+            if synced_prefixes:
+                LOG.info("Resuming sync_bucket with %s of its prefixes already synced", len(synced_prefixes))
+            self._sync_prefixes(s3_destination_bucket_name, prefixes, on_prefix_synced)
 
             LOG.info(
                 "Completed sync_bucket to %s for %s from %s to %s",
@@ -40,6 +40,7 @@ class AwsS3SyncerTest(TestCase):
         source_object = Mock()
         source_object.key = f"{settings.S3_BUCKET_PATH}/{account}{fake.file_path()}"
         source_object.bucket_name = source_bucket_name
+        source_object.size = 1024
 
         self.assertNotEqual(source_bucket_name, destination_bucket_name)
 
@@ -134,6 +135,7 @@ class AwsS3SyncerTestWithData(MasuTestCase):
         source_object = Mock()
         source_object.key = f"{settings.S3_BUCKET_PATH}/{schema_name}{fake.file_path()}"
         source_object.bucket_name = source_bucket_name
+        source_object.size = 1024
 
         self.assertNotEqual(source_bucket_name, destination_bucket_name)
 
@@ -215,6 +217,7 @@ class AwsS3SyncerTestWithData(MasuTestCase):
         source_object = Mock()
         source_object.key = f"{settings.S3_BUCKET_PATH}/{schema_name}{fake.file_path()}"
         source_object.bucket_name = source_bucket_name
+        source_object.size = 1024
         source_object.storage_class = "GLACIER"
 
         self.assertNotEqual(source_bucket_name, destination_bucket_name)
@@ -248,6 +251,7 @@ class AwsS3SyncerTestWithData(MasuTestCase):
         source_object = Mock()
         source_object.key = f"{settings.S3_BUCKET_PATH}/{schema_name}{fake.file_path()}"
         source_object.bucket_name = source_bucket_name
+        source_object.size = 1024
         source_object.storage_class = "GLACIER"
 
         self.assertNotEqual(source_bucket_name, destination_bucket_name)
@@ -280,6 +284,7 @@ class AwsS3SyncerTestWithData(MasuTestCase):
         source_object = Mock()
         source_object.key = f"{settings.S3_BUCKET_PATH}/{schema_name}{fake.file_path()}"
         source_object.bucket_name = source_bucket_name
+        source_object.size = 1024
         self.assertNotEqual(source_bucket_name, destination_bucket_name)
 
         mock_resource = mock_boto3.resource
@@ -294,3 +299,97 @@ class AwsS3SyncerTestWithData(MasuTestCase):
             syncer = AwsS3Syncer(source_bucket_name)
             syncer.sync_bucket(schema_name, destination_bucket_name, date_range)
         source_object.restore_object.assert_not_called()
+
+    @patch("api.dataexport.syncer.boto3")
+    def test_sync_large_file_multipart_copy(self, mock_boto3):
+        """Test that a file over the multipart threshold is copied by the transfer manager."""
+        source_bucket_name = fake.slug()
+        destination_bucket_name = fake.slug()
+        schema_name = self.schema
+        date_range = (date(2019, 1, 1), date(2019, 1, 2))
+
+        source_object = Mock()
+        source_object.key = f"{settings.S3_BUCKET_PATH}/{schema_name}{fake.file_path()}"
+        source_object.bucket_name = source_bucket_name
+        source_object.size = settings.DATA_EXPORT_MULTIPART_THRESHOLD
+
+        mock_buckets = mock_boto3.resource.return_value.Bucket
+        mock_buckets.return_value.objects.filter.return_value = (source_object,)
+        mock_destination_object = mock_buckets.return_value.Object
+
+        syncer = AwsS3Syncer(source_bucket_name)
+        syncer.sync_bucket(schema_name, destination_bucket_name, date_range)
+
+        mock_destination_object.return_value.copy.assert_called_with(
+            {"Bucket": source_bucket_name, "Key": source_object.key},
+            ExtraArgs={"ACL": "bucket-owner-full-control"},
+            Config=syncer.transfer_config,
+        )
+        mock_destination_object.return_value.copy_from.assert_not_called()
+
+    @patch("api.dataexport.syncer.boto3")
+    def test_sync_resumes_from_checkpoint(self, mock_boto3):
+        """Test that synced prefixes are skipped and each newly synced prefix is reported."""
+        source_bucket_name = fake.slug()
+        destination_bucket_name = fake.slug()
+        schema_name = self.schema
+        date_range = (date(2019, 1, 1), date(2019, 1, 3))
+
+        source_object = Mock()
+        source_object.key = f"{settings.S3_BUCKET_PATH}/{schema_name}{fake.file_path()}"
+        source_object.bucket_name = source_bucket_name
+        source_object.size = 1024
+
+        mock_buckets = mock_boto3.resource.return_value.Bucket
+        mock_filter = mock_buckets.return_value.objects.filter
+        mock_filter.return_value = (source_object,)
+
+        syncer = AwsS3Syncer(source_bucket_name)
+        prefixes = syncer._get_prefixes(schema_name, date_range)
+        synced_prefixes = prefixes[: len(prefixes) // 2]
+        on_prefix_synced = Mock()
+        syncer.sync_bucket(
+            schema_name,
+            destination_bucket_name,
+            date_range,
+            synced_prefixes=synced_prefixes,
+            on_prefix_synced=on_prefix_synced,
+        )
+
+        expected_prefixes = prefixes[len(prefixes) // 2 :]  # noqa E203
+        mock_filter.assert_has_calls([call(Prefix=prefix) for prefix in expected_prefixes], any_order=True)
+        self.assertEqual(mock_filter.call_count, len(expected_prefixes))
+        on_prefix_synced.assert_has_calls([call(prefix) for prefix in expected_prefixes], any_order=True)
+        self.assertEqual(on_prefix_synced.call_count, len(expected_prefixes))
+
+    @patch("api.dataexport.syncer.boto3")
+    def test_sync_file_in_glacier_does_not_stop_other_copies(self, mock_boto3):
+        """Test that the other files are still copied when one file is in glacier."""
+        client_error_glacier = ClientError(
+            error_response={"Error": {"Code": "InvalidObjectState"}}, operation_name=Mock()
+        )
+        source_bucket_name = fake.slug()
+        destination_bucket_name = fake.slug()
+        schema_name = self.schema
+        date_range = (date(2019, 1, 1), date(2019, 1, 2))
+
+        glacier_object = Mock(key="glacier", bucket_name=source_bucket_name, size=1024, storage_class="GLACIER")
+        source_object = Mock(key="standard", bucket_name=source_bucket_name, size=1024)
+
+        mock_buckets = mock_boto3.resource.return_value.Bucket
+        mock_buckets.return_value.objects.filter.return_value = (glacier_object, source_object)
+        mock_destination_object = mock_buckets.return_value.Object
+
+        def copy_from(ACL, CopySource):
+            if CopySource["Key"] == glacier_object.key:
+                raise client_error_glacier
+
+        mock_destination_object.return_value.copy_from.side_effect = copy_from
+        on_prefix_synced = Mock()
+
+        with self.assertRaises(SyncedFileInColdStorageError):
+            syncer = AwsS3Syncer(source_bucket_name)
+            syncer.sync_bucket(schema_name, destination_bucket_name, date_range, on_prefix_synced=on_prefix_synced)
+        glacier_object.restore_object.assert_called()
+        mock_destination_object.assert_any_call(source_object.key)
+        on_prefix_synced.assert_not_called()
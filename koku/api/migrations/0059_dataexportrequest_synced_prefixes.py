@@ -0,0 +1,18 @@
+# Generated by Django 3.2.13 on 2022-07-05 14:02
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0058_exchangeratedictionary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dataexportrequest",
+            name="synced_prefixes",
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -161,6 +161,15 @@ class QueryHandler:
         """Max rank setter."""
         self._max_rank = max_rank
 
+    def paginate_by_date(self, offset, limit):
+        """Restrict the query to one page of date buckets.
+
+        Returns:
+            (int): Number of date buckets in the full report, None if not paged
+
+        """
+        return None
+
     @property
     def resolution(self):
         """Extract resolution or provide default.
@@ -9,9 +9,12 @@ import operator
 from functools import reduce
 
 from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Case
+from django.db.models import CharField
 from django.db.models import F
 from django.db.models import Q
 from django.db.models import Value
+from django.db.models import When
 from django.db.models.expressions import Func
 from django.db.models.functions import Coalesce
 from tenant_schemas.utils import tenant_context
@@ -25,6 +28,9 @@ from reporting.provider.aws.models import AWSOrganizationalUnit
 
 LOG = logging.getLogger(__name__)
 
+# The annotation grouping the rows of the sub org units rollup by sub org unit.
+SUB_ORG_UNIT_KEY = "sub_org_unit"
+
 EXPORT_COLUMNS = [
     "cost_entry_id",
     "cost_entry_bill_id",
@@ -67,6 +73,8 @@ class AWSReportQueryHandler(ReportQueryHandler):
         "AmazonRedshift",
         "AmazonDocumentDB",
     }
+    # The organizational unit ids of each sub org unit while the rollup query runs
+    _sub_org_buckets = None
 
     def __init__(self, parameters):
         """Establish AWS report query handler.
@@ -118,21 +126,62 @@ class AWSReportQueryHandler(ReportQueryHandler):
         for q_param, db_field in fields.items():
             if q_param in prefix_removed_parameters_list:
                 annotations[q_param] = F(db_field)
+        if self._sub_org_buckets is not None:
+            annotations[SUB_ORG_UNIT_KEY] = Case(
+                *(
+                    When(organizational_unit_id__in=ou_ids, then=Value(org_unit_id))
+                    for org_unit_id, ou_ids in self._sub_org_buckets.items()
+                ),
+                output_field=CharField(),
+            )
         return annotations
 
-    def format_sub_org_results(self, query_data_results, query_data, sub_orgs_dict):  # noqa: C901
+    def _get_group_by(self):
+        """Create list for group_by parameters, grouping by sub org unit during the rollup query."""
+        group_by = super()._get_group_by()
+        if self._sub_org_buckets is not None:
+            group_by.insert(0, SUB_ORG_UNIT_KEY)
+        return group_by
+
+    def _get_filter(self, delta=False):
+        """Create the query filter, limited to the sub org units during the rollup query."""
+        filters = super()._get_filter(delta)
+        if self._sub_org_buckets is not None:
+            ou_ids = [ou_id for ou_ids in self._sub_org_buckets.values() for ou_id in ou_ids]
+            filters &= Q(organizational_unit_id__in=ou_ids)
+        return filters
+
+    def format_sub_org_results(self, query_data, sub_org_data, sub_org_names):  # noqa: C901
         """
         Add the sub_orgs into the overall results if grouping by org unit.
 
         Args:
-            query_data_results: (list) list of query data results
             query_data: (list) the original query_data
-            sub_orgs_dict: (dict) dictionary mapping the org_unit_names and ids
+            sub_org_data: (list) the sub org rollup data grouped by date and sub org unit
+            sub_org_names: (dict) dictionary mapping the org_unit_ids to their names
 
         Returns:
             (list) the overall query data results
         """
-        # loop through original query data
+        sub_orgs_by_date = {}
+        for day in sub_org_data:
+            sub_orgs = sub_orgs_by_date[day["date"]] = []
+            for sub_org in day.get(SUB_ORG_UNIT_KEY + "s", []):
+                values = sub_org.get("values")
+                if not values:
+                    continue
+                org_unit_id = sub_org[SUB_ORG_UNIT_KEY]
+                for value in values:
+                    # add id and org alias to values
+                    value.pop(SUB_ORG_UNIT_KEY, None)
+                    value["id"] = org_unit_id
+                    value["alias"] = sub_org_names.get(org_unit_id)
+                sub_orgs.append(
+                    {"id": org_unit_id, "type": "organizational_unit", "date": day["date"], "values": values}
+                )
+
+        # if - then we want to order by desc
+        reverse = "-cost_total" in self.order
         group_by_format_keys = [key + "s" for key in self.parameters.parameters.get("group_by").keys()]
         for each_day in query_data:
             accounts = each_day.get("accounts", [])
@@ -150,33 +199,13 @@ class AWSReportQueryHandler(ReportQueryHandler):
                     value["id"] = value.pop("account")
                     value["alias"] = value.pop("account_alias")
             # rename entire structure to org_entities
-            each_day["org_entities"] = each_day.pop("accounts", [])
-        # now go through each sub org query
-        for org_name, org_data in query_data_results.items():
-            for day in org_data:
-                for each_day in query_data:
-                    if day["date"] == each_day["date"] and day.get("values"):
-                        values = day.get("values")
-                        for value in values:
-                            # add id and org alias to values
-                            value["id"] = sub_orgs_dict.get(org_name)[0]
-                            value["alias"] = org_name
-                        org_entities = each_day["org_entities"]
-                        org_entities.append(
-                            {
-                                "id": sub_orgs_dict.get(org_name)[0],
-                                "type": "organizational_unit",
-                                "date": day.get("date"),
-                                "values": values,
-                            }
-                        )
-                        # now we need to do an order by cost
-                        reverse = False
-                        if "-cost_total" in self.order:
-                            # if - then we want to order by desc
-                            reverse = True
-                        org_entities.sort(key=lambda e: e["values"][0]["cost"]["total"]["value"], reverse=reverse)
-                        each_day["org_entities"] = org_entities
+            org_entities = each_day.pop("accounts", [])
+            sub_orgs = sub_orgs_by_date.get(each_day["date"])
+            if sub_orgs:
+                org_entities.extend(sub_orgs)
+                # now we need to do an order by cost
+                org_entities.sort(key=lambda e: e["values"][0]["cost"]["total"]["value"], reverse=reverse)
+            each_day["org_entities"] = org_entities
 
         return query_data
 
@@ -189,19 +218,17 @@ class AWSReportQueryHandler(ReportQueryHandler):
 
         return query_data
 
-    def execute_query(self):  # noqa: C901
+    def _execute_query(self):  # noqa: C901
         """Execute each query needed to return the results.
 
         If grouping by org_unit_id, a query will be executed to
-        obtain the account results, and each sub_org results.
+        obtain the account results, and one rollup query for the sub_org results.
         Else it will return the original query.
         """
 
         original_filters = copy.deepcopy(self.parameters.parameters.get("filter"))
-        sub_orgs_dict = {}
-        query_data_results = {}
+        sub_orgs = []
         org_unit_applied = False
-        csv_results = []
         group_by_param = self.parameters.parameters.get("group_by")
         ou_group_by_key = None
         for potential_key in ["org_unit_id", "or:org_unit_id"]:
@@ -220,21 +247,16 @@ class AWSReportQueryHandler(ReportQueryHandler):
                     self.parameters._configure_access_params(self.parameters.caller)
 
             sub_orgs = self._get_sub_org_units(org_unit_list=org_unit_group_by_data)
-            if sub_orgs and len(sub_orgs) > 0:
-                for org_object in sub_orgs:
-                    sub_orgs_dict[org_object.org_unit_name] = org_object.org_unit_id, org_object.org_unit_path
             # First we need to modify the parameters to get all accounts if org unit group_by is used
             self.parameters.set_filter(org_unit_single_level=org_unit_group_by_data)
             self.query_filter = self._get_filter()
 
-        acc_group_by_key = None
         filters = self.parameters.get("filter", {})
         if "account" in group_by_param and "org_unit_id" in filters:
             # When we filter on org_unit and group_by an account outside that org_unit
             # we are actually getting data from the org unit and the account
             #  as long as the user has access to both the account and org unit
-            acc_group_by_key = "account"
-            acc_group_by_data = group_by_param.get(acc_group_by_key)
+            acc_group_by_data = group_by_param.get("account")
             org_unit_list = filters.get("org_unit_id")
             self.parameters.parameters["access"]["aws.organizational_unit"] = org_unit_list
             self.parameters.parameters["access"]["aws.account"] = acc_group_by_data
@@ -248,62 +270,20 @@ class AWSReportQueryHandler(ReportQueryHandler):
         # (without org_units this is the only query - with org_units this is the query to find the accounts)
         query_data, query_sum = self.execute_individual_query(org_unit_applied)
 
-        # Next we want to loop through each sub_org and execute the query for it
-        if org_unit_applied:
-            for sub_org_name, value in sub_orgs_dict.items():
-                sub_org_id, sub_org_path = value
-                if self.parameters.get_filter("org_unit_id"):
-                    self.parameters.parameters["filter"].pop("org_unit_id")
-                if self.parameters.get_filter("org_unit_single_level"):
-                    self.parameters.parameters["filter"].pop("org_unit_single_level")
-                if self.parameters.parameters["group_by"].get("account"):
-                    self.parameters.parameters["group_by"].pop("account")
-                # only add the org_unit to the filter if the user has access
-                # through RBAC so that we avoid returning a 403
-                org_access = None
-                sub_org_unit_ids = []
-                if self.access:
-                    org_access = self.access.get("aws.organizational_unit", {}).get("read", [])
-                    for org_unit in org_access:
-                        sub_org_unit_ids.append(org_unit)
-
-                    # get all sub org units
-                    sub_orgs = self._get_sub_org_units(org_access)
-                    if sub_orgs and len(sub_orgs) > 0:
-                        for org_object in sub_orgs:
-                            sub_org_unit_ids.append(org_object.org_unit_id)
-
-                if org_access is None or (sub_org_id in sub_org_unit_ids or "*" in org_access):
-                    # We need need to use the sub org path here because if we use the org unit id
-                    # it will grab partial data from other orgs if the org unit is moved during
-                    # the report period.
-                    self.parameters.set_filter(org_unit_id=[sub_org_path])
-                self.query_filter = self._get_filter()
-                sub_query_data, sub_query_sum = self.execute_individual_query(org_unit_applied)
-                query_sum = self.total_sum(sub_query_sum, query_sum)
-
-                # If we're processing for CSV output, then just append the results to a
-                # CSV output list and ensure that id, alias, and type are filled out correctly
-                if not self.is_csv_output:
-                    query_data_results[sub_org_name] = sub_query_data
-                else:
-                    # Add the initial account query results, if not set
-                    if len(csv_results) == 0:
-                        csv_results = [dict(type="account", **d) for d in query_data]
-                    # And extend by the org unit query results
-                    # keys "account_alias" and "account_id" are used here to match the query's
-                    # structure so that the CSV MAPPER can rename the proper keys as one of the
-                    # final steps in CSV processing
-                    csv_results.extend(
-                        dict(type="organizational_unit", account_alias=sub_org_name, account=sub_org_id, **d)
-                        for d in sub_query_data
-                    )
+        # Next we want the results of every sub_org, grouped by sub_org in a single query
+        sub_org_data = []
+        sub_org_names = {org_unit.org_unit_id: org_unit.org_unit_name for org_unit in sub_orgs}
+        if sub_orgs:
+            sub_org_data, sub_org_sum = self._execute_sub_org_query(sub_orgs)
+            query_sum = self.total_sum(sub_org_sum, query_sum)
 
         if not self.is_csv_output and org_unit_applied:
             # If not CSV output and org unit was applied, then reshape the output
             # structures for the JSON serializer
-            query_data = self.format_sub_org_results(query_data_results, query_data, sub_orgs_dict)
+            query_data = self.format_sub_org_results(query_data, sub_org_data, sub_org_names)
         else:
+            if sub_org_data:
+                query_data = self._format_sub_org_csv_results(query_data, sub_org_data, sub_org_names)
             query_data = self._set_csv_output_fields(query_data)
 
         # Add each of the sub_org sums to the query_sum
@@ -314,6 +294,42 @@ class AWSReportQueryHandler(ReportQueryHandler):
         self.parameters.parameters["filter"] = original_filters
         return self._format_query_response()
 
+    def _execute_sub_org_query(self, sub_orgs):
+        """Execute one query returning the results of every sub org unit.
+
+        The rows of each sub org unit are found by the organizational units on its path,
+        rather than the org unit id, because an org unit that is moved during the report
+        period would otherwise take partial data from other orgs.
+
+        Args:
+            sub_orgs (list): the sub org units of the grouped by org units
+        Returns:
+            (tuple): the query data grouped by date and sub org unit, and the sum of all sub org units
+        """
+        self.parameters.parameters["filter"].pop("org_unit_id", None)
+        self.parameters.parameters["filter"].pop("org_unit_single_level", None)
+        self.parameters.parameters["group_by"].pop("account", None)
+        self._sub_org_buckets = self._get_sub_org_buckets(sub_orgs)
+        try:
+            self.query_filter = self._get_filter()
+            return self.execute_individual_query(org_unit_applied=True)
+        finally:
+            self._sub_org_buckets = None
+
+    def _format_sub_org_csv_results(self, query_data, sub_org_data, sub_org_names):
+        """Return the account rows followed by the rows of each sub org unit for CSV output."""
+        # keys "account_alias" and "account_id" are used here to match the query's
+        # structure so that the CSV MAPPER can rename the proper keys as one of the
+        # final steps in CSV processing
+        csv_results = [dict(type="account", **d) for d in query_data]
+        sub_org_order = {org_unit_id: index for index, org_unit_id in enumerate(sub_org_names)}
+        for row in sorted(sub_org_data, key=lambda row: sub_org_order[row[SUB_ORG_UNIT_KEY]]):
+            org_unit_id = row.pop(SUB_ORG_UNIT_KEY)
+            csv_results.append(
+                dict(type="organizational_unit", account_alias=sub_org_names[org_unit_id], account=org_unit_id, **row)
+            )
+        return csv_results
+
     def _format_query_response(self):
         """Format the query response with data.
 
@@ -563,7 +579,7 @@ select coalesce(raa.account_alias, t.usage_account_id)::text as "account",
             LOG.debug(f"Using query table: {query_table}")
             tag_results = None
             query = query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = query.filter(self.page_filter).annotate(**self.annotations)
 
             query_group_by = ["date"] + self._get_group_by()
             query_order_by = ["-date"]
@@ -711,44 +727,58 @@ select coalesce(raa.account_alias, t.usage_account_id)::text as "account",
         """
         try:
             # Parent OU filters
-            org_unit_objects = (
+            parents = (
                 AWSOrganizationalUnit.objects.filter(org_unit_id__in=org_unit_list)
                 .filter(account_alias__isnull=True)
                 .order_by("org_unit_id", "-created_timestamp")
                 .distinct("org_unit_id")
+                .values_list("org_unit_id", "level")
             )
-
-            sub_org_unit_list = None
-            if org_unit_objects:
-                sub_org_units = []
-                # Loop through parent ids to find children org units 1 level below.
-                for org_unit_object in org_unit_objects:
-                    sub_query = (
-                        AWSOrganizationalUnit.objects.filter(level=(org_unit_object.level + 1))
-                        .filter(org_unit_path__icontains=org_unit_object.org_unit_id)
-                        .filter(account_alias__isnull=False)
-                        .exclude(org_unit_id__in=org_unit_list)
-                        .order_by("org_unit_id", "-created_timestamp")
-                        .distinct("org_unit_id")
+            if not parents:
+                return []
+            # Children org units 1 level below any of the parents.
+            sub_org_units = (
+                AWSOrganizationalUnit.objects.filter(
+                    reduce(
+                        operator.or_,
+                        (Q(level=level + 1, org_unit_path__icontains=org_unit_id) for org_unit_id, level in parents),
                     )
-                    sub_org_units.append(sub_query)
-
-                # only do a union if more than one org_unit_id was passed in.
-                if len(sub_org_units) > 1:
-                    sub_query_set = sub_org_units.pop()
-                    sub_ou_ids_list = sub_query_set.union(*sub_org_units).values_list("org_unit_id", flat=True)
-                    # Note: The django orm won't let you do an order_by & distinct on the union of
-                    # multiple queries. The additional order_by &  distinct is essential to handle
-                    # use cases like OU_005 being moved from OU_002 to OU_001.
-                    sub_org_unit_list = (
-                        AWSOrganizationalUnit.objects.filter(org_unit_id__in=sub_ou_ids_list)
-                        .filter(account_alias__isnull=False)
-                        .order_by("org_unit_id", "-created_timestamp")
-                        .distinct("org_unit_id")
-                    )
-                else:
-                    sub_org_unit_list = sub_org_units[0]
-            return list(sub_org_unit_list) if sub_org_unit_list else []
+                )
+                .filter(account_alias__isnull=False)
+                .exclude(org_unit_id__in=org_unit_list)
+            )
+            if len(parents) > 1:
+                # The additional order_by & distinct over the children ids is essential to handle
+                # use cases like OU_005 being moved from OU_002 to OU_001.
+                sub_org_units = AWSOrganizationalUnit.objects.filter(
+                    org_unit_id__in=sub_org_units.values("org_unit_id")
+                ).filter(account_alias__isnull=False)
+            return list(sub_org_units.order_by("org_unit_id", "-created_timestamp").distinct("org_unit_id"))
         except Exception as e:
             LOG.error(f"Error getting sub org units: \n{e}")
             return []
+
+    def _get_sub_org_buckets(self, sub_orgs):
+        """Map each sub org unit to the ids of the organizational units on its path.
+
+        An organizational unit on the path of several sub org units belongs to the most specific one.
+
+        Args:
+            sub_orgs (list): list of sub org units
+        Returns:
+            (dict): the organizational unit ids keyed by sub org unit id
+        """
+        paths = {sub_org.org_unit_id: sub_org.org_unit_path.lower() for sub_org in sub_orgs}
+        with tenant_context(self.tenant):
+            org_units = AWSOrganizationalUnit.objects.filter(
+                reduce(operator.or_, (Q(org_unit_path__icontains=path) for path in paths.values()))
+            ).values_list("id", "org_unit_path")
+            buckets = {}
+            for ou_id, org_unit_path in org_units:
+                org_unit_path = org_unit_path.lower()
+                org_unit_id = max(
+                    (org_unit_id for org_unit_id, path in paths.items() if path in org_unit_path),
+                    key=lambda org_unit_id: len(paths[org_unit_id]),
+                )
+                buckets.setdefault(org_unit_id, []).append(ou_id)
+        return buckets
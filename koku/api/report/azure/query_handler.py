@@ -140,7 +140,7 @@ class AzureReportQueryHandler(ReportQueryHandler):
             self._pack_data_object(query_sum, **self._mapper.PACK_DEFINITIONS)
         return query_sum
 
-    def execute_query(self):  # noqa: C901
+    def _execute_query(self):  # noqa: C901
         """Execute query and return provided data.
 
         Returns:
@@ -151,7 +151,7 @@ class AzureReportQueryHandler(ReportQueryHandler):
 
         with tenant_context(self.tenant):
             query = self.query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = query.filter(self.page_filter).annotate(**self.annotations)
             query_group_by = ["date"] + self._get_group_by()
             query_order_by = ["-date"]
             query_order_by.extend(self.order)  # add implicit ordering
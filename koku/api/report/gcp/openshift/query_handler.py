@@ -71,7 +71,7 @@ class OCPGCPReportQueryHandler(GCPReportQueryHandler):
                     annotations[q_param] = Concat(db_field, Value(""))
         return annotations
 
-    def execute_query(self):  # noqa: C901
+    def _execute_query(self):  # noqa: C901
         """Execute query and return provided data.
 
         Returns:
@@ -83,7 +83,7 @@ class OCPGCPReportQueryHandler(GCPReportQueryHandler):
 
         with tenant_context(self.tenant):
             query = self.query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = query.filter(self.page_filter).annotate(**self.annotations)
             group_by_value = self._get_group_by()
             query_group_by = ["date"] + group_by_value
             query_order_by = ["-date"]
@@ -112,7 +112,7 @@ class OCPReportQueryHandler(ReportQueryHandler):
 
         return output
 
-    def execute_query(self):  # noqa: C901
+    def _execute_query(self):  # noqa: C901
         """Execute query and return provided data.
 
         Returns:
@@ -124,7 +124,7 @@ class OCPReportQueryHandler(ReportQueryHandler):
 
         with tenant_context(self.tenant):
             query = self.query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = query.filter(self.page_filter).annotate(**self.annotations)
             group_by_value = self._get_group_by()
 
             query_group_by = ["date"] + group_by_value
@@ -4,7 +4,9 @@
 #
 """Query Handling for Reports."""
 import copy
+import hashlib
 import logging
+import math
 import random
 import re
 import string
@@ -19,9 +21,9 @@ from json import dumps as json_dumps
 from urllib.parse import quote_plus
 
 import ciso8601
-import numpy as np
-import pandas as pd
+from django.conf import settings
 from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.cache import caches
 from django.db.models import F
 from django.db.models import Q
 from django.db.models import Window
@@ -34,6 +36,7 @@ from api.models import Provider
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.query_handler import QueryHandler
+from koku.cache import get_query_result_cache_key
 
 LOG = logging.getLogger(__name__)
 
@@ -57,6 +60,30 @@ def is_grouped_by_project(parameters):
     return _is_grouped_by_key(parameters.parameters.get("group_by", {}), "project")
 
 
+def _is_missing(value):
+    """Determine if a value is a SQL NULL or NaN."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _explode(values):
+    """Return the items of a list value, or the value itself."""
+    if isinstance(values, (list, tuple)):
+        return [value for value in values if not _is_missing(value)]
+    return [] if _is_missing(values) else [values]
+
+
+def _aggregate_others(totals, row, columns):
+    """Add the row to the Others totals, units are the max and other columns the sum."""
+    for column in columns:
+        value = row.get(column)
+        if _is_missing(value):
+            continue
+        if "units" not in column:
+            totals[column] = totals.get(column, 0) + value
+        elif totals.get(column) is None or value > totals[column]:
+            totals[column] = value
+
+
 def check_if_valid_date_str(date_str):
     """Check to see if a valid date has been passed in."""
     try:
@@ -97,6 +124,9 @@ class ReportQueryHandler(QueryHandler):
         self.query_delta = {"value": None, "percent": None}
 
         self.query_filter = self._get_filter()
+        # Restricts the grouped report rows to one page of date buckets, see paginate_by_date
+        self.page_filter = Q()
+        self.page_interval = None
 
     @cached_property
     def query_table_access_keys(self):
@@ -524,6 +554,88 @@ class ReportQueryHandler(QueryHandler):
 
         return data
 
+    def paginate_by_date(self, offset, limit):
+        """Materialize only one page of date buckets when the report is executed.
+
+        Report pages are windows over the date buckets of the time interval, so a
+        page can be pushed into SQL as a usage_start range on the grouped rows. The
+        unrestricted query still drives totals, so they cover the whole time range.
+        Ranked, delta, date ordered and CSV reports need every row and are not paged.
+
+        Args:
+            offset (int): Index of the first date bucket of the page
+            limit (int): Number of date buckets in the page
+        Returns:
+            (int): Number of date buckets in the full report, None if not paged
+
+        """
+        is_csv_output = self.parameters.accept_type and "text/csv" in self.parameters.accept_type
+        if not limit or is_csv_output or self._limit or self._delta or "date" in self.parameters.get("order_by", {}):
+            return None
+
+        count = len(self.time_interval)
+        page_interval = self.time_interval[offset : offset + limit]  # noqa: E203
+        if not page_interval or len(page_interval) == count:
+            return None
+
+        page_filter = Q()
+        if offset > 0:
+            page_filter &= Q(usage_start__gte=page_interval[0].date())
+        if offset + limit < count:
+            page_filter &= Q(usage_start__lt=self.time_interval[offset + limit].date())
+        self.page_filter = page_filter
+        self.page_interval = page_interval
+        return count
+
+    @property
+    def query_cache_key(self):
+        """Return the result cache key of the query, None if the reports of the provider are not cached.
+
+        The key is built from a canonical form of the query parameters, including the access
+        derived filters, so users with the same access asking for the same report in any
+        parameter order share one result.
+        """
+        canonical = json_dumps(
+            {
+                "handler": f"{type(self).__module__}.{type(self).__qualname__}",
+                "report_type": self._report_type,
+                "parameters": self.parameters.parameters,
+                "accept_type": self.parameters.accept_type,
+                "time_interval": [self.time_interval[:1], self.time_interval[-1:]],
+                "page_interval": self.page_interval,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return get_query_result_cache_key(self.tenant.schema_name, self.provider, digest)
+
+    def execute_query(self):
+        """Execute query and return provided data.
+
+        The output is cached until the next ingest of the providers of the report.
+
+        Returns:
+            (Dict): Dictionary response of query params, data, and total
+
+        """
+        cache = caches["default"]
+        cache_key = self.query_cache_key
+        cached = cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            LOG.debug(f"Query result cache hit: {cache_key}")
+            output, self.max_rank = cached
+            return output
+
+        output = self._execute_query()
+        if cache_key:
+            cache.set(cache_key, (output, self.max_rank), settings.CACHE_MIDDLEWARE_SECONDS)
+        return output
+
+    def _execute_query(self):
+        """Execute query and return provided data."""
+        raise NotImplementedError
+
     def _apply_group_by(self, query_data, group_by=None):
         """Group data by date for given time interval then group by list.
 
@@ -539,7 +651,8 @@ class ReportQueryHandler(QueryHandler):
         if group_by is None:
             group_by = self._get_group_by()
 
-        for item in self.time_interval:
+        time_interval = self.time_interval if self.page_interval is None else self.page_interval
+        for item in time_interval:
             date_string = self.date_to_string(item)
             bucket_by_date[date_string] = []
 
@@ -791,18 +904,20 @@ class ReportQueryHandler(QueryHandler):
         if self.is_openshift:
             ranks = ranks.annotate(clusters=ArrayAgg(Coalesce("cluster_alias", "cluster_id"), distinct=True))
 
-        rankings = []
-        distinct_ranks = []
+        distinct_ranks = {}
         for rank in ranks:
-            rank_value = (rank.get(group) for group in group_by_value)
-            if rank_value not in rankings:
-                rankings.append(rank_value)
-                distinct_ranks.append(rank)
-        return self._ranked_list(data, distinct_ranks)
+            rank_key = tuple(rank.get(group) for group in group_by_value)
+            if rank_key not in distinct_ranks:
+                distinct_ranks[rank_key] = rank
+        return self._ranked_list(data, list(distinct_ranks.values()))
 
-    def _ranked_list(self, data_list, ranks):
+    def _ranked_list(self, data_list, ranks):  # noqa: C901
         """Get list of ranked items less than top.
 
+        Every ranked group is zero-filled for each day in the data. Rows are looked up
+        by hashed group and day keys, and the ranks over the limit are folded into the
+        "Others" rows without building their zero-filled rows.
+
         Args:
             data_list (List(Dict)): List of ranked data points from the same bucket
             ranks (List): list of ranks to use; overrides ranking that may present in data_list.
@@ -813,114 +928,154 @@ class ReportQueryHandler(QueryHandler):
         is_offset = "offset" in self.parameters.get("filter", {})
         group_by = self._get_group_by()
         self.max_rank = len(ranks)
-        # Columns we drop in favor of the same named column merged in from rank data frame
-        drop_columns = ["cost_units", "source_uuid"]
-        if self.is_openshift:
-            drop_columns.append("clusters")
-
         if not data_list:
             return data_list
-        data_frame = pd.DataFrame(data_list)
 
-        rank_data_frame = pd.DataFrame(ranks)
-        rank_data_frame.drop(columns=["cost_total", "usage"], inplace=True, errors="ignore")
+        # Columns we drop in favor of the same named column merged in from rank data
+        drop_columns = ["cost_units", "source_uuid"]
+        rank_drop_columns = ["cost_total", "usage"]
+        if self.is_openshift:
+            drop_columns.append("clusters")
 
-        # Determine what to get values for in our rank data frame
-        agg_fields = {"cost_units": ["max"]}
+        # Units are merged into the rank data as the max of each group
+        unit_columns = ["cost_units"]
         if self.is_aws and "account" in group_by:
             drop_columns.append("account_alias")
         if self.is_aws and "account" not in group_by:
-            rank_data_frame.drop(columns=["account_alias"], inplace=True, errors="ignore")
+            rank_drop_columns.append("account_alias")
         if "costs" not in self._report_type:
-            agg_fields.update({"usage_units": ["max"]})
+            unit_columns.append("usage_units")
             drop_columns.append("usage_units")
-        if self._report_type == "instance_type" and "count" in data_frame.columns:
-            agg_fields.update({"count_units": ["max"]})
+        has_count = any("count" in row for row in data_list)
+        if self._report_type == "instance_type" and has_count:
+            unit_columns.append("count_units")
             drop_columns.append("count_units")
 
-        aggs = data_frame.groupby(group_by, dropna=False).agg(agg_fields)
-        columns = aggs.columns.droplevel(1)
-        aggs.columns = columns
-        aggs.reset_index(inplace=True)
-        aggs = aggs.replace({np.nan: None})
-        rank_data_frame = rank_data_frame.merge(aggs, on=group_by)
-
-        # Create a dataframe of days in the query
-        days = data_frame["date"].unique()
-        day_data_frame = pd.DataFrame(days, columns=["date"])
-
-        # Cross join ranks and days to get each field/rank for every day in th query
-        ranks_by_day = rank_data_frame.merge(day_data_frame, how="cross")
-
-        # Merge our data frame to "zero-fill" missing data for each rank field
-        # per day in the query, using a RIGHT JOIN
-        data_frame.drop(columns=drop_columns, inplace=True, errors="ignore")
-        data_frame = data_frame.merge(ranks_by_day, how="right", on=(group_by + ["date"]))
+        data_columns = {}
+        days = {}
+        data_by_group = defaultdict(lambda: defaultdict(list))
+        units_by_group = defaultdict(dict)
+        for row in data_list:
+            group_key = tuple(row.get(group) for group in group_by)
+            data_columns.update(dict.fromkeys(row))
+            days[row.get("date")] = None
+            data_by_group[group_key][row.get("date")].append(row)
+            group_units = units_by_group[group_key]
+            for column in unit_columns:
+                unit = row.get(column)
+                if not _is_missing(unit) and (group_units.get(column) is None or unit > group_units[column]):
+                    group_units[column] = unit
+        for column in drop_columns:
+            data_columns.pop(column, None)
+
+        ranked_groups = []
+        rank_columns = {}
+        for rank in ranks:
+            group_key = tuple(rank.get(group) for group in group_by)
+            rows_by_day = data_by_group.get(group_key)
+            if rows_by_day is None:
+                continue
+            rank_data = {
+                key: value
+                for key, value in rank.items()
+                if key not in rank_drop_columns and (key in group_by or key not in data_columns)
+            }
+            for column in unit_columns:
+                rank_data[column] = units_by_group[group_key].get(column)
+            rank_columns.update(dict.fromkeys(rank_data))
+            ranked_groups.append((rank_data, rows_by_day))
 
         if is_offset:
-            data_frame = data_frame[
-                (data_frame["rank"] > self._offset) & (data_frame["rank"] <= (self._offset + self._limit))
+            top_groups = [
+                group for group in ranked_groups if self._offset < group[0]["rank"] <= self._offset + self._limit
             ]
+            others = []
         else:
-            # Get others category
-            others_data_frame = self._aggregate_ranks_over_limit(data_frame, group_by)
-            # Reduce data to limit
-            data_frame = data_frame[data_frame["rank"] <= self._limit]
-
-            # Add the others category to the data set
-            data_frame = pd.concat([data_frame, others_data_frame])
-
-        # Replace NaN with 0
-        numeric_columns = [col for col in self.report_annotations if "unit" not in col]
-        fill_values = {column: 0 for column in numeric_columns}
-        data_frame.fillna(value=fill_values, inplace=True)
-
-        # Finally replace any remaining NaN with None for JSON compatibility
-        data_frame = data_frame.replace({np.nan: None})
+            top_groups = [group for group in ranked_groups if group[0]["rank"] <= self._limit]
+            others = self._aggregate_ranks_over_limit(
+                [group for group in ranked_groups if group[0]["rank"] > self._limit], group_by, days, has_count
+            )
 
-        return data_frame.to_dict("records")
+        columns = {**data_columns, **rank_columns, "date": None}
+        for row in others:
+            columns.update(dict.fromkeys(row))
+        numeric_columns = {column for column in self.report_annotations if "unit" not in column}
+
+        def fill_missing(row):
+            """Replace missing values with 0 for numeric columns and None otherwise."""
+            filled = {}
+            for column in columns:
+                value = row.get(column)
+                if _is_missing(value):
+                    value = 0 if column in numeric_columns else None
+                filled[column] = value
+            return filled
+
+        ranked_list = []
+        for rank_data, rows_by_day in top_groups:
+            for day in days:
+                # Zero-fill the days this group has no data for
+                for row in rows_by_day.get(day) or [{"date": day}]:
+                    data_row = {key: value for key, value in row.items() if key not in drop_columns}
+                    ranked_list.append(fill_missing({**data_row, **rank_data}))
+        ranked_list.extend(fill_missing(row) for row in others)
+        return ranked_list
+
+    def _aggregate_ranks_over_limit(self, ranked_groups, group_by, days, has_count):  # noqa: C901
+        """When filter[limit] is used without filter[offset] we want to create an Others category.
 
-    def _aggregate_ranks_over_limit(self, data_frame, group_by):
-        """When filter[limit] is used without filter[offset] we want to create an Others category."""
-        drop_columns = group_by + ["rank", "source_uuid"]
-        groups = ["date"]
+        Args:
+            ranked_groups (List(Tuple)): rank data and data rows by day of the ranks over the limit
+            group_by (List): the group by columns
+            days (Iterable): the days in the data
+            has_count (Boolean): whether the data has a count column
+        Returns:
+            List(Dict): one Others data point per day
 
+        """
+        if not ranked_groups:
+            return []
         skip_columns = ["source_uuid", "gcp_project_alias", "clusters"]
-        if "count" not in data_frame.columns:
+        if not has_count:
             skip_columns.extend(["count", "count_units"])
-
-        aggs = {
-            col: ["max"] if "units" in col else ["sum"] for col in self.report_annotations if col not in skip_columns
-        }
-        others_data_frame = data_frame[data_frame["rank"] > self._limit]
-        other_count = len(others_data_frame[group_by].drop_duplicates())
-
-        source_uuids = list(others_data_frame["source_uuid"].explode().dropna().unique())
-        if self.is_openshift:
-            clusters = list(others_data_frame["clusters"].explode().dropna().unique())
-            drop_columns.append("clusters")
-
-        others_data_frame = others_data_frame.drop(columns=drop_columns, errors="ignore")
-        others_data_frame = others_data_frame.groupby(groups, dropna=True).agg(aggs, axis=1)
-        columns = others_data_frame.columns.droplevel(1)
-        others_data_frame.columns = columns
-        others_data_frame.reset_index(inplace=True)
-
-        # Add back columns
-        other_str = "Others" if other_count > 1 else "Other"
-        for group in group_by:
-            others_data_frame[group] = other_str
-        if self.is_aws and "account" in group_by:
-            others_data_frame["account_alias"] = other_str
-        elif "gcp_project" in group_by:
-            others_data_frame["gcp_project_alias"] = other_str
-
-        others_data_frame["rank"] = self._limit + 1
-        others_data_frame["source_uuid"] = [source_uuids] * len(others_data_frame)
-        if self.is_openshift:
-            others_data_frame["clusters"] = [clusters] * len(others_data_frame)
-
-        return others_data_frame
+        agg_columns = [col for col in self.report_annotations if col not in skip_columns]
+
+        source_uuids = {}
+        clusters = {}
+        other_keys = set()
+        # Values merged in from the rank data are the same on every day
+        rank_totals = {}
+        day_totals = defaultdict(dict)
+        for rank_data, rows_by_day in ranked_groups:
+            other_keys.add(tuple(rank_data.get(group) for group in group_by))
+            source_uuids.update(dict.fromkeys(_explode(rank_data.get("source_uuid"))))
+            if self.is_openshift:
+                clusters.update(dict.fromkeys(_explode(rank_data.get("clusters"))))
+            _aggregate_others(rank_totals, rank_data, [col for col in agg_columns if col in rank_data])
+            day_columns = [col for col in agg_columns if col not in rank_data]
+            for day, rows in rows_by_day.items():
+                totals = day_totals[day]
+                for row in rows:
+                    _aggregate_others(totals, row, day_columns)
+
+        other_str = "Others" if len(other_keys) > 1 else "Other"
+        others = []
+        for day in sorted(day for day in days if not _is_missing(day)):
+            totals = {**day_totals[day], **rank_totals}
+            others_row = {column: totals.get(column, None if "units" in column else 0) for column in agg_columns}
+            others_row["date"] = day
+            for group in group_by:
+                others_row[group] = other_str
+            if self.is_aws and "account" in group_by:
+                others_row["account_alias"] = other_str
+            elif "gcp_project" in group_by:
+                others_row["gcp_project_alias"] = other_str
+            others_row["rank"] = self._limit + 1
+            others_row["source_uuid"] = list(source_uuids)
+            if self.is_openshift:
+                others_row["clusters"] = list(clusters)
+            others.append(others_row)
+        return others
 
     def date_group_data(self, data_list):
         """Group data by date."""
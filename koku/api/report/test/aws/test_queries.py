@@ -16,6 +16,7 @@ from unittest.mock import patch
 from unittest.mock import PropertyMock
 
 from dateutil.relativedelta import relativedelta
+from django.core.cache import caches
 from django.db.models import Count
 from django.db.models import DecimalField
 from django.db.models import F
@@ -24,11 +25,13 @@ from django.db.models import Q
 from django.db.models import Sum
 from django.db.models import Value
 from django.db.models.functions import Coalesce
+from django.test.utils import override_settings
 from django.urls import reverse
 from rest_framework.exceptions import ValidationError
 from tenant_schemas.utils import tenant_context
 
 from api.iam.test.iam_test_case import IamTestCase
+from api.provider.models import Provider
 from api.report.aws.query_handler import AWSReportQueryHandler
 from api.report.aws.view import AWSCostView
 from api.report.aws.view import AWSInstanceTypeView
@@ -40,6 +43,7 @@ from api.tags.aws.queries import AWSTagQueryHandler
 from api.tags.aws.view import AWSTagView
 from api.utils import DateHelper
 from api.utils import materialized_view_month_start
+from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 from reporting.models import AWSComputeSummaryByAccountP
 from reporting.models import AWSComputeSummaryP
 from reporting.models import AWSCostEntryBill
@@ -1333,6 +1337,39 @@ class AWSReportQueryTest(IamTestCase):
             for key in ranked_list[i]:
                 self.assertEqual(ranked_list[i][key], expected[i][key])
 
+    def test_rank_list_zero_fill(self):
+        """Test rank list zero-fills the ranked groups and folds the rest into Others for every day."""
+        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=daily&filter[limit]=1&group_by[service]=*"  # noqa: E501
+        query_params = self.mocked_query_params(url, AWSCostView)
+        handler = AWSReportQueryHandler(query_params)
+        ranks = [
+            {"service": "1", "rank": 1, "source_uuid": ["1"]},
+            {"service": "2", "rank": 2, "source_uuid": ["2"]},
+            {"service": "3", "rank": 3, "source_uuid": ["3"]},
+            {"service": "4", "rank": 4, "source_uuid": ["4"]},
+        ]
+        data_list = [
+            {"service": "1", "date": "2022-04-01", "cost_total": 1, "cost_units": "USD", "source_uuid": ["1"]},
+            {"service": "2", "date": "2022-04-01", "cost_total": 2, "cost_units": "USD", "source_uuid": ["2"]},
+            {"service": "3", "date": "2022-04-01", "cost_total": 3, "cost_units": "USD", "source_uuid": ["3"]},
+            {"service": "3", "date": "2022-04-02", "cost_total": 4, "cost_units": "USD", "source_uuid": ["3"]},
+        ]
+        ranked_list = handler._ranked_list(data_list, ranks)
+
+        self.assertEqual(handler.max_rank, 4)
+        self.assertEqual(
+            [(row["service"], row["date"], row["cost_total"], row["rank"]) for row in ranked_list],
+            [
+                ("1", "2022-04-01", 1, 1),
+                ("1", "2022-04-02", 0, 1),
+                ("Others", "2022-04-01", 5, 2),
+                ("Others", "2022-04-02", 4, 2),
+            ],
+        )
+        for row in ranked_list:
+            self.assertEqual(row["cost_units"], "USD")
+        self.assertEqual(ranked_list[-1]["source_uuid"], ["2", "3"])
+
     def test_rank_list_with_offset(self):
         """Test rank list limit and offset with account alias."""
         url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly&filter[limit]=1&filter[offset]=1&group_by[account]=*"  # noqa: E501
@@ -2837,6 +2874,46 @@ class AWSReportQueryTest(IamTestCase):
             expected_sub_org_units = self.ou_to_account_subou_map.get(org_unit).get("org_units")
             self.assertEqual(sub_orgs_ids, expected_sub_org_units)
 
+    def test_execute_query_with_org_unit_group_by_rolls_up_sub_orgs_in_one_query(self):
+        """Test that every sub org unit total comes from a single rollup query."""
+        org_unit = "R_001"
+        ten_days_ago = self.dh.n_days_ago(self.dh.today, 9)
+        with tenant_context(self.tenant):
+            url = f"?group_by[org_unit_id]={org_unit}"
+            query_params = self.mocked_query_params(url, AWSCostView, "costs")
+            handler = AWSReportQueryHandler(query_params)
+            sub_orgs = handler._get_sub_org_units([org_unit])
+            self.assertGreater(len(sub_orgs), 1)
+            with patch.object(
+                AWSReportQueryHandler, "execute_individual_query", wraps=handler.execute_individual_query
+            ) as mock_query:
+                data = handler._execute_query()
+            # One query for the accounts and one for all of the sub org units
+            self.assertEqual(mock_query.call_count, 2)
+
+            sub_org_totals = defaultdict(Decimal)
+            for day in data.get("data"):
+                for entity in day.get("org_entities", []):
+                    if entity.get("type") == "organizational_unit":
+                        for value in entity.get("values"):
+                            self.assertEqual(value.get("id"), entity.get("id"))
+                            self.assertNotIn("sub_org_unit", value)
+                            sub_org_totals[entity.get("id")] += value.get("cost").get("total").get("value")
+
+            for sub_org in sub_orgs:
+                expected = AWSCostEntryLineItemDailySummary.objects.filter(
+                    usage_start__gte=ten_days_ago,
+                    usage_start__lte=self.dh.today,
+                    organizational_unit__org_unit_path__icontains=sub_org.org_unit_path,
+                ).aggregate(
+                    cost_total=Sum(
+                        Coalesce(F("unblended_cost"), Value(0, output_field=DecimalField()))
+                        + Coalesce(F("markup_cost"), Value(0, output_field=DecimalField()))
+                    )
+                )
+                with self.subTest(sub_org=sub_org.org_unit_id):
+                    self.assertEqual(sub_org_totals[sub_org.org_unit_id], expected.get("cost_total") or 0)
+
 
 class AWSReportQueryLogicalAndTest(IamTestCase):
     """Tests the report queries."""
@@ -3173,3 +3250,41 @@ class AWSQueryHandlerTest(IamTestCase):
         query_output = handler.execute_query()
         data = query_output.get("data")
         self.assertIsNotNone(data)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "query-result-cache",
+                "KEY_FUNCTION": "koku.cache.make_key",
+            }
+        }
+    )
+    def test_execute_query_result_cache(self):
+        """Test that the same query in any parameter order shares one result until the next ingest."""
+        urls = (
+            "?filter[time_scope_units]=month&filter[time_scope_value]=-1&group_by[service]=*&filter[limit]=2",
+            "?filter[limit]=2&group_by[service]=*&filter[time_scope_value]=-1&filter[time_scope_units]=month",
+        )
+        self.addCleanup(caches["default"].clear)
+        with patch.object(
+            AWSReportQueryHandler, "_execute_query", autospec=True, side_effect=AWSReportQueryHandler._execute_query
+        ) as mock_execute:
+            outputs = []
+            for url in urls:
+                handler = AWSReportQueryHandler(self.mocked_query_params(url, AWSCostView))
+                outputs.append(handler.execute_query())
+            self.assertEqual(mock_execute.call_count, 1)
+            self.assertEqual(outputs[0], outputs[1])
+            self.assertEqual(handler.max_rank, mock_execute.call_args[0][0].max_rank)
+
+            invalidate_view_cache_for_tenant_and_source_type(self.schema_name, Provider.PROVIDER_AWS)
+            handler = AWSReportQueryHandler(self.mocked_query_params(urls[0], AWSCostView))
+            self.assertEqual(handler.execute_query(), outputs[0])
+            self.assertEqual(mock_execute.call_count, 2)
+
+            handler = AWSReportQueryHandler(
+                self.mocked_query_params(urls[0] + "&filter[service]=AmazonEC2", AWSCostView)
+            )
+            handler.execute_query()
+            self.assertEqual(mock_execute.call_count, 3)
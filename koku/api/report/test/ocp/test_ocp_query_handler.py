@@ -118,6 +118,41 @@ class OCPReportQueryHandlerTest(IamTestCase):
         self.assertIsNotNone(result_cost_total)
         self.assertEqual(result_cost_total, expected_cost_total)
 
+    def test_paginate_by_date(self):
+        """Test that a page of date buckets matches the same page of the full report."""
+        url = "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily&group_by[project]=*"
+        query_params = self.mocked_query_params(url, OCPCpuView)
+        handler = OCPReportQueryHandler(query_params)
+        expected = handler.execute_query()
+
+        for offset, limit in ((0, 3), (3, 3), (8, 5)):
+            with self.subTest(offset=offset, limit=limit):
+                query_params = self.mocked_query_params(url, OCPCpuView)
+                handler = OCPReportQueryHandler(query_params)
+                count = handler.paginate_by_date(offset, limit)
+                self.assertEqual(count, len(expected.get("data")))
+                query_output = handler.execute_query()
+                self.assertEqual(query_output.get("data"), expected.get("data")[offset : offset + limit])  # noqa: E203
+                self.assertEqual(query_output.get("total"), expected.get("total"))
+
+    def test_paginate_by_date_not_paged(self):
+        """Test that reports which need every row are not paged."""
+        urls = [
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily&filter[limit]=2&group_by[project]=*",  # noqa: E501
+            "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily&delta=usage__request",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                query_params = self.mocked_query_params(url, OCPCpuView)
+                handler = OCPReportQueryHandler(query_params)
+                self.assertIsNone(handler.paginate_by_date(0, 3))
+        url = "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily"
+        query_params = self.mocked_query_params(url, OCPCpuView)
+        handler = OCPReportQueryHandler(query_params)
+        self.assertIsNone(handler.paginate_by_date(0, 0))
+        self.assertIsNone(handler.paginate_by_date(0, 100))
+        self.assertIsNone(handler.paginate_by_date(100, 10))
+
     def test_get_cluster_capacity_monthly_resolution(self):
         """Test that cluster capacity returns a full month's capacity."""
         url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly"
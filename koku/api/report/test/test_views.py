@@ -9,6 +9,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_csv.renderers import CSVRenderer
 
+from api.common.pagination import DatePagedReportPagination
 from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
 from api.iam.test.iam_test_case import IamTestCase
@@ -161,6 +162,22 @@ class ReportViewTest(IamTestCase):
         paginator = get_paginator(params, 0)
         self.assertIsInstance(paginator, ReportRankedPagination)
 
+    def test_get_paginator_for_date_count(self):
+        """Test that the pre-paged report paginator is returned."""
+        paginator = get_paginator({}, 0, date_count=30)
+        self.assertIsInstance(paginator, DatePagedReportPagination)
+        self.assertEqual(paginator.count, 30)
+
+    def test_endpoint_view_paged(self):
+        """Test that report pages are consistent with the full report."""
+        url = reverse("reports-openshift-cpu")
+        params = "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily"
+        full = self.client.get(url + params + "&limit=0", **self.headers).data
+        page = self.client.get(url + params + "&limit=3&offset=3", **self.headers).data
+        self.assertEqual(page.get("meta").get("count"), full.get("meta").get("count"))
+        self.assertEqual(page.get("meta").get("total"), full.get("meta").get("total"))
+        self.assertEqual(page.get("data"), full.get("data")[3:6])
+
     @RbacPermissions({"invalid.permissions": {"things": ["thing_1", "thing_2"]}})
     def test_rbacpermissions_invalid(self):
         """Test that endpoints reject invalid permissions."""
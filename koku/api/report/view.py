@@ -17,6 +17,7 @@ from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
 from api.common import CACHE_RH_IDENTITY_HEADER
+from api.common.pagination import DatePagedReportPagination
 from api.common.pagination import OrgUnitPagination
 from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
@@ -26,11 +27,16 @@ from api.utils import UnitConverter
 LOG = logging.getLogger(__name__)
 
 
-def get_paginator(filter_query_params, count, group_by_params=False):
-    """Determine which paginator to use based on query params."""
-    if group_by_params and (
+def _is_org_unit_grouped(group_by_params):
+    """Determine if the report is grouped by org unit."""
+    return bool(group_by_params) and (
         "group_by[org_unit_id]" in group_by_params or "group_by[or:org_unit_id]" in group_by_params
-    ):
+    )
+
+
+def get_paginator(filter_query_params, count, group_by_params=False, date_count=None):
+    """Determine which paginator to use based on query params."""
+    if _is_org_unit_grouped(group_by_params):
         paginator = OrgUnitPagination(filter_query_params)
         paginator.others = count
     else:
@@ -38,12 +44,28 @@ def get_paginator(filter_query_params, count, group_by_params=False):
             paginator = ReportRankedPagination()
             paginator.count = count
             paginator.others = count
+        elif date_count is not None:
+            paginator = DatePagedReportPagination(date_count)
+            paginator.others = count
         else:
             paginator = ReportPagination()
             paginator.others = count
     return paginator
 
 
+def paginate_query_by_date(handler, filter_query_params, request):
+    """Push the requested report page into the handler's query.
+
+    Returns:
+        (int): Number of date buckets in the full report, None if the handler was not paged
+
+    """
+    if _is_org_unit_grouped(request.query_params) or "offset" in filter_query_params:
+        return None
+    paginator = ReportPagination()
+    return handler.paginate_by_date(paginator.get_offset(request), paginator.get_page_limit(request))
+
+
 def _find_unit():
     """Find the original unit for a report dataset."""
     unit = None
@@ -161,6 +183,7 @@ class ReportView(APIView):
         except ValidationError as exc:
             return Response(data=exc.detail, status=status.HTTP_400_BAD_REQUEST)
         handler = self.query_handler(params)
+        date_count = paginate_query_by_date(handler, params.parameters.get("filter", {}), request)
         output = handler.execute_query()
         max_rank = handler.max_rank
 
@@ -176,7 +199,9 @@ class ReportView(APIView):
                     error = {"details": _("Unit conversion failed.")}
                     raise ValidationError(error)
 
-        paginator = get_paginator(params.parameters.get("filter", {}), max_rank, request.query_params)
+        paginator = get_paginator(
+            params.parameters.get("filter", {}), max_rank, request.query_params, date_count=date_count
+        )
         paginated_result = paginator.paginate_queryset(output, request)
         LOG.debug(f"DATA: {output}")
         response = paginator.get_paginated_response(paginated_result)
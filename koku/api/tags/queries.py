@@ -6,6 +6,7 @@
 import copy
 import logging
 
+from django.db import connection
 from django.db.models import Q
 from tenant_schemas.utils import tenant_context
 
@@ -16,6 +17,41 @@ from api.query_handler import QueryHandler
 LOG = logging.getLogger(__name__)
 
 
+class TagIndex:
+    """Merge tag keys and values from several data sources.
+
+    Entries are indexed on (key, type) so each merge is a dictionary lookup, and the
+    values of an entry are kept as an insertion ordered set.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._entries = {}
+        self._keys = set()
+
+    def add(self, tag, tag_type=None):
+        """Merge a {"key": key, "values": [...]} dictionary into the index.
+
+        A tag without a type is dropped when its key already has a typed entry.
+        """
+        key = tag.get("key")
+        entry = self._entries.get((key, tag_type))
+        if entry is None:
+            if tag_type is None and key in self._keys:
+                return
+            entry = dict(tag, values=dict.fromkeys(tag.get("values")))
+            if tag_type is not None:
+                entry["type"] = tag_type
+            self._entries[(key, tag_type)] = entry
+            self._keys.add(key)
+        else:
+            entry["values"].update(dict.fromkeys(tag.get("values")))
+
+    def to_list(self, reverse=False):
+        """Return the merged entries in insertion order with sorted values."""
+        return [dict(entry, values=sorted(entry["values"], reverse=reverse)) for entry in self._entries.values()]
+
+
 class TagQueryHandler(QueryHandler):
     """Handles tag queries and responses.
 
@@ -305,38 +341,61 @@ class TagQueryHandler(QueryHandler):
         elif type_filter:
             type_filter_array.append(type_filter)
 
-        final_data = []
+        tag_index = TagIndex()
         with tenant_context(self.tenant):
-            tag_keys = {}
-            vals = ["key", "values"]
             for source in sources:
                 if type_filter and source.get("type") not in type_filter_array:
                     continue
+                vals = ["key", "values"]
                 tag_keys_query = source.get("db_table").objects
                 annotations = source.get("annotations")
                 if annotations:
                     tag_keys_query = tag_keys_query.annotate(**annotations)
-                    for annotation_key in annotations.keys():
-                        vals.append(annotation_key)
+                    vals.extend(annotations)
                 exclusion = self._get_exclusions("key")
-                tag_keys = list(tag_keys_query.filter(self.query_filter).exclude(exclusion).values_list(*vals).all())
-                converted = self._convert_to_dict(tag_keys, vals)
-                if type_filter and source.get("type"):
-                    self.append_to_final_data_with_type(final_data, converted, source)
-                else:
-                    self.append_to_final_data_without_type(final_data, converted)
+                tag_keys_query = tag_keys_query.filter(self.query_filter).exclude(exclusion)
+                tag_type = source.get("type") if type_filter else None
+                for row in self._aggregate_tag_values(tag_keys_query, vals):
+                    tag_index.add(dict(zip(vals, row)), tag_type)
+
+        return tag_index.to_list(reverse=self.order_direction == "desc")
 
-        # sort the values and deduplicate before returning
-        self.deduplicate_and_sort(final_data)
-        return final_data
+    @staticmethod
+    def _aggregate_tag_values(queryset, vals):
+        """Return the queryset rows grouped by key with their values deduplicated by the database.
+
+        Args:
+            queryset (QuerySet) the filtered tag summary queryset
+            vals (list) the selected columns; "key" and "values" followed by any annotations
+
+        Returns:
+            (list) rows of the vals columns, one per key and annotation values
+        """
+        qn = connection.ops.quote_name
+        sql, params = queryset.values_list(*vals).query.sql_with_params()
+        group_cols = ", ".join(f"t.{qn(col)}" for col in vals if col != "values")
+        select_cols = ", ".join(
+            "coalesce(array_agg(DISTINCT v.value) FILTER (WHERE v.value IS NOT NULL), '{}')"
+            if col == "values"
+            else f"t.{qn(col)}"
+            for col in vals
+        )
+        sql = f"""
+SELECT {select_cols}
+  FROM ({sql}) AS t
+  LEFT JOIN LATERAL unnest(t."values") AS v(value)
+    ON true
+ GROUP BY {group_cols}"""
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
 
     def get_tag_values(self):
         """
         Gets the values associated with a tag when filtering on a value.
         """
-        final_data = []
+        tag_index = TagIndex()
         with tenant_context(self.tenant):
-            tag_keys = {}
             for source in self.TAGS_VALUES_SOURCE:
                 vals_filter = QueryFilterCollection()
                 for key_field in source.get("fields"):
@@ -347,64 +406,9 @@ class TagQueryHandler(QueryHandler):
                     )
                 tag_values_query = source.get("db_table").objects
                 filt = self.query_filter & vals_filter.compose()
-                tag_keys = list(tag_values_query.filter(filt))
-                tag_tup = self._value_filter_dict(tag_keys)
-                converted = self._convert_to_dict(tag_tup)
-                self.append_to_final_data_without_type(final_data, converted)
-        self.deduplicate_and_sort(final_data)
-        return final_data
-
-    def deduplicate_and_sort(self, data):
-        for dikt in data:
-            dikt["values"] = sorted(set(dikt["values"]), reverse=self.order_direction == "desc")
-        return data
-
-    @staticmethod
-    def _convert_to_dict(tup, vals=["key", "values"]):
-        tag_map = {}
-        for result in tup:
-            tag = {}
-            for idx in range(len(vals)):
-                tag[vals[idx]] = result[idx]
-            if tag_map.get(tag.get("key")):
-                tag_map[tag.get("key")].get("values").extend(tag.get("values"))
-            else:
-                tag_map[tag.get("key")] = tag
-        return tag_map
-
-    def _value_filter_dict(self, t_keys):
-        values_list = []
-        for obj in t_keys:
-            values_list.append(obj.value)
-        return [(self.key, values_list)]
-
-    @staticmethod
-    def _get_dictionary_for_key(dictionary_list, key):
-        """Get dictionary matching key from list of dictionaries."""
-        for di in dictionary_list:
-            if key == di.get("key"):
-                return di
-        return None
-
-    def append_to_final_data_with_type(self, final_data, converted_data, source):
-        """Convert data to final list with a source type."""
-        for k, v in converted_data.items():
-            dikt = self._get_dictionary_for_key(final_data, k)
-            if dikt and dikt.get("type") == source.get("type"):
-                dikt["values"].extend(v.get("values"))
-            else:
-                copy_value = copy.deepcopy(v)
-                copy_value["type"] = source.get("type")
-                final_data.append(copy_value)
-
-    def append_to_final_data_without_type(self, final_data, converted_data):
-        """Convert data to final list without a source type."""
-        for k, v in converted_data.items():
-            dikt = self._get_dictionary_for_key(final_data, k)
-            if dikt and dikt.get("type") is None:
-                dikt["values"].extend(v.get("values"))
-            elif not dikt:
-                final_data.append(copy.deepcopy(v))
+                values = tag_values_query.filter(filt).values_list("value", flat=True).distinct()
+                tag_index.add({"key": self.key, "values": list(values)})
+        return tag_index.to_list(reverse=self.order_direction == "desc")
 
     def execute_query(self):
         """Execute query and return provided data.
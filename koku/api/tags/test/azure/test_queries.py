@@ -3,90 +3,52 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the common tag query function."""
-from unittest.mock import patch
-
 from api.iam.test.iam_test_case import IamTestCase
 from api.tags.azure.queries import AzureTagQueryHandler
 from api.tags.azure.view import AzureTagView
+from api.tags.queries import TagIndex
 
 
 class AzureTagQueryHandlerTest(IamTestCase):
     """Tests for the AzureTagQueryHandler."""
 
     def test_merge_tags(self):
-        """Test the _merge_tags functionality."""
-        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly"
-        query_params = self.mocked_query_params(url, AzureTagView)
-
-        tagHandler = AzureTagQueryHandler(query_params)
-
-        # Test no source type
-        final = []
-        source = {}
-        qs1 = [("ms-resource-usage", ["azure-cloud-shell"]), ("project", ["p1", "p2"]), ("cost", ["management"])]
-        tag_keys = tagHandler._convert_to_dict(qs1)
-        expected_dikt = {
-            "ms-resource-usage": {"key": "ms-resource-usage", "values": ["azure-cloud-shell"]},
-            "project": {"key": "project", "values": ["p1", "p2"]},
-            "cost": {"key": "cost", "values": ["management"]},
-        }
-        self.assertEqual(tag_keys, expected_dikt)
-
-        expected_1 = [
+        """Test the TagIndex merge functionality."""
+        qs1 = [
             {"key": "ms-resource-usage", "values": ["azure-cloud-shell"]},
             {"key": "project", "values": ["p1", "p2"]},
             {"key": "cost", "values": ["management"]},
         ]
-        tagHandler.append_to_final_data_without_type(final, tag_keys)
-        self.assertEqual(final, expected_1)
+
+        # Test no source type
+        tag_index = TagIndex()
+        for tag in qs1:
+            tag_index.add(tag)
+        self.assertEqual(tag_index.to_list(), qs1)
 
         # Test with source type
-        final = []
-        source = {"type": "storage"}
-        tagHandler.append_to_final_data_with_type(final, tag_keys, source)
+        tag_index = TagIndex()
+        for tag in qs1:
+            tag_index.add(tag, "storage")
         expected_2 = [
             {"key": "ms-resource-usage", "values": ["azure-cloud-shell"], "type": "storage"},
             {"key": "project", "values": ["p1", "p2"], "type": "storage"},
             {"key": "cost", "values": ["management"], "type": "storage"},
         ]
-        self.assertEqual(final, expected_2)
-
-        final = []
-        tagHandler.append_to_final_data_without_type(final, tag_keys)
-        tagHandler.append_to_final_data_with_type(final, tag_keys, source)
+        self.assertEqual(tag_index.to_list(), expected_2)
 
-        expected_3 = [
-            {"key": "ms-resource-usage", "values": ["azure-cloud-shell"]},
-            {"key": "project", "values": ["p1", "p2"]},
-            {"key": "cost", "values": ["management"]},
-            {"key": "ms-resource-usage", "values": ["azure-cloud-shell"], "type": "storage"},
-            {"key": "project", "values": ["p1", "p2"], "type": "storage"},
-            {"key": "cost", "values": ["management"], "type": "storage"},
+        tag_index = TagIndex()
+        for tag in qs1:
+            tag_index.add(tag)
+        for tag in qs1:
+            tag_index.add(tag, "storage")
+        qs2 = [
+            {"key": "ms-resource-usage", "values": ["azure-cloud-shell2"]},
+            {"key": "project", "values": ["p1", "p3"]},
         ]
-        self.assertEqual(final, expected_3)
-
-        qs2 = [("ms-resource-usage", ["azure-cloud-shell2"]), ("project", ["p1", "p3"])]
-        tag_keys2 = tagHandler._convert_to_dict(qs2)
-        expected_tag_keys2 = {
-            "ms-resource-usage": {"key": "ms-resource-usage", "values": ["azure-cloud-shell2"]},
-            "project": {"key": "project", "values": ["p1", "p3"]},
-        }
-        self.assertEqual(tag_keys2, expected_tag_keys2)
-
-        tagHandler.append_to_final_data_without_type(final, tag_keys2)
-        expected_4 = [
-            {"key": "ms-resource-usage", "values": ["azure-cloud-shell", "azure-cloud-shell2"]},
-            {"key": "project", "values": ["p1", "p2", "p1", "p3"]},
-            {"key": "cost", "values": ["management"]},
-            {"key": "ms-resource-usage", "values": ["azure-cloud-shell"], "type": "storage"},
-            {"key": "project", "values": ["p1", "p2"], "type": "storage"},
-            {"key": "cost", "values": ["management"], "type": "storage"},
-        ]
-        self.assertEqual(final, expected_4)
-
-        with patch("api.tags.azure.queries.AzureTagQueryHandler.order_direction", return_value="not-default"):
-            final = tagHandler.deduplicate_and_sort(final)
-        expected_5 = [
+        for tag in qs2:
+            tag_index.add(tag)
+        expected_3 = [
             {"key": "ms-resource-usage", "values": ["azure-cloud-shell", "azure-cloud-shell2"]},
             {"key": "project", "values": ["p1", "p2", "p3"]},
             {"key": "cost", "values": ["management"]},
@@ -94,5 +56,27 @@ class AzureTagQueryHandlerTest(IamTestCase):
             {"key": "project", "values": ["p1", "p2"], "type": "storage"},
             {"key": "cost", "values": ["management"], "type": "storage"},
         ]
+        self.assertEqual(tag_index.to_list(), expected_3)
+        self.assertEqual(tag_index.to_list(reverse=True)[1], {"key": "project", "values": ["p3", "p2", "p1"]})
+
+        # the merge must not modify the source rows
+        self.assertEqual(qs1[1], {"key": "project", "values": ["p1", "p2"]})
 
-        self.assertEqual(final, expected_5)
+    def test_merge_tags_untyped_after_typed(self):
+        """Test that untyped tags do not shadow a typed entry for the same key."""
+        tag_index = TagIndex()
+        tag_index.add({"key": "app", "values": ["web"], "enabled": True}, "pod")
+        tag_index.add({"key": "app", "values": ["db"]})
+        tag_index.add({"key": "app", "values": ["db", "web"]}, "pod")
+        self.assertEqual(
+            tag_index.to_list(), [{"key": "app", "values": ["db", "web"], "enabled": True, "type": "pod"}]
+        )
+
+    def test_get_tags_distinct_values(self):
+        """Test that get_tags returns each value of a key once."""
+        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly"
+        query_params = self.mocked_query_params(url, AzureTagView)
+        handler = AzureTagQueryHandler(query_params)
+        for tag in handler.get_tags():
+            with self.subTest(key=tag.get("key")):
+                self.assertEqual(tag.get("values"), sorted(set(tag.get("values"))))
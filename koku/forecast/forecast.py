@@ -3,19 +3,19 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Base forecasting module."""
+import hashlib
 import logging
 import operator
 from collections import defaultdict
-from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
 from functools import reduce
 
 import numpy as np
-import statsmodels.api as sm
+from django.conf import settings
+from django.core.cache import caches
 from django.db.models import Q
-from statsmodels.sandbox.regression.predstd import wls_prediction_std
-from statsmodels.tools.sm_exceptions import ValueWarning
+from scipy import stats
 from tenant_schemas.utils import tenant_context
 
 from api.models import Provider
@@ -32,6 +32,16 @@ from api.report.oci.provider_map import OCIProviderMap
 from api.report.ocp.provider_map import OCPProviderMap
 from api.utils import DateHelper
 from api.utils import get_cost_type
+from koku.cache import AWS_CACHE_PREFIX
+from koku.cache import AZURE_CACHE_PREFIX
+from koku.cache import GCP_CACHE_PREFIX
+from koku.cache import get_view_cache_generation
+from koku.cache import OCI_CACHE_PREFIX
+from koku.cache import OPENSHIFT_ALL_CACHE_PREFIX
+from koku.cache import OPENSHIFT_AWS_CACHE_PREFIX
+from koku.cache import OPENSHIFT_AZURE_CACHE_PREFIX
+from koku.cache import OPENSHIFT_CACHE_PREFIX
+from koku.cache import OPENSHIFT_GCP_CACHE_PREFIX
 from reporting.provider.aws.models import AWSOrganizationalUnit
 
 
@@ -128,9 +138,33 @@ class Forecast:
         """Return the provider map value for total inftrastructure cost."""
         return self.provider_map.report_type_map.get("aggregates", {}).get("infra_total")
 
+    @property
+    def cache_key(self):
+        """Return the cache key of this forecast.
+
+        The key carries the tenant schema and the view generations of the provider so that the
+        cached forecast is invalidated with the provider's report views after each ingest.
+        """
+        key_parts = (
+            self.provider,
+            getattr(self, "cost_type", None),
+            self.cost_summary_table._meta.db_table,
+            str(self.filters.compose()),
+            self.dh.today.date(),
+        )
+        digest = hashlib.md5(repr(key_parts).encode("utf-8")).hexdigest()
+        schema_name = self.params.tenant.schema_name
+        generation = get_view_cache_generation(schema_name, self.cache_key_prefix)
+        return f"{schema_name}:{self.cache_key_prefix}:{generation}-forecast-{digest}"
+
     def predict(self):
         """Define ORM query to run forecast and return prediction."""
-        cost_predictions = {}
+        cache = caches["default"]
+        cache_key = self.cache_key
+        response = cache.get(cache_key)
+        if response is not None:
+            return response
+
         with tenant_context(self.params.tenant):
             data = (
                 self.cost_summary_table.objects.filter(self.filters.compose())
@@ -142,52 +176,70 @@ class Forecast:
                     infrastructure_cost=self.infrastructure_cost_term,
                 )
             )
+            uniq_data = self._uniquify_qset(data, fields=COST_FIELD_NAMES)
 
-            for fieldname in COST_FIELD_NAMES:
-                uniq_data = self._uniquify_qset(data.values("usage_start", fieldname), field=fieldname)
-                cost_predictions[fieldname] = self._predict(uniq_data)
-
-            cost_predictions = self._key_results_by_date(cost_predictions)
-            return self.format_result(cost_predictions)
+        cost_predictions = self._predict(uniq_data)
+        cost_predictions = self._key_results_by_date(cost_predictions)
+        response = self.format_result(cost_predictions)
+        cache.set(cache_key, response, settings.CACHE_MIDDLEWARE_SECONDS)
+        return response
 
     def _predict(self, data):
         """Handle pre and post prediction work.
 
-        This function handles arranging incoming data to conform with statsmodels requirements.
+        This function handles arranging incoming data to conform with the regression requirements.
+        Every series with enough data points is fitted in a single batched regression.
         Then after receiving the forecast output, this function handles formatting to conform to
         API reponse requirements.
 
         Args:
-            data (list) a list of (datetime, float) tuples
+            data (dict) a list of (date, float) tuples keyed by cost field name
 
         Returns:
-            (LinearForecastResult) linear forecast results object
+            (dict) (prediction dict, R-squared, P-values) keyed by cost field name
         """
         LOG.debug("Forecast input data: %s", data)
 
-        if len(data) < self.MINIMUM:
-            LOG.warning(
-                "Number of data elements (%s) is fewer than the minimum (%s). Unable to generate forecast.",
-                len(data),
-                self.MINIMUM,
-            )
-            return ZERO_RESULT
+        predictions = {}
+        fieldnames, xs, ys, pred_xs = [], [], [], []
+        for fieldname, series in data.items():
+            if len(series) < self.MINIMUM:
+                LOG.warning(
+                    "Number of data elements (%s) is fewer than the minimum (%s). Unable to generate forecast.",
+                    len(series),
+                    self.MINIMUM,
+                )
+                predictions[fieldname] = ZERO_RESULT
+                continue
+
+            dates, costs = zip(*series)
+            X = self._enumerate_dates(dates)
+
+            # difference in days between the first day to be predicted and the last day of data after outlier removal
+            day_gap = (self.dh.today.date() - dates[-1]).days
 
-        dates, costs = zip(*data)
+            fieldnames.append(fieldname)
+            xs.append(X)
+            ys.append([float(c) for c in costs])
+            # calculate x-values for the prediction range
+            pred_xs.append(range(X[-1] + day_gap, X[-1] + day_gap + self.forecast_days_required))
 
-        X = self._enumerate_dates(dates)
-        Y = [float(c) for c in costs]
+        if fieldnames:
+            # run the forecast
+            for fieldname, results in zip(fieldnames, self._run_forecast(xs, ys, to_predict=pred_xs)):
+                predictions[fieldname] = self._format_prediction(results)
 
-        # difference in days between the first day to be predicted and the last day of data after outlier removal
-        day_gap = (
-            datetime.combine(self.dh.today.date(), self.dh.midnight) - datetime.combine(dates[-1], self.dh.midnight)
-        ).days
-        # calculate x-values for the prediction range
-        pred_x = [i for i in range(X[-1] + day_gap, X[-1] + day_gap + self.forecast_days_required)]
+        return predictions
 
-        # run the forecast
-        results = self._run_forecast(X, Y, to_predict=pred_x)
+    def _format_prediction(self, results):
+        """Key a linear forecast result by the predicted dates.
 
+        Args:
+            results (LinearForecastResult) linear forecast results object
+
+        Returns:
+            (tuple) prediction dict, R-squared, P-values
+        """
         result_dict = {}
         for i, value in enumerate(results.prediction):
             # extrapolate confidence intervals to align with prediction.
@@ -222,11 +274,7 @@ class Forecast:
             If _remove_outliers() returns {"2000-01-01": 1.0, "2000-01-03": 1.5}
             then _enumerate_dates() returns [0, 2]
         """
-        days = self.dh.list_days(
-            datetime.combine(date_list[0], self.dh.midnight), datetime.combine(date_list[-1], self.dh.midnight)
-        )
-        out = [i for i, day in enumerate(days) if day.date() in date_list]
-        return out
+        return [(day - date_list[0]).days for day in date_list]
 
     def _remove_outliers(self, data):
         """Remove outliers from our dateset before predicting.
@@ -335,48 +383,83 @@ class Forecast:
         return response
 
     def _run_forecast(self, x, y, to_predict=None):
-        """Apply the forecast model.
+        """Apply the forecast model to a batch of series.
+
+        Every series is fitted with ordinary least squares in one batched solve. Series of
+        different lengths are padded and masked out of the normal equations.
 
         Args:
-            x (list) a list of exogenous variables
-            y (list) a list of endogenous variables
-            to_predict (list) a list of exogenous variables used in the forecast results
+            x (list) a list of exogenous variables per series
+            y (list) a list of endogenous variables per series
+            to_predict (list) a list of exogenous variables used in the forecast results per series
 
         Note:
-            both x and y MUST be the same number of elements
+            both x and y MUST be the same number of elements for each series
 
         Returns:
-            (tuple)
-                (numpy.ndarray) prediction values
-                (numpy.ndarray) confidence interval lower bound
-                (numpy.ndarray) confidence interval upper bound
-                (float) R-squared value
-                (list) P-values
+            (list) a LinearForecastResult per series
         """
-        x = sm.add_constant(x)
-        to_predict = sm.add_constant(to_predict)
-        model = sm.OLS(y, x)
-        results = model.fit()
-        return LinearForecastResult(results, exog=to_predict)
+        n_obs = max(len(series) for series in x)
+        mask = np.array([[1.0] * len(series) + [0.0] * (n_obs - len(series)) for series in x])
+        exog = np.array([list(series) + [0] * (n_obs - len(series)) for series in x], dtype=float)
+        endog = np.array([list(series) + [0] * (n_obs - len(series)) for series in y], dtype=float)
+        exog = np.stack((mask, exog * mask), axis=-1)
+        endog = endog * mask
+
+        xtx = np.einsum("sni,snj->sij", exog, exog)
+        xty = np.einsum("sni,sn->si", exog, endog)
+        xtx_inv = np.linalg.inv(xtx)
+        params = np.einsum("sij,sj->si", xtx_inv, xty)
+
+        nobs = mask.sum(axis=1)
+        df_resid = nobs - 2
+        resid = (endog - np.einsum("sni,si->sn", exog, params)) * mask
+        ssr = (resid**2).sum(axis=1)
+        scale = ssr / df_resid
+        centered = (endog - (endog.sum(axis=1) / nobs)[:, None]) * mask
+        rsquared = 1 - ssr / (centered**2).sum(axis=1)
+
+        cov_params = xtx_inv * scale[:, None, None]
+        tvalues = params / np.sqrt(np.diagonal(cov_params, axis1=1, axis2=2))
+        pvalues = stats.t.sf(np.abs(tvalues), df_resid[:, None]) * 2
+
+        pred_exog = np.array([list(series) for series in to_predict], dtype=float)
+        pred_exog = np.stack((np.ones_like(pred_exog), pred_exog), axis=-1)
+        prediction = np.einsum("smi,si->sm", pred_exog, params)
+        # 95% prediction interval of each forecast value
+        pred_std = np.sqrt(scale[:, None] + np.einsum("smi,sij,smj->sm", pred_exog, cov_params, pred_exog))
+        interval = stats.t.isf(0.025, df_resid)[:, None] * pred_std
+
+        return [
+            LinearForecastResult(
+                params[i],
+                prediction[i],
+                prediction[i] - interval[i],
+                prediction[i] + interval[i],
+                rsquared[i],
+                pvalues[i],
+            )
+            for i in range(len(x))
+        ]
 
-    def _uniquify_qset(self, qset, field="total_cost"):
-        """Take a QuerySet list, sum costs within the same day, and arrange it into a list of tuples.
+    def _uniquify_qset(self, qset, fields=COST_FIELD_NAMES):
+        """Take a QuerySet list, sum costs within the same day, and arrange it into lists of tuples.
+
+        All of the cost fields are summed in a single pass over the QuerySet.
 
         Args:
             qset (QuerySet)
-            field (str) - field name in the QuerySet to be summed
+            fields (list) - field names in the QuerySet to be summed
 
         Returns:
-            [(date, cost), ...]
+            {field: [(date, cost), ...]}
         """
-        # FIXME: this QuerySet->dict->list conversion probably isn't ideal.
-        # FIXME: there's probably a way to aggregate multiple sources by date using just the ORM.
-        result = defaultdict(Decimal)
+        result = {field: defaultdict(Decimal) for field in fields}
         for item in qset:
-            result[item.get("usage_start")] += Decimal(item.get(field, 0.0))
-        result = self._remove_outliers(result)
-        out = [(k, v) for k, v in result.items()]
-        return out
+            usage_start = item.get("usage_start")
+            for field in fields:
+                result[field][usage_start] += Decimal(item.get(field) or 0.0)
+        return {field: list(self._remove_outliers(values).items()) for field, values in result.items()}
 
     def set_access_filters(self, access, filt, filters):
         """Set access filters to ensure RBAC restrictions adhere to user's access and filters.
@@ -405,22 +488,25 @@ class LinearForecastResult:
     Note: this class should be considered read-only
     """
 
-    def __init__(self, regression_result, exog=None):
+    def __init__(self, params, prediction, confidence_lower, confidence_upper, rsquared, pvalues):
         """Class constructor.
 
         Args:
-            regression_result (RegressionResult) the results of a statsmodels regression
-            exog (array-like) future exogenous variables; points to predict
+            params (array-like) the Y-intercept and slope estimates
+            prediction (array-like) the forecast prediction values
+            confidence_lower (array-like) the prediction interval lower-bound
+            confidence_upper (array-like) the prediction interval upper-bound
+            rsquared (float) the R-squared value
+            pvalues (array-like) the P-values of the params
         """
-        self._exog = exog
-        self._regression_result = regression_result
-        self._std_err, self._conf_lower, self._conf_upper = wls_prediction_std(regression_result, exog=exog)
-
-        try:
-            LOG.debug(regression_result.summary())
-        except (ValueWarning, UserWarning) as exc:
-            LOG.warning(exc)
-
+        self._params = params
+        self._prediction = prediction
+        self._conf_lower = confidence_lower
+        self._conf_upper = confidence_upper
+        self._rsquared = rsquared
+        self._pvalues = np.asarray(pvalues)
+
+        LOG.debug("Forecast prediction: %s", self.prediction)
         LOG.debug("Forecast interval lower-bound: %s", self.confidence_lower)
         LOG.debug("Forecast interval upper-bound: %s", self.confidence_upper)
 
@@ -428,23 +514,10 @@ class LinearForecastResult:
     def prediction(self):
         """Forecast prediction.
 
-        Args:
-            to_predict (array-like) - values to predict; uses model training values if not set.
-
         Returns:
-            (array-like) - an nparray of prediction values or empty list
+            (array-like) - an nparray of prediction values
         """
-        # predict() returns the same number of elements as the number of input observations
-        prediction = []
-        try:
-            if self._exog is not None:
-                prediction = self._regression_result.predict(sm.add_constant(self._exog))
-            else:
-                prediction = self._regression_result.predict()
-        except ValueError as exc:
-            LOG.error(exc)
-        LOG.debug("Forecast prediction: %s", prediction)
-        return prediction
+        return self._prediction
 
     @property
     def confidence_lower(self):
@@ -459,7 +532,7 @@ class LinearForecastResult:
     @property
     def rsquared(self):
         """Forecast R-squared value."""
-        return self._regression_result.rsquared
+        return self._rsquared
 
     @property
     def pvalues(self):
@@ -471,10 +544,10 @@ class LinearForecastResult:
             (str) or [(str), (str)]
         """
         f_format = f"%.{Forecast.PRECISION}f"  # avoid converting floats to e-notation
-        if len(self._regression_result.pvalues.tolist()) == 1:
-            return f_format % self._regression_result.pvalues.tolist()[0]
+        if len(self._pvalues.tolist()) == 1:
+            return f_format % self._pvalues.tolist()[0]
         else:
-            return [f_format % item for item in self._regression_result.pvalues.tolist()]
+            return [f_format % item for item in self._pvalues.tolist()]
 
     @property
     def slope(self):
@@ -486,7 +559,7 @@ class LinearForecastResult:
         Returns:
             (float) the estimated slope param
         """
-        return self._regression_result.params[1]
+        return self._params[1]
 
     @property
     def intercept(self):
@@ -498,7 +571,7 @@ class LinearForecastResult:
         Returns:
             (float) the estimated Y-intercept param
         """
-        return self._regression_result.params[0]
+        return self._params[0]
 
 
 class AWSForecast(Forecast):
@@ -506,6 +579,7 @@ class AWSForecast(Forecast):
 
     provider = Provider.PROVIDER_AWS
     provider_map_class = AWSProviderMap
+    cache_key_prefix = AWS_CACHE_PREFIX
 
     def set_access_filters(self, access, filt, filters):
         """Set access filters to ensure RBAC restrictions adhere to user's access and filters.
@@ -543,6 +617,7 @@ class AzureForecast(Forecast):
 
     provider = Provider.PROVIDER_AZURE
     provider_map_class = AzureProviderMap
+    cache_key_prefix = AZURE_CACHE_PREFIX
 
 
 class OCPForecast(Forecast):
@@ -550,6 +625,7 @@ class OCPForecast(Forecast):
 
     provider = Provider.PROVIDER_OCP
     provider_map_class = OCPProviderMap
+    cache_key_prefix = OPENSHIFT_CACHE_PREFIX
 
 
 class OCPAWSForecast(Forecast):
@@ -557,6 +633,7 @@ class OCPAWSForecast(Forecast):
 
     provider = Provider.OCP_AWS
     provider_map_class = OCPAWSProviderMap
+    cache_key_prefix = OPENSHIFT_AWS_CACHE_PREFIX
 
 
 class OCPAzureForecast(Forecast):
@@ -564,6 +641,7 @@ class OCPAzureForecast(Forecast):
 
     provider = Provider.OCP_AZURE
     provider_map_class = OCPAzureProviderMap
+    cache_key_prefix = OPENSHIFT_AZURE_CACHE_PREFIX
 
 
 class OCPGCPForecast(Forecast):
@@ -571,6 +649,7 @@ class OCPGCPForecast(Forecast):
 
     provider = Provider.OCP_GCP
     provider_map_class = OCPGCPProviderMap
+    cache_key_prefix = OPENSHIFT_GCP_CACHE_PREFIX
 
 
 class OCPAllForecast(Forecast):
@@ -578,6 +657,7 @@ class OCPAllForecast(Forecast):
 
     provider = Provider.OCP_ALL
     provider_map_class = OCPAllProviderMap
+    cache_key_prefix = OPENSHIFT_ALL_CACHE_PREFIX
 
 
 class GCPForecast(Forecast):
@@ -585,6 +665,7 @@ class GCPForecast(Forecast):
 
     provider = Provider.PROVIDER_GCP
     provider_map_class = GCPProviderMap
+    cache_key_prefix = GCP_CACHE_PREFIX
 
 
 class OCIForecast(Forecast):
@@ -592,3 +673,4 @@ class OCIForecast(Forecast):
 
     provider = Provider.PROVIDER_OCI
     provider_map_class = OCIProviderMap
+    cache_key_prefix = OCI_CACHE_PREFIX
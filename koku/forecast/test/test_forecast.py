@@ -12,7 +12,11 @@ from decimal import Decimal
 from unittest.mock import Mock
 from unittest.mock import patch
 
-from statsmodels.tools.sm_exceptions import ValueWarning
+import numpy as np
+import statsmodels.api as sm
+from django.core.cache import caches
+from django.test.utils import override_settings
+from statsmodels.sandbox.regression.predstd import wls_prediction_std
 
 from api.forecast.views import AWSCostForecastView
 from api.forecast.views import AzureCostForecastView
@@ -23,6 +27,7 @@ from api.forecast.views import OCPAWSCostForecastView
 from api.forecast.views import OCPAzureCostForecastView
 from api.forecast.views import OCPCostForecastView
 from api.iam.test.iam_test_case import IamTestCase
+from api.models import Provider
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.report.test.test_queries import assertSameQ
@@ -37,6 +42,9 @@ from forecast import OCPAzureForecast
 from forecast import OCPForecast
 from forecast.forecast import LinearForecastResult
 from forecast.forecast import ZERO_RESULT
+from koku.cache import AWS_CACHE_PREFIX
+from koku.cache import invalidate_view_cache_for_tenant_and_cache_key
+from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 from reporting.provider.aws.models import AWSCostSummaryByAccountP
 from reporting.provider.gcp.models import GCPCostSummaryByAccountP
 from reporting.provider.gcp.models import GCPCostSummaryByProjectP
@@ -62,6 +70,10 @@ class MockQuerySet:
             results.append({arg: row.get(arg) for arg in args})
         return results
 
+    def __iter__(self):
+        """Iterate over the queryset data."""
+        return iter(self.data)
+
     @property
     def len(self):
         """Length of data."""
@@ -366,8 +378,8 @@ class AWSForecastTest(IamTestCase):
         params = self.mocked_query_params("?", AWSCostForecastView)
         instance = AWSForecast(params)
 
-        out = instance._predict(scenario)
-        self.assertEqual(out, ZERO_RESULT)
+        out = instance._predict({"total_cost": scenario})
+        self.assertEqual(out, {"total_cost": ZERO_RESULT})
 
     def test_set_access_filter_with_list(self):
         """
@@ -444,9 +456,9 @@ class AWSForecastTest(IamTestCase):
     @patch("forecast.forecast.Forecast._enumerate_dates", return_value=[0, 1, 2, 3, 4])
     def test_negative_values(self, mock_enumerate_dates, mock_run_forecast, mock_format_result):
         """COST-1110: ensure that the forecast response does not include negative numbers."""
-        mock_run_forecast.return_value = Mock(
-            prediction=[1, 0, -1, -2, -3], confidence_lower=[2, 1, 0, -1, -2], confidence_upper=[3, 2, 1, 0, -1]
-        )
+        mock_run_forecast.return_value = [
+            Mock(prediction=[1, 0, -1, -2, -3], confidence_lower=[2, 1, 0, -1, -2], confidence_upper=[3, 2, 1, 0, -1])
+        ] * 3
         params = self.mocked_query_params("?", AWSCostForecastView)
         instance = AWSForecast(params)
         instance.predict()
@@ -459,6 +471,83 @@ class AWSForecastTest(IamTestCase):
                     self.assertGreaterEqual(inner_val[0]["confidence_min"], 0)
                     self.assertGreaterEqual(inner_val[0]["confidence_max"], 0)
 
+    def test_predict_single_query(self):
+        """Test that predict() fetches the forecast window once for all cost terms."""
+        dh = DateHelper()
+        expected = [
+            {
+                "usage_start": (dh.this_month_start + timedelta(days=n)).date(),
+                "total_cost": 5 + (0.01 * n),
+                "infrastructure_cost": 3 + (0.01 * n),
+                "supplementary_cost": 2 + (0.01 * n),
+            }
+            for n in range(0, 10)
+        ]
+        mocked_table = Mock()
+        mocked_table.objects.filter.return_value.order_by.return_value.values.return_value.annotate.return_value = (
+            MockQuerySet(expected)  # noqa: E501
+        )
+
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        instance = AWSForecast(params)
+        instance.cost_summary_table = mocked_table
+
+        with patch.object(AWSForecast, "_run_forecast", wraps=instance._run_forecast) as mock_run_forecast:
+            results = instance.predict()
+
+        self.assertNotEqual(results, [])
+        mocked_table.objects.filter.assert_called_once()
+        mock_run_forecast.assert_called_once()
+        self.assertEqual(len(mock_run_forecast.call_args[0][0]), 3)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "forecast"}}
+    )
+    def test_cache_key_invalidated(self):
+        """Test that invalidating the provider views changes the forecast cache key."""
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        instance = AWSForecast(params)
+        cache_key = instance.cache_key
+        self.assertEqual(instance.cache_key, cache_key)
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, AWS_CACHE_PREFIX)
+        invalidated_key = instance.cache_key
+        self.assertNotEqual(invalidated_key, cache_key)
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name)
+        self.assertNotEqual(instance.cache_key, invalidated_key)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "forecast"}}
+    )
+    def test_predict_cached(self):
+        """Test that predict() results are cached per tenant, provider and filters."""
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        instance = AWSForecast(params)
+        self.assertIn(AWS_CACHE_PREFIX, instance.cache_key)
+        self.assertIn(self.schema_name, instance.cache_key)
+
+        mocked_table = Mock()
+        mocked_table.objects.filter.return_value.order_by.return_value.values.return_value.annotate.return_value = (
+            MockQuerySet([])  # noqa: E501
+        )
+        instance.cost_summary_table = mocked_table
+        with patch.object(AWSForecast, "format_result", return_value=["FAKE RESULTS"]):
+            self.assertEqual(instance.predict(), ["FAKE RESULTS"])
+        self.assertEqual(instance.predict(), ["FAKE RESULTS"])
+        mocked_table.objects.filter.assert_called_once()
+
+        other_params = self.mocked_query_params("?", AWSCostForecastView)
+        other_instance = AWSForecast(other_params)
+        other_instance.filters.add(field="usage_account_id", operation="in", parameter=["1234"])
+        self.assertNotEqual(instance.cache_key, other_instance.cache_key)
+
+        invalidate_view_cache_for_tenant_and_source_type(self.schema_name, Provider.PROVIDER_AWS)
+        with patch.object(AWSForecast, "format_result", return_value=[]):
+            self.assertEqual(instance.predict(), [])
+        self.assertEqual(mocked_table.objects.filter.call_count, 2)
+        caches["default"].clear()
+
     def test__key_results_by_date(self):
         table = [
             {
@@ -1036,25 +1125,35 @@ class OCPAzureForecastTest(IamTestCase):
 class LinearForecastResultTest(IamTestCase):
     """Tests the LinearForecastResult class."""
 
-    @patch("forecast.forecast.wls_prediction_std", return_value=(1, 2, 3))
-    def test_constructor_logging(self, _):
-        """Test that the constructor logs messages."""
-        fake_results = Mock(summary=Mock(side_effect=ValueWarning("test")))
-
-        with self.assertLogs(logger="forecast.forecast", level=logging.WARNING):
-            LinearForecastResult(fake_results)
-
-    @patch("forecast.forecast.wls_prediction_std", return_value=(1, 2, 3))
-    def test_pvalues_slope_intercept(self, _):
+    def test_pvalues_slope_intercept(self):
         """Test the slope, intercept, and pvalues properties."""
-        fake_results = Mock(
-            summary=Mock(return_value="this is a test summary"),
-            pvalues=Mock(tolist=Mock(return_value=[99999, 88888])),
-            params=[66666, 77777],
-        )
-
-        lfr = LinearForecastResult(fake_results)
+        lfr = LinearForecastResult([66666, 77777], [1, 2], [0, 1], [2, 3], 0.5, [99999, 88888])
 
         self.assertEqual(lfr.pvalues, ["99999.00000000", "88888.00000000"])
         self.assertEqual(lfr.slope, 77777)
         self.assertEqual(lfr.intercept, 66666)
+        self.assertEqual(lfr.rsquared, 0.5)
+
+    def test_run_forecast_matches_ols(self):
+        """Test that the batched regression matches a statsmodels OLS fit of each series."""
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        instance = AWSForecast(params)
+
+        xs = [[0, 1, 2, 4, 5, 6, 7, 8, 9, 10], [0, 1, 2, 3, 4, 5, 6, 7]]
+        ys = [[random.uniform(0, 10) + x for x in series] for series in xs]
+        to_predict = [range(12, 20), range(9, 17)]
+
+        results = instance._run_forecast(xs, ys, to_predict=to_predict)
+        self.assertEqual(len(results), 2)
+        for x, y, pred_x, result in zip(xs, ys, to_predict, results):
+            with self.subTest(x=x):
+                exog = sm.add_constant(list(pred_x))
+                expected = sm.OLS(y, sm.add_constant(x)).fit()
+                _, expected_lower, expected_upper = wls_prediction_std(expected, exog=exog)
+                np.testing.assert_allclose(result.prediction, expected.predict(exog))
+                np.testing.assert_allclose(result.confidence_lower, expected_lower)
+                np.testing.assert_allclose(result.confidence_upper, expected_upper)
+                self.assertAlmostEqual(result.rsquared, expected.rsquared)
+                self.assertAlmostEqual(result.intercept, expected.params[0])
+                self.assertAlmostEqual(result.slope, expected.params[1])
+                np.testing.assert_allclose([float(p) for p in result.pvalues], expected.pvalues, atol=1e-8)
@@ -1,10 +1,11 @@
+import io
 import logging
-import os
 
 import pandas as pd
+from django.conf import settings
 
 from api.common import log_json
-from masu.util.aws.common import copy_local_hcs_report_file_to_s3_bucket
+from masu.util.aws.common import copy_hcs_data_to_s3_bucket
 
 LOG = logging.getLogger(__name__)
 
@@ -38,6 +39,9 @@ class CSVFileHandler:
         )
 
         LOG.info(log_json(tracing_id, "preparing to write file to object storage"))
-        my_df.to_csv(filename, header=cols, index=False)
-        copy_local_hcs_report_file_to_s3_bucket(tracing_id, s3_csv_path, filename, filename, finalize, date)
-        os.remove(filename)
+        if not settings.ENABLE_S3_ARCHIVING:
+            return
+        # The CSV is uploaded from memory, a daily report is small enough to skip the local file
+        data_fileobj = io.BytesIO(my_df.to_csv(header=cols, index=False).encode("utf-8"))
+        context = {"provider_uuid": self._provider_uuid, "provider_type": self._provider}
+        copy_hcs_data_to_s3_bucket(tracing_id, s3_csv_path, filename, data_fileobj, finalize, context)
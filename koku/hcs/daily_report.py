@@ -4,10 +4,15 @@
 #
 """HCS daily report builder"""
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 
 from api.common import log_json
+from hcs.csv_file_handler import CSVFileHandler
 from hcs.database.report_db_accessor import HCSReportDBAccessor
 from hcs.exceptions import HCSTableNotFoundError
+from masu.config import Config
 from masu.external.date_accessor import DateAccessor
 from masu.util.common import date_range
 
@@ -35,15 +40,38 @@ class ReportHCS:
         """
         sql_file = f"sql/reporting_{self._provider.lower()}_hcs_daily_summary.sql"
 
+        csv_handler = CSVFileHandler(self._schema_name, self._provider, self._provider_uuid)
+        # Bounds the daily reports held in memory while they wait for an upload worker
+        pending = threading.BoundedSemaphore(Config.HCS_MAX_WORKERS * 2)
+
+        def upload(date, cols, data):
+            try:
+                csv_handler.write_csv_to_s3(date, data, cols, finalize, self._tracing_id)
+            finally:
+                pending.release()
+
         with HCSReportDBAccessor(self._schema_name) as accessor:
             try:
-                for date in date_range(start_date, end_date, step=1):
-                    accessor.get_hcs_daily_summary(
-                        date, self._provider, self._provider_uuid, sql_file, self._tracing_id, finalize
-                    )
+                with ThreadPoolExecutor(max_workers=Config.HCS_MAX_WORKERS) as executor:
+                    futures = []
+                    for month_start, month_end in month_date_ranges(start_date, end_date):
+                        for date, cols, data in accessor.get_hcs_daily_summaries(
+                            month_start, month_end, self._provider, self._provider_uuid, sql_file, self._tracing_id
+                        ):
+                            pending.acquire()
+                            futures.append(executor.submit(upload, date, cols, data))
+                    for future in futures:
+                        future.result()
 
             except HCSTableNotFoundError as tnfe:
                 LOG.info(log_json(self._tracing_id, f"{tnfe}, skipping..."))
 
             except Exception as e:
                 LOG.error(log_json(self._tracing_id, e))
+
+
+def month_date_ranges(start_date, end_date):
+    """Split a date range into the (first, last) dates it covers in each month."""
+    for _, dates in groupby(date_range(start_date, end_date, step=1), key=lambda date: (date.year, date.month)):
+        dates = list(dates)
+        yield dates[0], dates[-1]
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Database accessor for report data."""
+import datetime
 import logging
 import pkgutil
 
@@ -13,6 +14,7 @@ from api.iam.models import Customer
 from api.provider.models import Provider
 from hcs.csv_file_handler import CSVFileHandler
 from hcs.exceptions import HCSTableNotFoundError
+from masu.config import Config
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
 from masu.external.date_accessor import DateAccessor
 from reporting.provider.aws.models import PRESTO_LINE_ITEM_DAILY_TABLE as AWS_PRESTO_LINE_ITEM_DAILY_TABLE
@@ -21,6 +23,9 @@ from reporting.provider.gcp.models import PRESTO_LINE_ITEM_DAILY_TABLE as GCP_PR
 
 LOG = logging.getLogger(__name__)
 
+# The usage date the HCS queries add to every row to partition the results by day
+HCS_DATE_COLUMN = "hcs_usage_date"
+
 HCS_TABLE_MAP = {
     Provider.PROVIDER_AWS: AWS_PRESTO_LINE_ITEM_DAILY_TABLE,
     Provider.PROVIDER_AZURE: AZURE_PRESTO_LINE_ITEM_DAILY_TABLE,
@@ -54,56 +59,86 @@ class HCSReportDBAccessor(ReportDBAccessorBase):
 
         :returns (None)
         """
+        csv_handler = CSVFileHandler(self.schema, provider, provider_uuid)
+        for day, cols, data in self.get_hcs_daily_summaries(
+            date, date, provider, provider_uuid, sql_summary_file, tracing_id
+        ):
+            csv_handler.write_csv_to_s3(day, data, cols, finalize, tracing_id)
+
+    def get_hcs_daily_summaries(self, start_date, end_date, provider, provider_uuid, sql_summary_file, tracing_id):
+        """Query the HCS data of a date range within one month and partition it by day.
+        The rows are streamed in usage date order so each day is yielded as soon as its last row arrives.
+        :param start_date       (datetime.date) The first date to process
+        :param end_date         (datetime.date) The last date to process, in the month of start_date
+        :param provider         (str)           The provider name
+        :param provider_uuid    (uuid)          ID for cost source
+        :param sql_summary_file (str)           The sql file used for processing
+        :param tracing_id       (id)            Logging identifier
+
+        :returns (generator) (date, cols, data) for each day with data
+        """
         LOG.info(log_json(tracing_id, "acquiring marketplace data..."))
         LOG.info(
             log_json(
                 tracing_id,
                 f"schema: {self.schema}, provider: {provider}, "
-                + f"date: {date}, org_id: {self._org_id}, ebs_num: {self._ebs_acct_num}",
+                + f"date: {start_date} to {end_date}, org_id: {self._org_id}, ebs_num: {self._ebs_acct_num}",
             )
         )
 
         try:
             sql = pkgutil.get_data("hcs.database", sql_summary_file)
-            sql = sql.decode("utf-8")
-            table = HCS_TABLE_MAP.get(provider.strip("-local"))
-
-            if not self.table_exists_trino(table):
-                raise HCSTableNotFoundError(table)
-
-            sql_params = {
-                "provider_uuid": provider_uuid,
-                "year": date.year,
-                "month": date.strftime("%m"),
-                "date": date,
-                "schema": self.schema,
-                "ebs_acct_num": self._ebs_acct_num,
-                "org_id": self._org_id,
-                "table": table,
-            }
-
-            LOG.debug(log_json(tracing_id, f"SQL params: {sql_params}"))
-
-            sql, sql_params = self.jinja_sql.prepare_query(sql, sql_params)
-            data, description = self._execute_presto_raw_sql_query_with_description(
-                self.schema, sql, bind_params=sql_params
-            )
-            # The format for the description is:
-            # [(name, type_code, display_size, internal_size, precision, scale, null_ok)]
-            # col[0] grabs the column names from the query results
-            cols = [col[0] for col in description]
-
-            if len(data) > 0:
-                LOG.info(log_json(tracing_id, f"data found for date: {date}"))
-                csv_handler = CSVFileHandler(self.schema, provider, provider_uuid)
-                csv_handler.write_csv_to_s3(date, data, cols, finalize, tracing_id)
-            else:
-                LOG.info(
-                    log_json(
-                        tracing_id,
-                        f"no data found for date: {date}, " f"provider: {provider}, provider_uuid: {provider_uuid}",
-                    )
-                )
-
         except FileNotFoundError:
             LOG.error(log_json(tracing_id, f"unable to locate SQL file: {sql_summary_file}"))
+            return
+
+        sql = sql.decode("utf-8")
+        table = HCS_TABLE_MAP.get(provider.strip("-local"))
+
+        if not self.table_exists_trino(table):
+            raise HCSTableNotFoundError(table)
+
+        sql_params = {
+            "provider_uuid": provider_uuid,
+            "year": start_date.year,
+            "month": start_date.strftime("%m"),
+            "start_date": start_date,
+            "end_date": end_date,
+            "schema": self.schema,
+            "ebs_acct_num": self._ebs_acct_num,
+            "org_id": self._org_id,
+            "table": table,
+        }
+
+        LOG.debug(log_json(tracing_id, f"SQL params: {sql_params}"))
+
+        sql, sql_params = self.jinja_sql.prepare_query(sql, sql_params)
+        usage_date, data = None, []
+        for batch_cols, rows in self._execute_presto_raw_sql_query_in_batches(
+            self.schema, sql, bind_params=sql_params, batch_size=Config.HCS_FETCH_SIZE
+        ):
+            date_index = batch_cols.index(HCS_DATE_COLUMN)
+            cols = batch_cols[:date_index] + batch_cols[date_index + 1 :]  # noqa E203
+            for row in rows:
+                row_date = row.pop(date_index)
+                if row_date != usage_date:
+                    if data:
+                        yield self._hcs_daily_data(usage_date, cols, data, tracing_id)
+                    usage_date, data = row_date, []
+                data.append(row)
+
+        if data:
+            yield self._hcs_daily_data(usage_date, cols, data, tracing_id)
+        elif usage_date is None:
+            LOG.info(
+                log_json(
+                    tracing_id,
+                    f"no data found for date: {start_date} to {end_date}, "
+                    + f"provider: {provider}, provider_uuid: {provider_uuid}",
+                )
+            )
+
+    def _hcs_daily_data(self, usage_date, cols, data, tracing_id):
+        """Return the data of one day with its usage date, which trino may return as an ISO string."""
+        LOG.info(log_json(tracing_id, f"data found for date: {usage_date}"))
+        return datetime.date.fromisoformat(str(usage_date)), cols, data
@@ -1,9 +1,11 @@
-SELECT *, '{{ebs_acct_num | sqlsafe}}' as ebs_account_id, '{{org_id | sqlsafe}}' as org_id
+SELECT *, '{{ebs_acct_num | sqlsafe}}' as ebs_account_id, '{{org_id | sqlsafe}}' as org_id,
+    date(lineitem_usagestartdate) as hcs_usage_date
 FROM hive.{{schema | sqlsafe}}.{{table | sqlsafe}}
 WHERE source = '{{provider_uuid | sqlsafe}}'
     AND year = '{{year | sqlsafe}}'
     AND month = '{{month | sqlsafe}}'
     AND bill_billingentity = 'AWS Marketplace'
     AND lineitem_legalentity like '%Red Hat%'
-    AND lineitem_usagestartdate >= TIMESTAMP '{{date | sqlsafe}}'
-    AND lineitem_usagestartdate < date_add('day', 1, TIMESTAMP '{{date | sqlsafe}}')
+    AND lineitem_usagestartdate >= TIMESTAMP '{{start_date | sqlsafe}}'
+    AND lineitem_usagestartdate < date_add('day', 1, TIMESTAMP '{{end_date | sqlsafe}}')
+ORDER BY hcs_usage_date
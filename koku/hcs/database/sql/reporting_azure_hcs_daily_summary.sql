@@ -1,9 +1,11 @@
-SELECT *, '{{ebs_acct_num | sqlsafe}}' as ebs_account_id, '{{org_id | sqlsafe}}' as org_id
+SELECT *, '{{ebs_acct_num | sqlsafe}}' as ebs_account_id, '{{org_id | sqlsafe}}' as org_id,
+    date(coalesce(date, usagedatetime)) as hcs_usage_date
 FROM hive.{{schema | sqlsafe}}.{{table | sqlsafe}}
 WHERE source = '{{provider_uuid | sqlsafe}}'
     AND year = '{{year | sqlsafe}}'
     AND month = '{{month | sqlsafe}}'
     AND publishertype = 'Marketplace'
     AND publishername like '%Red Hat%'
-    AND coalesce(date, usagedatetime) >= TIMESTAMP '{{date | sqlsafe}}'
-    AND coalesce(date, usagedatetime) < date_add('day', 1, TIMESTAMP '{{date | sqlsafe}}')
+    AND coalesce(date, usagedatetime) >= TIMESTAMP '{{start_date | sqlsafe}}'
+    AND coalesce(date, usagedatetime) < date_add('day', 1, TIMESTAMP '{{end_date | sqlsafe}}')
+ORDER BY hcs_usage_date
@@ -16,7 +16,7 @@ from api.provider.models import Provider
 from hcs.daily_report import ReportHCS
 from koku import celery_app
 from koku import settings
-from koku.feature_flags import UNLEASH_CLIENT
+from koku.feature_flags import FEATURE_FLAGS
 from masu.external.date_accessor import DateAccessor
 
 LOG = logging.getLogger(__name__)
@@ -45,9 +45,7 @@ def check_schema_name(schema_name: str) -> str:
 def enable_hcs_processing(schema_name: str) -> bool:  # pragma: no cover #noqa
     """Helper to determine if source is enabled for HCS."""
     schema_name = check_schema_name(schema_name)
-    context = {"schema": schema_name}
-    LOG.info(f"enable_hcs_processing context: {context}")
-    return bool(UNLEASH_CLIENT.is_enabled("hcs-data-processor", context))
+    return FEATURE_FLAGS.is_enabled("hcs-data-processor", schema_name)
 
 
 @celery_app.task(name="hcs.tasks.collect_hcs_report_data_from_manifest", queue=HCS_QUEUE)
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test HCSReportDBAccessor."""
+from datetime import date
 from datetime import timedelta
 from unittest.mock import MagicMock
 from unittest.mock import patch
@@ -51,10 +52,12 @@ class TestHCSReportDBAccessor(HCSTestCase):
             self.assertRaises(FileNotFoundError)
 
     @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase")
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_presto_raw_sql_query_in_batches")
     @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_presto_raw_sql_query_with_description")
-    def test_no_data_hcs_customer(self, mock_dba_query, mock_dba):
+    def test_no_data_hcs_customer(self, mock_dba_query, mock_dba_batches, mock_dba):
         """Test no data found for specified date"""
         mock_dba_query.return_value = (MagicMock(), MagicMock())
+        mock_dba_batches.return_value = iter([])
 
         with self.assertLogs("hcs.database", "INFO") as _logs:
             hcs_accessor = HCSReportDBAccessor(self.schema)
@@ -71,10 +74,12 @@ class TestHCSReportDBAccessor(HCSTestCase):
 
     @patch("hcs.csv_file_handler.CSVFileHandler")
     @patch("hcs.csv_file_handler.CSVFileHandler.write_csv_to_s3")
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_presto_raw_sql_query_in_batches")
     @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_presto_raw_sql_query_with_description")
-    def test_data_hcs_customer(self, mock_dba_query, mock_fh_writer, mock_fh):
+    def test_data_hcs_customer(self, mock_dba_query, mock_dba_batches, mock_fh_writer, mock_fh):
         """Test data found for specified date"""
         mock_dba_query.return_value = (MagicMock(), MagicMock())
+        mock_dba_batches.return_value = iter([(["x", "hcs_usage_date"], [["1", str(self.today.date())]])])
 
         with self.assertLogs("hcs.database", "INFO") as _logs:
             hcs_accessor = HCSReportDBAccessor(self.schema)
@@ -88,3 +93,42 @@ class TestHCSReportDBAccessor(HCSTestCase):
             self.assertIn("acquiring marketplace data...", _logs.output[0])
             self.assertIn(f"schema: {self.schema}, provider: {self.provider}, date: {self.today}", _logs.output[1])
             self.assertIn("data found for date", _logs.output[2])
+            mock_fh_writer.assert_called_once()
+
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_presto_raw_sql_query_in_batches")
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_presto_raw_sql_query_with_description")
+    def test_get_hcs_daily_summaries_partitions_by_day(self, mock_dba_query, mock_dba_batches):
+        """Test that one range query is split into the data of each day."""
+        mock_dba_query.return_value = (MagicMock(), MagicMock())
+        cols = ["x", "hcs_usage_date", "y"]
+        mock_dba_batches.return_value = iter(
+            [
+                (cols, [["1", "2022-04-01", "a"], ["2", "2022-04-01", "b"]]),
+                (cols, [["3", "2022-04-01", "c"], ["4", "2022-04-03", "d"]]),
+            ]
+        )
+        start_date, end_date = date(2022, 4, 1), date(2022, 4, 3)
+
+        hcs_accessor = HCSReportDBAccessor(self.schema)
+        result = list(
+            hcs_accessor.get_hcs_daily_summaries(
+                start_date,
+                end_date,
+                self.provider,
+                self.provider_uuid,
+                "sql/reporting_aws_hcs_daily_summary.sql",
+                "1234-1234-1234",
+            )
+        )
+
+        mock_dba_batches.assert_called_once()
+        sql = mock_dba_batches.call_args.args[1]
+        self.assertIn(f"TIMESTAMP '{start_date}'", sql)
+        self.assertIn(f"TIMESTAMP '{end_date}'", sql)
+        self.assertEqual(
+            result,
+            [
+                (date(2022, 4, 1), ["x", "y"], [["1", "a"], ["2", "b"], ["3", "c"]]),
+                (date(2022, 4, 3), ["x", "y"], [["4", "d"]]),
+            ],
+        )
@@ -4,8 +4,10 @@
 #
 """Test HCS csv_file_handler."""
 import logging
+from unittest.mock import patch
 
 from dateutil import parser
+from django.test import override_settings
 
 from api.models import Provider
 from api.utils import DateHelper
@@ -40,3 +42,18 @@ class TestHCSCSVFileHandler(HCSTestCase):
             fh.write_csv_to_s3(parser.parse("2022-04-04"), data.items(), "1234-1234-1234")
 
             self.assertIn("preparing to write file to object storage", _logs.output[0])
+
+    @override_settings(ENABLE_S3_ARCHIVING=True)
+    @patch("hcs.csv_file_handler.copy_hcs_data_to_s3_bucket")
+    def test_write_csv_to_s3_uploads_from_memory(self, mock_copy):
+        """Test that the CSV is uploaded from memory without a local file."""
+        data = [["123", "456"], ["789", "012"]]
+        fh = CSVFileHandler(self.schema, self.provider, self.provider_uuid)
+        fh.write_csv_to_s3(parser.parse("2022-04-04").date(), data, ["x", "y"], True, "1234-1234-1234")
+
+        mock_copy.assert_called_once()
+        tracing_id, s3_path, filename, data_fileobj, finalize, _ = mock_copy.call_args.args
+        self.assertEqual(s3_path, f"hcs/csv/org1234567/AWS/source={self.provider_uuid}/year=2022/month=04")
+        self.assertEqual(filename, "hcs_2022-04-04.csv")
+        self.assertEqual(data_fileobj.getvalue(), b"x,y\n123,456\n789,012\n")
+        self.assertTrue(finalize)
@@ -4,9 +4,13 @@
 #
 """Test HCS csv_file_handler."""
 import logging
+from datetime import date
 from datetime import timedelta
+from unittest.mock import call
+from unittest.mock import patch
 
 from api.utils import DateHelper
+from hcs.daily_report import month_date_ranges
 from hcs.daily_report import ReportHCS
 from hcs.test import HCSTestCase
 
@@ -31,3 +35,57 @@ class TestReportHCS(HCSTestCase):
         self.assertEqual(dr._provider, self.aws_provider_type)
         self.assertEqual(dr._provider_uuid, self.aws_provider_uuid)
         self.assertEqual(dr._tracing_id, self.tracing_id)
+
+    def test_month_date_ranges(self):
+        """Test that a date range is split at month boundaries."""
+        result = list(month_date_ranges("2022-03-30", "2022-05-02"))
+        expected = [
+            (date(2022, 3, 30), date(2022, 3, 31)),
+            (date(2022, 4, 1), date(2022, 4, 30)),
+            (date(2022, 5, 1), date(2022, 5, 2)),
+        ]
+        self.assertEqual(result, expected)
+
+    @patch("hcs.daily_report.CSVFileHandler.write_csv_to_s3")
+    @patch("hcs.daily_report.HCSReportDBAccessor.get_hcs_daily_summaries")
+    def test_generate_report_one_query_per_month(self, mock_summaries, mock_write):
+        """Test that each month is queried once and each day with data is uploaded."""
+        days = {
+            date(2022, 3, 31): [(date(2022, 3, 31), ["x"], [["1"]])],
+            date(2022, 4, 1): [(date(2022, 4, 1), ["x"], [["2"]]), (date(2022, 4, 2), ["x"], [["3"]])],
+        }
+        mock_summaries.side_effect = lambda start_date, *args: iter(days[start_date])
+
+        dr = ReportHCS(self.schema, self.aws_provider_type, self.aws_provider_uuid, self.tracing_id)
+        dr.generate_report("2022-03-31", "2022-04-02", True)
+
+        sql_file = f"sql/reporting_{self.aws_provider_type.lower()}_hcs_daily_summary.sql"
+        mock_summaries.assert_has_calls(
+            [
+                call(
+                    date(2022, 3, 31),
+                    date(2022, 3, 31),
+                    self.aws_provider_type,
+                    self.aws_provider_uuid,
+                    sql_file,
+                    self.tracing_id,
+                ),
+                call(
+                    date(2022, 4, 1),
+                    date(2022, 4, 2),
+                    self.aws_provider_type,
+                    self.aws_provider_uuid,
+                    sql_file,
+                    self.tracing_id,
+                ),
+            ]
+        )
+        self.assertEqual(mock_summaries.call_count, 2)
+        mock_write.assert_has_calls(
+            [
+                call(date(2022, 3, 31), [["1"]], ["x"], True, self.tracing_id),
+                call(date(2022, 4, 1), [["2"]], ["x"], True, self.tracing_id),
+                call(date(2022, 4, 2), [["3"]], ["x"], True, self.tracing_id),
+            ],
+            any_order=True,
+        )
@@ -4,13 +4,13 @@
 #
 """Cache functions."""
 import logging
+import re
 
-from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.dummy import DummyCache
 from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
 from django_redis.cache import RedisCache
-from redis import Redis
 
 from api.provider.models import Provider
 
@@ -33,40 +33,91 @@ OPENSHIFT_AZURE_CACHE_PREFIX = "openshift-azure-view"
 OPENSHIFT_GCP_CACHE_PREFIX = "openshift-gcp-view"
 OPENSHIFT_ALL_CACHE_PREFIX = "openshift-all-view"
 SOURCES_CACHE_PREFIX = "sources"
+QUERY_RESULT_CACHE_PREFIX = "query-result"
+
+# The view cache key prefix whose generation expires the cached reports of a query handler provider
+PROVIDER_CACHE_PREFIXES = {
+    Provider.PROVIDER_AWS: AWS_CACHE_PREFIX,
+    Provider.PROVIDER_AZURE: AZURE_CACHE_PREFIX,
+    Provider.PROVIDER_GCP: GCP_CACHE_PREFIX,
+    Provider.PROVIDER_OCI: OCI_CACHE_PREFIX,
+    Provider.PROVIDER_OCP: OPENSHIFT_CACHE_PREFIX,
+    Provider.OCP_AWS: OPENSHIFT_AWS_CACHE_PREFIX,
+    Provider.OCP_AZURE: OPENSHIFT_AZURE_CACHE_PREFIX,
+    Provider.OCP_GCP: OPENSHIFT_GCP_CACHE_PREFIX,
+    Provider.OCP_ALL: OPENSHIFT_ALL_CACHE_PREFIX,
+}
+
+
+# cache_page() keys are "views.decorators.cache.cache_(page|header).<key_prefix>.<hashes>"
+VIEW_CACHE_KEY_REGEX = re.compile(r"^views\.decorators\.cache\.cache_(?:page|header)\.([^.]+)\.")
+GENERATION_KEY_PREFIX = "view-generation"
+
+
+def _generation_key(schema_name, cache_key_prefix=None):
+    """Return the key of the view generation counter of a tenant, or of one of its cache key prefixes."""
+    if cache_key_prefix:
+        return f"{GENERATION_KEY_PREFIX}:{schema_name}:{cache_key_prefix}"
+    return f"{GENERATION_KEY_PREFIX}:{schema_name}"
+
+
+def get_view_cache_generation(schema_name, cache_key_prefix):
+    """Return the generations of all views and of the cache_key_prefix views of a tenant."""
+    keys = (_generation_key(schema_name), _generation_key(schema_name, cache_key_prefix))
+    generations = caches["default"].get_many(keys)
+    return ".".join(str(generations.get(key, 0)) for key in keys)
+
+
+def make_key(key, key_prefix, version):
+    """Build a tenant aware cache key.
+
+    View cache keys carry the view generations of the tenant, so bumping a generation makes every
+    view cached under it unreachable. Generation counters are keyed by the tenant they count for
+    rather than by the current schema.
+    """
+    if key.startswith(f"{GENERATION_KEY_PREFIX}:"):
+        schema_name = key.split(":")[1]
+    else:
+        schema_name = connection.schema_name
+        match = VIEW_CACHE_KEY_REGEX.match(key)
+        if match:
+            version = f"{version}.{get_view_cache_generation(schema_name, match.group(1))}"
+    return f"{schema_name}:{key_prefix}:{version}:{key}"
+
+
+def get_query_result_cache_key(schema_name, provider, digest):
+    """Return the key of a cached query result of a tenant, None if the reports of provider are not cached.
+
+    The key carries the view generations of the provider, so the ingests that invalidate the
+    provider views also expire its query results.
+    """
+    cache_key_prefix = PROVIDER_CACHE_PREFIXES.get(provider)
+    if not cache_key_prefix:
+        return None
+    generation = get_view_cache_generation(schema_name, cache_key_prefix)
+    return f"{QUERY_RESULT_CACHE_PREFIX}:{schema_name}:{cache_key_prefix}:{generation}:{digest}"
 
 
 def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix=None):
     """Invalidate our view cache for a specific tenant and source type.
 
-    If cache_key_prefix is None, all views will be invalidated.
+    If cache_key_prefix is None, all views will be invalidated. The views are invalidated by
+    incrementing their generation counter; the stale entries are left to expire.
     """
     cache = caches["default"]
-    if isinstance(cache, RedisCache):
-        cache = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
-        all_keys = cache.keys("*")
-        all_keys = [key.decode("utf-8") for key in all_keys]
-    elif isinstance(cache, LocMemCache):
-        all_keys = cache._cache.keys()
-        all_keys = list(all_keys)
-        all_keys = [key.split(":") for key in all_keys]
-        all_keys = [":".join(splits[-2:]) for splits in all_keys]
-    elif isinstance(cache, DummyCache):
+    if isinstance(cache, DummyCache):
         LOG.info("Skipping cache invalidation because views caching is disabled.")
         return
-    else:
+    if not isinstance(cache, (RedisCache, LocMemCache)):
         msg = "Using an unsupported caching backend!"
         raise KokuCacheError(msg)
 
-    all_keys = all_keys if all_keys is not None else []
-
-    if cache_key_prefix:
-        keys_to_invalidate = [key for key in all_keys if (schema_name in key and cache_key_prefix in key)]
-    else:
-        # Invalidate all cached views for the tenant
-        keys_to_invalidate = [key for key in all_keys if schema_name in key]
-
-    for key in keys_to_invalidate:
-        cache.delete(key)
+    key = _generation_key(schema_name, cache_key_prefix)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No view has been invalidated yet, they are all cached under generation 0
+        cache.add(key, 1, timeout=None)
 
     msg = f"Invalidated request cache for\n\ttenant: {schema_name}\n\tcache_key_prefix: {cache_key_prefix}"
     LOG.info(msg)
@@ -89,6 +140,8 @@ def invalidate_view_cache_for_tenant_and_source_type(schema_name, source_type):
         cache_key_prefixes = (AZURE_CACHE_PREFIX, OPENSHIFT_AZURE_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
     elif source_type in (Provider.PROVIDER_GCP, Provider.PROVIDER_GCP_LOCAL):
         cache_key_prefixes = (GCP_CACHE_PREFIX, OPENSHIFT_GCP_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
+    elif source_type in (Provider.PROVIDER_OCI, Provider.PROVIDER_OCI_LOCAL):
+        cache_key_prefixes = (OCI_CACHE_PREFIX,)
 
     for cache_key_prefix in cache_key_prefixes:
         invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix)
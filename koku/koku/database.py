@@ -299,76 +299,188 @@ def fast_table_exists(table_name):
         return rec is not None and rec[0] is not None and rec[0] > 0
 
 
-def cascade_delete(from_model, instance_pk_query, skip_relations=None, base_model=None, level=0):
+# The low-level line item tables are purged by partition or by the cleaners themselves.
+CASCADE_SKIP_TABLES = (
+    "reporting_awscostentrylineitem",
+    "reporting_gcpcostentrylineitem",
+    "reporting_ocpusagelineitem",
+    "reporting_ocpnodelabellineitem",
+    "reporting_ocpstoragelineitem",
+)
+CASCADE_ACTIONS = {"CASCADE": "DELETE", "SET_NULL": "SET NULL"}
+DELETE_PLANS_LOCK = threading.Lock()
+DELETE_PLANS = {}
+
+
+class DeleteStep:
+    """A table reached by a cascade delete and the relation it is reached through."""
+
+    __slots__ = ("model", "action", "parent", "column", "parent_column", "returning")
+
+    def __init__(self, model, action="DELETE", parent=None, column=None, parent_column=None):
+        """Initialize the step of model, reached through column referencing parent_column of step parent."""
+        self.model = model
+        self.action = action
+        self.parent = parent
+        self.column = column
+        self.parent_column = parent_column
+        self.returning = [model._meta.pk.column]
+
+    @property
+    def table(self):
+        """Return the table of the step."""
+        return self.model._meta.db_table
+
+    def __repr__(self):
+        """Return the step representation."""
+        return f"DeleteStep({self.table!r}, {self.action!r}, parent={self.parent}, column={self.column!r})"
+
+
+def _build_delete_plan(from_model, skip_relations):
+    """Walk the relations of from_model into a list of steps where every parent precedes its children."""
+    steps = [DeleteStep(from_model)]
+
+    def walk(parent_ix, path):
+        parent = steps[parent_ix]
+        for model_relation in parent.model._meta.related_objects:
+            related_model = model_relation.related_model
+            on_delete = getattr(model_relation, "on_delete", None)
+            action = CASCADE_ACTIONS.get(getattr(on_delete, "__name__", None))
+            if action is None:
+                continue
+            if related_model in skip_relations:
+                LOG.debug(f"SKIPPING RELATION {related_model.__name__} by directive")
+                continue
+            if action == "DELETE" and related_model in path:
+                LOG.warning(
+                    f"SKIPPING RELATION {related_model.__name__} (cyclic cascade from {parent.model.__name__})"
+                )
+                continue
+            parent_column = model_relation.remote_field.target_field.column
+            if parent_column not in parent.returning:
+                parent.returning.append(parent_column)
+            steps.append(
+                DeleteStep(related_model, action, parent_ix, model_relation.remote_field.column, parent_column)
+            )
+            if action == "DELETE":
+                walk(len(steps) - 1, path | {related_model})
+
+    walk(0, frozenset((from_model,)))
+    return tuple(steps)
+
+
+def get_delete_plan(from_model, skip_relations=None):
+    """Return the cascade delete plan of from_model.
+
+    The plan is computed once per process for each root model and set of skipped relations.
+    """
+    skip_relations = frozenset(skip_relations or ()) | {get_model(table) for table in CASCADE_SKIP_TABLES}
+    key = (from_model, skip_relations)
+    with DELETE_PLANS_LOCK:
+        plan = DELETE_PLANS.get(key)
+        if plan is None:
+            plan = DELETE_PLANS[key] = _build_delete_plan(from_model, skip_relations)
+    return plan
+
+
+def existing_tables(table_names):
+    """Return the subset of table_names that exist in the current schema with a single query."""
+    sql = """select t.name from unnest(%s::text[]) as t(name) where to_regclass(t.name) is not null;"""
+    with transaction.get_connection().cursor() as cur:
+        cur.execute(sql, (list(table_names),))
+        return {rec[0] for rec in cur.fetchall()}
+
+
+def _cascade_count_sql(active, qn):
+    """Return the selects counting the distinct rows of each table and action of the active steps."""
+    counts = []
+    params = []
+    for action in CASCADE_ACTIONS.values():
+        steps = [(ix, step) for ix, step in active.items() if step.action == action]
+        for table in dict.fromkeys(step.table for _, step in steps):
+            rows = " UNION ".join(
+                f"SELECT {qn(step.model._meta.pk.column)} FROM step_{ix}" for ix, step in steps if step.table == table
+            )
+            counts.append(f"SELECT %s, %s, count(*) FROM ({rows}) AS affected")
+            params.extend((action, table))
+    return counts, params
+
+
+def get_cascade_delete_sql(plan, instance_pk_query, dry_run=False):
+    """Compile the plan into one statement of chained CTEs returning (action, table, row count) rows.
+
+    Steps on tables missing from the current schema are left out along with their children;
+    without the root table there is nothing to delete and None is returned.
+    Every table is modified by a single statement, so rows that are deleted through one
+    relation are excluded from the SET NULL updates of another. With dry_run the CTEs
+    select the affected rows instead of modifying them.
+    """
+    qn = transaction.get_connection().ops.quote_name
+    tables = existing_tables({step.table for step in plan})
+    active = {}
+    for ix, step in enumerate(plan):
+        if step.table not in tables:
+            LOG.warning(f"SKIPPING RELATION {step.model.__name__} (table does not exist in current schema)")
+        elif ix == 0 or step.parent in active:
+            active[ix] = step
+    if not active:
+        return None, []
+
+    root_sql, params = instance_pk_query.values_list("pk").order_by().query.sql_with_params()
+    params = list(params)
+    deleted = {}
+    ctes = []
+    # The deletes are chained first so that the SET NULL updates can leave out the rows they remove.
+    for ix, step in sorted(active.items(), key=lambda item: item[1].action != "DELETE"):
+        pk = qn(step.model._meta.pk.column)
+        returning = ", ".join(qn(column) for column in step.returning)
+        if ix == 0:
+            where = f"{pk} IN ({root_sql})"
+        else:
+            where = f"{qn(step.column)} IN (SELECT {qn(step.parent_column)} FROM step_{step.parent})"
+        if step.action == "SET NULL":
+            for other in deleted.get(step.table, ()):
+                where += f" AND {pk} NOT IN (SELECT {pk} FROM step_{other})"
+            modify = f"UPDATE {qn(step.table)} SET {qn(step.column)} = NULL WHERE {where} RETURNING {returning}"
+        else:
+            deleted.setdefault(step.table, []).append(ix)
+            modify = f"DELETE FROM {qn(step.table)} WHERE {where} RETURNING {returning}"
+        body = f"SELECT {returning} FROM {qn(step.table)} WHERE {where}" if dry_run else modify
+        ctes.append(f"step_{ix} AS ({body})")
+
+    counts, count_params = _cascade_count_sql(active, qn)
+    params.extend(count_params)
+    sql = "WITH " + ",\n".join(ctes) + "\n" + "\nUNION ALL\n".join(counts)
+    return sql, params
+
+
+def cascade_delete(from_model, instance_pk_query, skip_relations=None, dry_run=False):
     """
-    Performs a cascading delete by walking the Django model relations and executing compiled SQL
-    to perform the on_delete actions instead or running the collector.
+    Performs a cascading delete with a cached plan of the Django model relations instead of running the collector.
+    The whole cascade is executed as one statement in the current schema.
     Parameters:
         from_model (models.Model) : A model class that is the relation root
         instance_pk_query (QuerySet) : A query for the records to delete and cascade from
-        base_model (None; Model) : The root model class, If null, this will be set for you.
-        level (int) : Recursion depth. This is used in logging only. Do not set.
         skip_relations (Iterable of Models) : Relations to skip over in case they are handled explicitly elsewhere
+        dry_run (bool) : Count the affected records without modifying them
+    Returns:
+        (dict) : The number of records per table for each action ("DELETE" or "SET NULL")
     """
-    if base_model is None:
-        base_model = from_model
-
-    if skip_relations is None:
-        skip_relations = []
-
-    # Skip the low-level data.
-    skip_relations.extend(
-        (
-            get_model("reporting_awscostentrylineitem"),
-            get_model("reporting_gcpcostentrylineitem"),
-            get_model("reporting_ocpusagelineitem"),
-            get_model("reporting_ocpnodelabellineitem"),
-            get_model("reporting_ocpstoragelineitem"),
-        )
-    )
-
-    instance_pk_query = instance_pk_query.values_list("pk").order_by()
-    LOG.debug(f"Level {level} Delete Cascade for {base_model.__name__}: Checking relations for {from_model.__name__}")
-    for model_relation in from_model._meta.related_objects:
-        related_model = model_relation.related_model
-        related_model_exists = fast_table_exists(related_model._meta.db_table)
-        if related_model in skip_relations:
-            LOG.debug(f"SKIPPING RELATION {related_model.__name__} by directive")
-            continue
-        if not related_model_exists:
-            LOG.warning(f"SKIPPING RELATION {related_model.__name__} (table does not exist in current schema)")
-            continue
-
-        if model_relation.on_delete.__name__ == "SET_NULL":
-            filterspec = {f"{model_relation.remote_field.column}__in": models.Subquery(instance_pk_query)}
-            updatespec = {f"{model_relation.remote_field.column}": None}
-            LOG.debug(
-                f"    Executing SET NULL constraint action on {related_model.__name__}"
-                f" relation of {from_model.__name__}"
-            )
-            with transaction.atomic():
-                set_constraints_immediate()
-                rec_count = execute_update_sql(related_model.objects.filter(**filterspec), **updatespec)
-                LOG.debug(f"    Updated {rec_count} records in {related_model.__name__}")
-        elif model_relation.on_delete.__name__ == "CASCADE":
-            filterspec = {f"{model_relation.remote_field.column}__in": models.Subquery(instance_pk_query)}
-            related_pk_values = related_model.objects.filter(**filterspec).values_list(related_model._meta.pk.name)
-            LOG.debug(f"    Cascading delete to relations of {related_model.__name__}")
-            cascade_delete(
-                related_model, related_pk_values, base_model=base_model, level=level + 1, skip_relations=skip_relations
-            )
-
-    LOG.debug(f"Level {level}: delete records from {from_model.__name__}")
-    if level == 0:
-        del_query = instance_pk_query
-    else:
-        filterspec = {f"{from_model._meta.pk.name}__in": models.Subquery(instance_pk_query)}
-        del_query = from_model.objects.filter(**filterspec)
+    plan = get_delete_plan(from_model, skip_relations)
+    sql, params = get_cascade_delete_sql(plan, instance_pk_query, dry_run=dry_run)
+    result = {action: {} for action in CASCADE_ACTIONS.values()}
+    if sql is None:
+        return result
 
+    LOG.debug(f"Delete Cascade for {from_model.__name__} across {len(plan)} relations (dry run: {dry_run})")
     with transaction.atomic():
         set_constraints_immediate()
-        rec_count = execute_delete_sql(del_query)
-        LOG.debug(f"Deleted {rec_count} records from {from_model.__name__}")
+        with transaction.get_connection().cursor() as cur:
+            cur.execute(sql, params)
+            for action, table, rec_count in cur.fetchall():
+                result[action][table] = rec_count
+    LOG.info(f"Delete Cascade for {from_model.__name__} (dry run: {dry_run}): {result}")
+    return result
 
 
 def _load_db_models():
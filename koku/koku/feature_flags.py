@@ -4,8 +4,11 @@
 #
 """Create Unleash Client."""
 import logging
+import threading
 
+from cachetools import TTLCache
 from django.conf import settings
+from prometheus_client import Counter
 from UnleashClient import UnleashClient
 from UnleashClient.strategies import Strategy
 
@@ -13,6 +16,14 @@ from .env import ENVIRONMENT
 
 LOG = logging.getLogger(__name__)
 
+FEATURE_FLAG_CACHE_SIZE = 10000
+FEATURE_FLAG_CACHE_HIT_COUNTER = Counter(
+    "feature_flag_cache_hits", "Number of feature flag states read from a snapshot", ["flag"]
+)
+FEATURE_FLAG_CACHE_MISS_COUNTER = Counter(
+    "feature_flag_cache_misses", "Number of feature flag states evaluated for a snapshot", ["flag"]
+)
+
 log_level = getattr(logging, "WARNING")
 if isinstance(getattr(logging, settings.UNLEASH_LOGGING_LEVEL), int):
     log_level = getattr(logging, settings.UNLEASH_LOGGING_LEVEL)
@@ -64,3 +75,55 @@ UNLEASH_CLIENT = KokuUnleashClient(
     cache_directory=settings.UNLEASH_CACHE_DIR,
     verbose_log_level=log_level,
 )
+
+
+class FeatureFlagSnapshots:
+    """Short-lived snapshots of feature flag states per account and provider type.
+
+    The flag checks run inside the per-file and per-row loops of the processors and downloaders,
+    so each state is evaluated once, overrides included, and then read from the snapshot until
+    its ttl passes.
+    """
+
+    def __init__(self, client, ttl, maxsize=FEATURE_FLAG_CACHE_SIZE):
+        """Create the snapshots of the flags evaluated by an Unleash client."""
+        self.client = client
+        self._snapshots = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def is_enabled(self, flag, account, provider_type=None, override=None):
+        """Return the state of a flag for an account and provider type.
+
+        Args:
+            flag (str): The Unleash feature flag name
+            account (str): The account schema name
+            provider_type (str): The provider type, if the flag depends on it
+            override (callable): Called with the account and provider type, enables the flag
+                without asking Unleash when it returns True
+
+        Returns:
+            (bool) The state of the flag
+
+        """
+        key = (flag, account, provider_type)
+        with self._lock:
+            enabled = self._snapshots.get(key)
+        if enabled is not None:
+            FEATURE_FLAG_CACHE_HIT_COUNTER.labels(flag=flag).inc()
+            return enabled
+
+        FEATURE_FLAG_CACHE_MISS_COUNTER.labels(flag=flag).inc()
+        context = {"schema": account, "source-type": provider_type}
+        LOG.info(f"evaluating feature flag {flag} for context: {context}")
+        enabled = bool((override and override(account, provider_type)) or self.client.is_enabled(flag, context))
+        with self._lock:
+            self._snapshots[key] = enabled
+        return enabled
+
+    def clear(self):
+        """Drop all the snapshots."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+FEATURE_FLAGS = FeatureFlagSnapshots(UNLEASH_CLIENT, ttl=settings.FEATURE_FLAG_CACHE_TTL)
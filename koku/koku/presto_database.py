@@ -1,12 +1,17 @@
 import logging
 import os
 import re
+import threading
+from contextlib import contextmanager
 from decimal import Decimal
+from functools import lru_cache
 
 import sqlparse
 import trino
 from trino.transaction import IsolationLevel
 
+from masu.prometheus_stats import TRINO_QUERY_TIME
+
 
 LOG = logging.getLogger(__name__)
 
@@ -14,6 +19,11 @@ POSITIONAL_VARS = re.compile("%s")
 NAMED_VARS = re.compile(r"%(.+)s")
 EOT = re.compile(r",\s*\)$")  # pylint: disable=anomalous-backslash-in-string
 
+# The number of idle connections kept per schema and catalog.
+CONNECTION_POOL_SIZE = int(os.environ.get("TRINO_CONNECTION_POOL_SIZE", 4))
+# The number of distinct SQL scripts whose split statements are kept.
+SQL_SCRIPT_CACHE_SIZE = 256
+
 
 class PreprocessStatementError(Exception):
     pass
@@ -81,19 +91,13 @@ def sql_mogrify(sql, params=None):
         return sql
 
 
-def connect(**connect_args):
+def _connect_args(**connect_args):
     """
-    Establish a trino connection.
-    Keyword Params:
-        schema (str) : trino schema (required)
-        host (str) : trino hostname (can set from environment)
-        port (int) : trino port (can set from environment)
-        user (str) : trino user (can set from environment)
-        catalog (str) : trino catalog (can set from enviromment)
+    Resolve the trino connection arguments from the keyword params and the environment.
     Returns:
-        trino.dbapi.Connection : connection to trino if successful
+        dict : keyword arguments for trino.dbapi.connect
     """
-    presto_connect_args = {
+    return {
         "host": (
             connect_args.get("host") or os.environ.get("TRINO_HOST") or os.environ.get("PRESTO_HOST") or "presto"
         ),
@@ -113,10 +117,126 @@ def connect(**connect_args):
         ),
         "schema": connect_args["schema"],
     }
-    conn = trino.dbapi.connect(**presto_connect_args)
+
+
+def connect(**connect_args):
+    """
+    Establish a trino connection.
+    Keyword Params:
+        schema (str) : trino schema (required)
+        host (str) : trino hostname (can set from environment)
+        port (int) : trino port (can set from environment)
+        user (str) : trino user (can set from environment)
+        catalog (str) : trino catalog (can set from enviromment)
+    Returns:
+        trino.dbapi.Connection : connection to trino if successful
+    """
+    conn = trino.dbapi.connect(**_connect_args(**connect_args))
     return conn
 
 
+class TrinoConnectionPool:
+    """
+    Process wide pool of idle trino connections keyed by schema and catalog.
+
+    A trino connection keeps its HTTP session, so reusing a connection reuses the
+    keep-alive connections to the coordinator instead of opening new ones per statement.
+    """
+
+    def __init__(self, max_idle=CONNECTION_POOL_SIZE):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._pid = os.getpid()
+
+    def _idle_connections(self, key):
+        """Return the idle connections of key. The caller holds the lock."""
+        if self._pid != os.getpid():
+            # Connections inherited from the parent process would share its sockets
+            self._idle = {}
+            self._pid = os.getpid()
+        return self._idle.setdefault(key, [])
+
+    def acquire(self, **connect_args):
+        """
+        Check out an idle connection or establish a new one.
+        Keyword Params:
+            Same as connect
+        Returns:
+            tuple : (pool key, trino.dbapi.Connection)
+        """
+        args = _connect_args(**connect_args)
+        key = (args["schema"], args["catalog"], args["host"], args["port"], args["user"])
+        with self._lock:
+            idle = self._idle_connections(key)
+            if idle:
+                return key, idle.pop()
+        return key, connect(**args)
+
+    def release(self, key, presto_conn):
+        """
+        Return a connection to the pool. Connections with an open transaction or
+        beyond the idle limit are closed.
+        """
+        if presto_conn.transaction is None:
+            with self._lock:
+                idle = self._idle_connections(key)
+                if len(idle) < self.max_idle:
+                    idle.append(presto_conn)
+                    return
+        presto_conn.close()
+
+    def clear(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for presto_conn in connections:
+                presto_conn.close()
+
+
+CONNECTION_POOL = TrinoConnectionPool()
+
+
+@contextmanager
+def pooled_connection(**connect_args):
+    """
+    Context manager checking a trino connection out of the process pool.
+    A connection that raised or was abandoned mid-query is closed instead of being returned to the pool.
+    Keyword Params:
+        Same as connect
+    Yields:
+        trino.dbapi.Connection : connection to trino
+    """
+    key, presto_conn = CONNECTION_POOL.acquire(**connect_args)
+    try:
+        yield presto_conn
+    except BaseException:
+        presto_conn.close()
+        raise
+    CONNECTION_POOL.release(key, presto_conn)
+
+
+@lru_cache(maxsize=SQL_SCRIPT_CACHE_SIZE)
+def split_script(sqlscript):
+    """
+    Split a buffer of semicolon-terminated SQL statements, caching the result per script.
+    Params:
+        sqlscript (str) : Buffer of one or more semicolon-terminated SQL statements.
+    Returns:
+        tuple : Stripped statements without their terminating semicolon
+    """
+    statements = []
+    # sqlparse.split() should be a safer means to split a sql script into discrete statements
+    for p_stmt in sqlparse.split(sqlscript):
+        p_stmt = str(p_stmt).strip()
+        # A semicolon statement terminator is invalid in the Presto dbapi interface
+        if p_stmt.endswith(";"):
+            p_stmt = p_stmt[:-1]
+        statements.append(p_stmt)
+    return tuple(statements)
+
+
 def _fetchall(presto_cur):
     """
     Wrapper around the trino.dbapi.Cursor.fetchall() method
@@ -172,8 +292,9 @@ def execute(presto_conn, sql, params=None):
     presto_stmt = sql_mogrify(sql, params)
     presto_cur = _cursor(presto_conn)
     LOG.debug(f"Executing PRESTO SQL: {presto_stmt}")
-    presto_cur = _execute(presto_cur, presto_stmt)
-    results = _fetchall(presto_cur)
+    with TRINO_QUERY_TIME.time():
+        presto_cur = _execute(presto_cur, presto_stmt)
+        results = _fetchall(presto_cur)
 
     return results
 
@@ -195,16 +316,8 @@ def executescript(presto_conn, sqlscript, params=None, preprocessor=None):
         list : Results of each successful SQL statement executed.
     """
     all_results = []
-    stmt_count = 0
-    # sqlparse.split() should be a safer means to split a sql script into discrete statements
-    for stmt_num, p_stmt in enumerate(sqlparse.split(sqlscript)):
-        stmt_count = stmt_count + 1
-        p_stmt = str(p_stmt).strip()
+    for stmt_num, p_stmt in enumerate(split_script(sqlscript)):
         if p_stmt:
-            # A semicolon statement terminator is invalid in the Presto dbapi interface
-            if p_stmt.endswith(";"):
-                p_stmt = p_stmt[:-1]
-
             # This is typically for jinjasql templated sql
             if preprocessor and params:
                 try:
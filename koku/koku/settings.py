@@ -155,6 +155,8 @@ UNLEASH_PREFIX = "https" if str(UNLEASH_PORT) == "443" else "http"
 UNLEASH_URL = f"{UNLEASH_PREFIX}://{UNLEASH_HOST}:{UNLEASH_PORT}/api"
 UNLEASH_TOKEN = CONFIGURATOR.get_feature_flag_token()
 UNLEASH_CACHE_DIR = ENVIRONMENT.get_value("UNLEASH_CACHE_DIR", default=os.path.join(BASE_DIR, "..", ".unleash"))
+# Seconds a feature flag state is reused for an account and provider type before Unleash is asked again
+FEATURE_FLAG_CACHE_TTL = ENVIRONMENT.int("FEATURE_FLAG_CACHE_TTL", default=60)
 
 ### Currency URL
 CURRENCY_URL = ENVIRONMENT.get_value("CURRENCY_URL", default="https://open.er-api.com/v6/latest/USD")
@@ -189,7 +191,6 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "koku.wsgi.application"
 
-WORKER_CACHE_KEY = "worker"
 WORKER_CACHE_TIMEOUT = ENVIRONMENT.get_value("WORKER_CACHE_TIMEOUT", default=3600)
 CACHE_MIDDLEWARE_SECONDS = ENVIRONMENT.get_value("CACHE_TIMEOUT", default=3600)
 
@@ -208,7 +209,7 @@ if "test" in sys.argv:
         "default": {
             "BACKEND": "django.core.cache.backends.dummy.DummyCache",
             "LOCATION": TEST_CACHE_LOCATION,
-            "KEY_FUNCTION": "tenant_schemas.cache.make_key",
+            "KEY_FUNCTION": "koku.cache.make_key",
             "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
         },
         "rbac": {"BACKEND": "django.core.cache.backends.dummy.DummyCache", "LOCATION": TEST_CACHE_LOCATION},
@@ -219,7 +220,7 @@ else:
         "default": {
             "BACKEND": "django_redis.cache.RedisCache",
             "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
-            "KEY_FUNCTION": "tenant_schemas.cache.make_key",
+            "KEY_FUNCTION": "koku.cache.make_key",
             "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
             "TIMEOUT": 3600,  # 1 hour default
             "OPTIONS": {
@@ -458,6 +459,12 @@ SKIP_MINIO_DATA_DELETION = ENVIRONMENT.bool("SKIP_MINIO_DATA_DELETION", default=
 ENABLE_S3_ARCHIVING = ENVIRONMENT.bool("ENABLE_S3_ARCHIVING", default=False)
 ENABLE_PARQUET_PROCESSING = ENVIRONMENT.bool("ENABLE_PARQUET_PROCESSING", default=False)
 PARQUET_PROCESSING_BATCH_SIZE = ENVIRONMENT.int("PARQUET_PROCESSING_BATCH_SIZE", default=200000)
+# Number of worker processes converting split CSV files to parquet at once, 1 converts files in the task process.
+PARQUET_PROCESSING_WORKERS = ENVIRONMENT.int("PARQUET_PROCESSING_WORKERS", default=1)
+# Address space limit in MiB of each parquet conversion worker process, 0 for no limit
+PARQUET_PROCESSING_WORKER_MEMORY_LIMIT = ENVIRONMENT.int("PARQUET_PROCESSING_WORKER_MEMORY_LIMIT", default=0)
+# Source types whose CSV files are parsed with the vectorized pyarrow ingest engine
+ENABLE_ARROW_INGEST_SOURCE_TYPE = ENVIRONMENT.list("ENABLE_ARROW_INGEST_SOURCE_TYPE", default=[])
 ENABLE_TRINO_SOURCES = ENVIRONMENT.list("ENABLE_TRINO_SOURCES", default=[])
 ENABLE_TRINO_ACCOUNTS = ENVIRONMENT.list("ENABLE_TRINO_ACCOUNTS", default=[])
 ENABLE_TRINO_SOURCE_TYPE = ENVIRONMENT.list("ENABLE_TRINO_SOURCE_TYPE", default=[])
@@ -479,6 +486,10 @@ IBM_SERVICE_URL = ENVIRONMENT.get_value("IBM_SERVICE_URL", default="https://ente
 
 # Time to wait between cold storage retrieval for data export. Default is 3 hours
 COLD_STORAGE_RETRIVAL_WAIT_TIME = ENVIRONMENT.int("COLD_STORAGE_RETRIVAL_WAIT_TIME", default=10800)
+# Number of S3 prefixes listed and objects copied at once by a data export
+DATA_EXPORT_WORKERS = ENVIRONMENT.int("DATA_EXPORT_WORKERS", default=8)
+# Size in bytes from which data export objects are copied in parts
+DATA_EXPORT_MULTIPART_THRESHOLD = ENVIRONMENT.int("DATA_EXPORT_MULTIPART_THRESHOLD", default=64 * 1024 * 1024)
 
 # Sources Client API Endpoints
 KOKU_SOURCES_CLIENT_HOST = CONFIGURATOR.get_endpoint_host("koku", "sources-client", "localhost")
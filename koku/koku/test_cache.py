@@ -8,6 +8,7 @@ import random
 
 from django.core.cache import caches
 from django.test.utils import override_settings
+from tenant_schemas.utils import schema_context
 
 from api.iam.test.iam_test_case import IamTestCase
 from api.provider.models import Provider
@@ -18,14 +19,22 @@ from koku.cache import invalidate_view_cache_for_tenant_and_cache_key
 from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 from koku.cache import invalidate_view_cache_for_tenant_and_source_types
 from koku.cache import KokuCacheError
+from koku.cache import make_key
 from koku.cache import OPENSHIFT_ALL_CACHE_PREFIX
 from koku.cache import OPENSHIFT_AWS_CACHE_PREFIX
 from koku.cache import OPENSHIFT_AZURE_CACHE_PREFIX
 from koku.cache import OPENSHIFT_CACHE_PREFIX
+from koku.cache import SOURCES_CACHE_PREFIX
 
 
 LOG = logging.getLogger(__name__)
 
+
+def view_key(cache_key_prefix):
+    """Return a cache_page() key of a view cached under cache_key_prefix."""
+    return f"views.decorators.cache.cache_page.{cache_key_prefix}.GET.0123456789abcdef.fedcba9876543210"
+
+
 CACHE_PREFIXES = (
     AWS_CACHE_PREFIX,
     AZURE_CACHE_PREFIX,
@@ -41,7 +50,7 @@ CACHE_PREFIXES = (
         "default": {
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
             "LOCATION": "unique-snowflake",
-            "KEY_FUNCTION": "tenant_schemas.cache.make_key",
+            "KEY_FUNCTION": "koku.cache.make_key",
             "REVERSE_KEY_FUNCTION": "tenant_schemas.cache.reverse_key",
         }
     }
@@ -55,6 +64,10 @@ class KokuCacheTest(IamTestCase):
 
         self.cache = caches["default"]
         self.cache_key_prefix = random.choice(CACHE_PREFIXES)
+        # View cache keys belong to the schema of the request
+        tenant_context = schema_context(self.schema_name)
+        tenant_context.__enter__()
+        self.addCleanup(tenant_context.__exit__, None, None, None)
 
     def tearDown(self):
         """Tear down the test."""
@@ -63,18 +76,52 @@ class KokuCacheTest(IamTestCase):
 
     def test_invalidate_view_cache_for_tenant_and_cache_key(self):
         """Test that specific cache data is deleted."""
-        key_to_clear = f"{self.schema_name}:{self.cache_key_prefix}"
-        remaining_key = f"keeper:{self.cache_key_prefix}"
-        cache_data = {key_to_clear: "value", remaining_key: "value"}
-        self.cache.set_many(cache_data)
-
-        self.assertIsNotNone(self.cache.get(key_to_clear))
-        self.assertIsNotNone(self.cache.get(remaining_key))
+        key_to_clear = view_key(self.cache_key_prefix)
+        remaining_key = view_key(SOURCES_CACHE_PREFIX)
+        with schema_context(self.schema_name):
+            self.cache.set_many({key_to_clear: "value", remaining_key: "value"})
+        with schema_context("keeper"):
+            self.cache.set(key_to_clear, "value")
 
         invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, self.cache_key_prefix)
 
-        self.assertIsNone(self.cache.get(key_to_clear))
-        self.assertIsNotNone(self.cache.get(remaining_key))
+        with schema_context(self.schema_name):
+            self.assertIsNone(self.cache.get(key_to_clear))
+            self.assertIsNotNone(self.cache.get(remaining_key))
+        with schema_context("keeper"):
+            self.assertIsNotNone(self.cache.get(key_to_clear))
+
+    def test_invalidate_view_cache_for_tenant(self):
+        """Test that all views of a tenant are invalidated without a cache key prefix."""
+        with schema_context(self.schema_name):
+            self.cache.set_many({view_key(prefix): "value" for prefix in CACHE_PREFIXES})
+            self.cache.set("not-a-view", "value")
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name)
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name)
+
+        with schema_context(self.schema_name):
+            for prefix in CACHE_PREFIXES:
+                self.assertIsNone(self.cache.get(view_key(prefix)))
+            self.assertIsNotNone(self.cache.get("not-a-view"))
+            self.cache.set(view_key(self.cache_key_prefix), "new value")
+            self.assertEqual(self.cache.get(view_key(self.cache_key_prefix)), "new value")
+
+    def test_view_cache_key_generation(self):
+        """Test that view keys carry the tenant and prefix generations and other keys do not."""
+        with schema_context(self.schema_name):
+            self.assertEqual(
+                make_key(view_key(self.cache_key_prefix), "", 1),
+                f"{self.schema_name}::1.0.0:{view_key(self.cache_key_prefix)}",
+            )
+            invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, self.cache_key_prefix)
+            self.assertEqual(
+                make_key(view_key(self.cache_key_prefix), "", 1),
+                f"{self.schema_name}::1.0.1:{view_key(self.cache_key_prefix)}",
+            )
+            self.assertEqual(make_key("not-a-view", "", 1), f"{self.schema_name}::1:not-a-view")
+        generation_key = f"view-generation:{self.schema_name}:{self.cache_key_prefix}"
+        self.assertEqual(make_key(generation_key, "", 1), f"{self.schema_name}::1:{generation_key}")
 
     @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
     def test_invalidate_view_cache_for_tenant_and_cache_key_dummy_cache(self):
@@ -97,7 +144,7 @@ class KokuCacheTest(IamTestCase):
         aws_cache_key_prefixes = (AWS_CACHE_PREFIX, OPENSHIFT_AWS_CACHE_PREFIX, OPENSHIFT_ALL_CACHE_PREFIX)
         aws_cache_data = {}
         for prefix in aws_cache_key_prefixes:
-            aws_cache_data.update({f"{self.schema_name}:{prefix}": "value"})
+            aws_cache_data.update({view_key(prefix): "value"})
         self.cache.set_many(aws_cache_data)
 
         invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "AWS")
@@ -114,7 +161,7 @@ class KokuCacheTest(IamTestCase):
 
         openshift_cache_data = {}
         for prefix in openshift_cache_key_prefixes:
-            openshift_cache_data.update({f"{self.schema_name}:{prefix}": "value"})
+            openshift_cache_data.update({view_key(prefix): "value"})
         self.cache.set_many(openshift_cache_data)
 
         invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "OCP")
@@ -126,7 +173,7 @@ class KokuCacheTest(IamTestCase):
 
         azure_cache_data = {}
         for prefix in azure_cache_key_prefixes:
-            azure_cache_data.update({f"{self.schema_name}:{prefix}": "value"})
+            azure_cache_data.update({view_key(prefix): "value"})
         self.cache.set_many(azure_cache_data)
 
         invalidate_view_cache_for_tenant_and_source_type(self.schema_name, "Azure")
@@ -160,7 +207,7 @@ class KokuCacheTest(IamTestCase):
             cache_data = sources[source]["cache_data"]
 
             for prefix in cache_keys:
-                cache_data.update({f"{self.schema_name}:{prefix}": "value"})
+                cache_data.update({view_key(prefix): "value"})
             self.cache.set_many(cache_data)
 
         # clear data based on given sources
@@ -216,7 +263,7 @@ class KokuCacheTest(IamTestCase):
             cache_data = sources[source]["cache_data"]
 
             for prefix in cache_keys:
-                cache_data.update({f"{self.schema_name}:{prefix}": "value"})
+                cache_data.update({view_key(prefix): "value"})
             self.cache.set_many(cache_data)
 
         # clear all cached data
@@ -0,0 +1,124 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+from datetime import datetime
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytz import UTC
+from tenant_schemas.utils import schema_context
+
+from . import database as kdb
+from api.iam.test.iam_test_case import IamTestCase
+from api.provider.models import Provider
+from reporting.provider.aws.models import AWSCostEntry
+from reporting.provider.aws.models import AWSCostEntryBill
+from reporting.provider.aws.models import AWSCostEntryLineItem
+from reporting.provider.aws.models import AWSCostEntryLineItemDaily
+from reporting.provider.aws.models import AWSCostEntryProduct
+
+
+class TestCascadeDelete(IamTestCase):
+    def setUp(self):
+        super().setUp()
+        self.provider = Provider.objects.filter(type=Provider.PROVIDER_AWS_LOCAL).first() or Provider.objects.create(
+            name="cascade_aws_provider", type=Provider.PROVIDER_AWS_LOCAL, customer=self.customer
+        )
+        with schema_context(self.schema_name):
+            self.bill = AWSCostEntryBill.objects.create(
+                billing_resource="cascade-delete",
+                bill_type="Anniversary",
+                billing_period_start=datetime(2020, 1, 1, tzinfo=UTC),
+                billing_period_end=datetime(2020, 2, 1, tzinfo=UTC),
+                provider=self.provider,
+            )
+            self.product = AWSCostEntryProduct.objects.create(sku="cascade-delete")
+            for day in range(1, 4):
+                AWSCostEntry.objects.create(
+                    interval_start=datetime(2020, 1, day, tzinfo=UTC),
+                    interval_end=datetime(2020, 1, day, 1, tzinfo=UTC),
+                    bill=self.bill,
+                )
+                AWSCostEntryLineItemDaily.objects.create(
+                    cost_entry_bill=self.bill,
+                    cost_entry_product=self.product,
+                    line_item_type="Usage",
+                    usage_account_id="cascade",
+                    usage_start=datetime(2020, 1, day).date(),
+                    product_code="AmazonEC2",
+                    currency_code="USD",
+                )
+
+    def test_delete_plan_is_ordered(self):
+        """Test that every step of a plan follows the step it cascades from."""
+        plan = kdb.get_delete_plan(AWSCostEntryBill)
+        self.assertIs(plan[0].model, AWSCostEntryBill)
+        for ix, step in enumerate(plan[1:], start=1):
+            self.assertLess(step.parent, ix)
+            self.assertEqual(plan[step.parent].action, "DELETE")
+            self.assertIn(step.parent_column, plan[step.parent].returning)
+        tables = {step.table for step in plan}
+        self.assertIn(AWSCostEntry._meta.db_table, tables)
+        self.assertNotIn(AWSCostEntryLineItem._meta.db_table, tables)
+
+    def test_delete_plan_is_cached(self):
+        """Test that the relations of a model are walked once per process."""
+        with patch.dict(kdb.DELETE_PLANS, clear=True):
+            with patch.object(kdb, "_build_delete_plan", wraps=kdb._build_delete_plan) as mock_build:
+                plan = kdb.get_delete_plan(AWSCostEntryBill)
+                self.assertIs(kdb.get_delete_plan(AWSCostEntryBill), plan)
+                mock_build.assert_called_once()
+                kdb.get_delete_plan(AWSCostEntryBill, skip_relations=[AWSCostEntry])
+                self.assertEqual(mock_build.call_count, 2)
+
+    def test_cascade_delete_single_statement(self):
+        """Test that the cascade deletes the related rows with one statement."""
+        with schema_context(self.schema_name):
+            bills = AWSCostEntryBill.objects.filter(pk=self.bill.pk)
+            with CaptureQueriesContext(connection) as queries:
+                result = kdb.cascade_delete(bills.query.model, bills)
+            statements = [query["sql"] for query in queries.captured_queries if "DELETE FROM" in query["sql"]]
+            self.assertEqual(len(statements), 1)
+            self.assertEqual(result["DELETE"][AWSCostEntryBill._meta.db_table], 1)
+            self.assertEqual(result["DELETE"][AWSCostEntry._meta.db_table], 3)
+            self.assertEqual(result["DELETE"][AWSCostEntryLineItemDaily._meta.db_table], 3)
+            self.assertFalse(AWSCostEntryBill.objects.filter(pk=self.bill.pk).exists())
+            self.assertFalse(AWSCostEntry.objects.filter(bill_id=self.bill.pk).exists())
+            self.assertFalse(AWSCostEntryLineItemDaily.objects.filter(cost_entry_bill_id=self.bill.pk).exists())
+
+    def test_cascade_delete_set_null(self):
+        """Test that SET NULL relations are updated instead of deleted."""
+        with schema_context(self.schema_name):
+            products = AWSCostEntryProduct.objects.filter(pk=self.product.pk)
+            result = kdb.cascade_delete(products.query.model, products)
+            self.assertEqual(result["SET NULL"][AWSCostEntryLineItemDaily._meta.db_table], 3)
+            self.assertFalse(AWSCostEntryProduct.objects.filter(pk=self.product.pk).exists())
+            self.assertEqual(
+                AWSCostEntryLineItemDaily.objects.filter(
+                    cost_entry_bill_id=self.bill.pk, cost_entry_product=None
+                ).count(),
+                3,
+            )
+
+    def test_cascade_delete_dry_run(self):
+        """Test that a dry run counts the rows without deleting them."""
+        with schema_context(self.schema_name):
+            bills = AWSCostEntryBill.objects.filter(pk=self.bill.pk)
+            expected = kdb.cascade_delete(bills.query.model, bills, dry_run=True)
+            self.assertEqual(expected["DELETE"][AWSCostEntry._meta.db_table], 3)
+            self.assertTrue(AWSCostEntryBill.objects.filter(pk=self.bill.pk).exists())
+            self.assertEqual(AWSCostEntry.objects.filter(bill_id=self.bill.pk).count(), 3)
+            self.assertEqual(kdb.cascade_delete(bills.query.model, bills), expected)
+
+    def test_cascade_delete_missing_tables(self):
+        """Test that relations to tables missing from the schema are skipped with their children."""
+        with schema_context(self.schema_name):
+            bills = AWSCostEntryBill.objects.filter(pk=self.bill.pk)
+            with patch.object(kdb, "existing_tables", return_value={AWSCostEntryBill._meta.db_table}):
+                sql, _ = kdb.get_cascade_delete_sql(kdb.get_delete_plan(AWSCostEntryBill), bills)
+            self.assertNotIn(AWSCostEntry._meta.db_table, sql)
+            with patch.object(kdb, "existing_tables", return_value=set()):
+                self.assertEqual(kdb.cascade_delete(bills.query.model, bills), {"DELETE": {}, "SET NULL": {}})
+            self.assertTrue(AWSCostEntryBill.objects.filter(pk=self.bill.pk).exists())
@@ -0,0 +1,75 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the feature flag snapshots."""
+import time
+from unittest.mock import Mock
+
+from django.test import TestCase
+from prometheus_client import REGISTRY
+
+from koku.feature_flags import FeatureFlagSnapshots
+
+
+class FeatureFlagSnapshotsTest(TestCase):
+    """Test the feature flag snapshots."""
+
+    def setUp(self):
+        """Set up the test."""
+        self.client = Mock()
+        self.client.is_enabled.return_value = True
+        self.snapshots = FeatureFlagSnapshots(self.client, ttl=60)
+
+    def get_sample_value(self, name, flag):
+        """Return the value of a flag counter."""
+        return REGISTRY.get_sample_value(name, {"flag": flag}) or 0
+
+    def test_is_enabled_evaluated_once(self):
+        """Test that a flag state is evaluated once per account and provider type."""
+        hits = self.get_sample_value("feature_flag_cache_hits_total", "flag-once")
+        misses = self.get_sample_value("feature_flag_cache_misses_total", "flag-once")
+
+        for _ in range(3):
+            self.assertTrue(self.snapshots.is_enabled("flag-once", "org1234567", "AWS"))
+        self.assertTrue(self.snapshots.is_enabled("flag-once", "org1234567", "OCP"))
+
+        self.client.is_enabled.assert_any_call("flag-once", {"schema": "org1234567", "source-type": "AWS"})
+        self.assertEqual(self.client.is_enabled.call_count, 2)
+        self.assertEqual(self.get_sample_value("feature_flag_cache_hits_total", "flag-once") - hits, 2)
+        self.assertEqual(self.get_sample_value("feature_flag_cache_misses_total", "flag-once") - misses, 2)
+
+    def test_disabled_state_is_kept(self):
+        """Test that a disabled flag state is read from the snapshot as well."""
+        self.client.is_enabled.return_value = False
+        self.assertFalse(self.snapshots.is_enabled("flag", "org1234567"))
+        self.assertFalse(self.snapshots.is_enabled("flag", "org1234567"))
+        self.client.is_enabled.assert_called_once()
+
+    def test_override(self):
+        """Test that an override enables the flag without asking Unleash."""
+        override = Mock(return_value=True)
+        self.assertTrue(self.snapshots.is_enabled("flag", "org1234567", "AWS", override=override))
+        self.assertTrue(self.snapshots.is_enabled("flag", "org1234567", "AWS", override=override))
+        override.assert_called_once_with("org1234567", "AWS")
+        self.client.is_enabled.assert_not_called()
+
+        override.return_value = False
+        self.client.is_enabled.return_value = False
+        self.assertFalse(self.snapshots.is_enabled("flag", "org1234567", "GCP", override=override))
+
+    def test_snapshot_expires(self):
+        """Test that a flag state is evaluated again once its snapshot expires."""
+        snapshots = FeatureFlagSnapshots(self.client, ttl=1)
+        self.assertTrue(snapshots.is_enabled("flag", "org1234567"))
+        self.client.is_enabled.return_value = False
+        self.assertTrue(snapshots.is_enabled("flag", "org1234567"))
+        time.sleep(2)
+        self.assertFalse(snapshots.is_enabled("flag", "org1234567"))
+
+    def test_clear(self):
+        """Test that clearing the snapshots evaluates the flags again."""
+        self.assertTrue(self.snapshots.is_enabled("flag", "org1234567"))
+        self.snapshots.clear()
+        self.assertTrue(self.snapshots.is_enabled("flag", "org1234567"))
+        self.assertEqual(self.client.is_enabled.call_count, 2)
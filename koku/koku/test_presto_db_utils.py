@@ -1,5 +1,6 @@
 import datetime
 import uuid
+from unittest.mock import Mock
 from unittest.mock import patch
 
 from jinjasql import JinjaSql
@@ -20,6 +21,50 @@ class TestPrestoDatabaseUtils(IamTestCase):
         self.assertEqual(conn.schema, self.schema_name)
         self.assertEqual(conn.catalog, "hive")
 
+    def test_pooled_connection(self):
+        """
+        Test that pooled connections are reused per schema and closed when they raise
+        """
+        pool = kpdb.TrinoConnectionPool(max_idle=1)
+        with patch("koku.presto_database.CONNECTION_POOL", pool):
+            with patch("koku.presto_database.connect", side_effect=lambda **_: Mock(transaction=None)) as mock_connect:
+                with kpdb.pooled_connection(schema=self.schema_name) as conn:
+                    pass
+                with kpdb.pooled_connection(schema=self.schema_name) as reused:
+                    self.assertIs(reused, conn)
+                    with kpdb.pooled_connection(schema=self.schema_name) as other:
+                        self.assertIsNot(other, conn)
+                self.assertEqual(mock_connect.call_count, 2)
+                # Only one idle connection is kept, the last one returned is closed
+                other.close.assert_not_called()
+                conn.close.assert_called_once()
+
+                with kpdb.pooled_connection(schema="other_schema") as other_schema:
+                    self.assertIsNot(other_schema, other)
+
+                with self.assertRaises(ValueError):
+                    with kpdb.pooled_connection(schema=self.schema_name) as failed:
+                        raise ValueError("Nope!")
+                self.assertIs(failed, other)
+                failed.close.assert_called_once()
+                with kpdb.pooled_connection(schema=self.schema_name) as new:
+                    self.assertIsNot(new, other)
+                self.assertEqual(mock_connect.call_count, 4)
+
+    def test_split_script(self):
+        """
+        Test that scripts are split once into statements without their terminator
+        """
+        sqlscript = """
+select x from y;
+select a from b;
+"""
+        kpdb.split_script.cache_clear()
+        self.assertEqual(kpdb.split_script(sqlscript), ("select x from y", "select a from b"))
+        with patch("koku.presto_database.sqlparse.split") as mock_split:
+            kpdb.split_script(sqlscript)
+        mock_split.assert_not_called()
+
     def test_sql_mogrify(self):
         """
         Test that sql_mogrify renders a syntactically correct SQL statement
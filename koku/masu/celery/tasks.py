@@ -46,6 +46,8 @@ from masu.util.ocp.common import REPORT_TYPES
 
 LOG = logging.getLogger(__name__)
 _DB_FETCH_BATCH_SIZE = 2000
+# Number of synced prefixes between the saves of a data export checkpoint
+DATA_EXPORT_CHECKPOINT_INTERVAL = 50
 
 
 @celery_app.task(name="masu.celery.tasks.check_report_updates", queue=DEFAULT)
@@ -186,17 +188,28 @@ def sync_data_to_customer(dump_request_uuid):
     the storage solution time to retrieve a file from cold storage.
     This task will retry 5 times, and then fail.
 
+    The synced prefixes are saved on the request as a checkpoint, so a retried
+    sync continues where the previous attempt stopped.
+
     """
     dump_request = DataExportRequest.objects.get(uuid=dump_request_uuid)
     dump_request.status = DataExportRequest.PROCESSING
     dump_request.save()
 
+    def checkpoint(prefix):
+        """Record a synced prefix, saving the checkpoint every DATA_EXPORT_CHECKPOINT_INTERVAL prefixes."""
+        dump_request.synced_prefixes.append(prefix)
+        if len(dump_request.synced_prefixes) % DATA_EXPORT_CHECKPOINT_INTERVAL == 0:
+            dump_request.save(update_fields=["synced_prefixes"])
+
     try:
         syncer = AwsS3Syncer(settings.S3_BUCKET_NAME)
         syncer.sync_bucket(
             dump_request.created_by.customer.schema_name,
             dump_request.bucket_name,
             (dump_request.start_date, dump_request.end_date),
+            synced_prefixes=dump_request.synced_prefixes,
+            on_prefix_synced=checkpoint,
         )
     except ClientError:
         LOG.exception(
@@ -13,12 +13,16 @@ DEFAULT_ACCOUNT_ACCCESS_TYPE = "db"
 DEFAULT_PVC_DIR = "/var/tmp/masu"
 DEFAULT_VOLUME_FILE_RETENTION = 60 * 60 * 24
 DEFAULT_REPORT_PROCESSING_BATCH_SIZE = 100000
+DEFAULT_DIMENSION_CACHE_SIZE = 100000
 DEFAULT_MASU_DATE_OVERRIDE = None
 DEFAULT_MASU_RETAIN_NUM_MONTHS_LINE_ITEM_ONLY = 1
 DEFAULT_INITIAL_INGEST_NUM_MONTHS = 3
 DEFAULT_INGEST_OVERRIDE = False
 DEFAULT_KAFKA_CONNECT = True
 DEFAULT_RETRY_SECONDS = 10
+DEFAULT_KAFKA_CONSUMER_WORKERS = 1
+DEFAULT_HCS_MAX_WORKERS = 4
+DEFAULT_HCS_FETCH_SIZE = 10000
 DEFAULT_DEL_RECORD_LIMIT = 5000
 DEFAULT_MAX_ITERATIONS = 3
 DEFAULT_ENABLE_PARQUET_PROCESSING = False
@@ -53,6 +57,9 @@ class Config:
         "REPORT_PROCESSING_BATCH_SIZE", default=DEFAULT_REPORT_PROCESSING_BATCH_SIZE
     )
 
+    # Maximum number of dimension ids (products, pricing, ...) cached per table while processing a manifest
+    DIMENSION_CACHE_SIZE = ENVIRONMENT.int("DIMENSION_CACHE_SIZE", default=DEFAULT_DIMENSION_CACHE_SIZE)
+
     AWS_DATETIME_STR_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
     OCP_DATETIME_STR_FORMAT = "%Y-%m-%d %H:%M:%S +0000 UTC"
     AZURE_DATETIME_STR_FORMAT = "%Y-%m-%d"
@@ -100,5 +107,12 @@ class Config:
 
     RETRY_SECONDS = ENVIRONMENT.int("RETRY_SECONDS", default=DEFAULT_RETRY_SECONDS)
 
+    # Number of upload messages processed concurrently, one per partition
+    KAFKA_CONSUMER_WORKERS = ENVIRONMENT.int("KAFKA_CONSUMER_WORKERS", default=DEFAULT_KAFKA_CONSUMER_WORKERS)
+
+    # Number of HCS daily reports uploaded concurrently and the trino rows fetched per round trip
+    HCS_MAX_WORKERS = ENVIRONMENT.int("HCS_MAX_WORKERS", default=DEFAULT_HCS_MAX_WORKERS)
+    HCS_FETCH_SIZE = ENVIRONMENT.int("HCS_FETCH_SIZE", default=DEFAULT_HCS_FETCH_SIZE)
+
     DEL_RECORD_LIMIT = ENVIRONMENT.int("DELETE_CYCLE_RECORD_LIMIT", default=DEFAULT_DEL_RECORD_LIMIT)
     MAX_ITERATIONS = ENVIRONMENT.int("DELETE_CYCLE_MAX_RETRY", default=DEFAULT_MAX_ITERATIONS)
@@ -3,14 +3,12 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Database accessor for OCP report data."""
-import copy
 import datetime
 import json
 import logging
 import os
 import pkgutil
 import uuid
-from decimal import Decimal
 
 import pytz
 from dateutil.parser import parse
@@ -19,9 +17,7 @@ from dateutil.rrule import rrule
 from django.conf import settings
 from django.db import connection
 from django.db.models import DecimalField
-from django.db.models import ExpressionWrapper
 from django.db.models import F
-from django.db.models import Sum
 from django.db.models import Value
 from django.db.models.functions import Coalesce
 from jinjasql import JinjaSql
@@ -54,6 +50,18 @@ from reporting.provider.ocp.models import UI_SUMMARY_TABLES
 
 LOG = logging.getLogger(__name__)
 
+# defines the usage type for each tag rate metric
+METRIC_USAGE_TYPE_MAP = {
+    "cpu_core_usage_per_hour": "cpu",
+    "cpu_core_request_per_hour": "cpu",
+    "cpu_core_effective_usage_per_hour": "cpu",
+    "memory_gb_usage_per_hour": "memory",
+    "memory_gb_request_per_hour": "memory",
+    "memory_gb_effective_usage_per_hour": "memory",
+    "storage_gb_usage_per_month": "storage",
+    "storage_gb_request_per_month": "storage",
+}
+
 
 def create_filter(data_source, start_date, end_date, cluster_id):
     """Create filter with data source, start and end dates."""
@@ -865,23 +873,6 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
             )
             return [(pvc[0], pvc[1], pvc[2]) for pvc in unique_pvcs]
 
-    def generate_monthly_cost_json_object(self, distribution, distributed_cost):
-        """Generates the default monthly cost dict."""
-        default_cost = Decimal(0)
-        if not isinstance(distributed_cost, Decimal) and distributed_cost:
-            distributed_cost = Decimal(distributed_cost)
-        if not distributed_cost:
-            distributed_cost = default_cost
-        cost_mapping = {distribution: distributed_cost}
-        return JSONBBuildObject(
-            Value(metric_constants.CPU_DISTRIBUTION),
-            cost_mapping.get(metric_constants.CPU_DISTRIBUTION, default_cost),
-            Value(metric_constants.MEMORY_DISTRIBUTION),
-            cost_mapping.get(metric_constants.MEMORY_DISTRIBUTION, default_cost),
-            Value(metric_constants.PVC_DISTRIBUTION),
-            cost_mapping.get(metric_constants.PVC_DISTRIBUTION, default_cost),
-        )
-
     def populate_monthly_cost(
         self, cost_type, rate_type, rate, start_date, end_date, cluster_id, cluster_alias, distribution, provider_uuid
     ):
@@ -1067,452 +1058,182 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
                     first_curr_month, first_next_month, cluster_id, cluster_alias, rate_type, rate_dict, provider_uuid
                 )
 
-    def get_node_to_project_distribution(self, start_date, end_date, cluster_id, node_cost):
-        """Returns a list of dictionaries containing the distributed cost.
-
-        args:
-            start_date (datetime, str): The start_date to calculate monthly_cost.
-            end_date (datetime, str): The end_date to calculate monthly_cost.
-            cluster_id (str): The id of the cluster
-            cluster_cost (dec): The flat cost of the cluster
+    def _upsert_monthly_cost(
+        self, sql_file, cost_type, rate_type, start_date, end_date, cluster_id, cluster_alias, provider_uuid, **params
+    ):
+        """Update or insert the monthly cost rows of a cost type with a single statement.
 
-        Node to Project Distribution:
-            - Node to project distribution is based on a per node scenario
-            - (node_cost) / (number of projects)
+        The distribution of the cost is computed in SQL, rows that already exist for the
+        month are updated and the missing ones are inserted.
+        """
+        if rate_type not in (metric_constants.INFRASTRUCTURE_COST_TYPE, metric_constants.SUPPLEMENTARY_COST_TYPE):
+            LOG.warning("Unknown rate type %s for %s monthly cost.", rate_type, cost_type)
+            return
+        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
+        if not report_period:
+            LOG.info("No report period for cluster %s from %s to %s.", cluster_id, start_date, end_date)
+            return
+        # usage_start, usage_end are date types
+        if isinstance(start_date, datetime.datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime.datetime):
+            end_date = end_date.date()
+        table_name = self._table_map["line_item_daily_summary"]
+        upsert_sql = pkgutil.get_data("masu.database", sql_file)
+        upsert_sql = upsert_sql.decode("utf-8")
+        upsert_sql_params = {
+            "schema": self.schema,
+            "cost_type": cost_type,
+            "cost_column_prefix": rate_type.lower(),
+            "start_date": start_date,
+            "end_date": end_date,
+            "report_period_id": report_period.id,
+            "cluster_id": cluster_id,
+            "cluster_alias": cluster_alias,
+            "source_uuid": str(provider_uuid) if provider_uuid else None,
+            **params,
+        }
+        upsert_sql, upsert_sql_params = self.jinja_sql.prepare_query(upsert_sql, upsert_sql_params)
+        LOG.info("Upserting %s %s monthly cost for cluster %s.", rate_type, cost_type, cluster_id)
+        self._execute_raw_sql_query(
+            table_name, upsert_sql, start_date, end_date, bind_params=list(upsert_sql_params), operation="UPSERT"
+        )
 
-        Return nested dictionaries:
-        - ex {'master_3': {'namespaces': ['openshift', 'kube-system'], 'distributed_cost': Decimal('500.0000000000')}
+    def _upsert_monthly_tag_cost(
+        self,
+        cost_type,
+        rate_type,
+        rate_dict,
+        start_date,
+        end_date,
+        cluster_id,
+        cluster_alias,
+        distribution,
+        provider_uuid,
+        default=False,
+    ):
+        """Add the tag based monthly cost of every node, PVC or cluster with a single statement.
 
+        Each tag value found on the line items of a node, PVC or cluster adds its rate
+        to the monthly cost. With default set, the default rate of a tag key is added once
+        for every value of the key that has no rate defined.
         """
-        with schema_context(self.schema):
-            distributed_project_list = (
-                OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start__gte=start_date, usage_start__lt=end_date, cluster_id=cluster_id
+        tag_rates = []
+        for tag_key, tag_values in (rate_dict or {}).items():
+            if default:
+                defined_values = tag_values.get("defined_keys") or []
+                tag_rates.append(
+                    {
+                        "tag_key": tag_key,
+                        "tag_values": json.dumps(list(defined_values)),
+                        "rate": tag_values.get("default_value"),
+                    }
                 )
-                .filter(namespace__isnull=False)
-                .filter(node__isnull=False)
-                .values("namespace", "node")
-                .distinct()
-            )
-            node_mappings = {}
-            for project in distributed_project_list:
-                node_value = project.get("node")
-                namespace_value = project.get("namespace")
-                node_map = node_mappings.get(node_value)
-                if node_map:
-                    namespaces = copy.deepcopy(node_map.get("namespaces", []))
-                    namespaces.append(namespace_value)
-                    node_map["namespaces"] = namespaces
-                    node_map["distributed_cost"] = Decimal(node_cost) / Decimal(len(namespaces))
-                    node_mappings[node_value] = node_map
-                else:
-                    initial_map = {"namespaces": [namespace_value], "distributed_cost": Decimal(node_cost)}
-                    node_mappings[node_value] = initial_map
-        return node_mappings
+            else:
+                for value_name, rate_value in tag_values.items():
+                    tag_rates.append({"tag_key": tag_key, "tag_values": json.dumps(value_name), "rate": rate_value})
+        if not tag_rates:
+            return
+        self._upsert_monthly_cost(
+            "sql/monthly_tag_cost_upsert.sql",
+            cost_type,
+            rate_type,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            provider_uuid,
+            distribution=distribution,
+            tag_rates=tag_rates,
+            default=default,
+            labels_field="volume_labels" if cost_type == "PVC" else "pod_labels",
+            data_source="Storage" if cost_type == "PVC" else "Pod",
+        )
 
     def upsert_monthly_node_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, node_cost, distribution, provider_uuid
     ):
-        """Update or insert daily summary line item for node cost."""
-        unique_nodes = self.get_distinct_nodes(start_date, end_date, cluster_id)
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        project_distrib_map = self.get_node_to_project_distribution(start_date, end_date, cluster_id, node_cost)
-        with schema_context(self.schema):
-            for node in unique_nodes:
-                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start=start_date,
-                    report_period=report_period,
-                    cluster_id=cluster_id,
-                    cluster_alias=cluster_alias,
-                    monthly_cost_type="Node",
-                    node=node,
-                    data_source="Pod",
-                    namespace__isnull=True,
-                ).first()
-                if not line_item:
-                    line_item = OCPUsageLineItemDailySummary(
-                        uuid=uuid.uuid4(),
-                        usage_start=start_date,
-                        usage_end=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="Node",
-                        node=node,
-                        data_source="Pod",
-                        source_uuid=provider_uuid,
-                    )
-                monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                    LOG.debug("Node (%s) has a monthly infrastructure cost of %s.", node, node_cost)
-                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                    LOG.debug("Node (%s) has a monthly supplemenarty cost of %s.", node, node_cost)
-                    line_item.supplementary_monthly_cost_json = monthly_cost
-                line_item.save()
-            # How are we gonna handle distributing the node cost to the projects.
-            project_nodes = project_distrib_map.keys()
-            for project_node in project_nodes:
-                for namespace in project_distrib_map[project_node]["namespaces"]:
-                    distributed_cost = project_distrib_map[project_node]["distributed_cost"]
-                    project_line_item = OCPUsageLineItemDailySummary.objects.filter(
-                        usage_start=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="Node",
-                        node=project_node,
-                        namespace=namespace,
-                        data_source="Pod",
-                    ).first()
-                    if not project_line_item:
-                        project_line_item = OCPUsageLineItemDailySummary(
-                            uuid=uuid.uuid4(),
-                            usage_start=start_date,
-                            usage_end=start_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            monthly_cost_type="Node",
-                            node=project_node,
-                            namespace=namespace,
-                            data_source="Pod",
-                            source_uuid=provider_uuid,
-                        )
-                    monthly_cost = self.generate_monthly_cost_json_object(distribution, distributed_cost)
-                    log_statement = (
-                        f"Distributing Node Cost to Project:\n"
-                        f" node ({project_node}) cost: {node_cost} \n"
-                        f" project ({namespace}) distributed cost: {distributed_cost}\n"
-                        f" distribution type: {distribution}\n"
-                    )
-                    if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                        project_line_item.infrastructure_project_monthly_cost = monthly_cost
-                    elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                        project_line_item.supplementary_project_monthly_cost = monthly_cost
-                    project_line_item.save()
-                    LOG.debug(log_statement)
-
-    def tag_upsert_monthly_node_cost_line_item(  # noqa: C901
+        """Update or insert daily summary line items for node cost.
+
+        Each node is charged node_cost, which is split evenly between the projects on the node.
+        """
+        self._upsert_monthly_cost(
+            "sql/monthly_cost_upsert.sql",
+            "Node",
+            rate_type,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            provider_uuid,
+            distribution=distribution,
+            rate=node_cost,
+        )
+
+    def tag_upsert_monthly_node_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution, provider_uuid
     ):
         """
         Update or insert daily summary line item for node cost.
 
-        It checks to see if a line item exists for each node
-        that contains the tag key:value pair,
-        if it does then the price is added to the monthly cost.
+        The rate of each tag key:value pair found on a line item
+        of the node is added to the monthly cost of the node.
         """
-        unique_nodes = self.get_distinct_nodes(start_date, end_date, cluster_id)
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for node in unique_nodes:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        for value_name, rate_value in tag_values.items():
-                            # this makes sure that there is an entry for that node
-                            # that contains the specified key_value pair
-                            item_check = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start__gte=start_date,
-                                usage_start__lte=end_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                node=node,
-                                pod_labels__contains={tag_key: value_name},
-                            ).first()
-                            if item_check:
-                                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                    usage_start=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="Node",
-                                    node=node,
-                                    data_source="Pod",
-                                ).first()
-                                if not line_item:
-                                    line_item = OCPUsageLineItemDailySummary(
-                                        uuid=uuid.uuid4(),
-                                        usage_start=start_date,
-                                        usage_end=start_date,
-                                        report_period=report_period,
-                                        cluster_id=cluster_id,
-                                        cluster_alias=cluster_alias,
-                                        monthly_cost_type="Node",
-                                        node=node,
-                                        data_source="Pod",
-                                        source_uuid=provider_uuid,
-                                    )
-                                node_cost = rate_value
-                                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                    LOG.debug("Node (%s) has a monthly infrastructure cost of %s.", node, rate_value)
-                                    if line_item.infrastructure_monthly_cost_json:
-                                        node_cost = (
-                                            line_item.infrastructure_monthly_cost_json.get(distribution, 0)
-                                            + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                    LOG.debug("Node (%s) has a monthly supplemenarty cost of %s.", node, rate_value)
-                                    if line_item.supplementary_monthly_cost_json:
-                                        node_cost = (
-                                            line_item.supplementary_monthly_cost_json.get(distribution, 0) + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                    line_item.supplementary_monthly_cost_json = monthly_cost
-                                line_item.save()
-
-    def tag_upsert_monthly_default_node_cost_line_item(  # noqa: C901
+        self._upsert_monthly_tag_cost(
+            "Node",
+            rate_type,
+            rate_dict,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            distribution,
+            provider_uuid,
+        )
+
+    def tag_upsert_monthly_default_node_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution, provider_uuid
     ):
         """
         Update or insert daily summary line item for node cost.
-        It checks to see if a line item exists for each node
-        that contains the tag key:value pair,
-        if it does then the price is added to the monthly cost.
+
+        The default rate is added to the monthly cost of the node
+        once for each value of the tag key without a defined rate.
         """
-        unique_nodes = self.get_distinct_nodes(start_date, end_date, cluster_id)
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for node in unique_nodes:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        tag_default = tag_values.get("default_value")
-                        values_to_skip = tag_values.get("defined_keys")
-                        item_check = OCPUsageLineItemDailySummary.objects.filter(
-                            usage_start__gte=start_date,
-                            usage_start__lte=end_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            node=node,
-                            pod_labels__has_key=tag_key,
-                        )
-                        for value in values_to_skip:
-                            item_check = item_check.exclude(pod_labels__contains={tag_key: value})
-                        # this won't run if there are no matching items and item_check will continue to be
-                        # filtered until there are no items left
-                        while item_check:
-                            # get the first value for our tag key and exclude it from the queryset for the next check
-                            # will remove values until there are none left
-                            tag_key_value = item_check.first().pod_labels.get(tag_key)
-                            item_check = item_check.exclude(pod_labels__contains={tag_key: tag_key_value})
-                            line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start=start_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                monthly_cost_type="Node",
-                                node=node,
-                                data_source="Pod",
-                            ).first()
-                            if not line_item:
-                                line_item = OCPUsageLineItemDailySummary(
-                                    uuid=uuid.uuid4(),
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="Node",
-                                    node=node,
-                                    data_source="Pod",
-                                    source_uuid=provider_uuid,
-                                )
-                            node_cost = tag_default
-                            if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                LOG.info(
-                                    "Node (%s) has a default monthly infrastructure cost of %s.", node, tag_default
-                                )
-                                if line_item.infrastructure_monthly_cost_json:
-                                    node_cost = (
-                                        line_item.infrastructure_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                line_item.infrastructure_monthly_cost_json = monthly_cost
-                            elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                LOG.info(
-                                    "Node (%s) has a default monthly supplemenarty cost of %s.", node, tag_default
-                                )
-                                if line_item.supplementary_monthly_cost_json:
-                                    node_cost = (
-                                        line_item.supplementary_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, node_cost)
-                                line_item.supplementary_monthly_cost_json = monthly_cost
-                            line_item.save()
-
-    def tag_upsert_monthly_default_pvc_cost_line_item(  # noqa: C901
+        self._upsert_monthly_tag_cost(
+            "Node",
+            rate_type,
+            rate_dict,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            distribution,
+            provider_uuid,
+            default=True,
+        )
+
+    def tag_upsert_monthly_default_pvc_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, provider_uuid
     ):
         """
-        Update or insert daily summary line item for node cost.
-        It checks to see if a line item exists for each node
-        that contains the tag key:value pair,
-        if it does then the price is added to the monthly cost.
-        """
-        distribution = metric_constants.PVC_DISTRIBUTION
-        unique_pvcs = self.get_distinct_pvcs(start_date, end_date, cluster_id)
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for pvc, node, namespace in unique_pvcs:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        tag_default = tag_values.get("default_value")
-                        values_to_skip = tag_values.get("defined_keys")
-                        item_check = OCPUsageLineItemDailySummary.objects.filter(
-                            usage_start__gte=start_date,
-                            usage_start__lte=end_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            persistentvolumeclaim=pvc,
-                            node=node,
-                            volume_labels__has_key=tag_key,
-                            namespace=namespace,
-                        )
-                        for value in values_to_skip:
-                            item_check = item_check.exclude(volume_labels__contains={tag_key: value})
-                        # this won't run if there are no matching items and item_check will continue to be
-                        # filtered until there are no items left
-                        while item_check:
-                            # get the first value for our tag key and exclude it from the queryset for the next check
-                            # will remove values until there are none left
-                            tag_key_value = item_check.first().volume_labels.get(tag_key)
-                            item_check = item_check.exclude(volume_labels__contains={tag_key: tag_key_value})
-                            line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start=start_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                monthly_cost_type="PVC",
-                                persistentvolumeclaim=pvc,
-                                node=node,
-                                data_source="Storage",
-                                namespace=namespace,
-                            ).first()
-                            if not line_item:
-                                line_item = OCPUsageLineItemDailySummary(
-                                    uuid=uuid.uuid4(),
-                                    usage_start=start_date,
-                                    usage_end=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="PVC",
-                                    persistentvolumeclaim=pvc,
-                                    node=node,
-                                    data_source="Storage",
-                                    namespace=namespace,
-                                    source_uuid=provider_uuid,
-                                )
-                            pvc_cost = tag_default
-                            if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                LOG.info("PVC (%s) has a default monthly infrastructure cost of %s.", pvc, tag_default)
-                                if line_item.infrastructure_monthly_cost_json:
-                                    pvc_cost = (
-                                        line_item.infrastructure_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                line_item.infrastructure_monthly_cost_json = monthly_cost
-                            elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                LOG.info("PVC (%s) has a default monthly supplemenarty cost of %s.", pvc, tag_default)
-                                if line_item.supplementary_monthly_cost_json:
-                                    pvc_cost = (
-                                        line_item.supplementary_monthly_cost_json.get(distribution, 0) + tag_default
-                                    )
-                                monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                line_item.supplementary_monthly_cost_json = monthly_cost
-                            line_item.save()
-
-    def get_cluster_to_node_distribution(self, start_date, end_date, cluster_id, distribution, cluster_cost):
-        """Returns a list of dictionaries containing the distributed cost.
-
-        args:
-            start_date (datetime, str): The start_date to calculate monthly_cost.
-            end_date (datetime, str): The end_date to calculate monthly_cost.
-            cluster_id (str): The id of the cluster
-            cluster_cost (dec): The flat cost of the cluster
-            distribution: Choice of monthly distribution ex. (memory or cpu)
-
-        Memory Distribution:
-            - (node memory capacity/cluster memory capacity) x cluster_cost
-        CPU Distribution:
-            - (node cpu capacity/cluster cpu capacity) x cluster_cost
-
-        Return list of dictionaries: ex [{"node":"aws_compute2", "distributed_cost": 285.71}]
-
-        """
-        node_column = "node_capacity_cpu_core_hours"
-        cluster_column = "cluster_capacity_cpu_core_hours"
-        if "memory" in distribution:
-            node_column = "node_capacity_memory_gigabyte_hours"
-            cluster_column = "cluster_capacity_memory_gigabyte_hours"
-
-        with schema_context(self.schema):
-            distributed_node_list = (
-                OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start__gte=start_date, usage_start__lt=end_date, cluster_id=cluster_id
-                )
-                .values("node")
-                .annotate(
-                    distributed_cost=ExpressionWrapper(
-                        Sum(node_column) / Sum(cluster_column) * cluster_cost, output_field=DecimalField()
-                    )
-                )
-            )
-        # TIP: For debugging add these to the annotation
-        # node_hours=Sum(node_column),
-        # cluster_hours=Sum(cluster_column),
-        # node_to_cluster_ratio=Sum(node_column)/Sum(cluster_column)
-        return distributed_node_list
-
-    def get_cluster_to_project_distribution(self, start_date, end_date, cluster_id, distribution, cluster_cost):
-        """Returns a list of dictionaries containing the distributed cost.
-
-        args:
-            start_date (datetime, str): The start_date to calculate monthly_cost.
-            end_date (datetime, str): The end_date to calculate monthly_cost.
-            cluster_id (str): The id of the cluster
-            cluster_cost (dec): The flat cost of the cluster
-            distribution: Choice of monthly distribution ex. (memory or cpu)
-
-        Project Distribution:
-            - Project distribution is a rolling window estimate of month to date.
-            - (project_usage / cluster_usage) x cluster_cost
-
-        Return list of dictionaries:
-        - ex [{'namespace': 'openshift', 'distributed_cost': Decimal('71.84')}
+        Update or insert daily summary line item for PVC cost.
 
+        The default rate is added to the monthly cost of the PVC
+        once for each value of the tag key without a defined rate.
         """
-        usage_column = "pod_usage_cpu_core_hours"
-        if "memory" in distribution:
-            usage_column = "pod_usage_memory_gigabyte_hours"
-
-        with schema_context(self.schema):
-            cluster_hours = (
-                OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start__gte=start_date, usage_start__lt=end_date, cluster_id=cluster_id
-                ).aggregate(cluster_hours=Sum(usage_column))
-            ).get("cluster_hours")
-            distributed_project_list = (
-                OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start__gte=start_date, usage_start__lt=end_date, cluster_id=cluster_id
-                )
-                .filter(namespace__isnull=False)
-                .values("namespace")
-                .annotate(
-                    distributed_cost=ExpressionWrapper(
-                        Sum(usage_column) / cluster_hours * cluster_cost, output_field=DecimalField()
-                    )
-                )
-            )
-        return distributed_project_list
+        self._upsert_monthly_tag_cost(
+            "PVC",
+            rate_type,
+            rate_dict,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            metric_constants.PVC_DISTRIBUTION,
+            provider_uuid,
+            default=True,
+        )
 
     def upsert_monthly_cluster_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, cluster_cost, distribution, provider_uuid
@@ -1520,421 +1241,114 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
         """
         Update or insert a daily summary line item for cluster cost.
 
+        The cluster cost is distributed to nodes by their share of the cluster capacity
+        and to projects by their share of the cluster usage.
+
         args:
             start_date (datetime, str): The start_date to calculate monthly_cost.
             end_date (datetime, str): The end_date to calculate monthly_cost.
             cluster_id (str): The id of the cluster
             cluster_alias: The name of the cluster
-            cost_type (str): Contains the type of monthly cost. ex: "Node"
-            rate_type (str): Contains the metric name. ex: "node_cost_per_month"
+            rate_type (str): Contains the cost type. ex: "Infrastructure"
             cluster_cost (dec): The flat cost of the cluster
             distribution: Choice of monthly distribution ex. (memory or cpu)
         """
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        distribution_list = self.get_cluster_to_node_distribution(
-            start_date, end_date, cluster_id, distribution, cluster_cost
+        self._upsert_monthly_cost(
+            "sql/monthly_cost_upsert.sql",
+            "Cluster",
+            rate_type,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            provider_uuid,
+            distribution=distribution,
+            rate=cluster_cost,
         )
-        if report_period:
-            with schema_context(self.schema):
-                # NOTE: I implemented a logic change here, now instead of one entry per cluster cost
-                # We now have multiple cluster cost entries for each node.
-                LOG.debug("Cluster (%s) has a monthly cost of %s.", cluster_id, cluster_cost)
-                LOG.debug("Distributing the cluster cost to nodes using %s distribution.", distribution)
-                for node_dikt in distribution_list:
-                    node = node_dikt.get("node")
-                    distributed_cost = node_dikt.get("distributed_cost", Decimal(0))
-                    line_item = OCPUsageLineItemDailySummary.objects.filter(
-                        usage_start=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="Cluster",
-                        node=node,
-                        data_source="Pod",
-                        namespace__isnull=True,
-                    ).first()
-                    if not line_item:
-                        line_item = OCPUsageLineItemDailySummary(
-                            uuid=uuid.uuid4(),
-                            usage_start=start_date,
-                            usage_end=start_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            monthly_cost_type="Cluster",
-                            node=node,
-                            data_source="Pod",
-                            source_uuid=provider_uuid,
-                        )
-                    monthly_cost = self.generate_monthly_cost_json_object(distribution, distributed_cost)
-                    log_statement = (
-                        f"Distributing Cluster Cost to Nodes:\n"
-                        f" cluster ({cluster_id}) cost: {cluster_cost} \n"
-                        f" node ({node}) distributed cost: {distributed_cost}\n"
-                        f" distribution type: {distribution}\n"
-                    )
-                    if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                        line_item.infrastructure_monthly_cost_json = monthly_cost
-                    elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                        line_item.supplementary_monthly_cost_json = monthly_cost
-                    LOG.debug(log_statement)
-                    line_item.save()
-            # Project Distribution
-            project_distribution_list = self.get_cluster_to_project_distribution(
-                start_date, end_date, cluster_id, distribution, cluster_cost
-            )
-            with schema_context(self.schema):
-                for project_dikt in project_distribution_list:
-                    namespace = project_dikt.get("namespace")
-                    distributed_cost = project_dikt.get("distributed_cost", Decimal(0))
-                    project_line_item = OCPUsageLineItemDailySummary.objects.filter(
-                        usage_start=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="Cluster",
-                        namespace=namespace,
-                        data_source="Pod",
-                    ).first()
-                    if not project_line_item:
-                        project_line_item = OCPUsageLineItemDailySummary(
-                            uuid=uuid.uuid4(),
-                            usage_start=start_date,
-                            usage_end=start_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            monthly_cost_type="Cluster",
-                            namespace=namespace,
-                            data_source="Pod",
-                            source_uuid=provider_uuid,
-                        )
-                    monthly_cost = self.generate_monthly_cost_json_object(distribution, distributed_cost)
-                    log_statement = (
-                        f"Distributing Cluster Cost to Project:\n"
-                        f" cluster ({cluster_id}) cost: {cluster_cost} \n"
-                        f" project ({namespace}) distributed cost: {distributed_cost}\n"
-                        f" distribution type: {distribution}\n"
-                    )
-                    if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                        project_line_item.infrastructure_project_monthly_cost = monthly_cost
-                    elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                        project_line_item.supplementary_project_monthly_cost = monthly_cost
-                    project_line_item.save()
-                    LOG.debug(log_statement)
-
-    def tag_upsert_monthly_pvc_cost_line_item(  # noqa: C901
+
+    def tag_upsert_monthly_pvc_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, provider_uuid
     ):
         """
         Update or insert daily summary line item for PVC cost.
 
-        It checks to see if a line item exists for each PVC
-        that contains the tag key:value pair,
-        if it does then the price is added to the monthly cost.
+        The rate of each tag key:value pair found on a line item
+        of the PVC is added to the monthly cost of the PVC.
         """
-        distribution = metric_constants.PVC_DISTRIBUTION
-        unique_pvcs = self.get_distinct_pvcs(start_date, end_date, cluster_id)
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for pvc, node, namespace in unique_pvcs:
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        for value_name, rate_value in tag_values.items():
-                            item_check = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start__gte=start_date,
-                                usage_start__lte=end_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                persistentvolumeclaim=pvc,
-                                node=node,
-                                volume_labels__contains={tag_key: value_name},
-                                namespace=namespace,
-                            ).first()
-                            if item_check:
-                                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                    usage_start=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="PVC",
-                                    persistentvolumeclaim=pvc,
-                                    node=node,
-                                    data_source="Storage",
-                                    namespace=namespace,
-                                ).first()
-                                if not line_item:
-                                    line_item = OCPUsageLineItemDailySummary(
-                                        uuid=uuid.uuid4(),
-                                        usage_start=start_date,
-                                        usage_end=start_date,
-                                        report_period=report_period,
-                                        cluster_id=cluster_id,
-                                        cluster_alias=cluster_alias,
-                                        monthly_cost_type="PVC",
-                                        persistentvolumeclaim=pvc,
-                                        node=node,
-                                        data_source="Storage",
-                                        namespace=namespace,
-                                        source_uuid=provider_uuid,
-                                    )
-                                pvc_cost = rate_value
-                                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                    LOG.debug("PVC (%s) has a monthly infrastructure cost of %s.", pvc, rate_value)
-                                    if line_item.infrastructure_monthly_cost_json:
-                                        pvc_cost = (
-                                            line_item.infrastructure_monthly_cost_json.get(distribution, 0)
-                                            + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                    LOG.debug("PVC (%s) has a monthly supplemenarty cost of %s.", pvc, rate_value)
-                                    if line_item.supplementary_monthly_cost_json:
-                                        pvc_cost = (
-                                            line_item.supplementary_monthly_cost_json.get(distribution, 0) + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, pvc_cost)
-                                    line_item.supplementary_monthly_cost_json = monthly_cost
-                                line_item.save()
+        self._upsert_monthly_tag_cost(
+            "PVC",
+            rate_type,
+            rate_dict,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            metric_constants.PVC_DISTRIBUTION,
+            provider_uuid,
+        )
 
     def upsert_monthly_pvc_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, pvc_cost, provider_uuid
     ):
-        """Update or insert daily summary line item for pvc cost."""
-        unique_pvcs = self.get_distinct_pvcs(start_date, end_date, cluster_id)
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            for pvc, node, namespace in unique_pvcs:
-                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start=start_date,
-                    report_period=report_period,
-                    cluster_id=cluster_id,
-                    cluster_alias=cluster_alias,
-                    monthly_cost_type="PVC",
-                    persistentvolumeclaim=pvc,
-                    node=node,
-                    data_source="Storage",
-                    namespace=namespace,
-                    infrastructure_project_monthly_cost__isnull=True,
-                    supplementary_project_monthly_cost__isnull=True,
-                ).first()
-                if not line_item:
-                    line_item = OCPUsageLineItemDailySummary(
-                        uuid=uuid.uuid4(),
-                        usage_start=start_date,
-                        usage_end=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="PVC",
-                        persistentvolumeclaim=pvc,
-                        node=node,
-                        data_source="Storage",
-                        namespace=namespace,
-                        source_uuid=provider_uuid,
-                    )
-                monthly_cost = self.generate_monthly_cost_json_object(metric_constants.PVC_DISTRIBUTION, pvc_cost)
-                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                    LOG.debug("PVC (%s) has a monthly infrastructure cost of %s.", pvc, pvc_cost)
-                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                    LOG.debug("PVC (%s) has a monthly supplemenarty cost of %s.", pvc, pvc_cost)
-                    line_item.supplementary_monthly_cost_json = monthly_cost
-                line_item.save()
-                # PVC to project Distribution
-                project_line_item = OCPUsageLineItemDailySummary.objects.filter(
-                    usage_start=start_date,
-                    report_period=report_period,
-                    cluster_id=cluster_id,
-                    cluster_alias=cluster_alias,
-                    monthly_cost_type="PVC",
-                    persistentvolumeclaim=pvc,
-                    node=node,
-                    namespace=namespace,
-                    data_source="Storage",
-                    infrastructure_monthly_cost_json__isnull=True,
-                    supplementary_monthly_cost_json__isnull=True,
-                ).first()
-                if not project_line_item:
-                    project_line_item = OCPUsageLineItemDailySummary(
-                        uuid=uuid.uuid4(),
-                        usage_start=start_date,
-                        usage_end=start_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        monthly_cost_type="PVC",
-                        persistentvolumeclaim=pvc,
-                        node=node,
-                        namespace=namespace,
-                        data_source="Storage",
-                        source_uuid=provider_uuid,
-                    )
-                monthly_cost = self.generate_monthly_cost_json_object(metric_constants.PVC_DISTRIBUTION, pvc_cost)
-                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                    LOG.debug("PVC (%s) has a monthly project infrastructure cost of %s.", pvc, pvc_cost)
-                    project_line_item.infrastructure_project_monthly_cost = monthly_cost
-                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                    LOG.debug("PVC (%s) has a monthly project supplemenarty cost of %s.", pvc, pvc_cost)
-                    project_line_item.supplementary_project_monthly_cost = monthly_cost
-                project_line_item.save()
-
-    def tag_upsert_monthly_cluster_cost_line_item(  # noqa: C901
+        """Update or insert daily summary line items for pvc cost.
+
+        Each PVC and the project of the PVC are charged pvc_cost.
+        """
+        self._upsert_monthly_cost(
+            "sql/monthly_cost_upsert.sql",
+            "PVC",
+            rate_type,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            provider_uuid,
+            distribution=metric_constants.PVC_DISTRIBUTION,
+            rate=pvc_cost,
+        )
+
+    def tag_upsert_monthly_cluster_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution, provider_uuid
     ):
         """
         Update or insert a daily summary line item for cluster cost based on tag rates.
-        It checks to see if a line item exists for the cluster
-        that contains the tag key:value pair,
-        if it does then the price is added to the monthly cost.
+
+        The rate of each tag key:value pair found on a line item
+        of the cluster is added to the monthly cost of the cluster.
         """
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        if report_period:
-            with schema_context(self.schema):
-                if rate_dict is not None:
-                    for tag_key in rate_dict:
-                        tag_values = rate_dict.get(tag_key)
-                        for value_name, rate_value in tag_values.items():
-                            # this makes sure that there is an entry for that node
-                            # that contains the specified key_value pair
-                            item_check = line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                usage_start__gte=start_date,
-                                usage_start__lte=end_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                pod_labels__contains={tag_key: value_name},
-                            ).first()
-                            if item_check:
-                                line_item = OCPUsageLineItemDailySummary.objects.filter(
-                                    usage_start=start_date,
-                                    report_period=report_period,
-                                    cluster_id=cluster_id,
-                                    cluster_alias=cluster_alias,
-                                    monthly_cost_type="Cluster",
-                                    data_source="Pod",
-                                ).first()
-                                if not line_item:
-                                    line_item = OCPUsageLineItemDailySummary(
-                                        uuid=uuid.uuid4(),
-                                        usage_start=start_date,
-                                        usage_end=start_date,
-                                        report_period=report_period,
-                                        cluster_id=cluster_id,
-                                        cluster_alias=cluster_alias,
-                                        monthly_cost_type="Cluster",
-                                        data_source="Pod",
-                                        source_uuid=provider_uuid,
-                                    )
-                                cluster_cost = rate_value
-                                if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                                    LOG.debug(
-                                        "Cluster (%s) has a monthly infrastructure cost of %s from tag rates.",
-                                        cluster_id,
-                                        rate_value,
-                                    )
-                                    if line_item.infrastructure_monthly_cost_json:
-                                        cluster_cost = (
-                                            line_item.infrastructure_monthly_cost_json.get(distribution, 0)
-                                            + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                                    line_item.infrastructure_monthly_cost_json = monthly_cost
-                                elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                                    LOG.debug(
-                                        "Cluster (%s) has a monthly supplemenarty cost of %s from tag rates.",
-                                        cluster_id,
-                                        rate_value,
-                                    )
-                                    if line_item.supplementary_monthly_cost_json:
-                                        cluster_cost = (
-                                            line_item.supplementary_monthly_cost_json.get(distribution, 0) + rate_value
-                                        )
-                                    monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                                    line_item.supplementary_monthly_cost_json = monthly_cost
-                                line_item.save()
-
-    def tag_upsert_monthly_default_cluster_cost_line_item(  # noqa: C901
+        self._upsert_monthly_tag_cost(
+            "Cluster",
+            rate_type,
+            rate_dict,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            distribution,
+            provider_uuid,
+        )
+
+    def tag_upsert_monthly_default_cluster_cost_line_item(
         self, start_date, end_date, cluster_id, cluster_alias, rate_type, rate_dict, distribution, provider_uuid
     ):
         """
         Update or insert daily summary line item for cluster cost.
 
-        It checks to see if a line item exists for each cluster
-        that contains the tag key:value pair,
-        if it does then the price is added to the monthly cost.
+        The default rate is added to the monthly cost of the cluster
+        once for each value of the tag key without a defined rate.
         """
-        report_period = self.get_usage_period_by_dates_and_cluster(start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            if rate_dict is not None:
-                for tag_key in rate_dict:
-                    tag_values = rate_dict.get(tag_key)
-                    tag_default = tag_values.get("default_value")
-                    values_to_skip = tag_values.get("defined_keys")
-                    item_check = OCPUsageLineItemDailySummary.objects.filter(
-                        usage_start__gte=start_date,
-                        usage_start__lte=end_date,
-                        report_period=report_period,
-                        cluster_id=cluster_id,
-                        cluster_alias=cluster_alias,
-                        pod_labels__has_key=tag_key,
-                    )
-                    for value in values_to_skip:
-                        item_check = item_check.exclude(pod_labels__contains={tag_key: value})
-                    # this won't run if there are no matching items and item_check will continue to be
-                    # filtered until there are no items left
-                    while item_check:
-                        # get the first value for our tag key and exclude it from the queryset for the next check
-                        # will remove values until there are none left
-                        tag_key_value = item_check.first().pod_labels.get(tag_key)
-                        item_check = item_check.exclude(pod_labels__contains={tag_key: tag_key_value})
-                        line_item = OCPUsageLineItemDailySummary.objects.filter(
-                            usage_start=start_date,
-                            report_period=report_period,
-                            cluster_id=cluster_id,
-                            cluster_alias=cluster_alias,
-                            monthly_cost_type="Cluster",
-                            data_source="Pod",
-                        ).first()
-                        if not line_item:
-                            line_item = OCPUsageLineItemDailySummary(
-                                uuid=uuid.uuid4(),
-                                usage_start=start_date,
-                                usage_end=start_date,
-                                report_period=report_period,
-                                cluster_id=cluster_id,
-                                cluster_alias=cluster_alias,
-                                monthly_cost_type="Cluster",
-                                data_source="Pod",
-                                source_uuid=provider_uuid,
-                            )
-                        cluster_cost = tag_default
-                        if rate_type == metric_constants.INFRASTRUCTURE_COST_TYPE:
-                            LOG.debug(
-                                "Cluster (%s) has a default monthly infrastructure cost of %s.",
-                                cluster_id,
-                                tag_default,
-                            )
-                            if line_item.infrastructure_monthly_cost_json:
-                                cluster_cost = (
-                                    line_item.infrastructure_monthly_cost_json.get(distribution, 0) + tag_default
-                                )
-                            monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                            line_item.infrastructure_monthly_cost_json = monthly_cost
-                        elif rate_type == metric_constants.SUPPLEMENTARY_COST_TYPE:
-                            LOG.debug(
-                                "Cluster (%s) has a default monthly supplemenarty cost of %s.", cluster_id, tag_default
-                            )
-                            if line_item.supplementary_monthly_cost_json:
-                                cluster_cost = (
-                                    line_item.supplementary_monthly_cost_json.get(distribution, 0) + tag_default
-                                )
-                            monthly_cost = self.generate_monthly_cost_json_object(distribution, cluster_cost)
-                            line_item.supplementary_monthly_cost_json = monthly_cost
-                        line_item.save()
+        self._upsert_monthly_tag_cost(
+            "Cluster",
+            rate_type,
+            rate_dict,
+            start_date,
+            end_date,
+            cluster_id,
+            cluster_alias,
+            distribution,
+            provider_uuid,
+            default=True,
+        )
 
     def remove_monthly_cost(self, start_date, end_date, cluster_id, cost_type):
         """Delete all monthly costs of a specific type over a date range."""
@@ -2089,14 +1503,40 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
             ),
         )
 
-    def populate_tag_usage_costs(  # noqa: C901
-        self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
-    ):
+    def _populate_tag_rates(self, sql_file, tag_rates, start_date, end_date, cluster_id):
+        """Apply a set of tag rates to the daily summary with a single statement."""
+        if not tag_rates:
+            return
+        # Cast start_date and end_date to date object, if they aren't already
+        if isinstance(start_date, str):
+            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
+        if isinstance(start_date, datetime.datetime):
+            start_date = start_date.date()
+            end_date = end_date.date()
+        table_name = self._table_map["line_item_daily_summary"]
+        tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
+        tag_rates_sql = tag_rates_sql.decode("utf-8")
+        tag_rates_sql_params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "cluster_id": cluster_id,
+            "schema": self.schema,
+            "tag_rates": tag_rates,
+        }
+        tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(tag_rates_sql, tag_rates_sql_params)
+        msg = f"Running {sql_file} SQL for {len(tag_rates)} tag rates with params: {tag_rates_sql_params}"
+        LOG.info(msg)
+        self._execute_raw_sql_query(
+            table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+        )
+
+    def populate_tag_usage_costs(self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id):
         """
         Update the reporting_ocpusagelineitem_daily_summary table with
         usage costs based on tag rates.
-        Due to the way the tag_keys are stored it loops through all of
-        the tag keys to filter and update costs.
+        Every (metric, tag key, tag value, rate) tuple of both rate types
+        is applied by a single statement joined against the tag rates.
 
         The data structure for infrastructure and supplementary rates are
         a dictionary that include the metric name, the tag key,
@@ -2108,75 +1548,34 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
                 }
             }
         """
-        # defines the usage type for each metric
-        metric_usage_type_map = {
-            "cpu_core_usage_per_hour": "cpu",
-            "cpu_core_request_per_hour": "cpu",
-            "cpu_core_effective_usage_per_hour": "cpu",
-            "memory_gb_usage_per_hour": "memory",
-            "memory_gb_request_per_hour": "memory",
-            "memory_gb_effective_usage_per_hour": "memory",
-            "storage_gb_usage_per_month": "storage",
-            "storage_gb_request_per_month": "storage",
-        }
-        # define the rates so the loop can operate on both rate types
-        rate_types = [
-            {"rates": infrastructure_rates, "sql_file": "sql/infrastructure_tag_rates.sql"},
-            {"rates": supplementary_rates, "sql_file": "sql/supplementary_tag_rates.sql"},
-        ]
-        # Cast start_date and end_date to date object, if they aren't already
-        if isinstance(start_date, str):
-            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        if isinstance(start_date, datetime.datetime):
-            start_date = start_date.date()
-            end_date = end_date.date()
-        # updates costs from tags
-        for rate_type in rate_types:
-            rate = rate_type.get("rates")
-            sql_file = rate_type.get("sql_file")
-            for metric in rate:
-                tags = rate.get(metric, {})
-                usage_type = metric_usage_type_map.get(metric)
-                if usage_type == "storage":
-                    labels_field = "volume_labels"
-                else:
-                    labels_field = "pod_labels"
-                table_name = self._table_map["line_item_daily_summary"]
-                for tag_key in tags:
-                    tag_vals = tags.get(tag_key, {})
-                    value_names = list(tag_vals.keys())
-                    for val_name in value_names:
-                        rate_value = tag_vals[val_name]
-                        key_value_pair = json.dumps({tag_key: val_name})
-                        tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
-                        tag_rates_sql = tag_rates_sql.decode("utf-8")
-                        tag_rates_sql_params = {
-                            "start_date": start_date,
-                            "end_date": end_date,
-                            "rate": rate_value,
-                            "cluster_id": cluster_id,
-                            "schema": self.schema,
-                            "usage_type": usage_type,
-                            "metric": metric,
-                            "k_v_pair": key_value_pair,
-                            "labels_field": labels_field,
-                        }
-                        tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(
-                            tag_rates_sql, tag_rates_sql_params
-                        )
-                        msg = f"Running populate_tag_usage_costs SQL with params: {tag_rates_sql_params}"
-                        LOG.info(msg)
-                        self._execute_raw_sql_query(
-                            table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+        tag_rates = []
+        for cost_type, rates in (("Infrastructure", infrastructure_rates), ("Supplementary", supplementary_rates)):
+            for metric, tags in rates.items():
+                usage_type = METRIC_USAGE_TYPE_MAP.get(metric)
+                labels_field = "volume_labels" if usage_type == "storage" else "pod_labels"
+                for tag_key, tag_vals in tags.items():
+                    for val_name, rate_value in tag_vals.items():
+                        tag_rates.append(
+                            {
+                                "cost_type": cost_type,
+                                "metric": metric,
+                                "usage_type": usage_type,
+                                "labels_field": labels_field,
+                                "tag_key": tag_key,
+                                "tag_value": json.dumps(val_name),
+                                "rate": rate_value,
+                            }
                         )
+        self._populate_tag_rates("sql/tag_rates.sql", tag_rates, start_date, end_date, cluster_id)
 
-    def populate_tag_usage_default_costs(  # noqa: C901
+    def populate_tag_usage_default_costs(
         self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
     ):
         """
         Update the reporting_ocpusagelineitem_daily_summary table
         with usage costs based on tag rates.
+        Every default rate of both rate types is applied by a single
+        statement joined against the tag rates.
 
         The data structure for infrastructure and supplementary rates
         are a dictionary that includes the metric, the tag key,
@@ -2191,74 +1590,27 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
                 }
             }
         """
-        # defines the usage type for each metric
-        metric_usage_type_map = {
-            "cpu_core_usage_per_hour": "cpu",
-            "cpu_core_request_per_hour": "cpu",
-            "cpu_core_effective_usage_per_hour": "cpu",
-            "memory_gb_usage_per_hour": "memory",
-            "memory_gb_request_per_hour": "memory",
-            "memory_gb_effective_usage_per_hour": "memory",
-            "storage_gb_usage_per_month": "storage",
-            "storage_gb_request_per_month": "storage",
-        }
-        # define the rates so the loop can operate on both rate types
-        rate_types = [
-            {"rates": infrastructure_rates, "sql_file": "sql/default_infrastructure_tag_rates.sql"},
-            {"rates": supplementary_rates, "sql_file": "sql/default_supplementary_tag_rates.sql"},
-        ]
-        # Cast start_date and end_date to date object, if they aren't already
-        if isinstance(start_date, str):
-            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        if isinstance(start_date, datetime.datetime):
-            start_date = start_date.date()
-            end_date = end_date.date()
-
-        # updates costs from tags
-        for rate_type in rate_types:
-            rate = rate_type.get("rates")
-            sql_file = rate_type.get("sql_file")
-            for metric in rate:
-                tags = rate.get(metric, {})
-                usage_type = metric_usage_type_map.get(metric)
-                if usage_type == "storage":
-                    labels_field = "volume_labels"
-                else:
-                    labels_field = "pod_labels"
-                table_name = self._table_map["line_item_daily_summary"]
-                for tag_key in tags:
-                    key_value_pair = []
-                    tag_vals = tags.get(tag_key)
+        tag_rates = []
+        for cost_type, rates in (("Infrastructure", infrastructure_rates), ("Supplementary", supplementary_rates)):
+            for metric, tags in rates.items():
+                usage_type = METRIC_USAGE_TYPE_MAP.get(metric)
+                labels_field = "volume_labels" if usage_type == "storage" else "pod_labels"
+                for tag_key, tag_vals in tags.items():
                     rate_value = tag_vals.get("default_value", 0)
                     if rate_value == 0:
                         continue
-                    value_names = tag_vals.get("defined_keys", [])
-                    for value_to_skip in value_names:
-                        key_value_pair.append(json.dumps({tag_key: value_to_skip}))
-                    json.dumps(key_value_pair)
-                    tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
-                    tag_rates_sql = tag_rates_sql.decode("utf-8")
-                    tag_rates_sql_params = {
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "rate": rate_value,
-                        "cluster_id": cluster_id,
-                        "schema": self.schema,
-                        "usage_type": usage_type,
-                        "metric": metric,
-                        "tag_key": tag_key,
-                        "k_v_pair": key_value_pair,
-                        "labels_field": labels_field,
-                    }
-                    tag_rates_sql, tag_rates_sql_params = self.jinja_sql.prepare_query(
-                        tag_rates_sql, tag_rates_sql_params
-                    )
-                    msg = f"Running populate_tag_usage_default_costs SQL with params: {tag_rates_sql_params}"
-                    LOG.info(msg)
-                    self._execute_raw_sql_query(
-                        table_name, tag_rates_sql, start_date, end_date, bind_params=list(tag_rates_sql_params)
+                    tag_rates.append(
+                        {
+                            "cost_type": cost_type,
+                            "metric": metric,
+                            "usage_type": usage_type,
+                            "labels_field": labels_field,
+                            "tag_key": tag_key,
+                            "defined_values": json.dumps(tag_vals.get("defined_keys", [])),
+                            "rate": rate_value,
+                        }
                     )
+        self._populate_tag_rates("sql/default_tag_rates.sql", tag_rates, start_date, end_date, cluster_id)
 
     def populate_openshift_cluster_information_tables(self, provider, cluster_id, cluster_alias, start_date, end_date):
         """Populate the cluster, node, PVC, and project tables for the cluster."""
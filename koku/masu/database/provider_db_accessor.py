@@ -71,6 +71,11 @@ class ProviderDBAccessor(KokuDBAccess):
 
         return query
 
+    def _invalidate_sources_cache(self):
+        """Invalidate the cached sources views of the provider's tenant."""
+        if self.provider.customer:
+            invalidate_view_cache_for_tenant_and_cache_key(self.provider.customer.schema_name, SOURCES_CACHE_PREFIX)
+
     def get_provider(self):
         """Return the provider."""
         return self.provider
@@ -181,7 +186,7 @@ class ProviderDBAccessor(KokuDBAccess):
         """
         self.provider.setup_complete = True
         self.provider.save()
-        invalidate_view_cache_for_tenant_and_cache_key(SOURCES_CACHE_PREFIX)
+        self._invalidate_sources_cache()
 
     def get_customer_uuid(self):
         """
@@ -278,7 +283,7 @@ class ProviderDBAccessor(KokuDBAccess):
 
         self.provider.infrastructure = mapping
         self.provider.save()
-        invalidate_view_cache_for_tenant_and_cache_key(SOURCES_CACHE_PREFIX)
+        self._invalidate_sources_cache()
 
     def get_associated_openshift_providers(self):
         """Return a list of OpenShift clusters associated with the cloud provider."""
@@ -299,11 +304,11 @@ class ProviderDBAccessor(KokuDBAccess):
             LOG.info(msg)
             self.provider.data_updated_timestamp = updated_datetime
             self.provider.save()
-            invalidate_view_cache_for_tenant_and_cache_key(SOURCES_CACHE_PREFIX)
+            self._invalidate_sources_cache()
 
     def set_additional_context(self, new_value):
         """Sets the additional context value."""
         if self.provider:
             self.provider.additional_context = new_value
             self.provider.save()
-            invalidate_view_cache_for_tenant_and_cache_key(SOURCES_CACHE_PREFIX)
+            self._invalidate_sources_cache()
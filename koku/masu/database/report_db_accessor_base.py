@@ -7,8 +7,10 @@ import logging
 import os
 import time
 import uuid
+from collections.abc import Mapping
 from decimal import Decimal
 from decimal import InvalidOperation
+from functools import lru_cache
 
 import ciso8601
 import django.apps
@@ -26,6 +28,7 @@ from koku.database_exc import get_extended_exception_by_type
 from masu.config import Config
 from masu.database.koku_database_access import KokuDBAccess
 from masu.database.koku_database_access import mini_transaction_delete
+from masu.prometheus_stats import TRINO_QUERY_TIME
 from reporting.models import PartitionedTable
 from reporting_common import REPORT_COLUMN_MAP
 
@@ -36,30 +39,67 @@ class ReportDBAccessorException(Exception):
     """An error in the DB accessor."""
 
 
+class ColumnTypes(Mapping):
+    """The Django internal types of the REPORT_COLUMN_MAP columns, resolved per table on first use.
+
+    The keys are every reporting table, whether its types are resolved yet or not.
+    """
+
+    def __init__(self, models):
+        """Initialize the map for the models keyed by table name."""
+        self._models = models
+        self._types = {}
+
+    def __getitem__(self, table_name):
+        """Return the column types of table_name, resolving them on first use."""
+        if table_name not in self._types:
+            model = self._models[table_name]
+            columns = REPORT_COLUMN_MAP[table_name].values()
+            self._types[table_name] = {column: model._meta.get_field(column).get_internal_type() for column in columns}
+        return self._types[table_name]
+
+    def __contains__(self, table_name):
+        """Return whether table_name is a reporting table."""
+        return table_name in self._models
+
+    def __iter__(self):
+        """Iterate over the reporting table names."""
+        return iter(self._models)
+
+    def __len__(self):
+        """Return the number of reporting tables."""
+        return len(self._models)
+
+
 class ReportSchema:
     """A container for the reporting table objects."""
 
     def __init__(self, tables):
         """Initialize the report schema."""
-        self.column_types = {}
+        self._models = {}
+        self.column_types = ColumnTypes(self._models)
         self._set_reporting_tables(tables)
 
     def _set_reporting_tables(self, models):
         """Load table objects for reference and creation.
 
+        The column types of a table are resolved when they are first used.
+
         Args:
             report_schema (ReportSchema): A schema struct object with all
                 report tables
         """
-        column_types = {}
         for model in models:
             if "django" in model._meta.db_table:
                 continue
             setattr(self, model._meta.db_table, model)
-            columns = REPORT_COLUMN_MAP[model._meta.db_table].values()
-            types = {column: model._meta.get_field(column).get_internal_type() for column in columns}
-            column_types.update({model._meta.db_table: types})
-            self.column_types = column_types
+            self._models[model._meta.db_table] = model
+
+
+@lru_cache(maxsize=1)
+def get_report_schema():
+    """Return the report schema of the installed models, built once per process."""
+    return ReportSchema(django.apps.apps.get_models())
 
 
 class ReportDBAccessorBase(KokuDBAccess):
@@ -72,7 +112,7 @@ class ReportDBAccessorBase(KokuDBAccess):
             schema (str): The customer schema to associate with
         """
         super().__init__(schema)
-        self.report_schema = ReportSchema(django.apps.apps.get_models())
+        self.report_schema = get_report_schema()
 
     @property
     def decimal_precision(self):
@@ -278,6 +318,90 @@ class ReportDBAccessorBase(KokuDBAccess):
 
         return self._get_primary_key(table_name, data)
 
+    def insert_on_conflict_returning(self, table, rows, key_columns, set_columns=None):
+        """Insert many rows with one statement and return the id of every row.
+
+        Rows that already exist, matched on key_columns, are not inserted again, and rows
+        with the same key_columns values are inserted once. If set_columns is given, existing
+        rows are updated instead, which requires a unique constraint on key_columns.
+
+        Args:
+            table (DjangoModel): The table to insert into
+            rows (list): A list of dictionaries of data to insert
+            key_columns (list): Columns identifying a row
+            set_columns (list): Columns to update on conflict
+
+        Returns:
+            (list): The row ids, in the order of rows
+
+        """
+        table_name = table._meta.db_table
+        fields = {field.column: field for field in table._meta.concrete_fields}
+        # Rows of the batch with the same key are written once; the last one wins like an upsert would
+        unique_rows = {}
+        row_keys = []
+        for row in rows:
+            row = self.clean_data(row, table_name)
+            row_key = tuple(row.get(column) for column in key_columns)
+            unique_rows[row_key] = row
+            row_keys.append(row_key)
+        unique_keys = list(unique_rows)
+        rows = list(unique_rows.values())
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        columns_formatted = ", ".join(columns)
+        keys_formatted = ", ".join(key_columns)
+        match = " AND ".join(
+            f"t.{column} IS NOT DISTINCT FROM i.{column}" if fields[column].null else f"t.{column} = i.{column}"
+            for column in key_columns
+        )
+        casts = ", ".join(f"%s::{fields[column].db_type(connection)}" for column in columns)
+
+        ids = {}
+        pending = list(range(len(rows)))
+        # A row inserted by a concurrent transaction is neither returned by the insert nor visible
+        # to this statement's snapshot, so rows without an id get a second pass.
+        for _ in range(2):
+            values = ", ".join(f"(%s::integer, {casts})" for _ in pending)
+            params = [value for idx in pending for value in (idx, *(rows[idx].get(column) for column in columns))]
+            if set_columns:
+                set_clause = ", ".join(f"{column} = excluded.{column}" for column in set_columns)
+                insert_sql = f"""
+                WITH input (ord, {columns_formatted}) AS (VALUES {values}),
+                upserted AS (
+                    INSERT INTO {self.schema}.{table_name} ({columns_formatted})
+                    SELECT {columns_formatted} FROM input
+                    ON CONFLICT ({keys_formatted}) DO UPDATE SET {set_clause}
+                    RETURNING id, {keys_formatted}
+                )
+                SELECT i.ord, t.id FROM input AS i JOIN upserted AS t ON {match}
+                """
+            else:
+                insert_sql = f"""
+                WITH input (ord, {columns_formatted}) AS (VALUES {values}),
+                inserted AS (
+                    INSERT INTO {self.schema}.{table_name} ({columns_formatted})
+                    SELECT {columns_formatted} FROM input AS i
+                     WHERE NOT EXISTS (SELECT 1 FROM {self.schema}.{table_name} AS t WHERE {match})
+                    ON CONFLICT DO NOTHING
+                    RETURNING id, {keys_formatted}
+                )
+                SELECT i.ord, t.id FROM input AS i JOIN inserted AS t ON {match}
+                UNION ALL
+                SELECT i.ord, min(t.id) FROM input AS i JOIN {self.schema}.{table_name} AS t ON {match} GROUP BY i.ord
+                """
+            with connection.cursor() as cursor:
+                cursor.db.set_schema(self.schema)
+                cursor.execute(insert_sql, params)
+                ids.update(cursor.fetchall())
+            pending = [idx for idx in pending if idx not in ids]
+            if not pending:
+                key_ids = {row_key: ids[idx] for idx, row_key in enumerate(unique_keys)}
+                return [key_ids[row_key] for row_key in row_keys]
+
+        LOG.error("Row in %s does not exist in database.", table_name)
+        LOG.error("Failed row data: %s", rows[pending[0]])
+        raise ReportDBAccessorException(f"Unable to resolve {len(pending)} rows in {table_name}.")
+
     def _get_primary_key(self, table_name, data):
         """Return the row id for a specific object."""
         with schema_context(self.schema):
@@ -375,11 +499,12 @@ class ReportDBAccessorBase(KokuDBAccess):
         """Execute a single presto query and return cur.fetchall and cur.description"""
         try:
             t1 = time.time()
-            presto_conn = kpdb.connect(schema=schema)
-            presto_cur = presto_conn.cursor()
-            presto_cur.execute(sql, bind_params)
-            results = presto_cur.fetchall()
-            description = presto_cur.description
+            with kpdb.pooled_connection(schema=schema) as presto_conn:
+                presto_cur = presto_conn.cursor()
+                with TRINO_QUERY_TIME.time():
+                    presto_cur.execute(sql, bind_params)
+                    results = presto_cur.fetchall()
+                description = presto_cur.description
             t2 = time.time()
             if log_ref:
                 msg = f"{log_ref} for {schema} \n\twith params {bind_params} \n\tcompleted in {t2 - t1} seconds."
@@ -393,12 +518,32 @@ class ReportDBAccessorBase(KokuDBAccess):
                 LOG.error(msg)
             raise ex
 
+    def _execute_presto_raw_sql_query_in_batches(self, schema, sql, bind_params=None, batch_size=1000):
+        """Execute a single presto query and yield the column names with each batch of rows as it is fetched."""
+        try:
+            t1 = time.time()
+            with kpdb.pooled_connection(schema=schema) as presto_conn:
+                presto_cur = presto_conn.cursor()
+                presto_cur.execute(sql, bind_params)
+                while True:
+                    rows = presto_cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    # col[0] grabs the column names from the cursor description
+                    yield [col[0] for col in presto_cur.description], rows
+            t2 = time.time()
+            TRINO_QUERY_TIME.observe(t2 - t1)
+            LOG.info(f"Trino query for {schema} \n\twith params {bind_params} \n\tcompleted in {t2 - t1} seconds.")
+        except Exception as ex:
+            LOG.error(f"Failing SQL {sql} \n\t and bind_params {bind_params}")
+            raise ex
+
     def _execute_presto_multipart_sql_query(
         self, schema, sql, bind_params=None, preprocessor=JinjaSql().prepare_query
     ):
         """Execute multiple related SQL queries in Presto."""
-        presto_conn = kpdb.connect(schema=self.schema)
-        return kpdb.executescript(presto_conn, sql, params=bind_params, preprocessor=preprocessor)
+        with kpdb.pooled_connection(schema=self.schema) as presto_conn:
+            return kpdb.executescript(presto_conn, sql, params=bind_params, preprocessor=preprocessor)
 
     def get_existing_partitions(self, table):
         if isinstance(table, str):
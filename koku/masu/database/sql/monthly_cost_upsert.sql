@@ -0,0 +1,162 @@
+WITH month_usage AS (
+    SELECT lids.node,
+        lids.namespace,
+        lids.persistentvolumeclaim,
+        {%- if 'memory' in distribution %}
+        lids.node_capacity_memory_gigabyte_hours as node_capacity,
+        lids.cluster_capacity_memory_gigabyte_hours as cluster_capacity,
+        lids.pod_usage_memory_gigabyte_hours as pod_usage
+        {%- else %}
+        lids.node_capacity_cpu_core_hours as node_capacity,
+        lids.cluster_capacity_cpu_core_hours as cluster_capacity,
+        lids.pod_usage_cpu_core_hours as pod_usage
+        {%- endif %}
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    WHERE lids.usage_start >= {{start_date}}
+        AND lids.usage_start < {{end_date}}
+        AND lids.cluster_id = {{cluster_id}}
+),
+distribution AS (
+{%- if cost_type == 'Node' %}
+    -- The node cost is charged to each node and split evenly between the projects on the node
+    SELECT node,
+        NULL::text as namespace,
+        NULL::text as persistentvolumeclaim,
+        'Pod' as data_source,
+        false as is_project,
+        {{rate}}::numeric as cost
+    FROM (
+        SELECT DISTINCT node
+        FROM month_usage
+        WHERE node IS NOT NULL
+    ) AS nodes
+    UNION ALL
+    SELECT node,
+        namespace,
+        NULL::text as persistentvolumeclaim,
+        'Pod' as data_source,
+        true as is_project,
+        {{rate}}::numeric / count(*) OVER (PARTITION BY node) as cost
+    FROM (
+        SELECT DISTINCT node, namespace
+        FROM month_usage
+        WHERE node IS NOT NULL
+            AND namespace IS NOT NULL
+    ) AS projects
+{%- elif cost_type == 'Cluster' %}
+    -- The cluster cost is distributed to nodes by capacity and to projects by usage
+    SELECT node,
+        NULL::text as namespace,
+        NULL::text as persistentvolumeclaim,
+        'Pod' as data_source,
+        false as is_project,
+        sum(node_capacity) / nullif(sum(cluster_capacity), 0) * {{rate}}::numeric as cost
+    FROM month_usage
+    GROUP BY node
+    UNION ALL
+    SELECT NULL::text as node,
+        namespace,
+        NULL::text as persistentvolumeclaim,
+        'Pod' as data_source,
+        true as is_project,
+        sum(pod_usage) / nullif(max(cluster.usage), 0) * {{rate}}::numeric as cost
+    FROM month_usage
+    CROSS JOIN (
+        SELECT sum(pod_usage) as usage
+        FROM month_usage
+    ) AS cluster
+    WHERE namespace IS NOT NULL
+    GROUP BY namespace
+{%- elif cost_type == 'PVC' %}
+    -- The PVC cost is charged to each PVC and to the project of the PVC
+    SELECT node,
+        namespace,
+        persistentvolumeclaim,
+        'Storage' as data_source,
+        project.is_project,
+        {{rate}}::numeric as cost
+    FROM (
+        SELECT DISTINCT persistentvolumeclaim, node, namespace
+        FROM month_usage
+        WHERE persistentvolumeclaim IS NOT NULL
+            AND namespace IS NOT NULL
+    ) AS pvcs
+    CROSS JOIN (VALUES (false), (true)) AS project (is_project)
+{%- endif %}
+),
+cost AS (
+    SELECT distribution.*,
+        jsonb_build_object('cpu', 0, 'memory', 0, 'pvc', 0)
+            || jsonb_build_object({{distribution}}, coalesce(cost, 0)) as cost_json
+    FROM distribution
+),
+updated AS (
+    UPDATE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    SET {{cost_column_prefix | sqlsafe}}_monthly_cost_json = CASE
+            WHEN c.is_project THEN lids.{{cost_column_prefix | sqlsafe}}_monthly_cost_json
+            ELSE c.cost_json
+        END,
+        {{cost_column_prefix | sqlsafe}}_project_monthly_cost = CASE
+            WHEN c.is_project THEN c.cost_json
+            ELSE lids.{{cost_column_prefix | sqlsafe}}_project_monthly_cost
+        END
+    FROM cost AS c
+    WHERE lids.usage_start = {{start_date}}
+        AND lids.report_period_id = {{report_period_id}}
+        AND lids.cluster_id = {{cluster_id}}
+        AND lids.cluster_alias = {{cluster_alias}}
+        AND lids.monthly_cost_type = {{cost_type}}
+        AND lids.data_source = c.data_source
+        AND lids.node IS NOT DISTINCT FROM c.node
+        AND lids.namespace IS NOT DISTINCT FROM c.namespace
+        AND lids.persistentvolumeclaim IS NOT DISTINCT FROM c.persistentvolumeclaim
+        {%- if cost_type == 'PVC' %}
+        -- PVC and PVC project rows share their keys and are told apart by the costs they carry
+        AND CASE
+            WHEN c.is_project
+                THEN lids.infrastructure_monthly_cost_json IS NULL AND lids.supplementary_monthly_cost_json IS NULL
+            ELSE lids.infrastructure_project_monthly_cost IS NULL AND lids.supplementary_project_monthly_cost IS NULL
+        END
+        {%- endif %}
+    RETURNING c.node, c.namespace, c.persistentvolumeclaim, c.is_project
+)
+INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+    uuid,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    usage_start,
+    usage_end,
+    monthly_cost_type,
+    node,
+    namespace,
+    persistentvolumeclaim,
+    data_source,
+    source_uuid,
+    {{cost_column_prefix | sqlsafe}}_monthly_cost_json,
+    {{cost_column_prefix | sqlsafe}}_project_monthly_cost
+)
+SELECT uuid_generate_v4() as uuid,
+    {{report_period_id}} as report_period_id,
+    {{cluster_id}} as cluster_id,
+    {{cluster_alias}} as cluster_alias,
+    {{start_date}} as usage_start,
+    {{start_date}} as usage_end,
+    {{cost_type}} as monthly_cost_type,
+    c.node,
+    c.namespace,
+    c.persistentvolumeclaim,
+    c.data_source,
+    {{source_uuid}}::uuid as source_uuid,
+    CASE WHEN c.is_project THEN NULL ELSE c.cost_json END,
+    CASE WHEN c.is_project THEN c.cost_json ELSE NULL END
+FROM cost AS c
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM updated AS u
+    WHERE u.node IS NOT DISTINCT FROM c.node
+        AND u.namespace IS NOT DISTINCT FROM c.namespace
+        AND u.persistentvolumeclaim IS NOT DISTINCT FROM c.persistentvolumeclaim
+        AND u.is_project = c.is_project
+)
+;
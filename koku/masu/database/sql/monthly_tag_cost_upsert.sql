@@ -0,0 +1,119 @@
+WITH tag_rates (tag_key, tag_values, rate) AS (
+    VALUES
+    {%- for tag_rate in tag_rates %}
+        ({{tag_rate.tag_key}}, {{tag_rate.tag_values}}::jsonb, {{tag_rate.rate}}::numeric){% if not loop.last %},{% endif %}
+    {%- endfor %}
+),
+labels AS (
+    SELECT DISTINCT
+        {%- if cost_type == 'Cluster' %}
+        NULL::text as node,
+        NULL::text as namespace,
+        NULL::text as persistentvolumeclaim,
+        {%- elif cost_type == 'Node' %}
+        lids.node,
+        NULL::text as namespace,
+        NULL::text as persistentvolumeclaim,
+        {%- else %}
+        lids.node,
+        lids.namespace,
+        lids.persistentvolumeclaim,
+        {%- endif %}
+        l.key,
+        l.value
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    CROSS JOIN LATERAL jsonb_each(
+        CASE WHEN jsonb_typeof(lids.{{labels_field | sqlsafe}}) = 'object' THEN lids.{{labels_field | sqlsafe}} END
+    ) AS l
+    WHERE lids.usage_start >= {{start_date}}
+        AND lids.usage_start < {{end_date}}
+        AND lids.report_period_id = {{report_period_id}}
+        AND lids.cluster_id = {{cluster_id}}
+        AND lids.cluster_alias = {{cluster_alias}}
+        {%- if cost_type == 'Node' %}
+        AND lids.node IS NOT NULL
+        {%- elif cost_type == 'PVC' %}
+        AND lids.persistentvolumeclaim IS NOT NULL
+        AND lids.namespace IS NOT NULL
+        {%- endif %}
+),
+distribution AS (
+    -- Each matching tag value found on the node, PVC or cluster adds its rate once
+    SELECT labels.node,
+        labels.namespace,
+        labels.persistentvolumeclaim,
+        sum(tag_rates.rate) as cost
+    FROM labels
+    JOIN tag_rates
+        ON tag_rates.tag_key = labels.key
+        {%- if default %}
+        -- The default rate applies to every value without a rate of its own
+        AND NOT tag_rates.tag_values @> jsonb_build_array(labels.value)
+        {%- else %}
+        AND tag_rates.tag_values = labels.value
+        {%- endif %}
+    GROUP BY labels.node, labels.namespace, labels.persistentvolumeclaim
+),
+updated AS (
+    -- The tag rates are added to any cost already on the row
+    UPDATE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    SET {{cost_column_prefix | sqlsafe}}_monthly_cost_json = jsonb_build_object('cpu', 0, 'memory', 0, 'pvc', 0)
+        || jsonb_build_object(
+            {{distribution}},
+            coalesce((lids.{{cost_column_prefix | sqlsafe}}_monthly_cost_json ->> {{distribution}})::numeric, 0)
+                + coalesce(d.cost, 0)
+        )
+    FROM distribution AS d
+    WHERE lids.usage_start = {{start_date}}
+        AND lids.report_period_id = {{report_period_id}}
+        AND lids.cluster_id = {{cluster_id}}
+        AND lids.cluster_alias = {{cluster_alias}}
+        AND lids.monthly_cost_type = {{cost_type}}
+        AND lids.data_source = {{data_source}}
+        AND lids.node IS NOT DISTINCT FROM d.node
+        AND lids.namespace IS NOT DISTINCT FROM d.namespace
+        AND lids.persistentvolumeclaim IS NOT DISTINCT FROM d.persistentvolumeclaim
+        {%- if cost_type == 'PVC' %}
+        AND lids.infrastructure_project_monthly_cost IS NULL
+        AND lids.supplementary_project_monthly_cost IS NULL
+        {%- endif %}
+    RETURNING d.node, d.namespace, d.persistentvolumeclaim
+)
+INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+    uuid,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    usage_start,
+    usage_end,
+    monthly_cost_type,
+    node,
+    namespace,
+    persistentvolumeclaim,
+    data_source,
+    source_uuid,
+    {{cost_column_prefix | sqlsafe}}_monthly_cost_json
+)
+SELECT uuid_generate_v4() as uuid,
+    {{report_period_id}} as report_period_id,
+    {{cluster_id}} as cluster_id,
+    {{cluster_alias}} as cluster_alias,
+    {{start_date}} as usage_start,
+    {{start_date}} as usage_end,
+    {{cost_type}} as monthly_cost_type,
+    d.node,
+    d.namespace,
+    d.persistentvolumeclaim,
+    {{data_source}} as data_source,
+    {{source_uuid}}::uuid as source_uuid,
+    jsonb_build_object('cpu', 0, 'memory', 0, 'pvc', 0)
+        || jsonb_build_object({{distribution}}, coalesce(d.cost, 0))
+FROM distribution AS d
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM updated AS u
+    WHERE u.node IS NOT DISTINCT FROM d.node
+        AND u.namespace IS NOT DISTINCT FROM d.namespace
+        AND u.persistentvolumeclaim IS NOT DISTINCT FROM d.persistentvolumeclaim
+)
+;
@@ -0,0 +1,129 @@
+WITH tag_rates (cost_type, metric, usage_type, labels_field, tag_key, tag_value, rate) AS (
+    VALUES
+    {%- for tag_rate in tag_rates %}
+        (
+            {{tag_rate.cost_type}},
+            {{tag_rate.metric}},
+            {{tag_rate.usage_type}},
+            {{tag_rate.labels_field}},
+            {{tag_rate.tag_key}},
+            {{tag_rate.tag_value}}::jsonb,
+            {{tag_rate.rate}}::numeric
+        ){% if not loop.last %},{% endif %}
+    {%- endfor %}
+)
+INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+    uuid,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    usage_start,
+    usage_end,
+    namespace,
+    node,
+    resource_id,
+    persistentvolumeclaim,
+    persistentvolume,
+    storageclass,
+    source_uuid,
+    infrastructure_usage_cost,
+    supplementary_usage_cost,
+    pod_labels,
+    volume_labels,
+    monthly_cost_type
+)
+SELECT uuid_generate_v4() as uuid,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    usage_start,
+    usage_start as usage_end,
+    namespace,
+    node,
+    resource_id,
+    persistentvolumeclaim,
+    persistentvolume,
+    storageclass,
+    source_uuid,
+    CASE WHEN cost_type = 'Infrastructure' THEN usage_cost END as infrastructure_usage_cost,
+    CASE WHEN cost_type = 'Supplementary' THEN usage_cost END as supplementary_usage_cost,
+    CASE WHEN labels_field = 'pod_labels' THEN labels END as pod_labels,
+    CASE WHEN labels_field = 'volume_labels' THEN labels END as volume_labels,
+    'Tag' as monthly_cost_type -- We are borrowing the monthly field here, although this is a daily usage cost
+FROM (
+    SELECT sub.*,
+        jsonb_build_object(
+            'cpu', CASE WHEN usage_type = 'cpu' THEN coalesce(rate * usage, 0.0) ELSE 0.0 END,
+            'memory', CASE WHEN usage_type = 'memory' THEN coalesce(rate * usage, 0.0) ELSE 0.0 END,
+            'storage', CASE WHEN usage_type = 'storage' THEN coalesce(rate * usage, 0.0) ELSE 0.0 END
+        ) as usage_cost
+    FROM (
+        SELECT lids.report_period_id,
+            lids.cluster_id,
+            lids.cluster_alias,
+            lids.data_source,
+            lids.usage_start,
+            lids.namespace,
+            lids.node,
+            lids.resource_id,
+            lids.persistentvolumeclaim,
+            lids.persistentvolume,
+            lids.storageclass,
+            lids.source_uuid,
+            tr.cost_type,
+            tr.usage_type,
+            tr.labels_field,
+            tr.rate,
+            jsonb_build_object(tr.tag_key, tr.tag_value) as labels,
+            sum(
+                CASE
+                    WHEN tr.metric = 'cpu_core_usage_per_hour' THEN lids.pod_usage_cpu_core_hours
+                    WHEN tr.metric = 'cpu_core_request_per_hour' THEN lids.pod_request_cpu_core_hours
+                    WHEN tr.metric = 'cpu_core_effective_usage_per_hour' THEN lids.pod_effective_usage_cpu_core_hours
+                    WHEN tr.metric = 'memory_gb_usage_per_hour' THEN lids.pod_usage_memory_gigabyte_hours
+                    WHEN tr.metric = 'memory_gb_request_per_hour' THEN lids.pod_request_memory_gigabyte_hours
+                    WHEN tr.metric = 'memory_gb_effective_usage_per_hour' THEN lids.pod_effective_usage_memory_gigabyte_hours
+                    WHEN tr.metric = 'storage_gb_usage_per_month' THEN lids.persistentvolumeclaim_usage_gigabyte_months
+                    WHEN tr.metric = 'storage_gb_request_per_month' THEN lids.volume_request_storage_gigabyte_months
+                END
+            ) as usage
+        FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+        -- Expand each row's labels once so every rate is matched with a hash join
+        -- instead of one containment scan of the month per rate.
+        CROSS JOIN LATERAL (
+            SELECT 'pod_labels' as labels_field, lids.pod_labels as labels, l.key, l.value
+            FROM jsonb_each(CASE WHEN jsonb_typeof(lids.pod_labels) = 'object' THEN lids.pod_labels END) AS l
+            UNION ALL
+            SELECT 'volume_labels' as labels_field, lids.volume_labels as labels, l.key, l.value
+            FROM jsonb_each(CASE WHEN jsonb_typeof(lids.volume_labels) = 'object' THEN lids.volume_labels END) AS l
+        ) AS lbl
+        JOIN tag_rates AS tr
+            ON tr.labels_field = lbl.labels_field
+            AND tr.tag_key = lbl.key
+            AND tr.tag_value = lbl.value
+        WHERE lids.cluster_id = {{cluster_id}}
+            AND lids.usage_start >= {{start_date}}
+            AND lids.usage_start <= {{end_date}}
+        GROUP BY lids.report_period_id,
+            lids.cluster_id,
+            lids.cluster_alias,
+            lids.data_source,
+            lids.usage_start,
+            lids.namespace,
+            lids.node,
+            lids.resource_id,
+            lids.persistentvolumeclaim,
+            lids.persistentvolume,
+            lids.storageclass,
+            lids.source_uuid,
+            tr.cost_type,
+            tr.usage_type,
+            tr.metric,
+            tr.labels_field,
+            tr.rate,
+            tr.tag_key,
+            tr.tag_value
+    ) AS sub
+) AS costs
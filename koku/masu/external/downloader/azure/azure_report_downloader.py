@@ -19,6 +19,7 @@ from masu.external.downloader.azure.azure_service import AzureService
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
 from masu.util.aws.common import copy_local_report_file_to_s3_bucket
+from masu.util.aws.common import get_manifest_keyed_filename
 from masu.util.aws.common import remove_files_not_in_set_from_s3_bucket
 from masu.util.azure import common as utils
 from masu.util.common import extract_uuids_from_string
@@ -245,7 +246,13 @@ class AzureReportDownloader(ReportDownloaderBase, DownloaderInterface):
             self.account, Provider.PROVIDER_AZURE, self._provider_uuid, start_date, Config.CSV_DATA_TYPE
         )
         copy_local_report_file_to_s3_bucket(
-            self.tracing_id, s3_csv_path, full_file_path, local_filename, manifest_id, start_date, self.context
+            self.tracing_id,
+            s3_csv_path,
+            full_file_path,
+            get_manifest_keyed_filename(local_filename, manifest_id),
+            manifest_id,
+            start_date,
+            self.context,
         )
 
         manifest_accessor = ReportManifestDBAccessor()
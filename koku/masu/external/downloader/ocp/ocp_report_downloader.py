@@ -30,34 +30,58 @@ REPORTS_DIR = Config.INSIGHTS_LOCAL_REPORT_DIR
 LOG = logging.getLogger(__name__)
 
 
-def divide_csv_daily(file_path, filename):
+def _split_csv_daily(file_path):  # noqa: C901
     """
-    Split local file into daily content.
+    Stream a local file into daily files in a single pass.
+
+    Rows are read in chunks and appended to a file per interval_start date. Operator
+    reports are ordered by interval, so a day is closed and yielded as soon as a chunk
+    starts after it. Should a closed day show up again it is reopened, appended to and
+    yielded again once complete.
     """
-    daily_files = []
     directory = os.path.dirname(file_path)
+    report_type, _ = utils.detect_type(file_path)
+    open_files = {}
+    written_days = set()
+
+    def close_day(day):
+        open_files.pop(day).close()
+        day_file = f"{report_type}.{day}.csv"
+        return {"filename": day_file, "filepath": f"{directory}/{day_file}"}
 
     try:
-        data_frame = pd.read_csv(file_path)
+        with pd.read_csv(file_path, dtype=str, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE) as reader:
+            for data_frame in reader:
+                days = data_frame.interval_start.str[:10]
+                chunk_days = set(days.dropna())
+                for day, day_frame in data_frame.groupby(days, sort=False):
+                    if day not in open_files:
+                        mode = "a" if day in written_days else "w"
+                        open_files[day] = open(f"{directory}/{report_type}.{day}.csv", mode)
+                    day_frame.to_csv(open_files[day], index=False, header=day not in written_days)
+                    written_days.add(day)
+                if chunk_days:
+                    first_day = min(chunk_days)
+                    for day in [day for day in open_files if day < first_day]:
+                        yield close_day(day)
     except Exception as error:
+        for handle in open_files.values():
+            handle.close()
         LOG.error(f"File {file_path} could not be parsed. Reason: {str(error)}")
         raise error
 
-    report_type, _ = utils.detect_type(file_path)
-    unique_times = data_frame.interval_start.unique()
-    days = list({cur_dt[:10] for cur_dt in unique_times})
-    daily_data_frames = [
-        {"data_frame": data_frame[data_frame.interval_start.str.contains(cur_day)], "date": cur_day}
-        for cur_day in days
-    ]
-
-    for daily_data in daily_data_frames:
-        day = daily_data.get("date")
-        df = daily_data.get("data_frame")
-        day_file = f"{report_type}.{day}.csv"
-        day_filepath = f"{directory}/{day_file}"
-        df.to_csv(day_filepath, index=False, header=True)
-        daily_files.append({"filename": day_file, "filepath": day_filepath})
+    for day in list(open_files):
+        yield close_day(day)
+
+
+def divide_csv_daily(file_path, filename):
+    """
+    Split local file into daily content.
+    """
+    daily_files = []
+    for daily_file in _split_csv_daily(file_path):
+        if daily_file not in daily_files:
+            daily_files.append(daily_file)
     return daily_files
 
 
@@ -81,7 +105,8 @@ def create_daily_archives(tracing_id, account, provider_uuid, filename, filepath
         if context.get("version"):
             daily_files = [{"filepath": filepath, "filename": filename}]
         else:
-            daily_files = divide_csv_daily(filepath, filename)
+            # Each day is uploaded as soon as the splitter closes it
+            daily_files = _split_csv_daily(filepath)
         for daily_file in daily_files:
             # Push to S3
             s3_csv_path = get_path_prefix(
@@ -96,7 +121,8 @@ def create_daily_archives(tracing_id, account, provider_uuid, filename, filepath
                 start_date,
                 context,
             )
-            daily_file_names.append(daily_file.get("filepath"))
+            if daily_file.get("filepath") not in daily_file_names:
+                daily_file_names.append(daily_file.get("filepath"))
     return daily_file_names
 
 
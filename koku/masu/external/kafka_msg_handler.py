@@ -13,10 +13,13 @@ import tempfile
 import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from tarfile import ReadError
 from tarfile import TarFile
 
 import requests
+from confluent_kafka import KafkaException
+from confluent_kafka import TIMESTAMP_NOT_AVAILABLE
 from confluent_kafka import TopicPartition
 from django.db import connections
 from django.db import DEFAULT_DB_ALIAS
@@ -44,12 +47,20 @@ from masu.processor.tasks import record_all_manifest_files
 from masu.processor.tasks import record_report_status
 from masu.processor.tasks import summarize_reports
 from masu.prometheus_stats import KAFKA_CONNECTION_ERRORS_COUNTER
+from masu.prometheus_stats import KAFKA_MESSAGE_LATENCY
+from masu.prometheus_stats import KAFKA_MESSAGES_IN_FLIGHT
+from masu.prometheus_stats import KAFKA_MESSAGES_PROCESSED_COUNTER
 from masu.util.ocp import common as utils
 
 
 LOG = logging.getLogger(__name__)
 SUCCESS_CONFIRM_STATUS = "success"
 FAILURE_CONFIRM_STATUS = "failure"
+LISTENER_COMMIT = "commit"
+LISTENER_RETRY = "retry"
+LISTENER_SKIP = "skip"
+# Payload tar members are copied to disk in chunks of this many bytes
+PAYLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class KafkaMsgHandlerError(Exception):
@@ -128,7 +139,7 @@ def get_account_from_cluster_id(cluster_id, manifest_uuid, context={}):
 
 def download_payload(request_id, url, context={}):
     """
-    Download the payload from ingress to temporary location.
+    Open a streaming download of the payload from ingress.
 
         Args:
         request_id (String): Identifier associated with the payload
@@ -136,77 +147,121 @@ def download_payload(request_id, url, context={}):
         context (Dict): Context for logging (account, etc)
 
         Returns:
-        Tuple: temp_dir (String), temp_file (String)
+        (requests.Response): The response, the payload is read in chunks from its raw stream
     """
-    # Create temporary directory for initial file staging and verification in the
-    # OpenShift PVC directory so that any failures can be triaged in the event
-    # the pod goes down.
-    os.makedirs(Config.PVC_DIR, exist_ok=True)
-    temp_dir = tempfile.mkdtemp(dir=Config.PVC_DIR)
-
-    # Download file from quarantine bucket as tar.gz
     try:
-        download_response = requests.get(url)
+        download_response = requests.get(url, stream=True)
         download_response.raise_for_status()
     except requests.exceptions.HTTPError as err:
-        shutil.rmtree(temp_dir)
         msg = f"Unable to download file. Error: {str(err)}"
         LOG.warning(log_json(request_id, msg))
         raise KafkaMsgHandlerError(msg)
 
-    sanitized_request_id = re.sub("[^A-Za-z0-9]+", "", request_id)
-    gzip_filename = f"{sanitized_request_id}.tar.gz"
-    temp_file = f"{temp_dir}/{gzip_filename}"
+    download_response.raw.decode_content = True
+    return download_response
+
+
+def write_payload_member(request_id, tarball, member, path, context={}):
+    """
+    Stream a payload tar member to a file.
+
+        Args:
+        request_id (String): Identifier associated with the payload
+        tarball (TarFile): the payload opened as a stream
+        member (TarInfo): the member to write
+        path (String): the file to write the member to
+        context (Dict): Context for logging (account, etc)
+    """
     try:
-        temp_file_hdl = open(temp_file, "wb")
-        temp_file_hdl.write(download_response.content)
-        temp_file_hdl.close()
+        with tarball.extractfile(member) as member_file, open(path, "wb") as out_file:
+            shutil.copyfileobj(member_file, out_file, PAYLOAD_CHUNK_SIZE)
     except OSError as error:
-        shutil.rmtree(temp_dir)
         msg = f"Unable to write file. Error: {str(error)}"
         LOG.warning(log_json(request_id, msg, context))
         raise KafkaMsgHandlerError(msg)
 
-    return (temp_dir, temp_file, gzip_filename)
-
 
-def extract_payload_contents(request_id, out_dir, tarball_path, tarball, context={}):
+def move_payload_reports(request_id, staged_paths, destination_dir, context={}):
     """
-    Extract the payload contents into a temporary location.
+    Move extracted reports to their destination, all of them or none.
 
         Args:
         request_id (String): Identifier associated with the payload
-        out_dir (String): temporary directory to extract data to
-        tarball_path (String): the path to the payload file to extract
-        tarball (String): the payload file to extract
+        staged_paths (Dict): the extracted report paths keyed by file name
+        destination_dir (String): the report directory
         context (Dict): Context for logging (account, etc)
+    """
+    moved_paths = []
+    try:
+        for filename, staged_path in staged_paths.items():
+            moved_paths.append(f"{destination_dir}/{filename}")
+            shutil.move(staged_path, moved_paths[-1])
+    except OSError as error:
+        for moved_path in moved_paths:
+            if os.path.exists(moved_path):
+                os.remove(moved_path)
+        msg = f"Unable to move reports to {destination_dir}. Reason: {str(error)}"
+        LOG.warning(log_json(request_id, msg, context))
+        raise KafkaMsgHandlerError("Extraction failure.")
 
-        Returns:
-            (String): path to manifest file
+
+def extract_payload_contents(request_id, out_dir, download_response, get_destination_dir, context={}):
     """
-    # Extract tarball into temp directory
+    Extract the payload contents from the download stream.
 
-    if not os.path.isfile(tarball_path):
-        msg = f"Unable to find tar file {tarball_path}."
-        LOG.warning(log_json(request_id, msg, context))
-        raise KafkaMsgHandlerError("Extraction failure, file not found.")
+    Only the manifest and the reports it lists are written, each once, to out_dir. The
+    manifest is passed to get_destination_dir, which returns the directory the reports are
+    moved to, or None to stop the extraction. Reports are moved only once the whole payload
+    was read, so a payload that fails mid-stream leaves nothing in the destination.
 
+        Args:
+        request_id (String): Identifier associated with the payload
+        out_dir (String): temporary directory to extract the payload to
+        download_response (requests.Response): the streaming payload download
+        get_destination_dir (Function): maps the manifest path to the report directory
+        context (Dict): Context for logging (account, etc)
+
+        Returns:
+            (String): path to manifest file, None if the extraction was stopped
+    """
+    manifest_path = None
+    report_files = None
+    destination_dir = None
+    staged_paths = {}
     try:
-        mytar = TarFile.open(tarball_path, mode="r:gz")
-        mytar.extractall(path=out_dir)
-        files = mytar.getnames()
-        manifest_path = [manifest for manifest in files if "manifest.json" in manifest]
-    except (ReadError, EOFError, OSError) as error:
-        msg = f"Unable to untar file {tarball_path}. Reason: {str(error)}"
+        with TarFile.open(fileobj=download_response.raw, mode="r|gz") as tarball:
+            for member in tarball:
+                if not member.isfile():
+                    continue
+                # Members are flattened so that no path in the tarball can escape the output directory
+                filename = os.path.basename(member.name)
+                if filename == "manifest.json":
+                    manifest_path = f"{out_dir}/{filename}"
+                    write_payload_member(request_id, tarball, member, manifest_path, context)
+                    with open(manifest_path) as manifest_file:
+                        report_files = {os.path.basename(name) for name in json.load(manifest_file).get("files", [])}
+                    destination_dir = get_destination_dir(manifest_path)
+                    if destination_dir is None:
+                        return None
+                    # Reports that preceded the manifest but are not listed in it are dropped
+                    for unlisted in set(staged_paths) - report_files:
+                        os.remove(staged_paths.pop(unlisted))
+                elif report_files is None or filename in report_files:
+                    staged_paths[filename] = f"{out_dir}/{filename}"
+                    write_payload_member(request_id, tarball, member, staged_paths[filename], context)
+    except (ReadError, EOFError, OSError, ValueError) as error:
+        msg = f"Unable to untar payload. Reason: {str(error)}"
         LOG.warning(log_json(request_id, msg, context))
-        shutil.rmtree(out_dir)
         raise KafkaMsgHandlerError("Extraction failure.")
+    finally:
+        download_response.close()
 
     if not manifest_path:
         msg = "No manifest found in payload."
         LOG.warning(log_json(request_id, msg, context))
         raise KafkaMsgHandlerError("No manifest found in payload.")
 
+    move_payload_reports(request_id, staged_paths, destination_dir, context)
     return manifest_path
 
 
@@ -274,13 +329,71 @@ def extract_payload(url, request_id, context={}):  # noqa: C901
                 current_file: String
 
     """
-    temp_dir, temp_file_path, temp_file = download_payload(request_id, url, context)
-    manifest_path = extract_payload_contents(request_id, temp_dir, temp_file_path, temp_file, context)
+    # Stage the manifest in the OpenShift PVC directory so that any failures can be triaged
+    # in the event the pod goes down.
+    os.makedirs(Config.PVC_DIR, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=Config.PVC_DIR)
+    report_meta = {}
+
+    def prepare_destination(manifest_path):
+        """Resolve the account of the manifest and return the report directory, None without an account."""
+        report_meta.update(utils.get_report_details(os.path.dirname(manifest_path)))
+        if not _set_report_account(report_meta, request_id, context):
+            return None
+        # Create directory tree for report.
+        usage_month = utils.month_date_range(report_meta.get("date"))
+        destination_dir = f"{Config.INSIGHTS_LOCAL_REPORT_DIR}/{report_meta.get('cluster_id')}/{usage_month}"
+        os.makedirs(destination_dir, exist_ok=True)
+        report_meta["destination_dir"] = destination_dir
+        return destination_dir
 
-    # Open manifest.json file and build the payload dictionary.
-    full_manifest_path = f"{temp_dir}/{manifest_path[0]}"
-    report_meta = utils.get_report_details(os.path.dirname(full_manifest_path))
+    try:
+        download_response = download_payload(request_id, url, context)
+        manifest_path = extract_payload_contents(request_id, temp_dir, download_response, prepare_destination, context)
+    except KafkaMsgHandlerError:
+        shutil.rmtree(temp_dir)
+        raise
+    manifest_uuid = report_meta.get("uuid", request_id)
+    if not manifest_path:
+        shutil.rmtree(temp_dir)
+        return None, manifest_uuid
+
+    # Copy manifest
+    destination_dir = report_meta.pop("destination_dir")
+    usage_month = os.path.basename(destination_dir)
+    manifest_destination_path = f"{destination_dir}/{os.path.basename(report_meta.get('manifest_path'))}"
+    shutil.copy(report_meta.get("manifest_path"), manifest_destination_path)
+
+    # Save Manifest
+    report_meta["manifest_id"] = create_manifest_entries(report_meta, request_id, context)
+
+    # The reports were streamed to their destination during extraction
+    report_metas = []
+    for report_file in report_meta.get("files"):
+        current_meta = report_meta.copy()
+        payload_destination_path = f"{destination_dir}/{report_file}"
+        if not os.path.isfile(payload_destination_path):
+            msg = f"File {str(report_file)} has not downloaded yet."
+            LOG.debug(log_json(manifest_uuid, msg, context))
+            continue
+        current_meta["current_file"] = payload_destination_path
+        record_all_manifest_files(report_meta["manifest_id"], report_meta.get("files"), manifest_uuid)
+        if not record_report_status(report_meta["manifest_id"], report_file, manifest_uuid, context):
+            msg = f"Successfully extracted OCP for {report_meta.get('cluster_id')}/{usage_month}"
+            LOG.info(log_json(manifest_uuid, msg, context))
+            construct_parquet_reports(request_id, context, report_meta, payload_destination_path, report_file)
+            report_metas.append(current_meta)
+        else:
+            # Report already processed
+            pass
 
+    # Remove temporary directory and files
+    shutil.rmtree(temp_dir)
+    return report_metas, manifest_uuid
+
+
+def _set_report_account(report_meta, request_id, context):
+    """Add the account of the report cluster to report_meta and context, return False without an account."""
     # Filter and get account from payload's cluster-id
     cluster_id = report_meta.get("cluster_id")
     manifest_uuid = report_meta.get("uuid", request_id)
@@ -297,8 +410,7 @@ def extract_payload(url, request_id, context={}):  # noqa: C901
     if not account:
         msg = f"Recieved unexpected OCP report from {cluster_id}"
         LOG.warning(log_json(manifest_uuid, msg, context))
-        shutil.rmtree(temp_dir)
-        return None, manifest_uuid
+        return False
     schema_name = account.get("schema_name")
     provider_type = account.get("provider_type")
     if schema_name.startswith("acct"):
@@ -314,45 +426,7 @@ def extract_payload(url, request_id, context={}):  # noqa: C901
     report_meta["account"] = schema_name.strip("acct")
     report_meta["request_id"] = request_id
     report_meta["tracing_id"] = manifest_uuid
-
-    # Create directory tree for report.
-    usage_month = utils.month_date_range(report_meta.get("date"))
-    destination_dir = f"{Config.INSIGHTS_LOCAL_REPORT_DIR}/{report_meta.get('cluster_id')}/{usage_month}"
-    os.makedirs(destination_dir, exist_ok=True)
-
-    # Copy manifest
-    manifest_destination_path = f"{destination_dir}/{os.path.basename(report_meta.get('manifest_path'))}"
-    shutil.copy(report_meta.get("manifest_path"), manifest_destination_path)
-
-    # Save Manifest
-    report_meta["manifest_id"] = create_manifest_entries(report_meta, request_id, context)
-
-    # Copy report payload
-    report_metas = []
-    for report_file in report_meta.get("files"):
-        current_meta = report_meta.copy()
-        subdirectory = os.path.dirname(full_manifest_path)
-        payload_source_path = f"{subdirectory}/{report_file}"
-        payload_destination_path = f"{destination_dir}/{report_file}"
-        try:
-            shutil.copy(payload_source_path, payload_destination_path)
-            current_meta["current_file"] = payload_destination_path
-            record_all_manifest_files(report_meta["manifest_id"], report_meta.get("files"), manifest_uuid)
-            if not record_report_status(report_meta["manifest_id"], report_file, manifest_uuid, context):
-                msg = f"Successfully extracted OCP for {report_meta.get('cluster_id')}/{usage_month}"
-                LOG.info(log_json(manifest_uuid, msg, context))
-                construct_parquet_reports(request_id, context, report_meta, payload_destination_path, report_file)
-                report_metas.append(current_meta)
-            else:
-                # Report already processed
-                pass
-        except FileNotFoundError:
-            msg = f"File {str(report_file)} has not downloaded yet."
-            LOG.debug(log_json(manifest_uuid, msg, context))
-
-    # Remove temporary directory and files
-    shutil.rmtree(temp_dir)
-    return report_metas, manifest_uuid
+    return True
 
 
 @KAFKA_CONNECTION_ERRORS_COUNTER.count_exceptions()
@@ -693,6 +767,11 @@ def get_producer():  # pragma: no cover
 def listen_for_messages_loop():
     """Wrap listen_for_messages in while true."""
     consumer = get_consumer()
+    if Config.KAFKA_CONSUMER_WORKERS > 1:
+        LOG.info(f"Consumer is listening for messages with {Config.KAFKA_CONSUMER_WORKERS} workers...")
+        listen_for_messages_concurrently(consumer, Config.KAFKA_CONSUMER_WORKERS)
+        return
+
     LOG.info("Consumer is listening for messages...")
     for _ in itertools.count():  # equivalent to while True, but mockable
         msg = consumer.poll(timeout=1.0)
@@ -714,57 +793,168 @@ def rewind_consumer_to_retry(consumer, topic_partition):
     time.sleep(Config.RETRY_SECONDS)
 
 
-def listen_for_messages(msg, consumer):
+def handle_listener_message(msg):
     """
-    Listen for messages on the hccm topic.
-
-    Once a message from one of these topics arrives, we add
-    them extract the payload and line item process the report files.
-
-    Once all files from the manifest are complete a celery job is
-    dispatched to the worker to complete summary processing for the manifest.
+    Process a message from the upload topic.
 
-    Several exceptions can occur while listening for messages:
+    Several exceptions can occur while processing:
     Database Errors - Re-processing attempts will be made until successful.
     Internal Errors - Re-processing attempts will be made until successful.
     Report Processing Errors - Kafka message will be committed with an error.
                                Errors of this type would require a report processor
                                fix and we do not want to block the message queue.
 
-    Upon successful processing the kafka message is manually committed.  Manual
-    commits are used so we can use the message queue to store unprocessed messages
-    to make the service more tolerant of SIGTERM events.
-
     Args:
-        consumer - (Consumer): kafka consumer for HCCM ingress topic.
+        msg (ConsumerRecord) - Message from kafka hccm topic.
 
     Returns:
-        None
+        (String): LISTENER_COMMIT when the offset can be committed, LISTENER_RETRY when the
+                  message has to be processed again, LISTENER_SKIP otherwise
 
     """
     offset = msg.offset()
     partition = msg.partition()
-    topic_partition = TopicPartition(topic=Config.UPLOAD_TOPIC, partition=partition, offset=offset)
+    outcome = LISTENER_SKIP
+    KAFKA_MESSAGES_IN_FLIGHT.inc()
     try:
         LOG.info(f"Processing message offset: {offset} partition: {partition}")
         process_messages(msg)
-        LOG.debug(f"COMMITTING: message offset: {offset} partition: {partition}")
-        consumer.commit()
+        outcome = LISTENER_COMMIT
     except (InterfaceError, OperationalError, ReportProcessorDBError) as error:
         close_and_set_db_connection()
         LOG.error(f"[listen_for_messages] Database error. Error: {type(error).__name__}: {error}. Retrying...")
-        rewind_consumer_to_retry(consumer, topic_partition)
+        outcome = LISTENER_RETRY
     except (KafkaMsgHandlerError, RabbitOperationalError) as error:
         LOG.error(f"[listen_for_messages] Internal error. {type(error).__name__}: {error}. Retrying...")
-        rewind_consumer_to_retry(consumer, topic_partition)
+        outcome = LISTENER_RETRY
     except ReportProcessorError as error:
         LOG.error(f"[listen_for_messages] Report processing error: {str(error)}")
-        LOG.debug(f"COMMITTING: message offset: {offset} partition: {partition}")
-        consumer.commit()
+        outcome = LISTENER_COMMIT
+    except Exception as error:
+        LOG.error(f"[listen_for_messages] UNKNOWN error encountered: {type(error).__name__}: {error}", exc_info=True)
+    finally:
+        KAFKA_MESSAGES_IN_FLIGHT.dec()
+
+    KAFKA_MESSAGES_PROCESSED_COUNTER.labels(outcome=outcome).inc()
+    timestamp_type, timestamp = msg.timestamp()
+    if outcome != LISTENER_RETRY and timestamp_type != TIMESTAMP_NOT_AVAILABLE:
+        KAFKA_MESSAGE_LATENCY.observe(max(time.time() - timestamp / 1000, 0))
+    return outcome
+
+
+def listen_for_messages(msg, consumer):
+    """
+    Listen for messages on the hccm topic.
+
+    Once a message from one of these topics arrives, we add
+    them extract the payload and line item process the report files.
+
+    Once all files from the manifest are complete a celery job is
+    dispatched to the worker to complete summary processing for the manifest.
+
+    Upon successful processing the kafka message is manually committed.  Manual
+    commits are used so we can use the message queue to store unprocessed messages
+    to make the service more tolerant of SIGTERM events.
+
+    Args:
+        consumer - (Consumer): kafka consumer for HCCM ingress topic.
+
+    Returns:
+        None
+
+    """
+    offset = msg.offset()
+    partition = msg.partition()
+    topic_partition = TopicPartition(topic=Config.UPLOAD_TOPIC, partition=partition, offset=offset)
+    outcome = handle_listener_message(msg)
+    try:
+        if outcome == LISTENER_COMMIT:
+            LOG.debug(f"COMMITTING: message offset: {offset} partition: {partition}")
+            consumer.commit()
+        elif outcome == LISTENER_RETRY:
+            rewind_consumer_to_retry(consumer, topic_partition)
     except Exception as error:
         LOG.error(f"[listen_for_messages] UNKNOWN error encountered: {type(error).__name__}: {error}", exc_info=True)
 
 
+def _complete_listener_messages(consumer, in_flight, retries):
+    """Commit or rewind the partitions of the messages whose processing completed."""
+    for key, (msg, future) in list(in_flight.items()):
+        if not future.done():
+            continue
+        del in_flight[key]
+        outcome = future.result()
+        try:
+            if outcome == LISTENER_COMMIT:
+                LOG.debug(f"COMMITTING: message offset: {msg.offset()} partition: {msg.partition()}")
+                consumer.commit(message=msg, asynchronous=False)
+            elif outcome == LISTENER_RETRY:
+                LOG.info(f"Seeking back to offset: {msg.offset()}, partition: {msg.partition()}")
+                consumer.seek(TopicPartition(topic=msg.topic(), partition=msg.partition(), offset=msg.offset()))
+                retries[key] = time.monotonic() + Config.RETRY_SECONDS
+        except KafkaException as error:
+            # The partition was revoked while the message was processed, its new owner will process it again
+            LOG.warning(f"[listen_for_messages] Unable to complete message offset {msg.offset()}: {error}")
+
+
+def _pause_busy_partitions(consumer, in_flight, retries, max_workers, paused):
+    """Pause the partitions with a message in flight or waiting to retry, or all of them when the pool is full."""
+    now = time.monotonic()
+    for key in [key for key, retry_at in retries.items() if retry_at <= now]:
+        del retries[key]
+    assignment = {(tp.topic, tp.partition) for tp in consumer.assignment()}
+    busy = assignment if len(in_flight) >= max_workers else set(in_flight) | set(retries)
+    to_pause = (busy & assignment) - paused
+    to_resume = (paused & assignment) - busy
+    if to_pause:
+        consumer.pause([TopicPartition(topic, partition) for topic, partition in to_pause])
+    if to_resume:
+        consumer.resume([TopicPartition(topic, partition) for topic, partition in to_resume])
+    paused.intersection_update(assignment)
+    paused.update(to_pause)
+    paused.difference_update(to_resume)
+
+
+def listen_for_messages_concurrently(consumer, max_workers):
+    """
+    Process the messages of different partitions in a bounded pool of workers.
+
+    A partition has at most one message in flight and stays paused until it completes, so the
+    offsets of each partition are committed in order once their processing completes. While
+    the pool is saturated every assigned partition is paused; polling continues so that the
+    consumer stays in its group.
+
+    Args:
+        consumer - (Consumer): kafka consumer for HCCM ingress topic.
+        max_workers - (Integer): number of messages processed concurrently
+
+    """
+    in_flight = {}
+    retries = {}
+    paused = set()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kafka-listener") as pool:
+        for _ in itertools.count():  # equivalent to while True, but mockable
+            _complete_listener_messages(consumer, in_flight, retries)
+            _pause_busy_partitions(consumer, in_flight, retries, max_workers, paused)
+            msg = consumer.poll(timeout=1.0)
+            if msg is None:
+                continue
+
+            if msg.error():
+                KAFKA_CONNECTION_ERRORS_COUNTER.inc()
+                LOG.error(f"[listen_for_messages_loop] consumer.poll message: {msg}. Error: {msg.error()}")
+                continue
+
+            key = (msg.topic(), msg.partition())
+            if key in in_flight or key in retries or len(in_flight) >= max_workers:
+                # Fetched before its partition was paused, it is delivered again once the partition resumes
+                consumer.seek(TopicPartition(topic=msg.topic(), partition=msg.partition(), offset=msg.offset()))
+                continue
+
+            in_flight[key] = (msg, pool.submit(handle_listener_message, msg))
+            _pause_busy_partitions(consumer, in_flight, retries, max_workers, paused)
+
+
 def koku_listener_thread():  # pragma: no cover
     """
     Configure Listener listener thread.
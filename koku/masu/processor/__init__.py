@@ -7,7 +7,7 @@ import logging
 
 from django.conf import settings
 
-from koku.feature_flags import UNLEASH_CLIENT
+from koku.feature_flags import FEATURE_FLAGS
 from masu.external import GZIP_COMPRESSED
 from masu.external import UNCOMPRESSED
 
@@ -16,17 +16,21 @@ LOG = logging.getLogger(__name__)
 ALLOWED_COMPRESSIONS = (UNCOMPRESSED, GZIP_COMPRESSED)
 
 
+def _trino_override(account, source_type):
+    """Check the environment overrides enabling Trino for an account or source type."""
+    return (
+        settings.ENABLE_PARQUET_PROCESSING
+        or source_type in settings.ENABLE_TRINO_SOURCE_TYPE
+        or account in settings.ENABLE_TRINO_ACCOUNTS
+    )
+
+
 def enable_trino_processing(source_uuid, source_type, account):  # noqa
     """Helper to determine if source is enabled for Trino."""
+    if source_uuid in settings.ENABLE_TRINO_SOURCES:
+        return True
+
     if account and not account.startswith("acct") and not account.startswith("org"):
         account = f"acct{account}"
 
-    context = {"schema": account, "source-type": source_type, "source-uuid": source_uuid}
-    LOG.info(f"enable_trino_processing context: {context}")
-    return bool(
-        settings.ENABLE_PARQUET_PROCESSING
-        or source_uuid in settings.ENABLE_TRINO_SOURCES
-        or source_type in settings.ENABLE_TRINO_SOURCE_TYPE
-        or account in settings.ENABLE_TRINO_ACCOUNTS
-        or UNLEASH_CLIENT.is_enabled("cost-trino-processor", context)
-    )
+    return FEATURE_FLAGS.is_enabled("cost-trino-processor", account, source_type, override=_trino_override)
@@ -58,6 +58,13 @@ class ProcessedReport:
 class AWSReportProcessor(ReportProcessorBase):
     """Cost Usage Report processor."""
 
+    DIMENSION_COLUMNS = (
+        "cost_entry_id",
+        "cost_entry_product_id",
+        "cost_entry_pricing_id",
+        "cost_entry_reservation_id",
+    )
+
     def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
@@ -87,10 +94,11 @@ class AWSReportProcessor(ReportProcessorBase):
         with AWSReportDBAccessor(self._schema) as report_db:
             self.report_schema = report_db.report_schema
             self.existing_bill_map = report_db.get_cost_entry_bills()
-            self.existing_cost_entry_map = report_db.get_cost_entries()
-            self.existing_product_map = report_db.get_products()
-            self.existing_pricing_map = report_db.get_pricing()
-            self.existing_reservation_map = report_db.get_reservations()
+        # Ids of the dimension rows resolved so far, shared by the files of the manifest
+        self.existing_cost_entry_map = self.dimensions.cache(AWSCostEntry)
+        self.existing_product_map = self.dimensions.cache(AWSCostEntryProduct)
+        self.existing_pricing_map = self.dimensions.cache(AWSCostEntryPricing)
+        self.existing_reservation_map = self.dimensions.cache(AWSCostEntryReservation)
 
         self.line_item_columns = None
         self.table_name = AWSCostEntryLineItem()
@@ -327,7 +335,7 @@ class AWSReportProcessor(ReportProcessorBase):
             bill_id (str): The current cost entry bill id
 
         Returns:
-            (str): The DB id of the cost entry object
+            (str): The DB id of the cost entry object or its PendingDimension placeholder
 
         """
         table_name = AWSCostEntry
@@ -341,12 +349,18 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.existing_cost_entry_map:
             return self.existing_cost_entry_map[key]
 
-        data = {"bill_id": bill_id, "interval_start": start, "interval_end": end}
-        with transaction.atomic():
-            cost_entry_id = report_db_accessor.insert_on_conflict_do_nothing(table_name, data)
-        self.processed_report.cost_entries[key] = cost_entry_id
+        cost_entry_id = self.dimensions.get(table_name, key)
+        if cost_entry_id is not None:
+            return cost_entry_id
 
-        return cost_entry_id
+        data = {"bill_id": bill_id, "interval_start": start, "interval_end": end}
+        return self.dimensions.add(
+            table_name,
+            key,
+            data,
+            key_columns=["bill_id", "interval_start", "interval_end"],
+            resolved=self.processed_report.cost_entries,
+        )
 
     def _create_cost_entry_line_item(
         self, row, cost_entry_id, bill_id, product_id, pricing_id, reservation_id, report_db_accesor
@@ -388,7 +402,7 @@ class AWSReportProcessor(ReportProcessorBase):
             row (dict): A dictionary representation of a CSV file row
 
         Returns:
-            (str): The DB id of the pricing object
+            (str): The DB id of the pricing object or its PendingDimension placeholder
 
         """
         table_name = AWSCostEntryPricing
@@ -403,16 +417,18 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.existing_pricing_map:
             return self.existing_pricing_map[key]
 
+        pricing_id = self.dimensions.get(table_name, key)
+        if pricing_id is not None:
+            return pricing_id
+
         data = self._get_data_for_table(row, table_name._meta.db_table)
         value_set = set(data.values())
         if value_set == {""}:
             return
 
-        with transaction.atomic():
-            pricing_id = report_db_accessor.insert_on_conflict_do_nothing(table_name, data)
-        self.processed_report.pricing[key] = pricing_id
-
-        return pricing_id
+        return self.dimensions.add(
+            table_name, key, data, key_columns=["term", "unit"], resolved=self.processed_report.pricing
+        )
 
     def _create_cost_entry_product(self, row, report_db_accessor):
         """Create a cost entry product object.
@@ -421,7 +437,7 @@ class AWSReportProcessor(ReportProcessorBase):
             row (dict): A dictionary representation of a CSV file row
 
         Returns:
-            (str): The DB id of the product object
+            (str): The DB id of the product object or its PendingDimension placeholder
 
         """
         table_name = AWSCostEntryProduct
@@ -436,17 +452,22 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.existing_product_map:
             return self.existing_product_map[key]
 
+        product_id = self.dimensions.get(table_name, key)
+        if product_id is not None:
+            return product_id
+
         data = self._get_data_for_table(row, table_name._meta.db_table)
         data = self._process_memory_value(data)
         value_set = set(data.values())
         if value_set == {""}:
             return
-        with transaction.atomic():
-            product_id = report_db_accessor.insert_on_conflict_do_nothing(
-                table_name, data, conflict_columns=["sku", "product_name", "region"]
-            )
-        self.processed_report.products[key] = product_id
-        return product_id
+        return self.dimensions.add(
+            table_name,
+            key,
+            data,
+            key_columns=["sku", "product_name", "region"],
+            resolved=self.processed_report.products,
+        )
 
     def _create_cost_entry_reservation(self, row, report_db_accessor):
         """Create a cost entry reservation object.
@@ -455,40 +476,41 @@ class AWSReportProcessor(ReportProcessorBase):
             row (dict): A dictionary representation of a CSV file row
 
         Returns:
-            (str): The DB id of the reservation object
+            (str): The DB id of the reservation object or its PendingDimension placeholder
 
         """
         table_name = AWSCostEntryReservation
         arn = row.get("reservation/ReservationARN")
         line_item_type = row.get("lineItem/LineItemType", "").lower()
-        reservation_id = None
 
         if arn in self.processed_report.reservations:
             reservation_id = self.processed_report.reservations.get(arn)
         elif arn in self.existing_reservation_map:
             reservation_id = self.existing_reservation_map[arn]
-
-        if reservation_id is None or line_item_type == "rifee":
-            data = self._get_data_for_table(row, table_name._meta.db_table)
-            value_set = set(data.values())
-            if value_set == {""}:
-                return
         else:
+            reservation_id = self.dimensions.get(table_name, arn)
+
+        if reservation_id is not None and line_item_type != "rifee":
             return reservation_id
 
+        data = self._get_data_for_table(row, table_name._meta.db_table)
+        value_set = set(data.values())
+        if value_set == {""}:
+            return
+
         # Special rows with additional reservation information
-        with transaction.atomic():
-            if line_item_type == "rifee":
-                reservation_id = report_db_accessor.insert_on_conflict_do_update(
-                    table_name, data, conflict_columns=["reservation_arn"], set_columns=list(data.keys())
-                )
-            else:
-                reservation_id = report_db_accessor.insert_on_conflict_do_nothing(
-                    table_name, data, conflict_columns=["reservation_arn"]
-                )
-        self.processed_report.reservations[arn] = reservation_id
-
-        return reservation_id
+        if line_item_type == "rifee":
+            return self.dimensions.add(
+                table_name,
+                arn,
+                data,
+                key_columns=["reservation_arn"],
+                resolved=self.processed_report.reservations,
+                set_columns=list(data.keys()),
+            )
+        return self.dimensions.add(
+            table_name, arn, data, key_columns=["reservation_arn"], resolved=self.processed_report.reservations
+        )
 
     def create_cost_entry_objects(self, row, report_db_accesor):
         """Create the set of objects required for a row of data."""
@@ -64,6 +64,8 @@ class ProcessedAzureReport:
 class AzureReportProcessor(ReportProcessorBase):
     """Cost Usage Report processor."""
 
+    DIMENSION_COLUMNS = ("cost_entry_product_id", "meter_id")
+
     def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
@@ -94,8 +96,9 @@ class AzureReportProcessor(ReportProcessorBase):
         with AzureReportDBAccessor(self._schema) as report_db:
             self.report_schema = report_db.report_schema
             self.existing_bill_map = report_db.get_cost_entry_bills()
-            self.existing_product_map = report_db.get_products()
-            self.existing_meter_map = report_db.get_meters()
+        # Ids of the dimension rows resolved so far, shared by the files of the manifest
+        self.existing_product_map = self.dimensions.cache(AzureCostEntryProductService)
+        self.existing_meter_map = self.dimensions.cache(AzureMeter)
 
         self.line_item_columns = None
         self.table_name = AzureCostEntryLineItemDaily()
@@ -176,9 +179,10 @@ class AzureReportProcessor(ReportProcessorBase):
             row (dict): A dictionary representation of a CSV file row
 
         Returns:
-            (str): The DB id of the product object
+            (str): The DB id of the product object or its PendingDimension placeholder
 
         """
+        table_name = AzureCostEntryProductService
         instance_id = row.get("instanceid")
         additional_info = row.get("additionalinfo")
         service_name = row.get("servicename")
@@ -199,20 +203,23 @@ class AzureReportProcessor(ReportProcessorBase):
         if key in self.existing_product_map:
             return self.existing_product_map[key]
 
-        data = self._get_data_for_table(row, AzureCostEntryProductService._meta.db_table)
+        product_id = self.dimensions.get(table_name, key)
+        if product_id is not None:
+            return product_id
+
+        data = self._get_data_for_table(row, table_name._meta.db_table)
         value_set = set(data.values())
         if value_set == {""}:
             return
         data["instance_type"] = instance_type
         data["provider_id"] = self._provider_uuid
-        with transaction.atomic():
-            product_id = report_db_accessor.insert_on_conflict_do_nothing(
-                AzureCostEntryProductService,
-                data,
-                conflict_columns=["instance_id", "instance_type", "service_tier", "service_name"],
-            )
-        self.processed_report.products[key] = product_id
-        return product_id
+        return self.dimensions.add(
+            table_name,
+            key,
+            data,
+            key_columns=["instance_id", "instance_type", "service_tier", "service_name"],
+            resolved=self.processed_report.products,
+        )
 
     def _create_meter(self, row, report_db_accessor):
         """Create a cost entry product object.
@@ -221,9 +228,10 @@ class AzureReportProcessor(ReportProcessorBase):
             row (dict): A dictionary representation of a CSV file row
 
         Returns:
-            (str): The DB id of the product object
+            (str): The DB id of the meter object or its PendingDimension placeholder
 
         """
+        table_name = AzureMeter
         meter_id = row.get("meterid")
 
         key = (meter_id,)
@@ -234,17 +242,18 @@ class AzureReportProcessor(ReportProcessorBase):
         if key in self.existing_meter_map:
             return self.existing_meter_map[key]
 
-        data = self._get_data_for_table(row, AzureMeter._meta.db_table)
+        meter_pk = self.dimensions.get(table_name, key)
+        if meter_pk is not None:
+            return meter_pk
+
+        data = self._get_data_for_table(row, table_name._meta.db_table)
         value_set = set(data.values())
         if value_set == {""}:
             return
         data["provider_id"] = self._provider_uuid
-        with transaction.atomic():
-            meter_pk = report_db_accessor.insert_on_conflict_do_nothing(
-                AzureMeter, data, conflict_columns=["meter_id"]
-            )
-        self.processed_report.meters[key] = meter_pk
-        return meter_pk
+        return self.dimensions.add(
+            table_name, key, data, key_columns=["meter_id"], resolved=self.processed_report.meters
+        )
 
     def _create_cost_entry_line_item(self, row, bill_id, product_id, meter_id, report_db_accesor):
         """Create a cost entry line item object.
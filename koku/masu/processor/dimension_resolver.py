@@ -0,0 +1,178 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Batched resolution of report dimension rows to database ids."""
+import logging
+from collections import OrderedDict
+
+from masu.config import Config
+
+LOG = logging.getLogger(__name__)
+
+# The number of manifests whose dimension ids are kept in process.
+MANIFEST_CACHE_COUNT = 4
+
+_manifest_caches = OrderedDict()
+
+
+class DimensionCache(OrderedDict):
+    """A bounded map of dimension keys to database ids evicting the least recently used ids."""
+
+    def __init__(self, max_size):
+        """Initialize an empty cache holding at most max_size ids."""
+        super().__init__()
+        self.max_size = max_size
+
+    def __getitem__(self, key):
+        """Return the id of key and mark it as recently used."""
+        row_id = super().__getitem__(key)
+        self.move_to_end(key)
+        return row_id
+
+    def __setitem__(self, key, row_id):
+        """Cache the id of key, evicting the least recently used id when full."""
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, row_id)
+        if len(self) > self.max_size:
+            del self[next(iter(self))]
+
+
+def get_manifest_dimension_caches(schema_name, manifest_id):
+    """Return the per table dimension caches shared by the files of a manifest.
+
+    Only the caches of the most recent manifests are kept. Without a manifest the
+    caches are private to the caller.
+    """
+    if not manifest_id:
+        return {}
+    key = (schema_name, manifest_id)
+    caches = _manifest_caches.get(key)
+    if caches is None:
+        caches = _manifest_caches[key] = {}
+        if len(_manifest_caches) > MANIFEST_CACHE_COUNT:
+            _manifest_caches.popitem(last=False)
+    _manifest_caches.move_to_end(key)
+    return caches
+
+
+class PendingDimension:
+    """Placeholder for a dimension id that is resolved with the next batch."""
+
+    __slots__ = ("resolved", "table_name", "key")
+
+    def __init__(self, resolved, table_name, key):
+        """Initialize the placeholder of key in table_name, whose id is stored in resolved."""
+        self.resolved = resolved
+        self.table_name = table_name
+        self.key = key
+
+    def __eq__(self, other):
+        """Return whether both placeholders stand for the same row."""
+        if not isinstance(other, PendingDimension):
+            return NotImplemented
+        return (self.table_name, self.key) == (other.table_name, other.key)
+
+    def __hash__(self):
+        """Return the hash of the row the placeholder stands for."""
+        return hash((self.table_name, self.key))
+
+    def __repr__(self):
+        """Return the placeholder representation."""
+        return f"PendingDimension({self.table_name!r}, {self.key!r})"
+
+
+class DimensionResolver:
+    """Collect the distinct dimension rows of a batch and resolve them one statement per table.
+
+    Processors look dimension ids up in the cache() of a table, which the files of a manifest
+    share. Unknown dimensions are queued with add(), which returns a PendingDimension placeholder
+    to store on the line item. resolve() writes the queued rows and stores their ids in the
+    cache and in the batch map given to add(), and resolve_line_items() swaps the placeholders
+    for ids.
+    """
+
+    def __init__(self, schema_name, manifest_id=None, cache_size=None):
+        """Initialize the resolver.
+
+        Args:
+            schema_name (str): The customer schema
+            manifest_id (int): Files of the same manifest share resolved ids
+            cache_size (int): The maximum number of ids cached per table
+
+        """
+        self._caches = get_manifest_dimension_caches(schema_name, manifest_id)
+        self._cache_size = cache_size or Config.DIMENSION_CACHE_SIZE
+        self._pending = OrderedDict()
+
+    def cache(self, table):
+        """Return the id cache of table."""
+        table_name = table._meta.db_table
+        cache = self._caches.get(table_name)
+        if cache is None:
+            cache = self._caches[table_name] = DimensionCache(self._cache_size)
+        return cache
+
+    def get(self, table, key):
+        """Return the placeholder of key if it is queued for the batch, or None."""
+        for (pending_table, _, _), (resolved, rows) in self._pending.items():
+            if pending_table is table and key in rows:
+                return PendingDimension(resolved, table._meta.db_table, key)
+        return None
+
+    def add(self, table, key, data, key_columns, resolved, set_columns=None):
+        """Queue a dimension row for the next batch and return its placeholder.
+
+        Args:
+            table (DjangoModel): The dimension table
+            key (hashable): The processor key of the row
+            data (dict): The row data
+            key_columns (list): Columns identifying the row in the database
+            resolved (dict): The batch map of processor keys to ids the row id is stored in
+            set_columns (list): Columns updated when the row already exists
+
+        Returns:
+            (PendingDimension): The placeholder of the row id
+
+        """
+        group = (table, tuple(key_columns), tuple(set_columns or ()))
+        _, rows = self._pending.setdefault(group, (resolved, OrderedDict()))
+        rows[key] = data
+        return PendingDimension(resolved, table._meta.db_table, key)
+
+    def resolve(self, report_db_accessor):
+        """Write the queued rows with one statement per table and store their ids.
+
+        If a statement fails, the ids of the batch are evicted, since the transaction the
+        rows were written in is rolled back. Ids resolved by earlier batches are kept.
+        """
+        pending, self._pending = self._pending, OrderedDict()
+        try:
+            for (table, key_columns, set_columns), (resolved, rows) in pending.items():
+                ids = report_db_accessor.insert_on_conflict_returning(
+                    table, list(rows.values()), list(key_columns), set_columns=list(set_columns)
+                )
+                resolved.update(zip(rows, ids))
+                self.cache(table).update(zip(rows, ids))
+                LOG.debug("Resolved %d rows in %s", len(ids), table._meta.db_table)
+        except Exception:
+            for (table, _, _), (resolved, rows) in pending.items():
+                cache = self.cache(table)
+                for key in rows:
+                    resolved.pop(key, None)
+                    cache.pop(key, None)
+            raise
+
+    @staticmethod
+    def resolve_value(value):
+        """Return the resolved id of a placeholder; other values are returned unchanged."""
+        if isinstance(value, PendingDimension):
+            return value.resolved[value.key]
+        return value
+
+    def resolve_line_items(self, line_items, columns):
+        """Replace the placeholders in the columns of line_items with resolved ids."""
+        for line_item in line_items:
+            for column in columns:
+                line_item[column] = self.resolve_value(line_item.get(column))
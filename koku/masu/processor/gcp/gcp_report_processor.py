@@ -63,6 +63,8 @@ class ProcessedGCPReport:
 class GCPReportProcessor(ReportProcessorBase):
     """Cost Usage Report processor."""
 
+    DIMENSION_COLUMNS = ("project_id", "cost_entry_product_id")
+
     def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
@@ -92,10 +94,12 @@ class GCPReportProcessor(ReportProcessorBase):
         with GCPReportDBAccessor(self._schema) as report_db:
             self.report_schema = report_db.report_schema
             self.existing_bill_map = report_db.get_cost_entry_bills()
-            self.existing_product_map = report_db.get_products()
-            self.existing_projects_map = report_db.get_projects()
             self.report_scan_range = report_db.get_gcp_scan_range_from_report_name(report_name=self._report_name)
 
+        # Ids of the dimension rows resolved so far, shared by the files of the manifest
+        self.existing_product_map = self.dimensions.cache(GCPCostEntryProductService)
+        self.existing_projects_map = self.dimensions.cache(GCPProject)
+
         self.scan_start = self.report_scan_range.get("start")
         self.scan_end = self.report_scan_range.get("end")
         if not self.scan_start or not self.scan_end:
@@ -229,7 +233,7 @@ class GCPReportProcessor(ReportProcessorBase):
             row (OrderedDict): A dictionary representation of a CSV file row.
 
         Returns:
-             (string) A GCP Project instance id with project_id matching row_id.
+             (string) A GCP Project instance id with project_id matching row_id, or its PendingDimension placeholder.
 
         """
         table_name = GCPProject
@@ -243,13 +247,18 @@ class GCPReportProcessor(ReportProcessorBase):
         if key in self.existing_projects_map:
             return self.existing_projects_map[key]
 
-        with transaction.atomic():
-            project_id = report_db_accessor.insert_on_conflict_do_update(
-                table_name, data, conflict_columns=["project_id"], set_columns=list(data.keys())
-            )
-
-        self.processed_report.projects[key] = project_id
-        return project_id
+        project_id = self.dimensions.get(table_name, key)
+        if project_id is not None:
+            return project_id
+
+        return self.dimensions.add(
+            table_name,
+            key,
+            data,
+            key_columns=["project_id"],
+            resolved=self.processed_report.projects,
+            set_columns=list(data.keys()),
+        )
 
     def _get_or_create_gcp_service_product(self, row, report_db_accessor):
         """Get or create service product.
@@ -259,7 +268,7 @@ class GCPReportProcessor(ReportProcessorBase):
             report_db_accessor: accessor class.
 
         Returns:
-            service_product_id (id): Identifier for the Service Product
+            service_product_id (id): Identifier for the Service Product or its PendingDimension placeholder
         """
         table_name = GCPCostEntryProductService
         data = self._get_data_for_table(row, table_name._meta.db_table)
@@ -272,13 +281,17 @@ class GCPReportProcessor(ReportProcessorBase):
         if key in self.existing_product_map:
             return self.existing_product_map[key]
 
-        with transaction.atomic():
-            service_product_id = report_db_accessor.insert_on_conflict_do_nothing(
-                table_name, data, conflict_columns=["service_id", "service_alias", "sku_id", "sku_alias"]
-            )
+        service_product_id = self.dimensions.get(table_name, key)
+        if service_product_id is not None:
+            return service_product_id
 
-        self.processed_report.products[key] = service_product_id
-        return service_product_id
+        return self.dimensions.add(
+            table_name,
+            key,
+            data,
+            key_columns=["service_id", "service_alias", "sku_id", "sku_alias"],
+            resolved=self.processed_report.products,
+        )
 
     def _create_cost_entry_line_item(self, row, bill_id, project_id, report_db_accessor, service_product_id):
         """Create a cost entry line item object.
@@ -57,7 +57,7 @@ class ProcessedOCPReport:
 class OCPReportProcessor:
     """OCP Usage Report processor."""
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid):
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
         Args:
@@ -65,18 +65,23 @@ class OCPReportProcessor:
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            manifest_id (Integer): Manifest Identifier.
 
         """
         self._processor = None
         _, self.report_type = utils.detect_type(report_path)
         if self.report_type == utils.OCPReportTypes.CPU_MEM_USAGE:
-            self._processor = OCPCpuMemReportProcessor(schema_name, report_path, compression, provider_uuid)
+            self._processor = OCPCpuMemReportProcessor(
+                schema_name, report_path, compression, provider_uuid, manifest_id
+            )
         elif self.report_type == utils.OCPReportTypes.STORAGE:
-            self._processor = OCPStorageProcessor(schema_name, report_path, compression, provider_uuid)
+            self._processor = OCPStorageProcessor(schema_name, report_path, compression, provider_uuid, manifest_id)
         elif self.report_type == utils.OCPReportTypes.NODE_LABELS:
-            self._processor = OCPNodeLabelProcessor(schema_name, report_path, compression, provider_uuid)
+            self._processor = OCPNodeLabelProcessor(schema_name, report_path, compression, provider_uuid, manifest_id)
         elif self.report_type == utils.OCPReportTypes.NAMESPACE_LABELS:
-            self._processor = OCPNamespaceLabelProcessor(schema_name, report_path, compression, provider_uuid)
+            self._processor = OCPNamespaceLabelProcessor(
+                schema_name, report_path, compression, provider_uuid, manifest_id
+            )
         elif self.report_type == utils.OCPReportTypes.UNKNOWN:
             raise OCPReportProcessorError("Unknown OCP report type.")
 
@@ -92,14 +97,16 @@ class OCPReportProcessor:
 class OCPReportProcessorBase(ReportProcessorBase):
     """Base class for OCP report processing."""
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid):
+    DIMENSION_COLUMNS = ("report_id",)
+
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize base class."""
         super().__init__(
             schema_name=schema_name,
             report_path=report_path,
             compression=compression,
             provider_uuid=provider_uuid,
-            manifest_id=None,
+            manifest_id=manifest_id,
             processed_report=ProcessedOCPReport(),
         )
 
@@ -112,7 +119,9 @@ class OCPReportProcessorBase(ReportProcessorBase):
 
         with OCPReportDBAccessor(self._schema) as report_db:
             self.existing_report_periods_map = report_db.get_report_periods()
-            self.existing_report_map = report_db.get_reports()
+
+        # Ids of the report rows resolved so far, shared by the files of the manifest
+        self.existing_report_map = self.dimensions.cache(OCPUsageReport)
 
         self.line_item_columns = None
 
@@ -124,7 +133,7 @@ class OCPReportProcessorBase(ReportProcessorBase):
             report_period_id (str): report period object id
 
         Returns:
-            (str): The DB id of the report object
+            (str): The DB id of the report object or its PendingDimension placeholder
 
         """
         table_name = OCPUsageReport
@@ -138,15 +147,18 @@ class OCPReportProcessorBase(ReportProcessorBase):
         if key in self.existing_report_map:
             return self.existing_report_map[key]
 
-        data = {"report_period_id": report_period_id, "interval_start": start, "interval_end": end}
-        with transaction.atomic():
-            report_id = report_db_accessor.insert_on_conflict_do_nothing(
-                table_name, data, conflict_columns=["report_period_id", "interval_start"]
-            )
+        report_id = self.dimensions.get(table_name, key)
+        if report_id is not None:
+            return report_id
 
-        self.processed_report.reports[key] = report_id
-
-        return report_id
+        data = {"report_period_id": report_period_id, "interval_start": start, "interval_end": end}
+        return self.dimensions.add(
+            table_name,
+            key,
+            data,
+            key_columns=["report_period_id", "interval_start"],
+            resolved=self.processed_report.reports,
+        )
 
     def _create_report_period(self, row, cluster_id, report_db_accessor, cluster_alias):
         """Create a report period object.
@@ -297,7 +309,7 @@ class OCPCpuMemReportProcessor(OCPReportProcessorBase):
 
     report_type = "OCPCpuMemReport"
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid):
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
         Args:
@@ -305,10 +317,15 @@ class OCPCpuMemReportProcessor(OCPReportProcessorBase):
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            manifest_id (Integer): Manifest Identifier.
 
         """
         super().__init__(
-            schema_name=schema_name, report_path=report_path, compression=compression, provider_uuid=provider_uuid
+            schema_name=schema_name,
+            report_path=report_path,
+            compression=compression,
+            provider_uuid=provider_uuid,
+            manifest_id=manifest_id,
         )
         self.table_name = OCPUsageLineItem()
         stmt = (
@@ -369,7 +386,7 @@ class OCPStorageProcessor(OCPReportProcessorBase):
 
     report_type = "OCPStorageReport"
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid):
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
         Args:
@@ -377,10 +394,15 @@ class OCPStorageProcessor(OCPReportProcessorBase):
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            manifest_id (Integer): Manifest Identifier.
 
         """
         super().__init__(
-            schema_name=schema_name, report_path=report_path, compression=compression, provider_uuid=provider_uuid
+            schema_name=schema_name,
+            report_path=report_path,
+            compression=compression,
+            provider_uuid=provider_uuid,
+            manifest_id=manifest_id,
         )
         self.table_name = OCPStorageLineItem()
         stmt = (
@@ -447,7 +469,7 @@ class OCPNodeLabelProcessor(OCPReportProcessorBase):
 
     report_type = "OCPNodeLabelReport"
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid):
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
         Args:
@@ -455,10 +477,15 @@ class OCPNodeLabelProcessor(OCPReportProcessorBase):
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            manifest_id (Integer): Manifest Identifier.
 
         """
         super().__init__(
-            schema_name=schema_name, report_path=report_path, compression=compression, provider_uuid=provider_uuid
+            schema_name=schema_name,
+            report_path=report_path,
+            compression=compression,
+            provider_uuid=provider_uuid,
+            manifest_id=manifest_id,
         )
         self.table_name = OCPNodeLabelLineItem()
         stmt = (
@@ -516,7 +543,7 @@ class OCPNamespaceLabelProcessor(OCPReportProcessorBase):
 
     report_type = "OCPNamespaceLabelReport"
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid):
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
         """Initialize the report processor.
 
         Args:
@@ -524,10 +551,15 @@ class OCPNamespaceLabelProcessor(OCPReportProcessorBase):
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            manifest_id (Integer): Manifest Identifier.
 
         """
         super().__init__(
-            schema_name=schema_name, report_path=report_path, compression=compression, provider_uuid=provider_uuid
+            schema_name=schema_name,
+            report_path=report_path,
+            compression=compression,
+            provider_uuid=provider_uuid,
+            manifest_id=manifest_id,
         )
         self.table_name = OCPNamespaceLabelLineItem()
         stmt = (
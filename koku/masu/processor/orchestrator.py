@@ -22,6 +22,7 @@ from masu.external.date_accessor import DateAccessor
 from masu.external.downloader.gcp.gcp_report_downloader import GCPSelfHealingComplete
 from masu.external.report_downloader import ReportDownloader
 from masu.external.report_downloader import ReportDownloaderError
+from masu.processor.task_lease import get_report_file_lease
 from masu.processor.tasks import get_report_files
 from masu.processor.tasks import GET_REPORT_FILES_QUEUE
 from masu.processor.tasks import record_all_manifest_files
@@ -29,7 +30,6 @@ from masu.processor.tasks import record_report_status
 from masu.processor.tasks import remove_expired_data
 from masu.processor.tasks import summarize_reports
 from masu.processor.tasks import SUMMARIZE_REPORTS_QUEUE
-from masu.processor.worker_cache import WorkerCache
 
 LOG = logging.getLogger(__name__)
 
@@ -52,7 +52,6 @@ class Orchestrator:
             billing_source (String): Individual account to retrieve.
 
         """
-        self.worker_cache = WorkerCache()
         self.billing_source = billing_source
         self.bill_date = bill_date
         self.provider_uuid = provider_uuid
@@ -358,8 +357,7 @@ class Orchestrator:
                 LOG.info(log_json(tracing_id, f"{local_file} was already processed"))
                 continue
 
-            cache_key = f"{provider_uuid}:{report_file}"
-            if self.worker_cache.task_is_running(cache_key):
+            if get_report_file_lease(provider_uuid, report_file).is_held():
                 LOG.info(log_json(tracing_id, f"{local_file} process is in progress"))
                 continue
 
@@ -0,0 +1,110 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Vectorized CSV reader used by the Parquet report processor."""
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+from masu.util.common import safe_float
+
+LOG = logging.getLogger(__name__)
+
+PANDAS_INGEST_ENGINE = "pandas"
+ARROW_INGEST_ENGINE = "arrow"
+
+# Size of the blocks pyarrow parses at a time. Blocks are re-sliced into
+# PARQUET_PROCESSING_BATCH_SIZE rows so both engines produce the same parquet parts.
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _convert_float_column(array):
+    """Convert a string column to float64 with the semantics of safe_float."""
+    try:
+        # safe_float turns blank cells into 0.0
+        values = pc.replace_substring_regex(array, pattern="^$", replacement="0")
+        return pc.cast(values, pa.float64()).to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # At least one cell is not a plain number, fall back to safe_float for the column.
+        return _convert_unique_values(array.to_pandas(), safe_float)
+
+
+def _convert_unique_values(series, converter):
+    """Run a scalar converter once per distinct value and broadcast the results.
+
+    Report columns such as dates and labels repeat the same handful of values for
+    every row, so converting the distinct values is far cheaper than converting cells.
+    """
+    codes, uniques = pd.factorize(series)
+    # Building the series from a list applies the same dtype inference read_csv
+    # applies to converter output (floats, naive or tz-aware datetimes, objects).
+    converted = pd.Series([converter(value) for value in uniques])
+    return converted.take(codes).reset_index(drop=True)
+
+
+def convert_data_frame_columns(table, converters):
+    """Return a pandas data frame with the report converters applied column by column."""
+    data = {}
+    for name, column in zip(table.column_names, table.columns):
+        converter = converters.get(name.lower())
+        if converter is None:
+            data[name] = column.to_pandas()
+        elif converter is safe_float:
+            data[name] = _convert_float_column(column)
+        else:
+            data[name] = _convert_unique_values(column.to_pandas(), converter)
+    return pd.DataFrame(data)
+
+
+def _iter_row_batches(reader, batch_size):
+    """Re-slice the blocks of a pyarrow CSV reader into tables of batch_size rows."""
+    pending = []
+    pending_rows = 0
+    for record_batch in reader:
+        pending.append(record_batch)
+        pending_rows += record_batch.num_rows
+        while pending_rows >= batch_size:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, batch_size)
+            remainder = table.slice(batch_size)
+            pending = remainder.to_batches()
+            pending_rows = remainder.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def read_csv_batches(csv_filename, col_names, converters, batch_size, compression=None):
+    """Yield data frames of batch_size rows parsed by the pyarrow CSV reader.
+
+    Every column is read as a non-nullable string, exactly as pandas hands raw cells to
+    the column converters, and the converters are then applied to whole columns.
+
+    Args:
+        csv_filename (str): The local CSV file path
+        col_names (list): The CSV header
+        converters (dict): The provider column converters keyed on lower case column name
+        batch_size (int): The number of rows per yielded data frame
+        compression (str): None or "gzip"
+
+    Returns:
+        (generator): pandas DataFrame batches
+
+    """
+    read_options = pa_csv.ReadOptions(block_size=ARROW_BLOCK_SIZE)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col_name: pa.string() for col_name in col_names},
+        strings_can_be_null=False,
+        quoted_strings_can_be_null=False,
+    )
+    row_offset = 0
+    with pa.input_stream(csv_filename, compression=compression) as stream:
+        reader = pa_csv.open_csv(stream, read_options=read_options, convert_options=convert_options)
+        for table in _iter_row_batches(reader, batch_size):
+            data_frame = convert_data_frame_columns(table, converters)
+            data_frame.index = pd.RangeIndex(row_offset, row_offset + len(data_frame))
+            row_offset += len(data_frame)
+            yield data_frame
@@ -23,6 +23,7 @@ from masu.processor.parquet.parquet_report_processor import ParquetReportProcess
 from masu.util.aws.common import match_openshift_resources_and_labels as aws_match_openshift_resources_and_labels
 from masu.util.azure.common import match_openshift_resources_and_labels as azure_match_openshift_resources_and_labels
 from masu.util.gcp.common import match_openshift_resources_and_labels as gcp_match_openshift_resources_and_labels
+from masu.util.ocp.common import OpenShiftMatcher
 from reporting.provider.ocp.models import OCPEnabledTagKeys
 
 LOG = logging.getLogger(__name__)
@@ -157,9 +158,10 @@ class OCPCloudParquetReportProcessor(ParquetReportProcessor):
                     matched_tags = self.db_accessor.get_openshift_on_cloud_matched_tags_trino(
                         self.provider_uuid, ocp_provider_uuid, self.start_date, self.end_date
                     )
+            matcher = OpenShiftMatcher(cluster_topology, matched_tags)
             for i, daily_data_frame in enumerate(daily_data_frames):
                 openshift_filtered_data_frame = self.ocp_on_cloud_data_processor(
-                    daily_data_frame, cluster_topology, matched_tags
+                    daily_data_frame, cluster_topology, matched_tags, matcher=matcher
                 )
 
                 self.create_ocp_on_cloud_parquet(
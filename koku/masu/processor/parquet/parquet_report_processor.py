@@ -6,10 +6,13 @@
 import datetime
 import logging
 import os
+import resource
+from contextlib import closing
 from functools import partial
 from pathlib import Path
 
 import pandas as pd
+from billiard.pool import Pool
 from dateutil import parser
 from django.conf import settings
 
@@ -24,11 +27,15 @@ from masu.processor.azure.azure_report_parquet_processor import AzureReportParqu
 from masu.processor.gcp.gcp_report_parquet_processor import GCPReportParquetProcessor
 from masu.processor.oci.oci_report_parquet_processor import OCIReportParquetProcessor
 from masu.processor.ocp.ocp_report_parquet_processor import OCPReportParquetProcessor
+from masu.processor.parquet.arrow_csv_reader import ARROW_INGEST_ENGINE
+from masu.processor.parquet.arrow_csv_reader import PANDAS_INGEST_ENGINE
+from masu.processor.parquet.arrow_csv_reader import read_csv_batches
 from masu.util.aws.common import aws_generate_daily_data
 from masu.util.aws.common import aws_post_processor
 from masu.util.aws.common import copy_data_to_s3_bucket
 from masu.util.aws.common import get_column_converters as aws_column_converters
-from masu.util.aws.common import remove_files_not_in_set_from_s3_bucket
+from masu.util.aws.common import get_manifest_keyed_filename
+from masu.util.aws.common import remove_files_not_in_set_from_s3_prefixes
 from masu.util.azure.common import azure_generate_daily_data
 from masu.util.azure.common import azure_post_processor
 from masu.util.azure.common import get_column_converters as azure_column_converters
@@ -73,6 +80,36 @@ class ParquetReportProcessorError(Exception):
     pass
 
 
+def init_parquet_worker(memory_limit):
+    """Cap the address space of a parquet conversion worker process.
+
+    Workers are forked from the Celery worker and must not use the database
+    connections they inherit, so they only convert files and upload them to S3.
+
+    Args:
+        memory_limit (int): The limit in MiB, 0 for no limit
+
+    """
+    if memory_limit:
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def convert_csv_file_in_worker(processor, csv_filename):
+    """Convert one CSV file to parquet in a worker process.
+
+    Returns:
+        (tuple): conversion result, last parquet file, unique tag keys, local files to remove
+
+    """
+    processor._set_file_start_date(csv_filename)
+    processor.files_to_remove = []
+    parquet_base_filename, daily_data_frames, success, parquet_file, unique_keys = processor._write_csv_as_parquet(
+        csv_filename
+    )
+    return (parquet_base_filename, daily_data_frames, success), parquet_file, unique_keys, processor.files_to_remove
+
+
 class ParquetReportProcessor:
     """Parquet report processor."""
 
@@ -200,6 +237,28 @@ class ParquetReportProcessor:
                     return report_type
         return None
 
+    @property
+    def ingest_engine(self):
+        """The engine used to parse CSV files for this provider type."""
+        if self.provider_type in settings.ENABLE_ARROW_INGEST_SOURCE_TYPE:
+            return ARROW_INGEST_ENGINE
+        return PANDAS_INGEST_ENGINE
+
+    @property
+    def reconcile_s3_by_manifest(self):
+        """Whether files from previous manifests are removed from the S3 prefixes.
+
+        Monthly reports are re-delivered in full, so their parquet files carry the
+        manifest id in their name. Daily chunked reports overwrite their files in place.
+        """
+        return self.provider_type not in (
+            Provider.PROVIDER_OCP,
+            Provider.PROVIDER_GCP,
+            Provider.PROVIDER_GCP_LOCAL,
+            Provider.PROVIDER_OCI,
+            Provider.PROVIDER_OCI_LOCAL,
+        )
+
     @property
     def post_processor(self):
         """Post processor based on provider type."""
@@ -362,36 +421,27 @@ class ParquetReportProcessor:
 
         # OCP data is daily chunked report files.
         # AWS and Azure are monthly reports. Previous reports should be removed so data isn't duplicated
-        if not manifest_accessor.get_s3_parquet_cleared(manifest) and self.provider_type not in (
-            Provider.PROVIDER_OCP,
-            Provider.PROVIDER_GCP,
-            Provider.PROVIDER_GCP_LOCAL,
-            Provider.PROVIDER_OCI,
-            Provider.PROVIDER_OCI_LOCAL,
-        ):
-            remove_files_not_in_set_from_s3_bucket(
-                self.tracing_id, self.parquet_path_s3, self.manifest_id, self.error_context
-            )
-            remove_files_not_in_set_from_s3_bucket(
-                self.tracing_id, self.parquet_daily_path_s3, self.manifest_id, self.error_context
-            )
-            remove_files_not_in_set_from_s3_bucket(
-                self.tracing_id, self.parquet_ocp_on_cloud_path_s3, self.manifest_id, self.error_context
+        if not manifest_accessor.get_s3_parquet_cleared(manifest) and self.reconcile_s3_by_manifest:
+            remove_files_not_in_set_from_s3_prefixes(
+                self.tracing_id,
+                [self.parquet_path_s3, self.parquet_daily_path_s3, self.parquet_ocp_on_cloud_path_s3],
+                self.manifest_id,
+                self.error_context,
             )
             manifest_accessor.mark_s3_parquet_cleared(manifest)
 
         failed_conversion = []
         daily_data_frames = []
+        csv_filenames = []
         for csv_filename in self.file_list:
             if self.provider_type == Provider.PROVIDER_OCP and self.report_type is None:
                 msg = f"Could not establish report type for {csv_filename}."
                 LOG.warn(log_json(self.tracing_id, msg, self.error_context))
                 failed_conversion.append(csv_filename)
                 continue
-            if self.provider_type == Provider.PROVIDER_OCI:
-                file_specific_start_date = csv_filename.split(".")[1]
-                self.start_date = file_specific_start_date
-            parquet_base_filename, daily_frame, success = self.convert_csv_to_parquet(csv_filename)
+            csv_filenames.append(csv_filename)
+
+        for csv_filename, (parquet_base_filename, daily_frame, success) in self._convert_csv_files(csv_filenames):
             daily_data_frames.extend(daily_frame)
             if self.provider_type not in (Provider.PROVIDER_AZURE):
                 self.create_daily_parquet(parquet_base_filename, daily_frame)
@@ -417,8 +467,80 @@ class ParquetReportProcessor:
         processor.sync_hive_partitions()
         self.presto_table_exists[self.report_type] = True
 
-    def convert_csv_to_parquet(self, csv_filename):  # noqa: C901
+    def _set_file_start_date(self, csv_filename):
+        """Set the start date of an OCI file, which is encoded in its name."""
+        if self.provider_type == Provider.PROVIDER_OCI:
+            file_specific_start_date = csv_filename.split(".")[1]
+            self.start_date = file_specific_start_date
+
+    def _convert_csv_files(self, csv_filenames):
+        """Yield the file name and conversion result of each CSV file in order.
+
+        Files are converted one at a time unless PARQUET_PROCESSING_WORKERS allows
+        converting several files at once in a pool of worker processes. The pool is
+        a billiard pool, which unlike multiprocessing can be started from the daemonic
+        Celery prefork pool workers.
+        """
+        workers = min(settings.PARQUET_PROCESSING_WORKERS, len(csv_filenames))
+        if workers <= 1:
+            for csv_filename in csv_filenames:
+                self._set_file_start_date(csv_filename)
+                yield csv_filename, self.convert_csv_to_parquet(csv_filename)
+            return
+
+        msg = f"Converting {len(csv_filenames)} files to parquet with {workers} worker processes."
+        LOG.info(log_json(self.tracing_id, msg, self.error_context))
+        results = []
+        parquet_file = None
+        parquet_csv_filename = None
+        unique_keys = set()
+        with Pool(
+            processes=workers,
+            initializer=init_parquet_worker,
+            initargs=(settings.PARQUET_PROCESSING_WORKER_MEMORY_LIMIT,),
+        ) as pool:
+            async_results = [pool.apply_async(convert_csv_file_in_worker, (self, name)) for name in csv_filenames]
+            for csv_filename, async_result in zip(csv_filenames, async_results):
+                try:
+                    result, file_parquet_file, file_unique_keys, files_to_remove = async_result.get()
+                except Exception as err:
+                    # The worker died, most likely because it exceeded its memory limit.
+                    msg = f"File {csv_filename} could not be converted to parquet. Reason: {str(err)}"
+                    LOG.warn(log_json(self.tracing_id, msg, self.error_context))
+                    parquet_base_filename = os.path.basename(csv_filename).replace(self.file_extension, "")
+                    result = (parquet_base_filename, [], False)
+                else:
+                    self.files_to_remove.extend(files_to_remove)
+                    if result[2] and file_parquet_file:
+                        parquet_file = file_parquet_file
+                        parquet_csv_filename = csv_filename
+                    unique_keys.update(file_unique_keys)
+                results.append((csv_filename, result))
+
+        # Tables and tag keys are created once for all files in this process.
+        if parquet_csv_filename:
+            self._set_file_start_date(parquet_csv_filename)
+        tables_created = self._create_parquet_table_and_keys(parquet_file, unique_keys)
+        for csv_filename, (parquet_base_filename, daily_data_frames, success) in results:
+            self._set_file_start_date(csv_filename)
+            yield csv_filename, (parquet_base_filename, daily_data_frames, success and tables_created)
+
+    def convert_csv_to_parquet(self, csv_filename):
         """Convert CSV file to parquet and send to S3."""
+        parquet_base_filename, daily_data_frames, success, parquet_file, unique_keys = self._write_csv_as_parquet(
+            csv_filename
+        )
+        if success:
+            success = self._create_parquet_table_and_keys(parquet_file, unique_keys, csv_filename)
+        return parquet_base_filename, daily_data_frames, success
+
+    def _write_csv_as_parquet(self, csv_filename):  # noqa: C901
+        """Convert CSV file to parquet parts and send them to S3.
+
+        Returns:
+            (tuple): parquet base file name, daily data frames, success, last parquet file, unique tag keys
+
+        """
         daily_data_frames = []
         converters = self._get_column_converters()
         csv_path, csv_name = os.path.split(csv_filename)
@@ -434,13 +556,7 @@ class ParquetReportProcessor:
 
         try:
             col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
-            csv_converters = {
-                col_name: converters[col_name.lower()] for col_name in col_names if col_name.lower() in converters
-            }
-            csv_converters.update({col: str for col in col_names if col not in csv_converters})
-            with pd.read_csv(
-                csv_filename, converters=csv_converters, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
-            ) as reader:
+            with self._get_csv_reader(csv_filename, col_names, converters, **kwargs) as reader:
                 for i, data_frame in enumerate(reader):
                     if data_frame.empty:
                         continue
@@ -457,18 +573,50 @@ class ParquetReportProcessor:
                         daily_data_frames.append(self.daily_data_processor(data_frame))
                     success = self._write_parquet_to_file(parquet_file, parquet_filename, data_frame)
                     if not success:
-                        return parquet_base_filename, daily_data_frames, False
-            if self.create_table and not self.presto_table_exists.get(self.report_type):
+                        return parquet_base_filename, daily_data_frames, False, parquet_file, unique_keys
+        except Exception as err:
+            msg = (
+                f"File {csv_filename} could not be written as parquet to temp file {parquet_file}. Reason: {str(err)}"
+            )
+            LOG.warn(log_json(self.tracing_id, msg, self.error_context))
+            return parquet_base_filename, daily_data_frames, False, parquet_file, unique_keys
+
+        return parquet_base_filename, daily_data_frames, True, parquet_file, unique_keys
+
+    def _create_parquet_table_and_keys(self, parquet_file, unique_keys, csv_filename=None):
+        """Create the Trino table for the converted files and the enabled tag keys."""
+        try:
+            if parquet_file and self.create_table and not self.presto_table_exists.get(self.report_type):
                 self.create_parquet_table(parquet_file)
             create_enabled_keys(self._schema_name, self.enabled_tags_model, unique_keys)
         except Exception as err:
             msg = (
-                f"File {csv_filename} could not be written as parquet to temp file {parquet_file}. Reason: {str(err)}"
+                f"File {csv_filename or self.report_file} could not be written as parquet to temp file "
+                f"{parquet_file}. Reason: {str(err)}"
             )
             LOG.warn(log_json(self.tracing_id, msg, self.error_context))
-            return parquet_base_filename, daily_data_frames, False
+            return False
+        return True
 
-        return parquet_base_filename, daily_data_frames, True
+    def _get_csv_reader(self, csv_filename, col_names, converters, **kwargs):
+        """Return a context managed iterator of data frame batches for the configured ingest engine."""
+        if self.ingest_engine == ARROW_INGEST_ENGINE:
+            return closing(
+                read_csv_batches(
+                    csv_filename,
+                    col_names,
+                    converters,
+                    settings.PARQUET_PROCESSING_BATCH_SIZE,
+                    compression=kwargs.get("compression"),
+                )
+            )
+        csv_converters = {
+            col_name: converters[col_name.lower()] for col_name in col_names if col_name.lower() in converters
+        }
+        csv_converters.update({col: str for col in col_names if col not in csv_converters})
+        return pd.read_csv(
+            csv_filename, converters=csv_converters, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
+        )
 
     def create_daily_parquet(self, parquet_base_filename, data_frames):
         """Create a parquet file for daily aggregated data."""
@@ -530,11 +678,19 @@ class ParquetReportProcessor:
             s3_path = self._determin_s3_path_for_gcp(file_type, file_name)
         else:
             s3_path = self._determin_s3_path(file_type)
+        s3_file_name = file_name
+        if self.reconcile_s3_by_manifest:
+            s3_file_name = get_manifest_keyed_filename(file_name, self.manifest_id)
         data_frame.to_parquet(file_path, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False)
         try:
             with open(file_path, "rb") as fin:
                 copy_data_to_s3_bucket(
-                    self.tracing_id, s3_path, file_name, fin, manifest_id=self.manifest_id, context=self.error_context
+                    self.tracing_id,
+                    s3_path,
+                    s3_file_name,
+                    fin,
+                    manifest_id=self.manifest_id,
+                    context=self.error_context,
                 )
                 msg = f"{file_path} sent to S3."
                 LOG.info(log_json(self.tracing_id, msg, self.error_context))
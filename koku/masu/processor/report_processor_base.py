@@ -10,6 +10,7 @@ import logging
 
 import ciso8601
 from dateutil.relativedelta import relativedelta
+from django.db import transaction
 from tenant_schemas.utils import schema_context
 
 from api.models import Provider
@@ -20,6 +21,7 @@ from masu.exceptions import MasuProcessingError
 from masu.external import GZIP_COMPRESSED
 from masu.external.date_accessor import DateAccessor
 from masu.processor import ALLOWED_COMPRESSIONS
+from masu.processor.dimension_resolver import DimensionResolver
 from reporting_common import REPORT_COLUMN_MAP
 
 LOG = logging.getLogger(__name__)
@@ -32,6 +34,9 @@ class ReportProcessorBase:
     Base object class for downloading cost reports from a cloud provider.
     """
 
+    # Line item columns referencing dimension rows, which are resolved when a batch is saved
+    DIMENSION_COLUMNS = ()
+
     def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id, processed_report):
         """Initialize the report processor base class.
 
@@ -53,6 +58,7 @@ class ReportProcessorBase:
         self._manifest_id = manifest_id
         self.processed_report = processed_report
         self.date_accessor = DateAccessor()
+        self.dimensions = DimensionResolver(schema_name, manifest_id)
 
     @property
     def data_cutoff_date(self):
@@ -113,6 +119,10 @@ class ReportProcessorBase:
 
     def _save_to_db(self, temp_table, report_db_accessor):
         """Save current batch of records to the database."""
+        with transaction.atomic():
+            self.dimensions.resolve(report_db_accessor)
+        self.dimensions.resolve_line_items(self.processed_report.line_items, self.DIMENSION_COLUMNS)
+
         columns = tuple(self.processed_report.line_items[0].keys())
         csv_file = self._write_processed_rows_to_csv()
 
@@ -0,0 +1,129 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Leases keeping a single worker on a unit of work across containers/pods."""
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+LOG = logging.getLogger(__name__)
+
+LEASE_CACHE_ALIAS = "worker"
+REPORT_FILE_TASK_NAME = "masu.processor.tasks.get_report_files"
+
+
+def create_lease_key(task_name, task_args=None):
+    """Create the lease key for a task with optional task args."""
+    lease_key = task_name
+    if task_args:
+        lease_key += ":"
+        lease_key += ":".join(str(arg) for arg in task_args)
+    return lease_key
+
+
+class TaskLease:
+    """A short-lived lease on a unit of work, held by one worker at a time.
+
+    The lease is a cache entry that is only added when it is absent, so a single worker
+    holds it at a time, and it expires on its own when the holding worker dies. No worker
+    has to inspect the others to find out which of them are still running.
+
+    Work requested while the lease is held is coalesced into one pending marker. Requests
+    with the same coalesce key are merged into a single request, and the holder dispatches
+    the marker once when it releases the lease. The marker outlives the lease, so whoever
+    takes over the lease of a holder that died dispatches it on release.
+
+    The leases are stored in the "worker" cache. It is a local memory cache in tests, which
+    lets the scheduling be tested without a shared cache server.
+
+    Example:
+
+        lease:   "masu.processor.tasks.update_summary_tables:org1234567:AWS:{provider_uuid}:2022-04"
+        value:   "{hostname}:{token}"
+
+        pending: "masu.processor.tasks.update_summary_tables:org1234567:AWS:{provider_uuid}:2022-04:pending"
+        value:   {"{manifest_id}": {"schema_name": "org1234567", "start_date": "2022-04-01", ...}}
+
+    """
+
+    def __init__(self, task_name, task_args=None, timeout=None, cache=None):
+        """Create a lease for a task and its args.
+
+        Args:
+            task_name (str): The name of the task the lease is for
+            task_args (list): The task args identifying the unit of work
+            timeout (int): Seconds after which an unreleased lease expires, WORKER_CACHE_TIMEOUT by default
+            cache (BaseCache): The cache storing the lease, the worker cache by default
+
+        """
+        self.task_name = task_name
+        self.task_args = [str(arg) for arg in task_args or []]
+        self.key = create_lease_key(task_name, task_args)
+        self.pending_key = f"{self.key}:pending"
+        self.timeout = int(timeout if timeout is not None else settings.WORKER_CACHE_TIMEOUT)
+        self.pending_timeout = 2 * self.timeout
+        self.cache = cache or caches[LEASE_CACHE_ALIAS]
+        self._token = f"{settings.HOSTNAME}:{uuid.uuid4()}"
+
+    def acquire(self):
+        """Take the lease, returning False when another worker holds it."""
+        return self.cache.add(self.key, self._token, self.timeout)
+
+    def is_held(self):
+        """Check if any worker holds the lease."""
+        return self.cache.get(self.key) is not None
+
+    def release(self):
+        """Release the lease if this instance still holds it.
+
+        Returns:
+            (dict) The pending requests coalesced while the lease was held, by coalesce key
+
+        """
+        if self.cache.get(self.key) == self._token:
+            self.cache.delete(self.key)
+        return self.pop_pending()
+
+    def defer(self, request, coalesce_key="", merge=None):
+        """Add a request to the pending marker of a lease held by another worker.
+
+        Args:
+            request (dict): The task kwargs of the deferred request
+            coalesce_key (str): Requests with the same coalesce key are merged into one
+            merge (callable): Merges a pending request with a new one, the new one replaces it by default
+
+        Returns:
+            (dict) The pending requests to dispatch now, because the lease was released before
+                the marker was written, by coalesce key
+
+        """
+        pending = self.cache.get(self.pending_key) or {}
+        if coalesce_key in pending and merge:
+            request = merge(pending[coalesce_key], request)
+        pending[coalesce_key] = request
+        self.cache.set(self.pending_key, pending, self.pending_timeout)
+        LOG.debug(f"Deferred request {coalesce_key} until {self.key} is released.")
+        # The holder may have released the lease, and dispatched the marker, before it was
+        # written. Whoever takes the lease next dispatches it, so nothing is left waiting.
+        if self.acquire():
+            return self.release()
+        return {}
+
+    def has_pending(self):
+        """Check if requests are waiting for the lease to be released."""
+        return bool(self.cache.get(self.pending_key))
+
+    def pop_pending(self):
+        """Remove and return the pending requests of the lease, by coalesce key."""
+        pending = self.cache.get(self.pending_key)
+        if pending:
+            self.cache.delete(self.pending_key)
+        return pending or {}
+
+
+def get_report_file_lease(provider_uuid, report_file):
+    """Return the lease of a report file being downloaded and processed."""
+    return TaskLease(REPORT_FILE_TASK_NAME, [provider_uuid, report_file])
@@ -45,7 +45,8 @@ from masu.processor.report_processor import ReportProcessorError
 from masu.processor.report_summary_updater import ReportSummaryUpdater
 from masu.processor.report_summary_updater import ReportSummaryUpdaterCloudError
 from masu.processor.report_summary_updater import ReportSummaryUpdaterProviderNotFoundError
-from masu.processor.worker_cache import WorkerCache
+from masu.processor.task_lease import get_report_file_lease
+from masu.processor.task_lease import TaskLease
 
 
 LOG = logging.getLogger(__name__)
@@ -74,6 +75,49 @@ QUEUE_LIST = [
 ]
 
 
+def merge_summary_requests(pending, request):
+    """Merge a deferred summary request into a pending one, widening the dates to cover both."""
+    merged = {**pending, **request}
+    merged["start_date"] = min(pending["start_date"], request["start_date"], key=str)
+    if pending.get("end_date") is None or request.get("end_date") is None:
+        merged["end_date"] = None
+    else:
+        merged["end_date"] = max(pending["end_date"], request["end_date"], key=str)
+    return merged
+
+
+def dispatch_pending_requests(task, pending, default_queue):
+    """Dispatch the requests coalesced while the lease of a task was held."""
+    for request in pending.values():
+        LOG.info(log_json(request.get("tracing_id"), f"Dispatching deferred {task.name} request."))
+        task.s(**request).apply_async(queue=request.get("queue_name") or default_queue)
+
+
+def release_lease(lease, task, default_queue):
+    """Release a task lease and dispatch the requests deferred while it was held."""
+    dispatch_pending_requests(task, lease.release(), default_queue)
+
+
+def defer_request(lease, task, request, default_queue, coalesce_key="", merge=None):
+    """Defer a request until the lease held by another worker is released.
+
+    The request that creates the pending marker also schedules check_deferred_requests, so the
+    marker is dispatched even if the lease holder dies without releasing the lease.
+    """
+    creates_marker = not lease.has_pending()
+    pending = lease.defer(request, coalesce_key=coalesce_key, merge=merge)
+    dispatch_pending_requests(task, pending, default_queue)
+    if creates_marker and not pending:
+        schedule_deferred_requests_check(lease, default_queue)
+
+
+def schedule_deferred_requests_check(lease, default_queue):
+    """Check on the requests deferred on a lease once it has had the time to expire."""
+    check_deferred_requests.s(lease.task_name, lease.task_args, default_queue).apply_async(
+        queue=default_queue, countdown=lease.timeout
+    )
+
+
 def record_all_manifest_files(manifest_id, report_files, tracing_id):
     """Store all report file names for manifest ID."""
     for report in report_files:
@@ -165,9 +209,9 @@ def get_report_files(  # noqa: C901
         if isinstance(report_month, str):
             month = parser.parse(report_month)
         report_file = report_context.get("key")
-        cache_key = f"{provider_uuid}:{report_file}"
         tracing_id = report_context.get("assembly_id", "no-tracing-id")
-        WorkerCache().add_task_to_cache(cache_key)
+        lease = get_report_file_lease(provider_uuid, report_file)
+        lease.acquire()
 
         try:
             report_dict = _get_report_files(
@@ -182,7 +226,7 @@ def get_report_files(  # noqa: C901
             )
         except (MasuProcessingError, MasuProviderError, ReportDownloaderError) as err:
             worker_stats.REPORT_FILE_DOWNLOAD_ERROR_COUNTER.labels(provider_type=provider_type).inc()
-            WorkerCache().remove_task_from_cache(cache_key)
+            lease.release()
             LOG.warning(log_json(tracing_id, str(err), context))
             return
 
@@ -196,7 +240,7 @@ def get_report_files(  # noqa: C901
             stmt += f" file: {report_dict['file']}"
             LOG.info(log_json(tracing_id, stmt, context))
         else:
-            WorkerCache().remove_task_from_cache(cache_key)
+            lease.release()
             return None
 
         report_meta = {
@@ -228,22 +272,22 @@ def get_report_files(  # noqa: C901
         except (ReportProcessorError, ReportProcessorDBError) as processing_error:
             worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
             LOG.error(log_json(tracing_id, str(processing_error), context))
-            WorkerCache().remove_task_from_cache(cache_key)
+            lease.release()
             raise processing_error
         except NotImplementedError as err:
             LOG.info(log_json(tracing_id, str(err), context))
-            WorkerCache().remove_task_from_cache(cache_key)
+            lease.release()
 
-        WorkerCache().remove_task_from_cache(cache_key)
+        lease.release()
 
         return report_meta
     except ReportDownloaderWarning as err:
         LOG.warning(log_json(tracing_id, str(err), context))
-        WorkerCache().remove_task_from_cache(cache_key)
+        lease.release()
     except Exception as err:
         worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
         LOG.error(log_json(tracing_id, str(err), context))
-        WorkerCache().remove_task_from_cache(cache_key)
+        lease.release()
 
 
 @celery_app.task(name="masu.processor.tasks.remove_expired_data", queue=DEFAULT)
@@ -374,22 +418,31 @@ def update_summary_tables(  # noqa: C901
     ocp_on_cloud_infra_map = {}
 
     if not synchronous:
-        worker_cache = WorkerCache()
-        if worker_cache.single_task_is_running(task_name, cache_args):
-            msg = f"Task {task_name} already running for {cache_args}. Requeuing."
+        lease = TaskLease(task_name, cache_args)
+        if not lease.acquire():
+            msg = f"Task {task_name} already running for {cache_args}. Deferring until its lease is released."
             LOG.info(log_json(tracing_id, msg))
-            update_summary_tables.s(
-                schema_name,
-                provider,
-                provider_uuid,
-                start_date,
-                end_date=end_date,
-                manifest_id=manifest_id,
-                queue_name=queue_name,
-                tracing_id=tracing_id,
-            ).apply_async(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
+            request = {
+                "schema_name": schema_name,
+                "provider": provider,
+                "provider_uuid": provider_uuid,
+                "start_date": start_date,
+                "end_date": end_date,
+                "manifest_id": manifest_id,
+                "queue_name": queue_name,
+                "tracing_id": tracing_id,
+                "ocp_on_cloud": ocp_on_cloud,
+            }
+            # Each manifest keeps its own request so that every manifest is marked complete
+            defer_request(
+                lease,
+                update_summary_tables,
+                request,
+                UPDATE_SUMMARY_TABLES_QUEUE,
+                coalesce_key=str(manifest_id),
+                merge=merge_summary_requests,
+            )
             return
-        worker_cache.lock_single_task(task_name, cache_args, timeout=settings.WORKER_CACHE_TIMEOUT)
 
     stmt = (
         f"update_summary_tables called with args: "
@@ -403,97 +456,94 @@ def update_summary_tables(  # noqa: C901
     LOG.info(log_json(tracing_id, stmt))
 
     try:
-        updater = ReportSummaryUpdater(schema_name, provider_uuid, manifest_id, tracing_id)
-        start_date, end_date = updater.update_daily_tables(start_date, end_date)
-        updater.update_summary_tables(start_date, end_date, tracing_id)
-        if ocp_on_cloud:
-            ocp_on_cloud_infra_map = updater.get_openshift_on_cloud_infra_map(start_date, end_date, tracing_id)
-    except ReportSummaryUpdaterCloudError as ex:
-        LOG.info(
-            log_json(tracing_id, f"Failed to correlate OpenShift metrics for provider: {provider_uuid}. Error: {ex}")
-        )
-
-    except ReportSummaryUpdaterProviderNotFoundError as pnf_ex:
-        LOG.warning(
-            log_json(
-                tracing_id,
-                (
-                    f"{pnf_ex} Possible source/provider delete during processing. "
-                    + "Processing for this provier will halt."
-                ),
+        try:
+            updater = ReportSummaryUpdater(schema_name, provider_uuid, manifest_id, tracing_id)
+            start_date, end_date = updater.update_daily_tables(start_date, end_date)
+            updater.update_summary_tables(start_date, end_date, tracing_id)
+            if ocp_on_cloud:
+                ocp_on_cloud_infra_map = updater.get_openshift_on_cloud_infra_map(start_date, end_date, tracing_id)
+        except ReportSummaryUpdaterCloudError as ex:
+            LOG.info(
+                log_json(
+                    tracing_id, f"Failed to correlate OpenShift metrics for provider: {provider_uuid}. Error: {ex}"
+                )
             )
-        )
-        if not synchronous:
-            worker_cache.release_single_task(task_name, cache_args)
-        return
-    except Exception as ex:
-        if not synchronous:
-            worker_cache.release_single_task(task_name, cache_args)
-        raise ex
 
-    if enable_trino_processing(provider_uuid, provider, schema_name) and provider in (
-        Provider.PROVIDER_AWS,
-        Provider.PROVIDER_AWS_LOCAL,
-        Provider.PROVIDER_AZURE,
-        Provider.PROVIDER_AZURE_LOCAL,
-    ):
-        cost_model = None
-        stmt = (
-            f"Markup for {provider} is calculated during summarization. No need to run update_cost_model_costs"
-            f" schema_name: {schema_name}, "
-            f" provider_uuid: {provider_uuid}"
-        )
-        LOG.info(log_json(tracing_id, stmt))
-    else:
-        with CostModelDBAccessor(schema_name, provider_uuid) as cost_model_accessor:
-            cost_model = cost_model_accessor.cost_model
-
-    # Create queued tasks for each OpenShift on Cloud cluster
-    signature_list = []
-    for openshift_provider_uuid, infrastructure_tuple in ocp_on_cloud_infra_map.items():
-        infra_provider_uuid = infrastructure_tuple[0]
-        infra_provider_type = infrastructure_tuple[1]
-        signature_list.append(
-            update_openshift_on_cloud.s(
-                schema_name,
-                openshift_provider_uuid,
-                infra_provider_uuid,
-                infra_provider_type,
-                str(start_date),
-                str(end_date),
-                manifest_id=manifest_id,
-                queue_name=queue_name,
-                synchronous=synchronous,
-                tracing_id=tracing_id,
-            ).set(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
-        )
+        except ReportSummaryUpdaterProviderNotFoundError as pnf_ex:
+            LOG.warning(
+                log_json(
+                    tracing_id,
+                    (
+                        f"{pnf_ex} Possible source/provider delete during processing. "
+                        + "Processing for this provier will halt."
+                    ),
+                )
+            )
+            return
 
-    # Apply OCP on Cloud tasks
-    if signature_list:
-        if synchronous:
-            group(signature_list).apply()
+        if enable_trino_processing(provider_uuid, provider, schema_name) and provider in (
+            Provider.PROVIDER_AWS,
+            Provider.PROVIDER_AWS_LOCAL,
+            Provider.PROVIDER_AZURE,
+            Provider.PROVIDER_AZURE_LOCAL,
+        ):
+            cost_model = None
+            stmt = (
+                f"Markup for {provider} is calculated during summarization. No need to run update_cost_model_costs"
+                f" schema_name: {schema_name}, "
+                f" provider_uuid: {provider_uuid}"
+            )
+            LOG.info(log_json(tracing_id, stmt))
         else:
-            group(signature_list).apply_async()
-
-    if cost_model is not None:
-        linked_tasks = update_cost_model_costs.s(
-            schema_name, provider_uuid, start_date, end_date, tracing_id=tracing_id
-        ).set(queue=queue_name or UPDATE_COST_MODEL_COSTS_QUEUE) | mark_manifest_complete.si(
-            schema_name, provider, provider_uuid=provider_uuid, manifest_id=manifest_id, tracing_id=tracing_id
-        ).set(
-            queue=queue_name or MARK_MANIFEST_COMPLETE_QUEUE
-        )
-    else:
-        stmt = f"update_cost_model_costs skipped. schema_name: {schema_name}, provider_uuid: {provider_uuid}"
-        LOG.info(log_json(tracing_id, stmt))
-        linked_tasks = mark_manifest_complete.s(
-            schema_name, provider, provider_uuid=provider_uuid, manifest_id=manifest_id, tracing_id=tracing_id
-        ).set(queue=queue_name or MARK_MANIFEST_COMPLETE_QUEUE)
+            with CostModelDBAccessor(schema_name, provider_uuid) as cost_model_accessor:
+                cost_model = cost_model_accessor.cost_model
+
+        # Create queued tasks for each OpenShift on Cloud cluster
+        signature_list = []
+        for openshift_provider_uuid, infrastructure_tuple in ocp_on_cloud_infra_map.items():
+            infra_provider_uuid = infrastructure_tuple[0]
+            infra_provider_type = infrastructure_tuple[1]
+            signature_list.append(
+                update_openshift_on_cloud.s(
+                    schema_name,
+                    openshift_provider_uuid,
+                    infra_provider_uuid,
+                    infra_provider_type,
+                    str(start_date),
+                    str(end_date),
+                    manifest_id=manifest_id,
+                    queue_name=queue_name,
+                    synchronous=synchronous,
+                    tracing_id=tracing_id,
+                ).set(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
+            )
 
-    chain(linked_tasks).apply_async()
+        # Apply OCP on Cloud tasks
+        if signature_list:
+            if synchronous:
+                group(signature_list).apply()
+            else:
+                group(signature_list).apply_async()
+
+        if cost_model is not None:
+            linked_tasks = update_cost_model_costs.s(
+                schema_name, provider_uuid, start_date, end_date, tracing_id=tracing_id
+            ).set(queue=queue_name or UPDATE_COST_MODEL_COSTS_QUEUE) | mark_manifest_complete.si(
+                schema_name, provider, provider_uuid=provider_uuid, manifest_id=manifest_id, tracing_id=tracing_id
+            ).set(
+                queue=queue_name or MARK_MANIFEST_COMPLETE_QUEUE
+            )
+        else:
+            stmt = f"update_cost_model_costs skipped. schema_name: {schema_name}, provider_uuid: {provider_uuid}"
+            LOG.info(log_json(tracing_id, stmt))
+            linked_tasks = mark_manifest_complete.s(
+                schema_name, provider, provider_uuid=provider_uuid, manifest_id=manifest_id, tracing_id=tracing_id
+            ).set(queue=queue_name or MARK_MANIFEST_COMPLETE_QUEUE)
 
-    if not synchronous:
-        worker_cache.release_single_task(task_name, cache_args)
+        chain(linked_tasks).apply_async()
+    finally:
+        if not synchronous:
+            release_lease(lease, update_summary_tables, UPDATE_SUMMARY_TABLES_QUEUE)
 
 
 @celery_app.task(
@@ -524,24 +574,31 @@ def update_openshift_on_cloud(
         cache_arg_date = start_date.strftime("%Y-%m")
     cache_args = [schema_name, infrastructure_provider_uuid, cache_arg_date]
     if not synchronous:
-        worker_cache = WorkerCache()
-        if worker_cache.single_task_is_running(task_name, cache_args):
-            msg = f"Task {task_name} already running for {cache_args}. Requeuing."
+        lease = TaskLease(task_name, cache_args)
+        if not lease.acquire():
+            msg = f"Task {task_name} already running for {cache_args}. Deferring until its lease is released."
             LOG.info(log_json(tracing_id, msg))
-            update_openshift_on_cloud.s(
-                schema_name,
-                openshift_provider_uuid,
-                infrastructure_provider_uuid,
-                infrastructure_provider_type,
-                start_date,
-                end_date,
-                manifest_id=manifest_id,
-                queue_name=queue_name,
-                synchronous=synchronous,
-                tracing_id=tracing_id,
-            ).apply_async(queue=queue_name or UPDATE_SUMMARY_TABLES_QUEUE)
+            request = {
+                "schema_name": schema_name,
+                "openshift_provider_uuid": openshift_provider_uuid,
+                "infrastructure_provider_uuid": infrastructure_provider_uuid,
+                "infrastructure_provider_type": infrastructure_provider_type,
+                "start_date": start_date,
+                "end_date": end_date,
+                "manifest_id": manifest_id,
+                "queue_name": queue_name,
+                "tracing_id": tracing_id,
+            }
+            # The clusters on one cloud source share its lease but each one needs its own update
+            defer_request(
+                lease,
+                update_openshift_on_cloud,
+                request,
+                UPDATE_SUMMARY_TABLES_QUEUE,
+                coalesce_key=f"{openshift_provider_uuid}:{manifest_id}",
+                merge=merge_summary_requests,
+            )
             return
-        worker_cache.lock_single_task(task_name, cache_args, timeout=settings.WORKER_CACHE_TIMEOUT)
     stmt = (
         f"update_openshift_on_cloud called with args: "
         f" schema_name: {schema_name}, "
@@ -581,7 +638,7 @@ def update_openshift_on_cloud(
         raise ReportSummaryUpdaterCloudError
     finally:
         if not synchronous:
-            worker_cache.release_single_task(task_name, cache_args)
+            release_lease(lease, update_openshift_on_cloud, UPDATE_SUMMARY_TABLES_QUEUE)
 
 
 @celery_app.task(name="masu.processor.tasks.update_all_summary_tables", queue=UPDATE_SUMMARY_TABLES_QUEUE)
@@ -638,21 +695,20 @@ def update_cost_model_costs(
     task_name = "masu.processor.tasks.update_cost_model_costs"
     cache_args = [schema_name, provider_uuid, start_date, end_date]
     if not synchronous:
-        worker_cache = WorkerCache()
-        if worker_cache.single_task_is_running(task_name, cache_args):
-            msg = f"Task {task_name} already running for {cache_args}. Requeuing."
+        lease = TaskLease(task_name, cache_args)
+        if not lease.acquire():
+            msg = f"Task {task_name} already running for {cache_args}. Deferring until its lease is released."
             LOG.info(log_json(tracing_id, msg))
-            update_cost_model_costs.s(
-                schema_name,
-                provider_uuid,
-                start_date=start_date,
-                end_date=end_date,
-                queue_name=queue_name,
-                synchronous=synchronous,
-                tracing_id=tracing_id,
-            ).apply_async(queue=queue_name or UPDATE_COST_MODEL_COSTS_QUEUE)
+            request = {
+                "schema_name": schema_name,
+                "provider_uuid": provider_uuid,
+                "start_date": start_date,
+                "end_date": end_date,
+                "queue_name": queue_name,
+                "tracing_id": tracing_id,
+            }
+            defer_request(lease, update_cost_model_costs, request, UPDATE_COST_MODEL_COSTS_QUEUE)
             return
-        worker_cache.lock_single_task(task_name, cache_args, timeout=settings.WORKER_CACHE_TIMEOUT)
 
     worker_stats.COST_MODEL_COST_UPDATE_ATTEMPTS_COUNTER.inc()
 
@@ -674,11 +730,35 @@ def update_cost_model_costs(
             ProviderDBAccessor(provider_uuid).set_data_updated_timestamp()
     except Exception as ex:
         if not synchronous:
-            worker_cache.release_single_task(task_name, cache_args)
+            release_lease(lease, update_cost_model_costs, UPDATE_COST_MODEL_COSTS_QUEUE)
         raise ex
 
     if not synchronous:
-        worker_cache.release_single_task(task_name, cache_args)
+        release_lease(lease, update_cost_model_costs, UPDATE_COST_MODEL_COSTS_QUEUE)
+
+
+@celery_app.task(name="masu.processor.tasks.check_deferred_requests", queue=UPDATE_SUMMARY_TABLES_QUEUE)
+def check_deferred_requests(task_name, task_args, default_queue):
+    """Dispatch the requests deferred on a lease whose holder died before releasing it.
+
+    Args:
+        task_name (str) The name of the task the lease is for.
+        task_args (list) The task args identifying the lease.
+        default_queue (str) The queue of the deferred requests that do not name one.
+
+    Returns
+        None
+
+    """
+    lease = TaskLease(task_name, task_args)
+    if not lease.has_pending():
+        return
+    if lease.acquire():
+        LOG.info(f"Lease {lease.key} expired before its deferred requests were dispatched. Dispatching them.")
+        release_lease(lease, celery_app.tasks[task_name], default_queue)
+    else:
+        # Another worker holds the lease now and dispatches the requests when it releases it
+        schedule_deferred_requests_check(lease, default_queue)
 
 
 # fmt: off
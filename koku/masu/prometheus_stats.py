@@ -6,6 +6,7 @@
 from prometheus_client import CollectorRegistry
 from prometheus_client import Counter
 from prometheus_client import Gauge
+from prometheus_client import Histogram
 from prometheus_client import multiprocess
 
 
@@ -47,6 +48,31 @@ COST_SUMMARY_ATTEMPTS_COUNTER = Counter(
 KAFKA_CONNECTION_ERRORS_COUNTER = Counter(
     "kafka_connection_errors", "Number of Kafka connection errors", registry=WORKER_REGISTRY
 )
+KAFKA_MESSAGES_PROCESSED_COUNTER = Counter(
+    "kafka_messages_processed",
+    "Number of Kafka upload messages processed",
+    ["outcome"],
+    registry=WORKER_REGISTRY,
+)
+KAFKA_MESSAGE_LATENCY = Histogram(
+    "kafka_message_latency_seconds",
+    "Seconds from a Kafka upload message being produced until its processing completes",
+    registry=WORKER_REGISTRY,
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 3600, 7200),
+)
+KAFKA_MESSAGES_IN_FLIGHT = Gauge(
+    "kafka_messages_in_flight",
+    "Number of Kafka upload messages being processed",
+    registry=WORKER_REGISTRY,
+    multiprocess_mode="livesum",
+)
+
+TRINO_QUERY_TIME = Histogram(
+    "trino_query_seconds",
+    "Seconds spent executing a Trino statement and fetching its results",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+    registry=WORKER_REGISTRY,
+)
 
 CELERY_ERRORS_COUNTER = Counter("celery_errors", "Number of celery errors", registry=WORKER_REGISTRY)
 
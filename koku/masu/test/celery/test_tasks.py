@@ -75,6 +75,27 @@ class TestCeleryTasks(MasuTestCase):
         mock_sync.assert_called_once()
         mock_sync.return_value.sync_bucket.assert_called_once()
 
+    @patch("masu.celery.tasks.DataExportRequest.objects")
+    @patch("masu.celery.tasks.AwsS3Syncer")
+    def test_sync_data_to_customer_checkpoint(self, mock_sync, mock_data_export_request):
+        """Test that the synced prefixes are passed to the syncer and saved as they are synced."""
+        data_export_object = Mock()
+        data_export_object.uuid = fake.uuid4()
+        data_export_object.synced_prefixes = ["synced/"]
+        mock_data_export_request.get.return_value = data_export_object
+
+        def sync_bucket(*args, synced_prefixes, on_prefix_synced):
+            for i in range(tasks.DATA_EXPORT_CHECKPOINT_INTERVAL):
+                on_prefix_synced(f"prefix-{i}/")
+
+        mock_sync.return_value.sync_bucket.side_effect = sync_bucket
+
+        tasks.sync_data_to_customer(data_export_object.uuid)
+
+        self.assertEqual(len(data_export_object.synced_prefixes), tasks.DATA_EXPORT_CHECKPOINT_INTERVAL + 1)
+        data_export_object.save.assert_any_call(update_fields=["synced_prefixes"])
+        self.assertEqual(data_export_object.status, APIExportRequest.COMPLETE)
+
     @patch("masu.celery.tasks.LOG")
     @patch("masu.celery.tasks.DataExportRequest")
     @patch("masu.celery.tasks.AwsS3Syncer")
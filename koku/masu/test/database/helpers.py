@@ -10,7 +10,6 @@ import random
 import uuid
 from decimal import Decimal
 
-import django.apps
 from dateutil import parser
 from dateutil import relativedelta
 from django.utils import timezone
@@ -26,7 +25,7 @@ from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.account_alias_accessor import AccountAliasAccessor
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
-from masu.database.report_db_accessor_base import ReportSchema
+from masu.database.report_db_accessor_base import get_report_schema
 from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
 from masu.external.date_accessor import DateAccessor
 from masu.util import common as azure_utils
@@ -45,7 +44,7 @@ class ReportObjectCreator:
     def __init__(self, schema):
         """Initialize the report object creation helpler."""
         self.schema = schema
-        self.report_schema = ReportSchema(django.apps.apps.get_models())
+        self.report_schema = get_report_schema()
         self.column_types = self.report_schema.column_types
 
     def create_cost_entry(self, bill, entry_datetime=None):
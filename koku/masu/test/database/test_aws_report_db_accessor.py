@@ -34,6 +34,7 @@ from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.cost_model_db_accessor import CostModelDBAccessor
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+from masu.database.report_db_accessor_base import get_report_schema
 from masu.database.report_db_accessor_base import ReportSchema
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.external.date_accessor import DateAccessor
@@ -71,8 +72,26 @@ class ReportSchemaTest(MasuTestCase):
 
         for table_name in self.all_tables:
             self.assertIsNotNone(getattr(report_schema, table_name))
+            self.assertIn(table_name, report_schema.column_types)
 
-        self.assertNotEqual(report_schema.column_types, {})
+        # Column types are resolved per table when they are first used
+        column_types = report_schema.column_types
+        self.assertEqual(column_types._types, {})
+        self.assertIn(AWS_CUR_TABLE_MAP["line_item"], column_types.keys())
+        self.assertNotEqual(column_types[AWS_CUR_TABLE_MAP["line_item"]], {})
+        self.assertEqual(list(column_types._types), [AWS_CUR_TABLE_MAP["line_item"]])
+        self.assertNotIn("not_a_reporting_table", column_types)
+        self.assertNotIn("not_a_reporting_table", column_types.keys())
+        self.assertIsNone(column_types.get("not_a_reporting_table"))
+
+    def test_accessor_construction_reuses_report_schema(self):
+        """Test that constructing accessors does not rebuild the report schema."""
+        get_report_schema()
+        with patch("masu.database.report_db_accessor_base.ReportSchema") as mock_schema:
+            for _ in range(10):
+                accessor = AWSReportDBAccessor(schema=self.schema)
+        mock_schema.assert_not_called()
+        self.assertIs(accessor.report_schema, self.accessor.report_schema)
 
     def test_get_reporting_tables(self):
         """Test that the report schema is populated with a column map."""
@@ -332,6 +351,78 @@ class AWSReportDBAccessorTest(MasuTestCase):
             self.assertEqual(row_id, row_id_2)
             self.assertEqual(row.number_of_reservations, initial_res_count + 1)
 
+    def test_insert_on_conflict_returning(self):
+        """Test that a multi-row INSERT returns the ids of new and existing rows."""
+        table_name = AWS_CUR_TABLE_MAP["product"]
+        table = get_model(table_name)
+        key_columns = ["sku", "product_name", "region"]
+        query = self.accessor._get_db_obj_query(table_name)
+        with schema_context(self.schema):
+            existing = self.creator.create_columns_for_table_with_bakery(table)
+            existing_id = self.accessor.insert_on_conflict_do_nothing(
+                table, dict(existing), conflict_columns=key_columns
+            )
+            data = [
+                self.creator.create_columns_for_table_with_bakery(table),
+                dict(existing),
+                self.creator.create_columns_for_table_with_bakery(table),
+            ]
+            data[2]["region"] = None
+            initial_count = query.count()
+
+            row_ids = self.accessor.insert_on_conflict_returning(table, [dict(row) for row in data], key_columns)
+
+            self.assertEqual(query.count(), initial_count + 2)
+            self.assertEqual(row_ids[1], existing_id)
+            self.assertEqual(len(set(row_ids)), 3)
+
+            row_ids_2 = self.accessor.insert_on_conflict_returning(table, [dict(row) for row in data], key_columns)
+
+            self.assertEqual(query.count(), initial_count + 2)
+            self.assertEqual(row_ids, row_ids_2)
+
+    def test_insert_on_conflict_returning_set_columns(self):
+        """Test that a multi-row INSERT updates existing rows when set columns are given."""
+        table_name = AWS_CUR_TABLE_MAP["reservation"]
+        table = get_model(table_name)
+        query = self.accessor._get_db_obj_query(table)
+        with schema_context(self.schema):
+            data = self.creator.create_columns_for_table_with_bakery(table)
+            data["number_of_reservations"] = 1
+            row_id = self.accessor.insert_on_conflict_returning(
+                table, [dict(data)], ["reservation_arn"], set_columns=list(data.keys())
+            )[0]
+            initial_count = query.count()
+
+            data["number_of_reservations"] = 2
+            row_id_2 = self.accessor.insert_on_conflict_returning(
+                table, [dict(data)], ["reservation_arn"], set_columns=list(data.keys())
+            )[0]
+
+            self.assertEqual(row_id, row_id_2)
+            self.assertEqual(query.count(), initial_count)
+            self.assertEqual(query.get(id=row_id).number_of_reservations, 2)
+
+    def test_insert_on_conflict_returning_duplicate_keys(self):
+        """Test that rows with the same key in one batch are inserted once."""
+        table_name = AWS_CUR_TABLE_MAP["reservation"]
+        table = get_model(table_name)
+        query = self.accessor._get_db_obj_query(table)
+        with schema_context(self.schema):
+            data = self.creator.create_columns_for_table_with_bakery(table)
+            data["number_of_reservations"] = 1
+            updated = dict(data, number_of_reservations=3)
+            initial_count = query.count()
+
+            row_ids = self.accessor.insert_on_conflict_returning(
+                table, [dict(data), updated], ["reservation_arn"], set_columns=list(data.keys())
+            )
+
+            self.assertEqual(len(row_ids), 2)
+            self.assertEqual(row_ids[0], row_ids[1])
+            self.assertEqual(query.count(), initial_count + 1)
+            self.assertEqual(query.get(id=row_ids[0]).number_of_reservations, 3)
+
     def test_insert_on_conflict_do_update_without_conflict(self):
         """Test that an INSERT succeeds inserting all non-conflicting rows."""
         table_name = AWS_CUR_TABLE_MAP["reservation"]
@@ -800,6 +800,40 @@ class OCPReportDBAccessorTest(MasuTestCase):
                         )
                     self.assertAlmostEqual(sum(monthly_project_cost), expected_project_value, 6)
 
+    def test_populate_monthly_cost_node_upserts(self):
+        """Test that repeated monthly node costs update the existing rows with one statement per month."""
+        dh = DateHelper()
+        start_date = dh.this_month_start
+        end_date = dh.this_month_end
+        first_month, _ = month_date_range_tuple(start_date)
+        self.cluster_id = self.ocpaws_ocp_cluster_id
+        distribution = metric_constants.CPU_DISTRIBUTION
+        rows = self.accessor._get_db_obj_query(OCPUsageLineItemDailySummary).filter(
+            usage_start=first_month, cluster_id=self.cluster_id, monthly_cost_type="Node"
+        )
+        args = (start_date, end_date, self.cluster_id, self.cluster_id, distribution, self.ocpaws_provider_uuid)
+        self.accessor.populate_monthly_cost("Node", "Infrastructure", 10, *args)
+        with schema_context(self.schema):
+            initial_count = rows.count()
+            self.assertNotEqual(initial_count, 0)
+
+        with patch.object(
+            self.accessor, "_execute_raw_sql_query", wraps=self.accessor._execute_raw_sql_query
+        ) as mock_execute:
+            self.accessor.populate_monthly_cost("Node", "Infrastructure", 20, *args)
+            mock_execute.assert_called_once()
+
+        with schema_context(self.schema):
+            self.assertEqual(rows.count(), initial_count)
+            for row in rows.filter(namespace__isnull=True):
+                self.assertEqual(row.infrastructure_monthly_cost_json.get(distribution), 20)
+            node_count = rows.filter(namespace__isnull=True).count()
+            project_total = sum(
+                row.infrastructure_project_monthly_cost.get(distribution)
+                for row in rows.filter(namespace__isnull=False)
+            )
+            self.assertAlmostEqual(project_total, node_count * 20, 6)
+
     def test_populate_monthly_cost_cluster_infrastructure_cost(self):
         """Test that the monthly infrastructure cost row for clusters in the summary table is populated."""
         distribution_choices = [metric_constants.CPU_DISTRIBUTION, metric_constants.MEMORY_DISTRIBUTION]
@@ -2566,6 +2600,40 @@ select * from eek where val1 in {{report_period_id}} ;
                                     actual_diff = float(post_record[1] - vals[1])
                                 self.assertAlmostEqual(actual_diff, expected_diff)
 
+    def test_populate_tag_usage_costs_single_statement(self):
+        """Test that all tag rates of both rate types are applied with one statement."""
+        dh = DateHelper()
+        infrastructure_rates = {
+            "cpu_core_usage_per_hour": {"app": {"banking": 1, "mobile": 2}},
+            "storage_gb_usage_per_month": {"app": {"weather": 3}},
+        }
+        supplementary_rates = {"memory_gb_usage_per_hour": {"app": {"banking": 4}, "env": {"prod": 5}}}
+        default_rates = {"cpu_core_usage_per_hour": {"app": {"default_value": 1, "defined_keys": ["banking"]}}}
+        with patch.object(self.accessor, "_execute_raw_sql_query") as mock_execute:
+            self.accessor.populate_tag_usage_costs(
+                infrastructure_rates, supplementary_rates, dh.this_month_start, dh.this_month_end, self.cluster_id
+            )
+            self.accessor.populate_tag_usage_default_costs(
+                default_rates, default_rates, dh.this_month_start, dh.this_month_end, self.cluster_id
+            )
+            self.assertEqual(mock_execute.call_count, 2)
+            tag_params, default_params = (call.kwargs["bind_params"] for call in mock_execute.call_args_list)
+            for value in ('"banking"', '"mobile"', '"weather"', '"prod"'):
+                self.assertIn(value, tag_params)
+            self.assertIn("volume_labels", tag_params)
+            self.assertEqual(default_params.count('["banking"]'), 2)
+
+            mock_execute.reset_mock()
+            self.accessor.populate_tag_usage_costs({}, {}, dh.this_month_start, dh.this_month_end, self.cluster_id)
+            self.accessor.populate_tag_usage_default_costs(
+                {"cpu_core_usage_per_hour": {"app": {"default_value": 0, "defined_keys": []}}},
+                {},
+                dh.this_month_start,
+                dh.this_month_end,
+                self.cluster_id,
+            )
+            mock_execute.assert_not_called()
+
     def test_populate_tag_based_default_usage_costs(self):  # noqa: C901
         """Test that the usage costs are updated correctly when default tag values are passed in."""
         # set up the key value pairs to test and the map for cost type and the fields it needs
@@ -168,24 +168,56 @@ class OCPReportDownloaderTest(MasuTestCase):
         with tempfile.TemporaryDirectory() as td:
             filename = "storage_data.csv"
             file_path = f"{td}/{filename}"
-            with patch("masu.external.downloader.ocp.ocp_report_downloader.pd") as mock_pd:
-                with patch(
-                    "masu.external.downloader.ocp.ocp_report_downloader.utils.detect_type",
-                    return_value=("storage_usage", None),
-                ):
-                    mock_report = {
-                        "interval_start": ["2020-01-01 00:00:00 +UTC", "2020-01-02 00:00:00 +UTC"],
-                        "persistentvolumeclaim_labels": ["label1", "label2"],
-                    }
-                    df = pd.DataFrame(data=mock_report)
-                    mock_pd.read_csv.return_value = df
-                    daily_files = divide_csv_daily(file_path, filename)
-                    self.assertNotEqual([], daily_files)
-                    self.assertEqual(len(daily_files), 2)
-                    gen_files = ["storage_usage.2020-01-01.csv", "storage_usage.2020-01-02.csv"]
-                    expected = [{"filename": gen_file, "filepath": f"{td}/{gen_file}"} for gen_file in gen_files]
-                    for expected_item in expected:
-                        self.assertIn(expected_item, daily_files)
+            with patch(
+                "masu.external.downloader.ocp.ocp_report_downloader.utils.detect_type",
+                return_value=("storage_usage", None),
+            ):
+                mock_report = {
+                    "interval_start": ["2020-01-01 00:00:00 +UTC", "2020-01-02 00:00:00 +UTC"],
+                    "persistentvolumeclaim_labels": ["label1", "label2"],
+                }
+                df = pd.DataFrame(data=mock_report)
+                df.to_csv(file_path, index=False, header=True)
+                daily_files = divide_csv_daily(file_path, filename)
+                self.assertNotEqual([], daily_files)
+                self.assertEqual(len(daily_files), 2)
+                gen_files = ["storage_usage.2020-01-01.csv", "storage_usage.2020-01-02.csv"]
+                expected = [{"filename": gen_file, "filepath": f"{td}/{gen_file}"} for gen_file in gen_files]
+                for expected_item in expected:
+                    self.assertIn(expected_item, daily_files)
+
+    @override_settings(PARQUET_PROCESSING_BATCH_SIZE=2)
+    def test_divide_csv_daily_streams_chunks(self):
+        """Test that days spread over several chunks are split in one pass without reformatting values."""
+        rows = [
+            ("2020-01-01 00:00:00 +0000 UTC", "1.10"),
+            ("2020-01-01 01:00:00 +0000 UTC", "2.20"),
+            ("2020-01-02 00:00:00 +0000 UTC", "3.30"),
+            ("2020-01-01 02:00:00 +0000 UTC", ""),
+            ("2020-01-03 00:00:00 +0000 UTC", "4.40"),
+            ("2020-01-02 01:00:00 +0000 UTC", "5.50"),
+        ]
+        with tempfile.TemporaryDirectory() as td:
+            filename = "pod_usage.csv"
+            file_path = f"{td}/{filename}"
+            with open(file_path, "w") as f:
+                f.write("interval_start,pod_usage_cpu_core_seconds\n")
+                f.writelines(f"{interval},{value}\n" for interval, value in rows)
+            with patch(
+                "masu.external.downloader.ocp.ocp_report_downloader.utils.detect_type",
+                return_value=("pod_usage", None),
+            ):
+                daily_files = divide_csv_daily(file_path, filename)
+            self.assertEqual(
+                [daily_file.get("filename") for daily_file in daily_files],
+                ["pod_usage.2020-01-01.csv", "pod_usage.2020-01-02.csv", "pod_usage.2020-01-03.csv"],
+            )
+            for daily_file in daily_files:
+                day = daily_file.get("filename").split(".")[1]
+                with open(daily_file.get("filepath")) as f:
+                    lines = f.read().splitlines()
+                expected = [f"{interval},{value}" for interval, value in rows if interval.startswith(day)]
+                self.assertEqual(lines, ["interval_start,pod_usage_cpu_core_seconds"] + expected)
 
     def test_divide_csv_daily_failure(self):
         """Test the divide_csv_daily method throw error on reading CSV."""
@@ -287,7 +319,7 @@ class OCPReportDownloaderTest(MasuTestCase):
     @override_settings(ENABLE_PARQUET_PROCESSING=True)
     @patch("masu.external.downloader.ocp.ocp_report_downloader.os")
     @patch("masu.external.downloader.ocp.ocp_report_downloader.copy_local_report_file_to_s3_bucket")
-    @patch("masu.external.downloader.ocp.ocp_report_downloader.divide_csv_daily")
+    @patch("masu.external.downloader.ocp.ocp_report_downloader._split_csv_daily")
     def test_create_daily_archives(self, mock_divide, mock_s3_copy, mock_os):
         """Test that this method returns a file list."""
         start_date = DateHelper().this_month_start
@@ -3,17 +3,23 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the Kafka msg handler."""
+import io
 import json
 import logging
 import os
 import shutil
+import tarfile
 import tempfile
+import time
 import uuid
 from datetime import datetime
+from unittest.mock import Mock
 from unittest.mock import patch
 
 import requests_mock
 from confluent_kafka import KafkaError
+from confluent_kafka import TIMESTAMP_CREATE_TIME
+from confluent_kafka import TopicPartition
 from django.db import InterfaceError
 from django.db import OperationalError
 from requests.exceptions import HTTPError
@@ -47,11 +53,6 @@ def raise_exception():
     raise KafkaMsgHandlerError()
 
 
-def raise_OSError(path):
-    """Raise a OSError."""
-    raise OSError()
-
-
 class FakeManifest:
     def __init__(self, num_processed_files=1, num_total_files=1):
         self.num_processed_files = num_processed_files
@@ -88,6 +89,7 @@ class MockMessage:
         self._topic = topic
         self._offset = offset
         self._partition = partition
+        self._timestamp = int(time.time() * 1000)
         value_dict.update({"url": url})
         value_str = json.dumps(value_dict)
         self._value = value_str.encode("utf-8")
@@ -114,6 +116,9 @@ class MockMessage:
     def headers(self):
         return self._headers
 
+    def timestamp(self):
+        return (TIMESTAMP_CREATE_TIME, self._timestamp)
+
 
 class MockKafkaConsumer:
     def __init__(self, preloaded_messages=None):
@@ -134,6 +139,41 @@ class MockKafkaConsumer:
         self.preloaded_messages.pop()
 
 
+class MockConcurrentKafkaConsumer:
+    """A consumer that honors pause, resume and seek."""
+
+    def __init__(self, messages):
+        self.messages = {(msg.topic(), msg.partition(), msg.offset()): msg for msg in messages}
+        self.queue = list(messages)
+        self.paused = set()
+        self.commits = []
+
+    def assignment(self):
+        return [TopicPartition(topic, partition) for topic, partition, _ in self.messages]
+
+    def pause(self, partitions):
+        self.paused.update((tp.topic, tp.partition) for tp in partitions)
+
+    def resume(self, partitions):
+        self.paused.difference_update((tp.topic, tp.partition) for tp in partitions)
+
+    def seek(self, tp):
+        msg = self.messages[(tp.topic, tp.partition, tp.offset)]
+        if msg not in self.queue:
+            self.queue.insert(0, msg)
+
+    def poll(self, *args, **kwargs):
+        for msg in self.queue:
+            if (msg.topic(), msg.partition()) not in self.paused:
+                self.queue.remove(msg)
+                return msg
+        time.sleep(0.005)
+        return None
+
+    def commit(self, message, asynchronous=True):
+        self.commits.append((message.partition(), message.offset()))
+
+
 class KafkaMsgHandlerTest(MasuTestCase):
     """Test Cases for the Kafka msg handler."""
 
@@ -287,6 +327,44 @@ class KafkaMsgHandlerTest(MasuTestCase):
                     msg_handler.listen_for_messages(msg, mock_consumer)
                     close_mock.assert_not_called()
 
+    def test_listen_for_messages_concurrently(self):
+        """Test that partitions are processed concurrently and committed in order after retries."""
+        messages = [
+            MockMessage(partition=0, offset=1),
+            MockMessage(partition=0, offset=2),
+            MockMessage(partition=1, offset=7),
+            MockMessage(partition=2, offset=3),
+        ]
+        consumer = MockConcurrentKafkaConsumer(messages)
+        failed = []
+
+        def process(msg):
+            if msg.offset() == 2 and not failed:
+                failed.append(msg)
+                raise KafkaMsgHandlerError()
+            return True
+
+        with patch("masu.external.kafka_msg_handler.process_messages", side_effect=process) as mock_process:
+            with patch.object(Config, "RETRY_SECONDS", 0):
+                with patch("itertools.count", side_effect=[range(400)]):
+                    msg_handler.listen_for_messages_concurrently(consumer, 2)
+
+        self.assertEqual(mock_process.call_count, 5)
+        self.assertEqual(len(failed), 1)
+        self.assertEqual([offset for partition, offset in consumer.commits if partition == 0], [1, 2])
+        self.assertCountEqual(consumer.commits, [(0, 1), (0, 2), (1, 7), (2, 3)])
+        self.assertEqual(consumer.queue, [])
+
+    def test_handle_listener_message_metrics(self):
+        """Test that processed messages are counted and their latency observed."""
+        msg = MockMessage(offset=5)
+        with patch("masu.external.kafka_msg_handler.process_messages"):
+            with patch("masu.external.kafka_msg_handler.KAFKA_MESSAGE_LATENCY") as mock_latency:
+                with patch("masu.external.kafka_msg_handler.KAFKA_MESSAGES_PROCESSED_COUNTER") as mock_counter:
+                    self.assertEqual(msg_handler.handle_listener_message(msg), msg_handler.LISTENER_COMMIT)
+        mock_counter.labels.assert_called_with(outcome=msg_handler.LISTENER_COMMIT)
+        mock_latency.observe.assert_called_once()
+
     def test_process_messages(self):
         """Test the process_message function."""
 
@@ -572,6 +650,107 @@ class KafkaMsgHandlerTest(MasuTestCase):
                                 shutil.rmtree(fake_dir)
                                 shutil.rmtree(fake_pvc_dir)
 
+    def test_extract_payload_streams_reports_once(self):
+        """Test that reports are written to their destination whether they precede the manifest or not."""
+        with tarfile.open(fileobj=io.BytesIO(self.tarball_file), mode="r:gz") as payload:
+            members = [(member, payload.extractfile(member).read()) for member in payload if member.isfile()]
+
+        fake_account = {"provider_uuid": uuid.uuid4(), "provider_type": "OCP", "schema_name": "testschema"}
+        payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
+        for manifest_last in (False, True):
+            with self.subTest(manifest_last=manifest_last):
+                ordered = sorted(members, key=lambda item: ("manifest.json" in item[0].name) == manifest_last)
+                buffer = io.BytesIO()
+                with tarfile.open(fileobj=buffer, mode="w:gz") as payload:
+                    for member, content in ordered:
+                        payload.addfile(member, io.BytesIO(content))
+
+                fake_dir = tempfile.mkdtemp()
+                fake_pvc_dir = tempfile.mkdtemp()
+                with requests_mock.mock() as m, patch.object(Config, "INSIGHTS_LOCAL_REPORT_DIR", fake_dir):
+                    m.get(payload_url, content=buffer.getvalue())
+                    with patch.object(Config, "PVC_DIR", fake_pvc_dir), patch(
+                        "masu.external.kafka_msg_handler.get_account_from_cluster_id", return_value=fake_account
+                    ), patch("masu.external.kafka_msg_handler.create_manifest_entries", return_value=1), patch(
+                        "masu.external.kafka_msg_handler.record_report_status", return_value=True
+                    ), patch(
+                        "masu.external.kafka_msg_handler.shutil.copy", wraps=shutil.copy
+                    ) as mock_copy:
+                        msg_handler.extract_payload(payload_url, "test_request_id")
+                    expected_path = f"{Config.INSIGHTS_LOCAL_REPORT_DIR}/{self.cluster_id}/{self.date_range}"
+                    report_files = [member.name for member, _ in members if member.name.endswith(".csv")]
+                    for report_file in report_files:
+                        self.assertTrue(os.path.isfile(f"{expected_path}/{os.path.basename(report_file)}"))
+                    # Only the manifest is copied, the temporary directory is removed
+                    mock_copy.assert_called_once()
+                    self.assertEqual(os.listdir(fake_pvc_dir), [])
+                shutil.rmtree(fake_dir)
+                shutil.rmtree(fake_pvc_dir)
+
+    def build_payload(self, members):
+        """Return a gzipped tarball of the (name, content) members."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as payload:
+            for name, content in members:
+                member = tarfile.TarInfo(name)
+                member.size = len(content)
+                payload.addfile(member, io.BytesIO(content))
+        return buffer.getvalue()
+
+    def test_extract_payload_contents_skips_unlisted_members(self):
+        """Test that only the reports listed in the manifest are written."""
+        manifest = json.dumps({"files": ["report.csv"]}).encode()
+        payload = self.build_payload(
+            [("early.csv", b"a,b"), ("manifest.json", manifest), ("report.csv", b"a,b"), ("late.csv", b"a,b")]
+        )
+        out_dir = tempfile.mkdtemp()
+        destination_dir = tempfile.mkdtemp()
+        response = Mock(raw=io.BytesIO(payload))
+
+        manifest_path = msg_handler.extract_payload_contents(
+            "test_request_id", out_dir, response, lambda path: destination_dir
+        )
+
+        self.assertEqual(manifest_path, f"{out_dir}/manifest.json")
+        self.assertEqual(os.listdir(destination_dir), ["report.csv"])
+        self.assertEqual(os.listdir(out_dir), ["manifest.json"])
+        response.close.assert_called_once()
+        shutil.rmtree(out_dir)
+        shutil.rmtree(destination_dir)
+
+    def test_extract_payload_contents_truncated(self):
+        """Test that a payload failing mid-stream leaves no report in the destination."""
+        manifest = json.dumps({"files": ["small.csv", "large.csv"]}).encode()
+        payload = self.build_payload(
+            [("manifest.json", manifest), ("small.csv", b"a,b"), ("large.csv", os.urandom(200000))]
+        )
+        out_dir = tempfile.mkdtemp()
+        destination_dir = tempfile.mkdtemp()
+        response = Mock(raw=io.BytesIO(payload[:-50000]))
+
+        with self.assertRaises(KafkaMsgHandlerError):
+            msg_handler.extract_payload_contents("test_request_id", out_dir, response, lambda path: destination_dir)
+
+        self.assertEqual(os.listdir(destination_dir), [])
+        response.close.assert_called_once()
+        shutil.rmtree(out_dir)
+        shutil.rmtree(destination_dir)
+
+    def test_move_payload_reports_failure(self):
+        """Test that reports already moved are removed when a move fails."""
+        out_dir = tempfile.mkdtemp()
+        destination_dir = tempfile.mkdtemp()
+        staged_paths = {"report.csv": f"{out_dir}/report.csv", "missing.csv": f"{out_dir}/missing.csv"}
+        with open(staged_paths["report.csv"], "w") as report:
+            report.write("a,b")
+
+        with self.assertRaises(KafkaMsgHandlerError):
+            msg_handler.move_payload_reports("test_request_id", staged_paths, destination_dir)
+
+        self.assertEqual(os.listdir(destination_dir), [])
+        shutil.rmtree(out_dir)
+        shutil.rmtree(destination_dir)
+
     def test_extract_payload_dates(self):
         """Test to verify extracting payload is successful."""
 
@@ -659,8 +838,8 @@ class KafkaMsgHandlerTest(MasuTestCase):
                                 shutil.rmtree(fake_dir)
                                 shutil.rmtree(fake_pvc_dir)
 
-    @patch("masu.external.kafka_msg_handler.TarFile.extractall", side_effect=raise_OSError)
-    def test_extract_bad_payload_not_tar(self, mock_extractall):
+    @patch("masu.external.kafka_msg_handler.TarFile.next", side_effect=OSError)
+    def test_extract_bad_payload_not_tar(self, mock_next):
         """Test to verify extracting payload missing report files is not successful."""
         fake_account = {"provider_uuid": uuid.uuid4(), "provider_type": "OCP", "schema_name": "testschema"}
         payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
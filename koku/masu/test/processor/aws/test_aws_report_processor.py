@@ -29,8 +29,10 @@ from masu.exceptions import MasuProcessingError
 from masu.external import GZIP_COMPRESSED
 from masu.external import UNCOMPRESSED
 from masu.external.date_accessor import DateAccessor
+from masu.processor import dimension_resolver
 from masu.processor.aws.aws_report_processor import AWSReportProcessor
 from masu.processor.aws.aws_report_processor import ProcessedReport
+from masu.processor.dimension_resolver import PendingDimension
 from masu.test import MasuTestCase
 from reporting_common import REPORT_COLUMN_MAP
 
@@ -129,6 +131,18 @@ class AWSReportProcessorTest(MasuTestCase):
         self.processor.processed_report.remove_processed_rows()
         self.processor.line_item_columns = None
 
+    def resolve_batch(self):
+        """Resolve the queued dimension rows and their placeholders on the line items."""
+        self.processor.dimensions.resolve(self.accessor)
+        self.processor.dimensions.resolve_line_items(
+            self.processor.processed_report.line_items, AWSReportProcessor.DIMENSION_COLUMNS
+        )
+
+    def resolve(self, value):
+        """Resolve the queued dimension rows and return the id of value."""
+        self.processor.dimensions.resolve(self.accessor)
+        return self.processor.dimensions.resolve_value(value)
+
     def test_initializer(self):
         """Test initializer."""
         self.assertIsNotNone(self.processor._schema)
@@ -554,6 +568,82 @@ class AWSReportProcessorTest(MasuTestCase):
             for key in test_entry:
                 self.assertIn(key, ce_map)
 
+    def test_mappings_per_manifest(self):
+        """Test that resolved ids are shared by the processors of a manifest only."""
+
+        def get_processor(manifest_id):
+            return AWSReportProcessor(
+                schema_name=self.schema,
+                report_path=self.test_report,
+                compression=UNCOMPRESSED,
+                provider_uuid=self.aws_provider_uuid,
+                manifest_id=manifest_id,
+            )
+
+        with patch.dict(dimension_resolver._manifest_caches, clear=True):
+            self.processor = get_processor(self.manifest.id)
+            product_id = self.resolve(self.processor._create_cost_entry_product(self.row, self.accessor))
+            self.assertIn(product_id, self.processor.existing_product_map.values())
+
+            processor = get_processor(self.manifest.id)
+            self.assertEqual(processor.existing_product_map, self.processor.existing_product_map)
+            self.assertEqual(processor._create_cost_entry_product(self.row, self.accessor), product_id)
+
+            for processor in (get_processor(None), get_processor(self.manifest.id + 1)):
+                self.assertEqual(processor.existing_product_map, {})
+                product = processor._create_cost_entry_product(self.row, self.accessor)
+                self.assertIsInstance(product, PendingDimension)
+
+    def test_create_cost_entry_product_queued_once(self):
+        """Test that a product seen twice in a batch is queued once."""
+        first = self.processor._create_cost_entry_product(self.row, self.accessor)
+        second = self.processor._create_cost_entry_product(self.row, self.accessor)
+
+        self.assertIsInstance(first, PendingDimension)
+        self.assertIsInstance(second, PendingDimension)
+        ((_, rows),) = self.processor.dimensions._pending.values()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(self.resolve(first), self.processor.dimensions.resolve_value(second))
+
+    def test_dimensions_resolved_once_per_batch(self):
+        """Test that the dimension rows of a batch are written with one statement per table."""
+        with open(self.test_report) as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            self.processor.create_cost_entry_objects(row, self.accessor)
+
+        with patch.object(
+            AWSReportDBAccessor,
+            "insert_on_conflict_returning",
+            autospec=True,
+            side_effect=AWSReportDBAccessor.insert_on_conflict_returning,
+        ) as mock_insert:
+            with schema_context(self.schema):
+                self.processor.dimensions.resolve(self.accessor)
+        statements = [(call.args[1], tuple(call.kwargs["set_columns"])) for call in mock_insert.call_args_list]
+        self.assertTrue(statements)
+        self.assertEqual(len(statements), len(set(statements)))
+
+        self.processor.dimensions.resolve_line_items(
+            self.processor.processed_report.line_items, AWSReportProcessor.DIMENSION_COLUMNS
+        )
+        for line_item in self.processor.processed_report.line_items:
+            for column in AWSReportProcessor.DIMENSION_COLUMNS:
+                self.assertNotIsInstance(line_item.get(column), PendingDimension)
+
+    def test_save_to_db_rollback_evicts_batch_ids(self):
+        """Test that a failed dimension write evicts only the ids of the batch."""
+        self.processor.existing_product_map.update({"key": 1})
+        product = self.processor._create_cost_entry_product(self.row, self.accessor)
+
+        with patch.object(AWSReportDBAccessor, "insert_on_conflict_returning", side_effect=Exception("boom")):
+            with self.assertRaises(Exception):
+                self.processor._save_to_db(None, self.accessor)
+
+        self.assertEqual(self.processor.existing_product_map, {"key": 1})
+        self.assertNotIn(product.key, self.processor.existing_product_map)
+        self.assertEqual(self.processor.processed_report.products, {})
+
     def test_write_processed_rows_to_csv(self):
         """Test that the CSV bulk upload file contains proper data."""
         bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
@@ -564,6 +654,7 @@ class AWSReportProcessorTest(MasuTestCase):
         self.processor._create_cost_entry_line_item(
             self.row, cost_entry_id, bill_id, product_id, pricing_id, reservation_id, self.accessor
         )
+        self.resolve_batch()
 
         file_obj = self.processor._write_processed_rows_to_csv()
 
@@ -655,7 +746,7 @@ class AWSReportProcessorTest(MasuTestCase):
 
         bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
 
-        cost_entry_id = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
+        cost_entry_id = self.resolve(self.processor._create_cost_entry(self.row, bill_id, self.accessor))
 
         self.assertIsNotNone(cost_entry_id)
 
@@ -664,6 +755,17 @@ class AWSReportProcessorTest(MasuTestCase):
 
         self.assertEqual(cost_entry_id, id_in_db)
 
+    def test_create_cost_entry_queued_once(self):
+        """Test that a cost entry seen twice in a batch is queued once."""
+        bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
+        first = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
+        second = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
+
+        self.assertIsInstance(first, PendingDimension)
+        self.assertEqual(first, second)
+        ((_, rows),) = self.processor.dimensions._pending.values()
+        self.assertEqual(len(rows), 1)
+
     def test_create_cost_entry_existing(self):
         """Test that a cost entry id is returned from an existing entry."""
         bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
@@ -707,7 +809,7 @@ class AWSReportProcessorTest(MasuTestCase):
         """Test that a cost entry product id is returned."""
         table_name = AWS_CUR_TABLE_MAP["product"]
 
-        product_id = self.processor._create_cost_entry_product(self.row, self.accessor)
+        product_id = self.resolve(self.processor._create_cost_entry_product(self.row, self.accessor))
 
         self.assertIsNotNone(product_id)
 
@@ -746,7 +848,7 @@ class AWSReportProcessorTest(MasuTestCase):
         """Test that a cost entry pricing id is returned."""
         table_name = AWS_CUR_TABLE_MAP["pricing"]
 
-        pricing_id = self.processor._create_cost_entry_pricing(self.row, self.accessor)
+        pricing_id = self.resolve(self.processor._create_cost_entry_pricing(self.row, self.accessor))
 
         self.assertIsNotNone(pricing_id)
 
@@ -786,7 +888,7 @@ class AWSReportProcessorTest(MasuTestCase):
 
         table_name = AWS_CUR_TABLE_MAP["reservation"]
 
-        reservation_id = self.processor._create_cost_entry_reservation(row, self.accessor)
+        reservation_id = self.resolve(self.processor._create_cost_entry_reservation(row, self.accessor))
 
         self.assertIsNotNone(reservation_id)
 
@@ -805,7 +907,7 @@ class AWSReportProcessorTest(MasuTestCase):
 
         table_name = AWS_CUR_TABLE_MAP["reservation"]
 
-        reservation_id = self.processor._create_cost_entry_reservation(row, self.accessor)
+        reservation_id = self.resolve(self.processor._create_cost_entry_reservation(row, self.accessor))
 
         self.assertIsNotNone(reservation_id)
 
@@ -818,7 +920,7 @@ class AWSReportProcessorTest(MasuTestCase):
         row["lineItem/LineItemType"] = "RIFee"
         res_count = row["reservation/NumberOfReservations"]
         row["reservation/NumberOfReservations"] = res_count + 1
-        reservation_id = self.processor._create_cost_entry_reservation(row, self.accessor)
+        reservation_id = self.resolve(self.processor._create_cost_entry_reservation(row, self.accessor))
 
         self.assertEqual(reservation_id, id_in_db)
 
@@ -322,6 +322,8 @@ class AzureReportProcessorTest(MasuTestCase):
         """Test that a product id is returned."""
         table_name = AZURE_REPORT_TABLE_MAP["product"]
         product_id = self.processor._create_cost_entry_product(self.row, self.accessor)
+        self.processor.dimensions.resolve(self.accessor)
+        product_id = self.processor.dimensions.resolve_value(product_id)
 
         self.assertIsNotNone(product_id)
 
@@ -334,6 +336,8 @@ class AzureReportProcessorTest(MasuTestCase):
         """Test that a meter id is returned."""
         table_name = AZURE_REPORT_TABLE_MAP["meter"]
         meter_id = self.processor._create_meter(self.row, self.accessor)
+        self.processor.dimensions.resolve(self.accessor)
+        meter_id = self.processor.dimensions.resolve_value(meter_id)
 
         self.assertIsNotNone(meter_id)
 
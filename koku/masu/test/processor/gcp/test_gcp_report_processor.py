@@ -99,6 +99,11 @@ class GCPReportProcessorTest(MasuTestCase):
         super().tearDown()
         shutil.rmtree(self.temp_dir)
 
+    def resolve(self, value):
+        """Resolve the queued dimension rows and return the id of value."""
+        self.processor.dimensions.resolve(self.accessor)
+        return self.processor.dimensions.resolve_value(value)
+
     def test_gcp_process(self):
         """Test the processing of an GCP file writes objects to the database."""
         with schema_context(self.schema):
@@ -137,7 +142,7 @@ class GCPReportProcessorTest(MasuTestCase):
     def test_create_gcp_project(self):
         """Test calling _get_or_create_gcp_project on a project id that doesn't exist creates it."""
         project_data = {"project.id": fake.word(), "billing_account_id": fake.word(), "project.name": fake.word()}
-        project_id = self.processor._get_or_create_gcp_project(project_data, self.accessor)
+        project_id = self.resolve(self.processor._get_or_create_gcp_project(project_data, self.accessor))
         with schema_context(self.schema):
             self.assertTrue(GCPProject.objects.filter(id=project_id).exists())
 
@@ -146,11 +151,11 @@ class GCPReportProcessorTest(MasuTestCase):
         project_id = fake.word()
         project_info = {"project.id": project_id, "billing_account_id": fake.word(), "project.name": fake.word()}
         expected_name = "BiggoStormsMixTape"
-        pt_id_1 = self.processor._get_or_create_gcp_project(project_info, self.accessor)
+        pt_id_1 = self.resolve(self.processor._get_or_create_gcp_project(project_info, self.accessor))
         with schema_context(self.schema):
             self.assertTrue(GCPProject.objects.filter(id=pt_id_1).exists())
         project_info["project.name"] = expected_name
-        pt_id_2 = self.processor._get_or_create_gcp_project(project_info, self.accessor)
+        pt_id_2 = self.resolve(self.processor._get_or_create_gcp_project(project_info, self.accessor))
         # Check that both calls return the same project table id
         self.assertEqual(pt_id_1, pt_id_2)
         with schema_context(self.schema):
@@ -166,8 +171,11 @@ class GCPReportProcessorTest(MasuTestCase):
             project = GCPProject.objects.create(
                 project_id=project_id, account_id=account_id, project_name=project_name
             )
-        fetched_project_id = self.processor._get_or_create_gcp_project(
-            {"project.id": project_id, "billing_account_id": account_id, "project.name": project_name}, self.accessor
+        fetched_project_id = self.resolve(
+            self.processor._get_or_create_gcp_project(
+                {"project.id": project_id, "billing_account_id": account_id, "project.name": project_name},
+                self.accessor,
+            )
         )
         self.assertEqual(fetched_project_id, project.id)
         with schema_context(self.schema):
@@ -364,6 +364,9 @@ class OCPReportProcessorTest(MasuTestCase):
         self.ocp_processor._processor._create_usage_report_line_item(
             self.row, report_period_id, report_id, self.accessor
         )
+        processor = self.ocp_processor._processor
+        processor.dimensions.resolve(self.accessor)
+        processor.dimensions.resolve_line_items(processor.processed_report.line_items, processor.DIMENSION_COLUMNS)
 
         file_obj = self.ocp_processor._processor._write_processed_rows_to_csv()
         line_item_data = self.ocp_processor._processor.processed_report.line_items.pop()
@@ -407,6 +410,8 @@ class OCPReportProcessorTest(MasuTestCase):
             )
 
             report_id = self.ocp_processor._processor._create_report(self.row, report_period_id, accessor)
+            self.ocp_processor._processor.dimensions.resolve(accessor)
+            report_id = self.ocp_processor._processor.dimensions.resolve_value(report_id)
 
             self.assertIsNotNone(report_id)
 
@@ -0,0 +1,101 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the vectorized CSV reader."""
+import io
+import os
+import tempfile
+
+import pandas as pd
+
+from masu.processor.parquet.arrow_csv_reader import read_csv_batches
+from masu.test import MasuTestCase
+from masu.util.aws.common import get_column_converters as aws_column_converters
+from masu.util.azure.common import get_column_converters as azure_column_converters
+from masu.util.gcp.common import get_column_converters as gcp_column_converters
+from masu.util.ocp.common import get_column_converters as ocp_column_converters
+
+TEST_DATA_DIR = "./koku/masu/test/data"
+
+
+class TestArrowCSVReader(MasuTestCase):
+    """Test cases for the pyarrow ingest engine."""
+
+    def read_with_pandas(self, csv_filename, converters, batch_size, **kwargs):
+        """Read the file the way the pandas ingest engine does."""
+        col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
+        csv_converters = {col: converters[col.lower()] for col in col_names if col.lower() in converters}
+        csv_converters.update({col: str for col in col_names if col not in csv_converters})
+        with pd.read_csv(csv_filename, converters=csv_converters, chunksize=batch_size, **kwargs) as reader:
+            return list(reader)
+
+    def read_with_arrow(self, csv_filename, converters, batch_size, **kwargs):
+        """Read the file with the arrow ingest engine."""
+        col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
+        return list(
+            read_csv_batches(csv_filename, col_names, converters, batch_size, compression=kwargs.get("compression"))
+        )
+
+    def assert_engines_match(self, csv_filename, converters, batch_size, **kwargs):
+        """Assert both engines produce the same frames and the same parquet bytes."""
+        expected = self.read_with_pandas(csv_filename, converters, batch_size, **kwargs)
+        result = self.read_with_arrow(csv_filename, converters, batch_size, **kwargs)
+        self.assertEqual(len(result), len(expected))
+        for expected_frame, result_frame in zip(expected, result):
+            pd.testing.assert_frame_equal(result_frame, expected_frame)
+            expected_parquet = io.BytesIO()
+            result_parquet = io.BytesIO()
+            expected_frame.to_parquet(
+                expected_parquet, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False
+            )
+            result_frame.to_parquet(
+                result_parquet, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False
+            )
+            self.assertEqual(result_parquet.getvalue(), expected_parquet.getvalue())
+
+    def test_read_csv_batches_aws(self):
+        """Test that AWS CUR files match the pandas engine."""
+        converters = aws_column_converters()
+        self.assert_engines_match(f"{TEST_DATA_DIR}/test_cur.csv", converters, 5)
+        self.assert_engines_match(f"{TEST_DATA_DIR}/test_cur.csv.gz", converters, 5, compression="gzip")
+
+    def test_read_csv_batches_ocp(self):
+        """Test that OCP operator files match the pandas engine."""
+        converters = ocp_column_converters()
+        for file_name in (
+            "e6b3701e-1e91-433b-b238-a31e49937558_February-2019-my-ocp-cluster-1.csv",
+            "e6b3701e-1e91-433b-b238-a31e49937558_storage.csv",
+            "e6b3701e-1e91-433b-b238-a31e49937558_node_labels.csv",
+            "434eda91-885b-40b2-8733-7a21fad62b56_namespace_labels.csv",
+        ):
+            with self.subTest(file_name=file_name):
+                self.assert_engines_match(f"{TEST_DATA_DIR}/ocp/{file_name}", converters, 100)
+
+    def test_read_csv_batches_azure_and_gcp(self):
+        """Test that Azure and GCP files match the pandas engine."""
+        self.assert_engines_match(f"{TEST_DATA_DIR}/azure/azure_version_2.csv", azure_column_converters(), 2)
+        self.assert_engines_match(
+            f"{TEST_DATA_DIR}/gcp/202011_30c31bca571d9b7f3b2c8459dd8bc34a_2020-11-08:2020-11-11.csv",
+            gcp_column_converters(),
+            10,
+        )
+
+    def test_read_csv_batches_unparseable_floats(self):
+        """Test that cells pyarrow cannot parse fall back to safe_float."""
+        converters = ocp_column_converters()
+        content = (
+            "interval_start,pod_usage_cpu_core_seconds,pod_labels\n"
+            "2019-02-01 00:00:00 +0000 UTC,1.5,label_app:web\n"
+            "2019-02-01 00:00:00 +0000 UTC,,label_app:web\n"
+            "2019-02-01 01:00:00 +0000 UTC,not-a-number,\n"
+            "2019-02-01 01:00:00 +0000 UTC,1_000,label_app:db|label_env\n"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_filename = os.path.join(temp_dir, "pod_usage.csv")
+            with open(csv_filename, "w") as csv_file:
+                csv_file.write(content)
+            self.assert_engines_match(csv_filename, converters, 3)
+            result = pd.concat(self.read_with_arrow(csv_filename, converters, 3))
+        self.assertEqual(result["pod_usage_cpu_core_seconds"].tolist(), [1.5, 0.0, 0.0, 1000.0])
+        self.assertEqual(result.index.tolist(), [0, 1, 2, 3])
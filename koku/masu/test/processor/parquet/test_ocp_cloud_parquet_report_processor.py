@@ -20,6 +20,7 @@ from masu.processor.parquet.parquet_report_processor import PARQUET_EXT
 from masu.test import MasuTestCase
 from masu.util.aws.common import match_openshift_resources_and_labels
 from masu.util.gcp.common import match_openshift_resources_and_labels as gcp_match_openshift_resources_and_labels
+from masu.util.ocp.common import OpenShiftMatcher
 from reporting.provider.ocp.models import OCPEnabledTagKeys
 
 
@@ -185,6 +186,7 @@ class TestOCPCloudParquetReportProcessor(MasuTestCase):
 
         mock_topology.assert_called()
         mock_data_processor.assert_called()
+        self.assertIsInstance(mock_data_processor.call_args.kwargs["matcher"], OpenShiftMatcher)
         mock_create_parquet.assert_called()
 
     def test_ocp_on_gcp_data_processor(self):
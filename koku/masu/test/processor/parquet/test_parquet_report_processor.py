@@ -4,6 +4,7 @@
 #
 import datetime
 import logging
+import multiprocessing
 import os
 import shutil
 from datetime import timedelta
@@ -12,6 +13,7 @@ from pathlib import Path
 from unittest.mock import patch
 from unittest.mock import PropertyMock
 
+import billiard.process
 import faker
 import pandas as pd
 from django.test import override_settings
@@ -24,6 +26,8 @@ from masu.processor.azure.azure_report_parquet_processor import AzureReportParqu
 from masu.processor.gcp.gcp_report_parquet_processor import GCPReportParquetProcessor
 from masu.processor.oci.oci_report_parquet_processor import OCIReportParquetProcessor
 from masu.processor.ocp.ocp_report_parquet_processor import OCPReportParquetProcessor
+from masu.processor.parquet.arrow_csv_reader import ARROW_INGEST_ENGINE
+from masu.processor.parquet.arrow_csv_reader import PANDAS_INGEST_ENGINE
 from masu.processor.parquet.parquet_report_processor import CSV_EXT
 from masu.processor.parquet.parquet_report_processor import CSV_GZIP_EXT
 from masu.processor.parquet.parquet_report_processor import ParquetReportProcessor
@@ -219,6 +223,125 @@ class TestParquetReportProcessor(MasuTestCase):
 
             self.assertEqual(report_processor.post_processor, test.get("expected"))
 
+    def test_ingest_engine(self):
+        """Test that the ingest engine is selected per provider type."""
+        self.assertEqual(self.report_processor.ingest_engine, PANDAS_INGEST_ENGINE)
+        with override_settings(ENABLE_ARROW_INGEST_SOURCE_TYPE=[Provider.PROVIDER_AWS]):
+            self.assertEqual(self.report_processor.ingest_engine, ARROW_INGEST_ENGINE)
+        with override_settings(ENABLE_ARROW_INGEST_SOURCE_TYPE=[Provider.PROVIDER_OCP]):
+            self.assertEqual(self.report_processor.ingest_engine, PANDAS_INGEST_ENGINE)
+
+    @override_settings(ENABLE_ARROW_INGEST_SOURCE_TYPE=[Provider.PROVIDER_AWS])
+    def test_convert_csv_to_parquet_arrow_ingest_engine(self):
+        """Test convert_csv_to_parquet with the arrow ingest engine."""
+        test_report_test_path = "./koku/masu/test/data/test_cur.csv.gz"
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+        Path(local_path).mkdir(parents=True, exist_ok=True)
+        test_report = f"{local_path}/test_cur.csv.gz"
+        shutil.copy2(test_report_test_path, test_report)
+        report_processor = ParquetReportProcessor(
+            schema_name=self.schema,
+            report_path=test_report,
+            provider_uuid=self.aws_provider_uuid,
+            provider_type=Provider.PROVIDER_AWS_LOCAL,
+            manifest_id=self.manifest_id,
+            context={"tracing_id": self.tracing_id, "start_date": DateHelper().today, "create_table": True},
+        )
+        with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+            with patch.object(ParquetReportProcessor, "create_parquet_table"):
+                with patch("masu.processor.parquet.parquet_report_processor.read_csv_batches") as mock_reader:
+                    mock_reader.return_value = iter([])
+                    _, __, result = report_processor.convert_csv_to_parquet(test_report)
+                    self.assertTrue(result)
+                    mock_reader.assert_called()
+                _, daily_frames, result = report_processor.convert_csv_to_parquet(test_report)
+                self.assertTrue(result)
+                self.assertTrue(daily_frames)
+        shutil.rmtree(local_path, ignore_errors=True)
+
+    def _get_split_file_processor(self, local_path, file_count):
+        """Return an AWS processor for file_count copies of the test CUR."""
+        Path(local_path).mkdir(parents=True, exist_ok=True)
+        file_list = []
+        for i in range(file_count):
+            split_file = f"{local_path}/test_cur_{i}.csv.gz"
+            shutil.copy2("./koku/masu/test/data/test_cur.csv.gz", split_file)
+            file_list.append(split_file)
+        return ParquetReportProcessor(
+            schema_name=self.schema,
+            report_path=file_list[0],
+            provider_uuid=self.aws_provider_uuid,
+            provider_type=Provider.PROVIDER_AWS_LOCAL,
+            manifest_id=self.manifest_id,
+            context={
+                "tracing_id": self.tracing_id,
+                "start_date": DateHelper().today,
+                "create_table": True,
+                "split_files": file_list,
+            },
+        )
+
+    @override_settings(PARQUET_PROCESSING_WORKERS=2)
+    def test_convert_to_parquet_worker_pool(self):
+        """Test that split files are converted in worker processes and tables are created once."""
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+        report_processor = self._get_split_file_processor(local_path, 3)
+        with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+            with patch.object(ParquetReportProcessor, "create_parquet_table") as mock_create_table:
+                with patch.object(ParquetReportProcessor, "create_daily_parquet") as mock_create_daily:
+                    with patch(
+                        "masu.processor.parquet.parquet_report_processor.create_enabled_keys"
+                    ) as mock_create_keys:
+                        results = list(report_processor._convert_csv_files(report_processor.file_list))
+                        _, daily_frames = report_processor.convert_to_parquet()
+
+        self.assertEqual([csv_filename for csv_filename, _ in results], report_processor.file_list)
+        for csv_filename, (parquet_base_filename, daily_data_frames, success) in results:
+            self.assertTrue(success)
+            self.assertEqual(parquet_base_filename, os.path.basename(csv_filename).replace(CSV_GZIP_EXT, ""))
+            self.assertTrue(daily_data_frames)
+        self.assertEqual(mock_create_table.call_count, 2)
+        self.assertEqual(mock_create_keys.call_count, 2)
+        self.assertEqual(mock_create_daily.call_count, 3)
+        self.assertTrue(daily_frames)
+        self.assertTrue(report_processor.files_to_remove)
+        self.assertTrue(all(f.startswith(report_processor.local_path) for f in report_processor.files_to_remove))
+        shutil.rmtree(local_path, ignore_errors=True)
+
+    @override_settings(PARQUET_PROCESSING_WORKERS=2)
+    def test_convert_to_parquet_worker_pool_broken(self):
+        """Test that files are marked failed when a worker process dies."""
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+        report_processor = self._get_split_file_processor(local_path, 2)
+        with patch.object(ParquetReportProcessor, "_write_csv_as_parquet", side_effect=lambda *args: os._exit(1)):
+            with patch("masu.processor.parquet.parquet_report_processor.create_enabled_keys"):
+                results = list(report_processor._convert_csv_files(report_processor.file_list))
+        self.assertEqual(len(results), 2)
+        for _, (parquet_base_filename, daily_data_frames, success) in results:
+            self.assertFalse(success)
+            self.assertEqual(daily_data_frames, [])
+        shutil.rmtree(local_path, ignore_errors=True)
+
+    @override_settings(PARQUET_PROCESSING_WORKERS=2)
+    def test_convert_to_parquet_worker_pool_daemonic_process(self):
+        """Test that the worker pool runs in a daemonic process such as a Celery prefork pool worker."""
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+        report_processor = self._get_split_file_processor(local_path, 2)
+        with patch.dict(multiprocessing.current_process()._config, {"daemon": True}), patch.dict(
+            billiard.process.current_process()._config, {"daemon": True}
+        ):
+            with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+                with patch.object(ParquetReportProcessor, "create_parquet_table"):
+                    with patch("masu.processor.parquet.parquet_report_processor.create_enabled_keys"):
+                        with patch.object(ParquetReportProcessor, "convert_csv_to_parquet") as mock_convert:
+                            results = list(report_processor._convert_csv_files(report_processor.file_list))
+        mock_convert.assert_not_called()
+        self.assertEqual([csv_filename for csv_filename, _ in results], report_processor.file_list)
+        for _, (_, daily_data_frames, success) in results:
+            self.assertTrue(success)
+            self.assertTrue(daily_data_frames)
+        shutil.rmtree(local_path, ignore_errors=True)
+
     @patch("masu.processor.parquet.parquet_report_processor.os.path.exists")
     @patch("masu.processor.parquet.parquet_report_processor.os.remove")
     def test_convert_to_parquet(self, mock_remove, mock_exists):
@@ -234,7 +357,7 @@ class TestParquetReportProcessor(MasuTestCase):
         with patch("masu.processor.parquet.parquet_report_processor.enable_trino_processing", return_value=True):
             with patch("masu.processor.parquet.parquet_report_processor.get_path_prefix"):
                 with patch(
-                    "masu.processor.parquet.parquet_report_processor.remove_files_not_in_set_from_s3_bucket"
+                    "masu.processor.parquet.parquet_report_processor.remove_files_not_in_set_from_s3_prefixes"
                 ) as mock_remove:
                     with patch(
                         "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor."
@@ -0,0 +1,155 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the dimension resolver."""
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from masu.processor import dimension_resolver
+from masu.processor.dimension_resolver import DimensionCache
+from masu.processor.dimension_resolver import DimensionResolver
+from masu.processor.dimension_resolver import get_manifest_dimension_caches
+from masu.processor.dimension_resolver import PendingDimension
+from masu.test import MasuTestCase
+from reporting.provider.aws.models import AWSCostEntryPricing
+from reporting.provider.aws.models import AWSCostEntryProduct
+
+
+def insert_rows(table, rows, key_columns, set_columns):
+    """Return one id per row, as insert_on_conflict_returning does."""
+    return [index + 100 for index, _ in enumerate(rows)]
+
+
+class DimensionCacheTest(MasuTestCase):
+    """Test cases for the dimension caches."""
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the least recently used id is evicted when the cache is full."""
+        cache = DimensionCache(2)
+        cache.update({"a": 1, "b": 2})
+        self.assertEqual(cache["a"], 1)
+
+        cache["c"] = 3
+
+        self.assertEqual(dict(cache), {"a": 1, "c": 3})
+
+    def test_manifest_caches(self):
+        """Test that the caches of the most recent manifests are shared."""
+        with patch.dict(dimension_resolver._manifest_caches, clear=True):
+            caches = get_manifest_dimension_caches(self.schema, 1)
+            self.assertIs(get_manifest_dimension_caches(self.schema, 1), caches)
+            self.assertIsNot(get_manifest_dimension_caches("acct", 1), caches)
+            self.assertIsNot(
+                get_manifest_dimension_caches(self.schema, None), get_manifest_dimension_caches(None, None)
+            )
+
+            for manifest_id in range(2, dimension_resolver.MANIFEST_CACHE_COUNT + 2):
+                get_manifest_dimension_caches(self.schema, manifest_id)
+
+            self.assertEqual(len(dimension_resolver._manifest_caches), dimension_resolver.MANIFEST_CACHE_COUNT)
+            self.assertNotIn((self.schema, 1), dimension_resolver._manifest_caches)
+
+
+class DimensionResolverTest(MasuTestCase):
+    """Test cases for the dimension resolver."""
+
+    def test_add_and_get(self):
+        """Test that a queued row is returned as a placeholder until it is resolved."""
+        resolver = DimensionResolver(self.schema)
+        products = {}
+        self.assertIsNone(resolver.get(AWSCostEntryProduct, "sku"))
+
+        pending = resolver.add(AWSCostEntryProduct, "sku", {"sku": "sku"}, ["sku"], resolved=products)
+        self.assertIsInstance(pending, PendingDimension)
+        self.assertEqual(resolver.get(AWSCostEntryProduct, "sku"), pending)
+        self.assertIsNone(resolver.get(AWSCostEntryPricing, "sku"))
+
+        accessor = Mock()
+        accessor.insert_on_conflict_returning.side_effect = insert_rows
+        resolver.resolve(accessor)
+        self.assertEqual(products, {"sku": 100})
+        self.assertEqual(dict(resolver.cache(AWSCostEntryProduct)), {"sku": 100})
+        self.assertIsNone(resolver.get(AWSCostEntryProduct, "sku"))
+
+    def test_resolver_shares_manifest_cache(self):
+        """Test that the resolvers of a manifest share their caches."""
+        with patch.dict(dimension_resolver._manifest_caches, clear=True):
+            resolver = DimensionResolver(self.schema, 1)
+            resolver.cache(AWSCostEntryProduct)["sku"] = 100
+
+            self.assertEqual(DimensionResolver(self.schema, 1).cache(AWSCostEntryProduct)["sku"], 100)
+            self.assertEqual(DimensionResolver(self.schema, 2).cache(AWSCostEntryProduct), {})
+            self.assertEqual(DimensionResolver(self.schema).cache(AWSCostEntryProduct), {})
+
+    def test_cache_size(self):
+        """Test that the caches are bounded by the cache size."""
+        resolver = DimensionResolver(self.schema, cache_size=1)
+        for key in ("a", "b"):
+            resolver.add(AWSCostEntryProduct, key, {"sku": key}, ["sku"], resolved={})
+        accessor = Mock()
+        accessor.insert_on_conflict_returning.side_effect = insert_rows
+
+        resolver.resolve(accessor)
+
+        self.assertEqual(dict(resolver.cache(AWSCostEntryProduct)), {"b": 101})
+
+    def test_resolve(self):
+        """Test that queued rows are resolved with one statement per table."""
+        resolver = DimensionResolver(self.schema)
+        products, pricing = {}, {}
+        line_items = [
+            {
+                "cost_entry_product_id": resolver.add(
+                    AWSCostEntryProduct, key, {"sku": key}, ["sku"], resolved=products
+                ),
+                "cost_entry_pricing_id": resolver.add(
+                    AWSCostEntryPricing, "USD", {"unit": "USD"}, ["unit"], resolved=pricing
+                ),
+            }
+            for key in ("a", "b", "a")
+        ]
+        accessor = Mock()
+        accessor.insert_on_conflict_returning.side_effect = insert_rows
+
+        resolver.resolve(accessor)
+        resolver.resolve_line_items(line_items, ("cost_entry_product_id", "cost_entry_pricing_id"))
+
+        self.assertEqual(accessor.insert_on_conflict_returning.call_count, 2)
+        self.assertEqual(products, {"a": 100, "b": 101})
+        self.assertEqual(pricing, {"USD": 100})
+        self.assertEqual([line_item["cost_entry_product_id"] for line_item in line_items], [100, 101, 100])
+        self.assertEqual({line_item["cost_entry_pricing_id"] for line_item in line_items}, {100})
+
+    def test_resolve_failure_evicts_batch_ids(self):
+        """Test that only the ids of a failed batch are evicted."""
+        resolver = DimensionResolver(self.schema)
+        resolver.cache(AWSCostEntryProduct)["old"] = 1
+        products, pricing = {"old": 1}, {}
+        resolver.add(AWSCostEntryProduct, "sku", {"sku": "sku"}, ["sku"], resolved=products)
+        resolver.add(AWSCostEntryPricing, "USD", {"unit": "USD"}, ["unit"], resolved=pricing)
+        accessor = Mock()
+        accessor.insert_on_conflict_returning.side_effect = [[100], Exception("rolled back")]
+
+        with self.assertRaises(Exception):
+            resolver.resolve(accessor)
+
+        self.assertEqual(products, {"old": 1})
+        self.assertEqual(pricing, {})
+        self.assertEqual(dict(resolver.cache(AWSCostEntryProduct)), {"old": 1})
+        self.assertEqual(dict(resolver.cache(AWSCostEntryPricing)), {})
+        self.assertIsNone(resolver.get(AWSCostEntryProduct, "sku"))
+
+    def test_pending_dimension_equality(self):
+        """Test that placeholders of the same row are equal."""
+        pending = PendingDimension({}, "products", "sku")
+        self.assertEqual(pending, PendingDimension({"sku": 1}, "products", "sku"))
+        self.assertNotEqual(pending, PendingDimension({}, "pricing", "sku"))
+        self.assertNotEqual(pending, "sku")
+        self.assertEqual(len({pending, PendingDimension({}, "products", "sku")}), 1)
+
+    def test_resolve_value(self):
+        """Test that values other than placeholders are returned unchanged."""
+        self.assertEqual(DimensionResolver.resolve_value(5), 5)
+        self.assertIsNone(DimensionResolver.resolve_value(None))
+        self.assertEqual(DimensionResolver.resolve_value(PendingDimension({"key": 7}, "products", "key")), 7)
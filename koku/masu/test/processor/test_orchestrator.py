@@ -71,8 +71,7 @@ class OrchestratorTest(MasuTestCase):
             }
         ]
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")  # noqa: C901
-    def test_initializer(self, mock_inspect):  # noqa: C901
+    def test_initializer(self):  # noqa: C901
         """Test to init."""
         orchestrator = Orchestrator()
         provider_count = Provider.objects.filter(active=True).count()
@@ -128,10 +127,9 @@ class OrchestratorTest(MasuTestCase):
                     self.fail("Unexpected provider")
 
     @patch("masu.processor.orchestrator.AccountLabel")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.external.report_downloader.ReportDownloader._set_downloader", return_value=FakeDownloader)
     @patch("masu.external.accounts_accessor.AccountsAccessor.get_accounts", return_value=[])
-    def test_prepare_no_accounts(self, mock_downloader, mock_accounts_accessor, mock_inspect, mock_account_labler):
+    def test_prepare_no_accounts(self, mock_downloader, mock_accounts_accessor, mock_account_labler):
         """Test downloading cost usage reports."""
         orchestrator = Orchestrator()
         reports = orchestrator.prepare()
@@ -139,17 +137,15 @@ class OrchestratorTest(MasuTestCase):
         self.assertIsNone(reports)
         mock_account_labler.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch.object(AccountsAccessor, "get_accounts")
-    def test_init_all_accounts(self, mock_accessor, mock_inspect):
+    def test_init_all_accounts(self, mock_accessor):
         """Test initializing orchestrator with forced billing source."""
         mock_accessor.return_value = self.mock_accounts
         orchestrator_all = Orchestrator()
         self.assertEqual(orchestrator_all._accounts, self.mock_accounts)
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch.object(AccountsAccessor, "get_accounts")
-    def test_init_with_billing_source(self, mock_accessor, mock_inspect):
+    def test_init_with_billing_source(self, mock_accessor):
         """Test initializing orchestrator with forced billing source."""
         mock_accessor.return_value = self.mock_accounts
 
@@ -160,9 +156,8 @@ class OrchestratorTest(MasuTestCase):
         found_account = individual._accounts[0]
         self.assertEqual(found_account.get("data_source"), fake_source.get("data_source"))
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch.object(AccountsAccessor, "get_accounts")
-    def test_init_all_accounts_error(self, mock_accessor, mock_inspect):
+    def test_init_all_accounts_error(self, mock_accessor):
         """Test initializing orchestrator accounts error."""
         mock_accessor.side_effect = AccountsAccessorError("Sample timeout error")
         try:
@@ -170,10 +165,9 @@ class OrchestratorTest(MasuTestCase):
         except Exception:
             self.fail("unexpected error")
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch.object(ExpiredDataRemover, "remove")
     @patch("masu.processor.orchestrator.remove_expired_data.apply_async", return_value=True)
-    def test_remove_expired_report_data(self, mock_task, mock_remover, mock_inspect):
+    def test_remove_expired_report_data(self, mock_task, mock_remover):
         """Test removing expired report data."""
         expected_results = [{"account_payer_id": "999999999", "billing_period_start": "2018-06-24 15:47:33.052509"}]
         mock_remover.return_value = expected_results
@@ -191,11 +185,10 @@ class OrchestratorTest(MasuTestCase):
             async_id = results.pop().get("async_id")
             self.assertIn(expected.format(async_id), logger.output)
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch.object(AccountsAccessor, "get_accounts")
     @patch.object(ExpiredDataRemover, "remove")
     @patch("masu.processor.orchestrator.remove_expired_data.apply_async", return_value=True)
-    def test_remove_expired_report_data_no_accounts(self, mock_task, mock_remover, mock_accessor, mock_inspect):
+    def test_remove_expired_report_data_no_accounts(self, mock_task, mock_remover, mock_accessor):
         """Test removing expired report data with no accounts."""
         expected_results = [{"account_payer_id": "999999999", "billing_period_start": "2018-06-24 15:47:33.052509"}]
         mock_remover.return_value = expected_results
@@ -206,10 +199,9 @@ class OrchestratorTest(MasuTestCase):
 
         self.assertEqual(results, [])
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.AccountLabel", spec=True)
     @patch("masu.processor.orchestrator.Orchestrator.start_manifest_processing", side_effect=ReportDownloaderError)
-    def test_prepare_w_downloader_error(self, mock_task, mock_labeler, mock_inspect):
+    def test_prepare_w_downloader_error(self, mock_task, mock_labeler):
         """Test that Orchestrator.prepare() handles downloader errors."""
 
         orchestrator = Orchestrator()
@@ -217,10 +209,9 @@ class OrchestratorTest(MasuTestCase):
         mock_task.assert_called()
         mock_labeler.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.AccountLabel", spec=True)
     @patch("masu.processor.orchestrator.Orchestrator.start_manifest_processing", side_effect=Exception)
-    def test_prepare_w_exception(self, mock_task, mock_labeler, mock_inspect):
+    def test_prepare_w_exception(self, mock_task, mock_labeler):
         """Test that Orchestrator.prepare() handles broad exceptions."""
 
         orchestrator = Orchestrator()
@@ -228,10 +219,9 @@ class OrchestratorTest(MasuTestCase):
         mock_task.assert_called()
         mock_labeler.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.AccountLabel", spec=True)
     @patch("masu.processor.orchestrator.Orchestrator.start_manifest_processing", return_value=([], True))
-    def test_prepare_w_manifest_processing_successful(self, mock_task, mock_labeler, mock_inspect):
+    def test_prepare_w_manifest_processing_successful(self, mock_task, mock_labeler):
         """Test that Orchestrator.prepare() works when manifest processing is successful."""
         mock_labeler().get_label_details.return_value = (True, True)
 
@@ -239,22 +229,23 @@ class OrchestratorTest(MasuTestCase):
         orchestrator.prepare()
         mock_labeler.assert_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.AccountLabel", spec=True)
     @patch("masu.processor.orchestrator.get_report_files.apply_async", return_value=True)
-    def test_prepare_w_no_manifest_found(self, mock_task, mock_labeler, mock_inspect):
+    def test_prepare_w_no_manifest_found(self, mock_task, mock_labeler):
         """Test that Orchestrator.prepare() is skipped when no manifest is found."""
         orchestrator = Orchestrator()
         orchestrator.prepare()
         mock_task.assert_not_called()
         mock_labeler.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.record_report_status", return_value=True)
     @patch("masu.processor.orchestrator.chord", return_value=True)
     @patch("masu.processor.orchestrator.ReportDownloader.download_manifest", return_value={})
     def test_start_manifest_processing_already_progressed(
-        self, mock_record_report_status, mock_download_manifest, mock_task, mock_inspect
+        self,
+        mock_record_report_status,
+        mock_download_manifest,
+        mock_task,
     ):
         """Test start_manifest_processing with report already processed."""
         orchestrator = Orchestrator()
@@ -271,13 +262,10 @@ class OrchestratorTest(MasuTestCase):
         )
         mock_task.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
-    @patch("masu.processor.orchestrator.WorkerCache.task_is_running", return_value=True)
+    @patch("masu.processor.task_lease.TaskLease.is_held", return_value=True)
     @patch("masu.processor.orchestrator.chord", return_value=True)
     @patch("masu.processor.orchestrator.ReportDownloader.download_manifest", return_value={})
-    def test_start_manifest_processing_in_progress(
-        self, mock_record_report_status, mock_download_manifest, mock_task, mock_inspect
-    ):
+    def test_start_manifest_processing_in_progress(self, mock_record_report_status, mock_download_manifest, mock_task):
         """Test start_manifest_processing with report in progressed."""
         orchestrator = Orchestrator()
         account = self.mock_accounts[0]
@@ -293,10 +281,9 @@ class OrchestratorTest(MasuTestCase):
         )
         mock_task.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.chord")
     @patch("masu.processor.orchestrator.ReportDownloader.download_manifest")
-    def test_start_manifest_processing(self, mock_download_manifest, mock_task, mock_inspect):
+    def test_start_manifest_processing(self, mock_download_manifest, mock_task):
         """Test start_manifest_processing."""
         test_matrix = [
             {"mock_downloader_manifest_list": [], "expect_chord_called": False},
@@ -328,13 +315,10 @@ class OrchestratorTest(MasuTestCase):
             else:
                 mock_task.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.chord")
     @patch("masu.processor.orchestrator.group")
     @patch("masu.processor.orchestrator.ReportDownloader.download_manifest")
-    def test_start_manifest_processing_priority_queue(
-        self, mock_download_manifest, mock_task, mock_group, mock_inspect
-    ):
+    def test_start_manifest_processing_priority_queue(self, mock_download_manifest, mock_task, mock_group):
         """Test start_manifest_processing using priority queue."""
         test_queues = [
             {
@@ -391,13 +375,10 @@ class OrchestratorTest(MasuTestCase):
                 self.assertEqual(summary_actual_queue, test.get("summary-expected"))
                 self.assertEqual(hcs_actual_queue, test.get("hcs-expected"))
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.orchestrator.group")
     @patch("masu.processor.orchestrator.chord")
     @patch("masu.processor.orchestrator.ReportDownloader.download_manifest")
-    def test_start_manifest_processing_no_resummary(
-        self, mock_download_manifest, mock_chord, mock_group, mock_inspect
-    ):
+    def test_start_manifest_processing_no_resummary(self, mock_download_manifest, mock_chord, mock_group):
         """Test start_manifest_processing."""
         test_matrix = [
             {"mock_downloader_manifest_list": [], "expect_chord_called": False, "expected_chain_called": False},
@@ -434,9 +415,8 @@ class OrchestratorTest(MasuTestCase):
             else:
                 mock_group.assert_not_called()
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.database.provider_db_accessor.ProviderDBAccessor.get_setup_complete")
-    def test_get_reports(self, fake_accessor, mock_inspect):
+    def test_get_reports(self, fake_accessor):
         """Test get_reports for combinations of setup_complete and ingest override."""
         initial_month_qty = Config.INITIAL_INGEST_NUM_MONTHS
         test_matrix = [
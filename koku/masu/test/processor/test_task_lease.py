@@ -0,0 +1,112 @@
+#
+# Copyright 2022 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the task leases."""
+import time
+
+from django.core.cache import caches
+from django.test.utils import override_settings
+
+from masu.processor.task_lease import create_lease_key
+from masu.processor.task_lease import get_report_file_lease
+from masu.processor.task_lease import TaskLease
+from masu.test import MasuTestCase
+
+
+@override_settings(HOSTNAME="kokuworker")
+class TaskLeaseTest(MasuTestCase):
+    """Test class for the task leases."""
+
+    def setUp(self):
+        """Set up the test."""
+        super().setUp()
+        caches["worker"].clear()
+
+    def tearDown(self):
+        """Tear down the test."""
+        super().tearDown()
+        caches["worker"].clear()
+
+    def test_create_lease_key(self):
+        """Test that the task args are part of the key."""
+        self.assertEqual(create_lease_key("task"), "task")
+        self.assertEqual(create_lease_key("task", ["org1234567", 1]), "task:org1234567:1")
+
+    def test_acquire_release(self):
+        """Test that a single lease is held at a time."""
+        lease = TaskLease("task", ["org1234567"])
+        other_lease = TaskLease("task", ["org1234567"])
+
+        self.assertTrue(lease.acquire())
+        self.assertTrue(other_lease.is_held())
+        self.assertFalse(other_lease.acquire())
+
+        lease.release()
+        self.assertFalse(other_lease.is_held())
+        self.assertTrue(other_lease.acquire())
+
+    def test_release_lease_held_by_another(self):
+        """Test that releasing an expired lease does not release the lease of its new holder."""
+        lease = TaskLease("task", timeout=1)
+        self.assertTrue(lease.acquire())
+        time.sleep(2)
+
+        other_lease = TaskLease("task")
+        self.assertTrue(other_lease.acquire())
+        lease.release()
+        self.assertTrue(other_lease.is_held())
+
+    def test_lease_expires(self):
+        """Test that the lease of a worker that died expires."""
+        lease = TaskLease("task", timeout=1)
+        self.assertTrue(lease.acquire())
+        time.sleep(2)
+        self.assertFalse(lease.is_held())
+
+    def test_defer_coalesces_pending_requests(self):
+        """Test that requests deferred while the lease is held are dispatched once on release."""
+        lease = TaskLease("task")
+        self.assertTrue(lease.acquire())
+
+        waiting = TaskLease("task")
+
+        def merge(pending, request):
+            return {"count": pending["count"] + request["count"]}
+
+        self.assertEqual(waiting.defer({"count": 1}, coalesce_key="a", merge=merge), {})
+        self.assertEqual(waiting.defer({"count": 2}, coalesce_key="a", merge=merge), {})
+        self.assertEqual(waiting.defer({"count": 5}, coalesce_key="b", merge=merge), {})
+
+        self.assertEqual(lease.release(), {"a": {"count": 3}, "b": {"count": 5}})
+        self.assertEqual(lease.release(), {})
+        self.assertFalse(lease.is_held())
+
+    def test_defer_after_release(self):
+        """Test that a request deferred after the lease was released is returned to dispatch."""
+        lease = TaskLease("task")
+        self.assertTrue(lease.acquire())
+        self.assertFalse(TaskLease("task").acquire())
+        lease.release()
+
+        self.assertEqual(TaskLease("task").defer({"count": 1}), {"": {"count": 1}})
+        self.assertFalse(lease.is_held())
+
+    def test_pending_outlives_lease(self):
+        """Test that the pending marker of a holder that died is left for the next holder."""
+        lease = TaskLease("task", timeout=2)
+        self.assertTrue(lease.acquire())
+        self.assertFalse(lease.has_pending())
+        TaskLease("task", timeout=2).defer({"count": 1})
+        self.assertTrue(lease.has_pending())
+        time.sleep(3)
+
+        next_lease = TaskLease("task")
+        self.assertTrue(next_lease.acquire())
+        self.assertEqual(next_lease.release(), {"": {"count": 1}})
+        self.assertFalse(next_lease.has_pending())
+
+    def test_get_report_file_lease(self):
+        """Test that the report file lease is keyed on the provider and file."""
+        lease = get_report_file_lease("provider-uuid", "report.csv")
+        self.assertEqual(lease.key, "masu.processor.tasks.get_report_files:provider-uuid:report.csv")
@@ -12,7 +12,6 @@ import time
 from datetime import date
 from datetime import timedelta
 from decimal import Decimal
-from unittest import skip
 from unittest.mock import ANY
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -49,13 +48,16 @@ from masu.processor.report_processor import ReportProcessorError
 from masu.processor.report_summary_updater import ReportSummaryUpdaterCloudError
 from masu.processor.report_summary_updater import ReportSummaryUpdaterError
 from masu.processor.report_summary_updater import ReportSummaryUpdaterProviderNotFoundError
+from masu.processor.task_lease import TaskLease
 from masu.processor.tasks import autovacuum_tune_schema
+from masu.processor.tasks import check_deferred_requests
 from masu.processor.tasks import get_report_files
 from masu.processor.tasks import mark_manifest_complete
 from masu.processor.tasks import MARK_MANIFEST_COMPLETE_QUEUE
 from masu.processor.tasks import normalize_table_options
 from masu.processor.tasks import record_all_manifest_files
 from masu.processor.tasks import record_report_status
+from masu.processor.tasks import release_lease
 from masu.processor.tasks import remove_expired_data
 from masu.processor.tasks import remove_stale_tenants
 from masu.processor.tasks import summarize_reports
@@ -65,7 +67,6 @@ from masu.processor.tasks import UPDATE_COST_MODEL_COSTS_QUEUE
 from masu.processor.tasks import update_openshift_on_cloud
 from masu.processor.tasks import update_summary_tables
 from masu.processor.tasks import vacuum_schema
-from masu.processor.worker_cache import create_single_task_cache_key
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
 from masu.test.external.downloader.aws import fake_arn
@@ -158,9 +159,8 @@ class GetReportFileTests(MasuTestCase):
             statement_found = any(expected in log for log in logger.output)
             self.assertTrue(statement_found)
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor._tasks.download.ReportDownloader._set_downloader", side_effect=Exception("only a test"))
-    def test_get_report_task_exception(self, fake_downloader, mock_inspect):
+    def test_get_report_task_exception(self, fake_downloader):
         """Test task."""
         account = fake_arn(service="iam", generate_account_id=True)
 
@@ -431,10 +431,9 @@ class TestProcessorTasks(MasuTestCase):
             "report_context": {"current_file": f"/my/{self.test_assembly_id}/koku-1.csv.gz"},
         }
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
+    @patch("masu.processor.tasks.TaskLease.release")
     @patch("masu.processor.tasks._process_report_file")
-    def test_get_report_files_exception(self, mock_process_files, mock_inspect, mock_cache_remove):
+    def test_get_report_files_exception(self, mock_process_files, mock_cache_remove):
         """Test raising download exception is handled."""
         exceptions = [MasuProcessingError, MasuProviderError, ReportDownloaderError]
         for exception in exceptions:
@@ -447,44 +446,38 @@ class TestProcessorTasks(MasuTestCase):
                     mock_cache_remove.assert_called()
                     mock_process_files.assert_not_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
+    @patch("masu.processor.tasks.TaskLease.release")
     @patch("masu.processor.tasks._get_report_files")
     @patch("masu.processor.tasks._process_report_file", side_effect=ReportProcessorError("Mocked process error!"))
-    def test_get_report_process_exception(self, mock_process_files, mock_get_files, mock_inspect, mock_cache_remove):
+    def test_get_report_process_exception(self, mock_process_files, mock_get_files, mock_cache_remove):
         """Test raising processor exception is handled."""
         mock_get_files.return_value = {"file": self.fake.word(), "compression": "GZIP"}
 
         get_report_files(**self.get_report_args)
         mock_cache_remove.assert_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
+    @patch("masu.processor.tasks.TaskLease.release")
     @patch("masu.processor.tasks._get_report_files")
     @patch("masu.processor.tasks._process_report_file", side_effect=NotImplementedError)
-    def test_get_report_process_not_implemented_error(
-        self, mock_process_files, mock_get_files, mock_inspect, mock_cache_remove
-    ):
+    def test_get_report_process_not_implemented_error(self, mock_process_files, mock_get_files, mock_cache_remove):
         """Test raising processor exception is handled."""
         mock_get_files.return_value = {"file": self.fake.word(), "compression": "PLAIN"}
 
         get_report_files(**self.get_report_args)
         mock_cache_remove.assert_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
+    @patch("masu.processor.tasks.TaskLease.release")
     @patch("masu.processor.tasks._get_report_files", side_effect=Exception("Mocked download error!"))
-    def test_get_report_broad_exception(self, mock_get_files, mock_inspect, mock_cache_remove):
+    def test_get_report_broad_exception(self, mock_get_files, mock_cache_remove):
         """Test raising download broad exception is handled."""
         mock_get_files.return_value = {"file": self.fake.word(), "compression": "GZIP"}
 
         get_report_files(**self.get_report_args)
         mock_cache_remove.assert_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
+    @patch("masu.processor.tasks.TaskLease.release")
     @patch("masu.processor.tasks._get_report_files", side_effect=ReportDownloaderWarning("Mocked download warning!"))
-    def test_get_report_download_warning(self, mock_get_files, mock_inspect, mock_cache_remove):
+    def test_get_report_download_warning(self, mock_get_files, mock_cache_remove):
         """Test raising download warning is handled."""
         mock_get_files.return_value = {"file": self.fake.word(), "compression": "GZIP"}
 
@@ -533,14 +526,11 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
         # have something to pull from
         self.start_date = DateHelper().today.replace(day=1)
 
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks.CostModelDBAccessor")
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.update_cost_model_costs")
     @patch("masu.processor.ocp.ocp_cost_model_cost_updater.CostModelDBAccessor")
-    def test_update_summary_tables_ocp(
-        self, mock_cost_model, mock_charge_info, mock_chain, mock_task_cost_model, mock_cache
-    ):
+    def test_update_summary_tables_ocp(self, mock_cost_model, mock_charge_info, mock_chain, mock_task_cost_model):
         """Test that the summary table task runs."""
         infrastructure_rates = {
             "cpu_core_usage_per_hour": 1.5,
@@ -949,62 +939,54 @@ class TestMarkManifestCompleteTask(MasuTestCase):
 
 
 @override_settings(HOSTNAME="kokuworker")
-class TestWorkerCacheThrottling(MasuTestCase):
-    """Tests for tasks that use the worker cache."""
-
-    def single_task_is_running(self, task_name, task_args=None):
-        """Check for a single task key in the cache."""
-        cache = caches["worker"]
-        cache_str = create_single_task_cache_key(task_name, task_args)
-        return bool(cache.get(cache_str))
-
-    def lock_single_task(self, task_name, task_args=None, timeout=None):
-        """Add a cache entry for a single task to lock a specific task."""
-        cache = caches["worker"]
-        cache_str = create_single_task_cache_key(task_name, task_args)
-        cache.add(cache_str, "kokuworker", 3)
-
-    @patch("masu.processor.tasks.group")
+class TestTaskLeaseThrottling(MasuTestCase):
+    """Tests for tasks that use a task lease."""
+
+    def setUp(self):
+        """Set up the test."""
+        super().setUp()
+        caches["worker"].clear()
+        check_patcher = patch("masu.processor.tasks.check_deferred_requests.s")
+        self.mock_check = check_patcher.start()
+        self.addCleanup(check_patcher.stop)
+
+    def tearDown(self):
+        """Tear down the test."""
+        super().tearDown()
+        caches["worker"].clear()
+
     @patch("masu.processor.tasks.update_summary_tables.s")
     @patch("masu.processor.tasks.ReportSummaryUpdater.update_summary_tables")
     @patch("masu.processor.tasks.ReportSummaryUpdater.update_daily_tables")
-    @patch("masu.processor.tasks.chain")
-    @patch("masu.processor.tasks.mark_manifest_complete")
-    @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
-    def test_update_summary_tables_worker_throttled(
-        self,
-        mock_inspect,
-        mock_lock,
-        mock_release,
-        mock_update_cost,
-        mock_complete,
-        mock_chain,
-        mock_daily,
-        mock_summary,
-        mock_delay,
-        mock_ocp_on_cloud,
-    ):
-        """Test that the worker cache is used."""
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
+    def test_update_summary_tables_worker_throttled(self, mock_daily, mock_summary, mock_delay):
+        """Test that requests made while the lease is held are coalesced and dispatched on release."""
         task_name = "masu.processor.tasks.update_summary_tables"
         start_date = DateHelper().this_month_start
         end_date = DateHelper().this_month_end
         cache_args = [self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, str(start_date.strftime("%Y-%m"))]
-        mock_lock.side_effect = self.lock_single_task
+        held_lease = TaskLease(task_name, cache_args)
+        self.assertTrue(held_lease.acquire())
 
-        mock_daily.return_value = start_date, end_date
-        mock_summary.return_value = start_date, end_date
-        update_summary_tables(self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date, end_date)
+        update_summary_tables(
+            self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date + timedelta(days=1), end_date, 1
+        )
+        update_summary_tables(self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date, end_date, 1)
+        update_summary_tables(self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date, end_date, 2)
+        mock_daily.assert_not_called()
+        mock_summary.assert_not_called()
         mock_delay.assert_not_called()
-        update_summary_tables(self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date, end_date)
-        mock_delay.assert_called()
-        self.assertTrue(self.single_task_is_running(task_name, cache_args))
-        # Let the cache entry expire
-        time.sleep(3)
-        self.assertFalse(self.single_task_is_running(task_name, cache_args))
+        # Only the request creating the pending marker schedules the check for a dead lease holder
+        self.mock_check.assert_called_once_with(task_name, [str(arg) for arg in cache_args], "summary")
+        self.mock_check.return_value.apply_async.assert_called_once_with(queue="summary", countdown=held_lease.timeout)
+
+        release_lease(held_lease, update_summary_tables, "summary")
+        self.assertEqual(mock_delay.call_count, 2)
+        deferred = {call.kwargs["manifest_id"]: call.kwargs for call in mock_delay.call_args_list}
+        self.assertEqual(deferred[1]["start_date"], start_date)
+        self.assertEqual(deferred[1]["end_date"], end_date)
+        self.assertEqual(deferred[2]["start_date"], start_date)
+        mock_delay.return_value.apply_async.assert_called_with(queue="summary")
+        self.assertFalse(held_lease.is_held())
 
     @patch("masu.processor.tasks.update_summary_tables.s")
     @patch("masu.processor.tasks.ReportSummaryUpdater.update_summary_tables")
@@ -1012,34 +994,76 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_worker_error(
-        self,
-        mock_inspect,
-        mock_lock,
-        mock_release,
-        mock_update_cost,
-        mock_complete,
-        mock_chain,
-        mock_daily,
-        mock_summary,
-        mock_delay,
+        self, mock_update_cost, mock_complete, mock_chain, mock_daily, mock_summary, mock_delay
     ):
-        """Test that the worker cache is used."""
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
+        """Test that the lease is released when the task fails."""
         task_name = "masu.processor.tasks.update_summary_tables"
-        cache_args = [self.schema]
-
         start_date = DateHelper().this_month_start
         end_date = DateHelper().this_month_end
+        cache_args = [self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, str(start_date.strftime("%Y-%m"))]
+
         mock_daily.return_value = start_date, end_date
         mock_summary.side_effect = ReportProcessorError
         with self.assertRaises(ReportProcessorError):
             update_summary_tables(self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date, end_date)
-            mock_delay.assert_not_called()
-            self.assertFalse(self.single_task_is_running(task_name, cache_args))
+        mock_delay.assert_not_called()
+        self.assertFalse(TaskLease(task_name, cache_args).is_held())
+
+    @patch("masu.processor.tasks.CostModelDBAccessor", side_effect=ReportProcessorError)
+    @patch("masu.processor.tasks.enable_trino_processing", return_value=False)
+    @patch("masu.processor.tasks.ReportSummaryUpdater.get_openshift_on_cloud_infra_map", return_value={})
+    @patch("masu.processor.tasks.ReportSummaryUpdater.update_summary_tables")
+    @patch("masu.processor.tasks.ReportSummaryUpdater.update_daily_tables")
+    def test_update_summary_tables_releases_lease_after_summary(
+        self, mock_daily, mock_summary, mock_infra_map, mock_trino, mock_cost_model
+    ):
+        """Test that the lease is released when the task fails after the tables are summarized."""
+        task_name = "masu.processor.tasks.update_summary_tables"
+        start_date = DateHelper().this_month_start
+        end_date = DateHelper().this_month_end
+        cache_args = [self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, str(start_date.strftime("%Y-%m"))]
+
+        mock_daily.return_value = start_date, end_date
+        with self.assertRaises(ReportProcessorError):
+            update_summary_tables(self.schema, Provider.PROVIDER_AWS, self.aws_provider_uuid, start_date, end_date)
+        mock_summary.assert_called()
+        self.assertFalse(TaskLease(task_name, cache_args).is_held())
+
+    @patch("masu.processor.tasks.update_cost_model_costs.s")
+    def test_check_deferred_requests_after_holder_died(self, mock_delay):
+        """Test that the requests deferred on the lease of a dead holder are dispatched."""
+        task_name = "masu.processor.tasks.update_cost_model_costs"
+        cache_args = [self.schema, self.aws_provider_uuid]
+        dead_lease = TaskLease(task_name, cache_args, timeout=2)
+        self.assertTrue(dead_lease.acquire())
+        dead_lease.defer({"schema_name": self.schema, "provider_uuid": self.aws_provider_uuid})
+
+        check_deferred_requests(task_name, cache_args, "cost_model")
+        mock_delay.assert_not_called()
+        self.mock_check.assert_called_once_with(task_name, cache_args, "cost_model")
+
+        time.sleep(3)
+        check_deferred_requests(task_name, cache_args, "cost_model")
+        mock_delay.assert_called_once_with(schema_name=self.schema, provider_uuid=self.aws_provider_uuid)
+        mock_delay.return_value.apply_async.assert_called_once_with(queue="cost_model")
+        self.assertFalse(TaskLease(task_name, cache_args).is_held())
+        self.assertFalse(TaskLease(task_name, cache_args).has_pending())
+
+    @patch("masu.processor.tasks.update_cost_model_costs.s")
+    def test_check_deferred_requests_already_dispatched(self, mock_delay):
+        """Test that nothing is dispatched when the lease holder dispatched the deferred requests."""
+        task_name = "masu.processor.tasks.update_cost_model_costs"
+        cache_args = [self.schema, self.aws_provider_uuid]
+        lease = TaskLease(task_name, cache_args)
+        self.assertTrue(lease.acquire())
+        lease.defer({"schema_name": self.schema, "provider_uuid": self.aws_provider_uuid})
+        lease.release()
+
+        check_deferred_requests(task_name, cache_args, "cost_model")
+        mock_delay.assert_not_called()
+        self.mock_check.assert_not_called()
+        self.assertFalse(TaskLease(task_name, cache_args).is_held())
 
     @patch("masu.processor.tasks.update_summary_tables.s")
     @patch("masu.processor.tasks.ReportSummaryUpdater.update_summary_tables")
@@ -1047,23 +1071,10 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_cloud_summary_error(
-        self,
-        mock_inspect,
-        mock_lock,
-        mock_release,
-        mock_update_cost,
-        mock_complete,
-        mock_chain,
-        mock_daily,
-        mock_summary,
-        mock_delay,
+        self, mock_update_cost, mock_complete, mock_chain, mock_daily, mock_summary, mock_delay
     ):
         """Test that the update_summary_table cloud exception is caught."""
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
         start_date = DateHelper().this_month_start
         end_date = DateHelper().this_month_end
         mock_daily.return_value = start_date, end_date
@@ -1083,23 +1094,10 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_provider_not_found_error(
-        self,
-        mock_inspect,
-        mock_lock,
-        mock_release,
-        mock_update_cost,
-        mock_complete,
-        mock_chain,
-        mock_daily,
-        mock_summary,
-        mock_delay,
+        self, mock_update_cost, mock_complete, mock_chain, mock_daily, mock_summary, mock_delay
     ):
         """Test that the update_summary_table provider not found exception is caught."""
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
         start_date = DateHelper().this_month_start
         end_date = DateHelper().this_month_end
         mock_daily.return_value = start_date, end_date
@@ -1114,50 +1112,31 @@ class TestWorkerCacheThrottling(MasuTestCase):
                     break
             self.assertTrue(statement_found)
 
-    @skip("cost model calcs are taking longer with the conversion to partables. This test needs a rethink.")
     @patch("masu.processor.tasks.update_cost_model_costs.s")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
-    def test_update_cost_model_costs_throttled(self, mock_inspect, mock_lock, mock_release, mock_delay):
-        """Test that refresh materialized views runs with cache lock."""
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
-        mock_lock.side_effect = self.lock_single_task
-
+    @patch("masu.processor.tasks.CostModelCostUpdater")
+    def test_update_cost_model_costs_throttled(self, mock_updater, mock_delay):
+        """Test that a cost model update requested while the lease is held runs once on release."""
         start_date = DateHelper().last_month_start - relativedelta.relativedelta(months=1)
         end_date = DateHelper().today
         expected_start_date = start_date.strftime("%Y-%m-%d")
         expected_end_date = end_date.strftime("%Y-%m-%d")
         task_name = "masu.processor.tasks.update_cost_model_costs"
         cache_args = [self.schema, self.aws_provider_uuid, expected_start_date, expected_end_date]
-
-        manifest_dict = {
-            "assembly_id": "12345",
-            "billing_period_start_datetime": DateHelper().today,
-            "num_total_files": 2,
-            "provider_uuid": self.aws_provider_uuid,
-        }
-
-        with ReportManifestDBAccessor() as manifest_accessor:
-            manifest = manifest_accessor.add(**manifest_dict)
-            manifest.save()
+        held_lease = TaskLease(task_name, cache_args)
+        self.assertTrue(held_lease.acquire())
 
         update_cost_model_costs(self.schema, self.aws_provider_uuid, expected_start_date, expected_end_date)
-        mock_delay.assert_not_called()
         update_cost_model_costs(self.schema, self.aws_provider_uuid, expected_start_date, expected_end_date)
-        mock_delay.assert_called()
-        self.assertTrue(self.single_task_is_running(task_name, cache_args))
-        # Let the cache entry expire
-        time.sleep(3)
-        self.assertFalse(self.single_task_is_running(task_name, cache_args))
+        mock_updater.assert_not_called()
+        mock_delay.assert_not_called()
+
+        release_lease(held_lease, update_cost_model_costs, "cost_model")
+        mock_delay.assert_called_once()
+        mock_delay.return_value.apply_async.assert_called_once_with(queue="cost_model")
 
     @patch("masu.processor.tasks.CostModelCostUpdater")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
-    def test_update_cost_model_costs_error(self, mock_inspect, mock_lock, mock_release, mock_updater):
-        """Test that refresh materialized views runs with cache lock."""
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
+    def test_update_cost_model_costs_error(self, mock_updater):
+        """Test that the lease is released when the cost model update fails."""
         start_date = DateHelper().last_month_start - relativedelta.relativedelta(months=1)
         end_date = DateHelper().today
         expected_start_date = start_date.strftime("%Y-%m-%d")
@@ -1168,65 +1147,60 @@ class TestWorkerCacheThrottling(MasuTestCase):
         mock_updater.side_effect = ReportProcessorError
         with self.assertRaises(ReportProcessorError):
             update_cost_model_costs(self.schema, self.aws_provider_uuid, expected_start_date, expected_end_date)
-            self.assertFalse(self.single_task_is_running(task_name, cache_args))
+        self.assertFalse(TaskLease(task_name, cache_args).is_held())
 
     @patch("masu.processor.tasks.ReportSummaryUpdater.update_openshift_on_cloud_summary_tables")
     @patch("masu.processor.tasks.update_openshift_on_cloud.s")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
-    @patch("masu.processor.worker_cache.CELERY_INSPECT")
-    def test_update_openshift_on_cloud_throttled(self, mock_inspect, mock_lock, mock_release, mock_delay, mock_update):
-        """Test that refresh materialized views runs with cache lock."""
+    def test_update_openshift_on_cloud_throttled(self, mock_delay, mock_update):
+        """Test that each cluster deferred on a held cloud source lease is dispatched on release."""
         start_date = DateHelper().this_month_start.date()
         end_date = DateHelper().today.date()
-
-        mock_lock.side_effect = self.lock_single_task
-        mock_inspect.reserved.return_value = {"celery@kokuworker": []}
-
         task_name = "masu.processor.tasks.update_openshift_on_cloud"
         cache_args = [self.schema, self.aws_provider_uuid, str(start_date.strftime("%Y-%m"))]
+        held_lease = TaskLease(task_name, cache_args)
+        self.assertTrue(held_lease.acquire())
 
-        manifest_dict = {
-            "assembly_id": "12345",
-            "billing_period_start_datetime": DateHelper().today,
-            "num_total_files": 2,
-            "provider_uuid": self.aws_provider_uuid,
-        }
-
-        with ReportManifestDBAccessor() as manifest_accessor:
-            manifest = manifest_accessor.add(**manifest_dict)
-            manifest.save()
-
-        update_openshift_on_cloud(
-            self.schema,
-            self.ocp_on_aws_ocp_provider.uuid,
-            self.aws_provider_uuid,
-            Provider.PROVIDER_AWS,
-            start_date,
-            end_date,
-        )
+        for openshift_provider_uuid in [self.ocp_on_aws_ocp_provider.uuid, self.ocp_on_aws_ocp_provider.uuid, "other"]:
+            update_openshift_on_cloud(
+                self.schema,
+                openshift_provider_uuid,
+                self.aws_provider_uuid,
+                Provider.PROVIDER_AWS,
+                start_date,
+                end_date,
+            )
+        mock_update.assert_not_called()
         mock_delay.assert_not_called()
-        update_openshift_on_cloud(
-            self.schema,
-            self.ocp_on_aws_ocp_provider.uuid,
-            self.aws_provider_uuid,
-            Provider.PROVIDER_AWS,
-            start_date,
-            end_date,
-        )
-        update_openshift_on_cloud(
-            self.schema,
-            self.ocp_on_aws_ocp_provider.uuid,
-            self.aws_provider_uuid,
-            Provider.PROVIDER_AWS,
-            start_date,
-            end_date,
+
+        release_lease(held_lease, update_openshift_on_cloud, "summary")
+        self.assertEqual(mock_delay.call_count, 2)
+        self.assertEqual(
+            {call.kwargs["openshift_provider_uuid"] for call in mock_delay.call_args_list},
+            {self.ocp_on_aws_ocp_provider.uuid, "other"},
         )
-        mock_delay.assert_called()
-        self.assertTrue(self.single_task_is_running(task_name, cache_args))
-        # Let the cache entry expire
-        time.sleep(3)
-        self.assertFalse(self.single_task_is_running(task_name, cache_args))
+
+    @patch("masu.processor.tasks.ReportSummaryUpdater.update_openshift_on_cloud_summary_tables")
+    @patch("masu.processor.tasks.update_openshift_on_cloud.s")
+    def test_update_openshift_on_cloud_deferred_after_release(self, mock_delay, mock_update):
+        """Test that a request deferred just after the lease was released is dispatched right away."""
+        start_date = DateHelper().this_month_start.date()
+        end_date = DateHelper().today.date()
+        task_name = "masu.processor.tasks.update_openshift_on_cloud"
+        cache_args = [self.schema, self.aws_provider_uuid, str(start_date.strftime("%Y-%m"))]
+        held_lease = TaskLease(task_name, cache_args)
+        self.assertTrue(held_lease.acquire())
+
+        with patch("masu.processor.tasks.TaskLease.acquire", side_effect=[False, True]):
+            update_openshift_on_cloud(
+                self.schema,
+                self.ocp_on_aws_ocp_provider.uuid,
+                self.aws_provider_uuid,
+                Provider.PROVIDER_AWS,
+                start_date,
+                end_date,
+            )
+        mock_update.assert_not_called()
+        mock_delay.assert_called_once()
 
 
 class TestRemoveStaleTenants(MasuTestCase):
@@ -330,7 +330,7 @@ class TestAWSUtils(MasuTestCase):
         )
         expected_key = "removed_key"
         mock_object = Mock(metadata={}, key=expected_key)
-        mock_summary = Mock()
+        mock_summary = Mock(key=expected_key)
         mock_summary.Object.return_value = mock_object
         with patch("masu.util.aws.common.settings", ENABLE_S3_ARCHIVING=True):
             with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
@@ -344,6 +344,81 @@ class TestAWSUtils(MasuTestCase):
                 removed = utils.remove_files_not_in_set_from_s3_bucket("request_id", s3_csv_path, "manifest_id")
                 self.assertEqual(removed, [])
 
+    def test_get_manifest_id_from_key(self):
+        """Test that the manifest id is parsed from manifest keyed file names."""
+        file_name = utils.get_manifest_keyed_filename("koku-1.csv.gz", 42)
+        self.assertEqual(file_name, "manifest-42_koku-1.csv.gz")
+        self.assertEqual(utils.get_manifest_id_from_key(f"data/csv/account/AWS/{file_name}"), "42")
+        self.assertEqual(utils.get_manifest_id_from_key(file_name), "42")
+        self.assertIsNone(utils.get_manifest_id_from_key("data/csv/account/AWS/koku-1.csv.gz"))
+        self.assertIsNone(utils.get_manifest_id_from_key("data/manifest-42_csv/koku-1.csv.gz"))
+
+    def test_remove_files_not_in_set_from_s3_prefixes(self):
+        """Test that manifest keyed files are reconciled from the listing with batched deletes."""
+        current_key = "data/csv/account/AWS/manifest-1_koku-1.csv.gz"
+        stale_keys = [f"data/csv/account/AWS/manifest-0_koku-{i}.csv.gz" for i in range(1500)]
+        legacy_key = "data/parquet/account/AWS/koku-1.parquet"
+        summaries = [Mock(key=key) for key in [current_key] + stale_keys]
+        legacy_summary = Mock(key=legacy_key)
+        legacy_summary.Object.return_value = Mock(metadata={"manifestid": "0"})
+        with patch("masu.util.aws.common.settings", ENABLE_S3_ARCHIVING=True, S3_BUCKET_NAME="bucket"):
+            with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
+                mock_bucket = mock_s3.return_value.Bucket.return_value
+                mock_bucket.objects.filter.side_effect = [summaries, [legacy_summary]]
+                mock_bucket.delete_objects.return_value = {}
+                removed = utils.remove_files_not_in_set_from_s3_prefixes(
+                    "request_id", ["data/csv/account/AWS", "data/parquet/account/AWS", None], 1
+                )
+        self.assertEqual(removed, stale_keys + [legacy_key])
+        self.assertEqual(mock_bucket.objects.filter.call_count, 2)
+        for summary in summaries:
+            summary.Object.assert_not_called()
+        legacy_summary.Object.assert_called_once()
+        delete_calls = mock_bucket.delete_objects.call_args_list
+        self.assertEqual(len(delete_calls), 2)
+        self.assertEqual(len(delete_calls[0].kwargs["Delete"]["Objects"]), utils.S3_DELETE_BATCH_SIZE)
+        self.assertEqual(delete_calls[1].kwargs["Delete"]["Objects"][-1], {"Key": legacy_key})
+
+    def test_delete_s3_objects(self):
+        """Test that keys S3 fails to delete are logged and not returned."""
+        keys = [f"data/csv/account/AWS/koku-{i}.csv.gz" for i in range(1500)]
+        mock_bucket = Mock()
+        mock_bucket.delete_objects.side_effect = [
+            {"Deleted": [{"Key": key} for key in keys[1:1000]], "Errors": [{"Key": keys[0], "Code": "AccessDenied"}]},
+            {"Deleted": [{"Key": key} for key in keys[1000:]]},
+        ]
+        with self.assertLogs("masu.util.aws.common", level="WARNING") as logger:
+            deleted = utils.delete_s3_objects("request_id", mock_bucket, keys)
+        self.assertEqual(deleted, keys[1:])
+        self.assertIn(f"{keys[0]} (AccessDenied)", logger.output[0])
+        delete_calls = mock_bucket.delete_objects.call_args_list
+        self.assertEqual([len(call.kwargs["Delete"]["Objects"]) for call in delete_calls], [1000, 500])
+
+    def test_gcp_self_healing_remove_files_for_manifest_from_s3_bucket(self):
+        """Test that the files under the prefix are removed with batched deletes."""
+        keys = [f"data/csv/account/GCP/koku-{i}.csv.gz" for i in range(1001)]
+        summaries = []
+        for key in keys:
+            summary = Mock()
+            summary.Object.return_value = Mock(key=key)
+            summaries.append(summary)
+        with patch("masu.util.aws.common.settings", ENABLE_S3_ARCHIVING=True, S3_BUCKET_NAME="bucket"):
+            with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
+                mock_bucket = mock_s3.return_value.Bucket.return_value
+                mock_bucket.objects.filter.return_value = summaries
+                mock_bucket.delete_objects.side_effect = [{}, {"Errors": [{"Key": keys[-1], "Code": "InternalError"}]}]
+                removed = utils.gcp_self_healing_remove_files_for_manifest_from_s3_bucket(
+                    "request_id", "data/csv/account/GCP", ["1"]
+                )
+                self.assertEqual(removed, keys[:-1])
+                self.assertEqual(mock_bucket.delete_objects.call_count, 2)
+
+                mock_bucket.objects.filter.return_value = []
+                removed = utils.gcp_self_healing_remove_files_for_manifest_from_s3_bucket(
+                    "request_id", "data/csv/account/GCP", ["1"]
+                )
+                self.assertEqual(removed, "No files to remove for month path")
+
     def test_copy_data_to_s3_bucket(self):
         """Test copy_data_to_s3_bucket."""
         upload = utils.copy_data_to_s3_bucket("request_id", "path", "filename", "data", "manifest_id")
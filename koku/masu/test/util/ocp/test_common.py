@@ -258,6 +258,58 @@ class OCPUtilTests(MasuTestCase):
             result = utils.match_openshift_labels(td, matched_tags)
             self.assertEqual(result, expected)
 
+    def test_openshift_matcher_match_labels(self):
+        """Test that the matcher finds the labels match_openshift_labels finds."""
+        matched_tags = [{"key": "value"}, {"other_key": "other_value"}]
+        matcher = utils.OpenShiftMatcher({}, matched_tags)
+        for tags in (
+            {"key": "value"},
+            {"key": "other_value"},
+            {"key": "value", "other_key": "other_value"},
+            {"key": "value", "other_key": None},
+            {"KEY": "VALUE", "keyz": "value"},
+        ):
+            with self.subTest(tags=tags):
+                tags = json.dumps(tags).lower()
+                self.assertEqual(matcher.match_labels(tags), utils.match_openshift_labels(tags, matched_tags))
+
+    def test_openshift_matcher_match_tags(self):
+        """Test that tags are matched per row and null tags match nothing."""
+        matcher = utils.OpenShiftMatcher({}, [{"app": "web"}])
+        tags = pd.Series(['{"App": "Web"}', None, '{"openshift_project": "p"}', '{"App": "Web"}'], index=[5, 6, 7, 8])
+        (special_case,), matched_tag = matcher.match_tags(tags, [utils.OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN])
+        self.assertEqual(special_case.tolist(), [False, False, True, False])
+        self.assertEqual(matched_tag.tolist(), ['"app": "web"', "", "", '"app": "web"'])
+        self.assertEqual(matched_tag.index.tolist(), [5, 6, 7, 8])
+
+        matcher = utils.OpenShiftMatcher({}, [])
+        _, matched_tag = matcher.match_tags(tags, [])
+        self.assertEqual(matched_tag.tolist(), ["", "", "", ""])
+
+    def test_openshift_matcher_match_tags_empty_or_malformed(self):
+        """Test that empty or malformed tags match no label instead of failing the file."""
+        matcher = utils.OpenShiftMatcher({}, [{"app": "web"}])
+        tags = pd.Series(["", '{"App": "Web"}', "app: web", "[]", '"app"', "{}"])
+        (special_case,), matched_tag = matcher.match_tags(tags, [utils.OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN])
+        self.assertEqual(special_case.tolist(), [False] * 6)
+        self.assertEqual(matched_tag.tolist(), ["", '"app": "web"', "", "", "", ""])
+
+    def test_openshift_matcher_match_tags_escaped_key(self):
+        """Test that a label key JSON escaped in the tags string still matches."""
+        matched_tags = [{'app "name"': "web"}]
+        matcher = utils.OpenShiftMatcher({}, matched_tags)
+        tags = pd.Series([json.dumps({'App "Name"': "Web"}), json.dumps({"app": "web"})])
+        _, matched_tag = matcher.match_tags(tags, [])
+        expected = utils.match_openshift_labels(tags[0].lower(), matched_tags)
+        self.assertNotEqual(expected, "")
+        self.assertEqual(matched_tag.tolist(), [expected, ""])
+
+    def test_openshift_matcher_match_resource_names(self):
+        """Test that resource ids containing a node or volume name match."""
+        matcher = utils.OpenShiftMatcher({"nodes": ["node-a"], "persistent_volumes": ["pv-1"]}, [])
+        resource_ids = pd.Series(["/vm/node-a", "/disks/pv-1", "/vm/node-b", None])
+        self.assertEqual(matcher.match_resource_names(resource_ids).tolist(), [True, True, False, False])
+
     def test_get_report_details(self):
         """Test that we handle manifest files properly."""
         with tempfile.TemporaryDirectory() as manifest_path:
@@ -12,6 +12,7 @@ from datetime import timedelta
 from decimal import Decimal
 from os.path import exists
 
+import pandas as pd
 from dateutil import parser
 from django.test import TestCase
 from tenant_schemas.utils import schema_context
@@ -434,6 +435,42 @@ class CommonUtilTests(MasuTestCase):
         result = common_utils.strip_characters_from_column_name(bad_str)
         self.assertEqual(result, expected)
 
+    def test_fold_tag_columns(self):
+        """Test that tag columns fold into the JSON a row dictionary produces."""
+        tag_columns = ["resourceTags/user:app", "resourceTags/user:env", 'resourceTags/user:é"quote']
+        data_frame = pd.DataFrame(
+            {
+                "lineItem/UsageAmount": ["1", "2", "3", "4"],
+                tag_columns[0]: ["web", "", "db", ""],
+                tag_columns[1]: ["prod", "", "", "ünïcode"],
+                tag_columns[2]: ["", "", 'say "hi"', ""],
+            },
+            index=[10, 11, 12, 13],
+        )
+
+        def scrub(column):
+            return column.replace("resourceTags/user:", "")
+
+        expected = [
+            json.dumps({scrub(column): value for column, value in row.items() if value})
+            for _, row in data_frame[tag_columns].iterrows()
+        ]
+        result = common_utils.fold_tag_columns(data_frame, tag_columns, scrub)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(result.index.tolist(), [10, 11, 12, 13])
+        self.assertEqual(result[11], "{}")
+
+        result = common_utils.fold_tag_columns(data_frame, [], scrub)
+        self.assertEqual(result.tolist(), ["{}"] * 4)
+
+    def test_fold_tag_columns_duplicate_keys(self):
+        """Test that the last non-empty value wins when columns share a tag key."""
+        data_frame = pd.DataFrame(
+            {"tags/a.owner": ["one", ""], "tags/b.env": ["", "prod"], "tags/c.owner": ["", "two"]}
+        )
+        result = common_utils.fold_tag_columns(data_frame, list(data_frame), lambda column: column.split(".")[-1])
+        self.assertEqual(result.tolist(), ['{"owner": "one"}', '{"env": "prod", "owner": "two"}'])
+
 
 class NamedTemporaryGZipTests(TestCase):
     """Tests for NamedTemporaryGZip."""
@@ -4,7 +4,6 @@
 #
 """AWS utility functions."""
 import datetime
-import json
 import logging
 import re
 import uuid
@@ -25,13 +24,19 @@ from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.processor import enable_trino_processing
 from masu.util import common as utils
+from masu.util.common import fold_tag_columns
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN
+from masu.util.ocp.common import OpenShiftMatcher
 from reporting.provider.aws.models import PRESTO_REQUIRED_COLUMNS
 
 LOG = logging.getLogger(__name__)
 
+# AWS S3 delete API limits to 1000 objects per request.
+S3_DELETE_BATCH_SIZE = 1000
+MANIFEST_KEY_REGEX = re.compile(r"(?:^|/)manifest-(?P<manifest_id>\d+)_[^/]*$")
+
 
 def get_assume_role_session(arn, session="MasuSession"):
     """
@@ -388,9 +393,51 @@ def copy_local_hcs_report_file_to_s3_bucket(
             copy_hcs_data_to_s3_bucket(request_id, s3_path, local_filename, fin, finalize, context)
 
 
-def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, context={}):
+def get_manifest_keyed_filename(filename, manifest_id):
     """
-    Removes all files in a given prefix if they are not within the given set.
+    Return the object file name with the manifest id encoded in it.
+
+    Objects named this way are matched to their manifest from a bucket listing
+    instead of a HEAD request for their metadata.
+    """
+    return f"manifest-{manifest_id}_{filename}"
+
+
+def get_manifest_id_from_key(key):
+    """Return the manifest id encoded in an object key or None for keys without one."""
+    match = MANIFEST_KEY_REGEX.search(key)
+    if match:
+        return match.group("manifest_id")
+    return None
+
+
+def delete_s3_objects(request_id, s3_bucket, keys, context={}):
+    """
+    Delete the given keys with batched delete_objects calls.
+
+    Keys S3 reports as not deleted are logged and left out of the returned list of deleted keys.
+    """
+    deleted = []
+    for i in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+        batch = keys[i : i + S3_DELETE_BATCH_SIZE]  # noqa E203
+        response = s3_bucket.delete_objects(Delete={"Objects": [{"Key": key} for key in batch]})
+        errors = response.get("Errors", [])
+        if errors:
+            failed = ",".join(f"{error.get('Key')} ({error.get('Code')})" for error in errors)
+            msg = f"Unable to remove files from s3 bucket {settings.S3_BUCKET_NAME}: {failed}."
+            LOG.warning(log_json(request_id, msg, context))
+        failed_keys = {error.get("Key") for error in errors}
+        deleted.extend(key for key in batch if key not in failed_keys)
+    return deleted
+
+
+def remove_files_not_in_set_from_s3_prefixes(request_id, s3_paths, manifest_id, context={}):
+    """
+    Removes all files under the given prefixes that do not belong to the given manifest.
+
+    Stale files are found from the bucket listing when the manifest id is encoded in
+    the key. Only objects written before keys carried the manifest id fall back to
+    reading their metadata. All stale files are removed with batched deletes.
     """
     if not (
         settings.ENABLE_S3_ARCHIVING
@@ -399,19 +446,22 @@ def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, con
         return []
 
     removed = []
-    if s3_path:
+    s3_paths = [s3_path for s3_path in s3_paths if s3_path]
+    if s3_paths:
+        manifest_id_str = str(manifest_id)
         try:
             s3_resource = get_s3_resource()
-            existing_objects = s3_resource.Bucket(settings.S3_BUCKET_NAME).objects.filter(Prefix=s3_path)
-            for obj_summary in existing_objects:
-                existing_object = obj_summary.Object()
-                metadata = existing_object.metadata
-                manifest = metadata.get("manifestid")
-                manifest_id_str = str(manifest_id)
-                key = existing_object.key
-                if manifest != manifest_id_str:
-                    s3_resource.Object(settings.S3_BUCKET_NAME, key).delete()
-                    removed.append(key)
+            s3_bucket = s3_resource.Bucket(settings.S3_BUCKET_NAME)
+            stale_keys = []
+            for s3_path in s3_paths:
+                for obj_summary in s3_bucket.objects.filter(Prefix=s3_path):
+                    key = obj_summary.key
+                    manifest = get_manifest_id_from_key(key)
+                    if manifest is None:
+                        manifest = obj_summary.Object().metadata.get("manifestid")
+                    if manifest != manifest_id_str:
+                        stale_keys.append(key)
+            removed = delete_s3_objects(request_id, s3_bucket, stale_keys, context)
             if removed:
                 msg = f"Removed files from s3 bucket {settings.S3_BUCKET_NAME}: {','.join(removed)}."
                 LOG.info(log_json(request_id, msg, context))
@@ -421,6 +471,13 @@ def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, con
     return removed
 
 
+def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, context={}):
+    """
+    Removes all files in a given prefix if they are not within the given set.
+    """
+    return remove_files_not_in_set_from_s3_prefixes(request_id, [s3_path], manifest_id, context)
+
+
 def gcp_self_healing_remove_files_for_manifest_from_s3_bucket(request_id, s3_path, manifest_list, context={}):
     """
     Removes all files in a given prefix if they are not within the given set.
@@ -436,8 +493,9 @@ def gcp_self_healing_remove_files_for_manifest_from_s3_bucket(request_id, s3_pat
         LOG.info(f"Attempting to run bulk deletion on {s3_path}")
         try:
             s3_resource = get_s3_resource()
-            bulk_delete_objects = []
-            existing_objects = s3_resource.Bucket(settings.S3_BUCKET_NAME).objects.filter(Prefix=s3_path)
+            s3_bucket = s3_resource.Bucket(settings.S3_BUCKET_NAME)
+            keys = []
+            existing_objects = s3_bucket.objects.filter(Prefix=s3_path)
             for obj_summary in existing_objects:
                 existing_object = obj_summary.Object()
                 # metadata = existing_object.metadata
@@ -447,21 +505,12 @@ def gcp_self_healing_remove_files_for_manifest_from_s3_bucket(request_id, s3_pat
                 # metadata id associated with the parquet files.
                 # to the this metadata check
                 # if manifest in manifest_list:
-                key = existing_object.key
-                bulk_delete_objects.append({"Key": key})
-                removed.append(key)
-            bucket = s3_resource.Bucket(settings.S3_BUCKET_NAME)
-            # split the bulk delete objects into x number of objects to delete at a time
-            num_files_delete = 250
-            for i in range(0, len(bulk_delete_objects), num_files_delete):
-                sublist = bulk_delete_objects[i : i + num_files_delete]  # noqa E203
-                bucket.delete_objects(Delete={"Objects": sublist})
-                sublist_values = [val for obj in sublist for val in obj.values()]
-                removed.append(sublist_values)
-                if removed:
-                    msg = f"BULK: Removed files from s3 bucket {settings.S3_BUCKET_NAME}: {','.join(sublist_values)}."
-                    LOG.info(log_json(request_id, msg, context))
-            if removed == []:
+                keys.append(existing_object.key)
+            removed = delete_s3_objects(request_id, s3_bucket, keys, context)
+            if removed:
+                msg = f"BULK: Removed files from s3 bucket {settings.S3_BUCKET_NAME}: {','.join(removed)}."
+                LOG.info(log_json(request_id, msg, context))
+            if keys == []:
                 removed = "No files to remove for month path"
                 LOG.info(removed)
         except (EndpointConnectionError, ClientError) as err:
@@ -484,13 +533,7 @@ def aws_post_processor(data_frame):
 
     resource_tag_columns = [column for column in columns if "resourceTags/user:" in column]
     unique_keys = {scrub_resource_col_name(column) for column in resource_tag_columns}
-    tag_df = data_frame[resource_tag_columns]
-    resource_tags_dict = tag_df.apply(
-        lambda row: {scrub_resource_col_name(column): value for column, value in row.items() if value}, axis=1
-    )
-    resource_tags_dict.where(resource_tags_dict.notna(), lambda _: [{}], inplace=True)
-
-    data_frame["resourceTags"] = resource_tags_dict.apply(json.dumps)
+    data_frame["resourceTags"] = fold_tag_columns(data_frame, resource_tag_columns, scrub_resource_col_name)
     # Make sure we have entries for our required columns
     data_frame = data_frame.reindex(columns=columns)
 
@@ -553,60 +596,29 @@ def aws_generate_daily_data(data_frame):
     return daily_data_frame
 
 
-def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_tags):
-    """Filter a dataframe to the subset that matches an OpenShift source."""
-    resource_ids = cluster_topology.get("resource_ids", [])
-    resource_id_df = data_frame["lineitem_resourceid"]
+def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_tags, matcher=None):
+    """Filter a dataframe to the subset that matches an OpenShift source.
 
-    LOG.info("Matching OpenShift on AWS by resource ID.")
-    resource_id_matched = resource_id_df.isin(resource_ids)
-    data_frame["resource_id_matched"] = resource_id_matched
+    A matcher compiled from the same cluster topology and matched tags can be
+    passed to reuse it across data frames.
+    """
+    if matcher is None:
+        matcher = OpenShiftMatcher(cluster_topology, matched_tags)
 
-    tags = data_frame["resourcetags"]
-    tags = tags.str.lower()
+    LOG.info("Matching OpenShift on AWS by resource ID.")
+    data_frame["resource_id_matched"] = data_frame["lineitem_resourceid"].isin(matcher.resource_ids)
 
-    special_case_tag_matched = tags.str.contains(
-        "|".join(["openshift_cluster", "openshift_project", "openshift_node"])
+    LOG.info("Matching OpenShift on AWS tags.")
+    (special_case_tag_matched,), matched_tag = matcher.match_tags(
+        data_frame["resourcetags"], [OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN]
     )
-    data_frame["special_case_tag_matched"] = special_case_tag_matched
-
-    if matched_tags:
-        tag_keys = []
-        tag_values = []
-        for tag in matched_tags:
-            tag_keys.extend(list(tag.keys()))
-            tag_values.extend(list(tag.values()))
-
-        tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
-        data_frame["tag_matched"] = tag_matched
-        any_tag_matched = tag_matched.any()
-
-        if any_tag_matched:
-            tag_df = pd.concat([tags, tag_matched], axis=1)
-            tag_df.columns = ("tags", "tag_matched")
-            tag_subset = tag_df[tag_df.tag_matched == True].tags  # noqa: E712
-
-            LOG.info("Matching OpenShift on AWS tags.")
-
-            matched_tag = tag_subset.apply(match_openshift_labels, args=(matched_tags,))
-            data_frame["matched_tag"] = matched_tag
-            data_frame["matched_tag"].fillna(value="", inplace=True)
-        else:
-            data_frame["matched_tag"] = ""
-    else:
-        data_frame["tag_matched"] = False
-        data_frame["matched_tag"] = ""
+    data_frame["matched_tag"] = matched_tag
+
     openshift_matched_data_frame = data_frame[
-        (data_frame["resource_id_matched"] == True)  # noqa: E712
-        | (data_frame["special_case_tag_matched"] == True)  # noqa: E712
-        | (data_frame["matched_tag"] != "")  # noqa: E712
+        data_frame["resource_id_matched"] | special_case_tag_matched | (data_frame["matched_tag"] != "")
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
-    openshift_matched_data_frame = openshift_matched_data_frame.drop(
-        columns=["special_case_tag_matched", "tag_matched"]
-    )
-
+    openshift_matched_data_frame["uuid"] = [str(uuid.uuid4()) for _ in range(len(openshift_matched_data_frame))]
     return openshift_matched_data_frame
 
 
@@ -11,7 +11,6 @@ import uuid
 
 import ciso8601
 import numpy as np
-import pandas as pd
 from tenant_schemas.utils import schema_context
 
 from api.models import Provider
@@ -19,7 +18,8 @@ from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN
+from masu.util.ocp.common import OpenShiftMatcher
 from reporting.provider.azure.models import PRESTO_COLUMNS
 
 LOG = logging.getLogger(__name__)
@@ -182,63 +182,30 @@ def azure_generate_daily_data(data_frame):
     return data_frame
 
 
-def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_tags):
-    """Filter a dataframe to the subset that matches an OpenShift source."""
-    nodes = cluster_topology.get("nodes", [])
-    volumes = cluster_topology.get("persistent_volumes", [])
-    matchable_resources = nodes + volumes
+def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_tags, matcher=None):
+    """Filter a dataframe to the subset that matches an OpenShift source.
+
+    A matcher compiled from the same cluster topology and matched tags can be
+    passed to reuse it across data frames.
+    """
+    if matcher is None:
+        matcher = OpenShiftMatcher(cluster_topology, matched_tags)
     resource_id_df = data_frame["resourceid"]
     if resource_id_df.isna().values.all():
         resource_id_df = data_frame["instanceid"]
 
     LOG.info("Matching OpenShift on Azure by resource ID.")
-    resource_id_matched = resource_id_df.str.contains("|".join(matchable_resources))
-    data_frame["resource_id_matched"] = resource_id_matched
-
-    tags = data_frame["tags"]
-    tags = tags.str.lower()
+    data_frame["resource_id_matched"] = matcher.match_resource_names(resource_id_df)
 
-    special_case_tag_matched = tags.str.contains(
-        "|".join(["openshift_cluster", "openshift_project", "openshift_node"])
+    LOG.info("Matching OpenShift on Azure tags.")
+    (special_case_tag_matched,), matched_tag = matcher.match_tags(
+        data_frame["tags"], [OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN]
     )
-    data_frame["special_case_tag_matched"] = special_case_tag_matched
-
-    if matched_tags:
-        tag_keys = []
-        tag_values = []
-        for tag in matched_tags:
-            tag_keys.extend(list(tag.keys()))
-            tag_values.extend(list(tag.values()))
-
-        tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
-        data_frame["tag_matched"] = tag_matched
-        any_tag_matched = tag_matched.any()
-
-        if any_tag_matched:
-            tag_df = pd.concat([tags, tag_matched], axis=1)
-            tag_df.columns = ("tags", "tag_matched")
-            tag_subset = tag_df[tag_df.tag_matched == True].tags  # noqa: E712
-
-            LOG.info("Matching OpenShift on Azure tags.")
-
-            matched_tag = tag_subset.apply(match_openshift_labels, args=(matched_tags,))
-            data_frame["matched_tag"] = matched_tag
-            data_frame["matched_tag"].fillna(value="", inplace=True)
-        else:
-            data_frame["matched_tag"] = ""
-    else:
-        data_frame["tag_matched"] = False
-        data_frame["matched_tag"] = ""
+    data_frame["matched_tag"] = matched_tag
 
     openshift_matched_data_frame = data_frame[
-        (data_frame["resource_id_matched"] == True)  # noqa: E712
-        | (data_frame["special_case_tag_matched"] == True)  # noqa: E712
-        | (data_frame["matched_tag"] != "")  # noqa: E712
+        data_frame["resource_id_matched"] | special_case_tag_matched | (data_frame["matched_tag"] != "")
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
-    openshift_matched_data_frame = openshift_matched_data_frame.drop(
-        columns=["special_case_tag_matched", "tag_matched"]
-    )
-
+    openshift_matched_data_frame["uuid"] = [str(uuid.uuid4()) for _ in range(len(openshift_matched_data_frame))]
     return openshift_matched_data_frame
@@ -15,6 +15,8 @@ from os import remove
 from tempfile import gettempdir
 from uuid import uuid4
 
+import numpy as np
+import pandas as pd
 from dateutil import parser
 from dateutil.rrule import DAILY
 from dateutil.rrule import rrule
@@ -152,6 +154,56 @@ def strip_characters_from_column_name(column_name):
     return re.sub(r"\W+", "_", column_name).lower()
 
 
+def _fold_tag_columns_by_row(data_frame, tag_columns, tag_keys):
+    """Build the tags JSON one row at a time."""
+    tags = data_frame[tag_columns].apply(
+        lambda row: {key: value for key, value in zip(tag_keys, row) if value}, axis=1
+    )
+    tags.where(tags.notna(), lambda _: [{}], inplace=True)
+    return tags.apply(json.dumps)
+
+
+def fold_tag_columns(data_frame, tag_columns, scrub_column_name):
+    """Return a series with the tag columns of each row folded into a JSON object.
+
+    Tag columns are sparse, so only the non-empty cells are encoded and joined
+    per row with numpy instead of building a dictionary for every row. The output
+    matches json.dumps of the row dictionary in column order.
+
+    Args:
+        data_frame (DataFrame): The report data
+        tag_columns (list): The tag column names in the order keys are written
+        scrub_column_name (function): Returns the tag key of a tag column name
+
+    Returns:
+        (Series): JSON strings indexed like data_frame
+
+    """
+    tag_keys = [scrub_column_name(column) for column in tag_columns]
+    if len(set(tag_keys)) != len(tag_keys):
+        # Several columns map to the same key and the last non-empty value wins.
+        return _fold_tag_columns_by_row(data_frame, tag_columns, tag_keys)
+
+    tags = np.full(len(data_frame), "{}", dtype=object)
+    if tag_columns and not data_frame.empty:
+        values = data_frame[tag_columns].to_numpy(dtype=object)
+        # Row-major order keeps the cells of a row together and in column order.
+        rows, columns = np.nonzero(values != "")
+        cells = values[rows, columns]
+        present = pd.notna(cells)
+        rows, columns, cells = rows[present], columns[present], cells[present]
+        if len(rows):
+            codes, unique_values = pd.factorize(cells)
+            encoded_values = np.array([json.dumps(value) for value in unique_values], dtype=object)[codes]
+            encoded_keys = np.array([f"{json.dumps(key)}: " for key in tag_keys], dtype=object)[columns]
+            row_starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            separators = np.full(len(rows), ", ", dtype=object)
+            separators[row_starts] = ""
+            joined = np.add.reduceat(separators + encoded_keys + encoded_values, row_starts)
+            tags[rows[row_starts]] = "{" + joined + "}"
+    return pd.Series(tags, index=data_frame.index)
+
+
 class NamedTemporaryGZip:
     """Context manager for a temporary GZip file.
 
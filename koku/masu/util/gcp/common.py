@@ -6,6 +6,7 @@
 import datetime
 import json
 import logging
+import re
 import uuid
 from json.decoder import JSONDecodeError
 
@@ -18,7 +19,7 @@ from masu.database.gcp_report_db_accessor import GCPReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import OpenShiftMatcher
 
 LOG = logging.getLogger(__name__)
 pd.options.mode.chained_assignment = None
@@ -183,21 +184,18 @@ def gcp_generate_daily_data(data_frame):
     return daily_data_frame
 
 
-def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_tags):
-    """Filter a dataframe to the subset that matches an OpenShift source."""
-    tags = data_frame["labels"]
-    tags = tags.str.lower()
+def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_tags, matcher=None):
+    """Filter a dataframe to the subset that matches an OpenShift source.
 
+    A matcher compiled from the same cluster topology and matched tags can be
+    passed to reuse it across data frames.
+    """
+    if matcher is None:
+        matcher = OpenShiftMatcher(cluster_topology, matched_tags)
     cluster_id = cluster_topology.get("cluster_id")
     cluster_alias = cluster_topology.get("cluster_alias")
-
-    LOG.info("Matching OpenShift on GCP by labels.")
-    ocp_matched = tags.str.contains(f"kubernetes-io-cluster-{cluster_id}|kubernetes-io-cluster-{cluster_alias}")
-
-    data_frame["ocp_matched"] = ocp_matched
-    data_frame["cluster_id"] = cluster_id
-
-    special_case_tag_matched = tags.str.contains(
+    ocp_pattern = re.compile(f"kubernetes-io-cluster-{cluster_id}|kubernetes-io-cluster-{cluster_alias}")
+    special_case_pattern = re.compile(
         "|".join(
             [
                 f"openshift_cluster.*{cluster_id}",
@@ -207,42 +205,17 @@ def match_openshift_resources_and_labels(data_frame, cluster_topology, matched_t
             ]
         )
     )
-    data_frame["special_case_tag_matched"] = special_case_tag_matched
-    if matched_tags:
-        tag_keys = []
-        tag_values = []
-        for tag in matched_tags:
-            tag_keys.extend(list(tag.keys()))
-            tag_values.extend(list(tag.values()))
-
-        tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
-        data_frame["tag_matched"] = tag_matched
-        any_tag_matched = tag_matched.any()
-
-        if any_tag_matched:
-            tag_df = pd.concat([tags, tag_matched], axis=1)
-            tag_df.columns = ("tags", "tag_matched")
-            tag_subset = tag_df[tag_df.tag_matched == True].tags  # noqa: E712
-
-            LOG.info("Matching OpenShift on GCP tags.")
-
-            matched_tag = tag_subset.apply(match_openshift_labels, args=(matched_tags,))
-            data_frame["matched_tag"] = matched_tag
-            data_frame["matched_tag"].fillna(value="", inplace=True)
-        else:
-            data_frame["matched_tag"] = ""
-    else:
-        data_frame["tag_matched"] = False
-        data_frame["matched_tag"] = ""
-    openshift_matched_data_frame = data_frame[
-        (data_frame["ocp_matched"] == True)  # noqa: E712
-        | (data_frame["special_case_tag_matched"] == True)  # noqa: E712
-        | (data_frame["matched_tag"] != "")  # noqa: E712
-    ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
-    openshift_matched_data_frame = openshift_matched_data_frame.drop(
-        columns=["special_case_tag_matched", "tag_matched", "ocp_matched"]
+    LOG.info("Matching OpenShift on GCP by labels.")
+    (ocp_matched, special_case_tag_matched), matched_tag = matcher.match_tags(
+        data_frame["labels"], [ocp_pattern, special_case_pattern]
     )
+    data_frame["cluster_id"] = cluster_id
+    data_frame["matched_tag"] = matched_tag
+
+    openshift_matched_data_frame = data_frame[
+        ocp_matched | special_case_tag_matched | (data_frame["matched_tag"] != "")
+    ]
 
+    openshift_matched_data_frame["uuid"] = [str(uuid.uuid4()) for _ in range(len(openshift_matched_data_frame))]
     return openshift_matched_data_frame
@@ -4,7 +4,6 @@
 #
 """Common util functions."""
 import datetime
-import json
 import logging
 
 import ciso8601
@@ -14,6 +13,7 @@ from tenant_schemas.utils import schema_context
 from api.provider.models import Provider
 from masu.database.oci_report_db_accessor import OCIReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
+from masu.util.common import fold_tag_columns
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
 from reporting.provider.oci.models import PRESTO_REQUIRED_COLUMNS
@@ -94,13 +94,7 @@ def oci_post_processor(data_frame):
 
     resource_tag_columns = [column for column in columns if "tags/" in column]
     unique_keys = {scrub_resource_col_name(column) for column in resource_tag_columns}
-    tag_df = data_frame[resource_tag_columns]
-    resource_tags_dict = tag_df.apply(
-        lambda row: {scrub_resource_col_name(column): value for column, value in row.items() if value}, axis=1
-    )
-    resource_tags_dict.where(resource_tags_dict.notna(), lambda _: [{}], inplace=True)
-
-    data_frame["tags"] = resource_tags_dict.apply(json.dumps)
+    data_frame["tags"] = fold_tag_columns(data_frame, resource_tag_columns, scrub_resource_col_name)
     # Make sure we have entries for our required columns
     data_frame = data_frame.reindex(columns=columns)
 
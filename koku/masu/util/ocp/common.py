@@ -7,10 +7,12 @@ import copy
 import json
 import logging
 import os
+import re
 from datetime import datetime
 from enum import Enum
 
 import ciso8601
+import numpy as np
 import pandas as pd
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
@@ -489,3 +491,92 @@ def match_openshift_labels(tag_dict, matched_tags):
             tag = json.dumps(lower_tag).replace("{", "").replace("}", "")
             tag_matches.append(tag)
     return ",".join(tag_matches)
+
+
+# Tags that match any OpenShift cluster on AWS and Azure regardless of the enabled labels.
+OPENSHIFT_SPECIAL_CASE_TAGS_PATTERN = re.compile("openshift_cluster|openshift_project|openshift_node")
+
+
+class OpenShiftMatcher:
+    """Cluster topology and matched labels compiled for matching cloud line items.
+
+    The matcher is built once per cluster and reused for every data frame of a
+    report. Resource ids and enabled labels are hashed lookups, and tags are
+    parsed once per distinct tags string rather than once per row, and only when
+    an enabled label key appears in it.
+    """
+
+    def __init__(self, cluster_topology, matched_tags):
+        """Compile the cluster topology and the enabled (key, value) label pairs."""
+        self.cluster_topology = cluster_topology
+        self.resource_ids = frozenset(cluster_topology.get("resource_ids", []))
+        resource_names = cluster_topology.get("nodes", []) + cluster_topology.get("persistent_volumes", [])
+        self.resource_names_pattern = re.compile("|".join(resource_names))
+        self.label_pairs = frozenset(pair for tag in matched_tags for pair in tag.items())
+        # The keys appear in a tags string either as they are or JSON escaped
+        label_keys = {key for key, _ in self.label_pairs}
+        label_keys |= {json.dumps(key)[1:-1] for key in label_keys}
+        self.label_keys_pattern = re.compile("|".join(re.escape(key) for key in sorted(label_keys)))
+
+    def match_labels(self, tags):
+        """Return the enabled labels found in a lowercase tags JSON string, like match_openshift_labels.
+
+        Empty or malformed tags strings match no label.
+        """
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            return ""
+        if not isinstance(tags, dict):
+            return ""
+        tag_matches = []
+        for key, value in tags.items():
+            if not value:
+                continue
+            lower_key, lower_value = key.lower(), value.lower()
+            if (lower_key, lower_value) in self.label_pairs:
+                tag = json.dumps({lower_key: lower_value}).replace("{", "").replace("}", "")
+                tag_matches.append(tag)
+        return ",".join(tag_matches)
+
+    def match_resource_names(self, resource_ids):
+        """Return whether each resource id contains a node or persistent volume name."""
+        return _map_unique_values(resource_ids, lambda value: self.resource_names_pattern.search(value) is not None)
+
+    def match_tags(self, tags, patterns):
+        """Match a column of tags JSON strings.
+
+        Args:
+            tags (Series): The tags column
+            patterns (list): Compiled patterns searched for in the lowercase tags
+
+        Returns:
+            (list, Series): a boolean series per pattern, the matched labels of each row
+
+        """
+        codes, unique_tags = pd.factorize(tags)
+        unique_tags = [value.lower() for value in unique_tags]
+        pattern_matches = [
+            _broadcast(codes, [pattern.search(value) is not None for value in unique_tags], False, tags.index)
+            for pattern in patterns
+        ]
+        if self.label_pairs:
+            matched_labels = [
+                self.match_labels(value) if self.label_keys_pattern.search(value) else "" for value in unique_tags
+            ]
+        else:
+            matched_labels = [""] * len(unique_tags)
+        return pattern_matches, _broadcast(codes, matched_labels, "", tags.index, dtype=object)
+
+
+def _broadcast(codes, unique_results, missing, index, dtype=bool):
+    """Return a series with the result of each row's distinct value, missing for null values."""
+    # Null values are factorized to -1, which selects the trailing missing value.
+    results = np.array(unique_results + [missing], dtype=dtype)
+    return pd.Series(results[codes], index=index)
+
+
+def _map_unique_values(series, func):
+    """Apply func once per distinct non-null value of series and broadcast the results."""
+    codes, uniques = pd.factorize(series)
+    return _broadcast(codes, [func(value) for value in uniques], False, series.index)